@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""Repeated instantiations of Doreen with and without the assess cache.
+
+Build a synthetic PKB (100k cards with 8 reviews each by default), then
+instantiate `ProfessorDoreen` several times (as the UI does when it recreates
+professors) with `use_assess_cache=False` and `use_assess_cache=True`, and
+print the duration of each instantiation and the cache counters. The cache is
+then cleared from memory to measure an instantiation reading the grades
+saved in the database (e.g. after a restart of the application).
+
+The database is a temporary file.
+
+Usage: python3 benchmarks/bench_assess_cache.py [--num-cards N] [--num-reviews-per-card M] [--num-instances I]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import tempfile
+import time
+
+import yaml
+
+import opencal
+import opencal.config
+import opencal.io.connection
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+
+
+def make_card_list(num_cards, num_reviews_per_card):
+    rng = random.Random(0)
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    card_list = []
+    for card_index in range(num_cards):
+        creation_datetime = today - datetime.timedelta(days=rng.randrange(400, 800))
+        card_list.append(Card(
+            creation_datetime=creation_datetime,
+            question=f"Question {card_index}",
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=2**i), rng.random() < 0.8)
+                for i in range(num_reviews_per_card)
+            ],
+            id=card_index + 1
+        ))
+    return card_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=100000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    parser.add_argument("--num-instances", type=int, default=3, help="The number of instantiations of the professor")
+    args = parser.parse_args()
+
+    card_list = make_card_list(args.num_cards, args.num_reviews_per_card)
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        cfg = yaml.safe_load(opencal.config.DEFAULT_CONFIG_STR)
+        cfg["opencal"]["db_path"] = os.path.join(temp_dir_path, "bench.sqlite")
+        opencal.cfg = cfg
+
+        from opencal.core.professor.consolidation.doreen import ProfessorDoreen
+
+        print(f"Synthetic PKB: {args.num_cards} cards, {args.num_reviews_per_card} reviews per card")
+        print()
+        print(f"{'':30s} {'time (s)':>10s}   cache counters")
+
+        def instantiate(label, use_assess_cache):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):     # Mute the professor's messages
+                professor = ProfessorDoreen(card_list, use_assess_cache=use_assess_cache)
+            duration = time.perf_counter() - start
+            stats = professor.assess_cache.stats() if professor.assess_cache is not None else ""
+            print(f"{label:30s} {duration:10.3f}   {stats}")
+            return professor
+
+        for instance_index in range(args.num_instances):
+            instantiate(f"without cache #{instance_index + 1}", False)
+
+        for instance_index in range(args.num_instances):
+            professor = instantiate(f"with cache #{instance_index + 1}", True)
+
+        professor.assess_cache.clear()
+        instantiate("with cache (from database)", True)
+
+        opencal.io.connection.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""Full and differential backups of an SQLite database.
+
+Build a synthetic PKB (125k cards with 8 reviews each, i.e. 1M reviews, by
+default) and save it with `save_pkb`, then back it up:
+
+- with the former algorithm of `backup_db` (reference): online backup API,
+  one page per step and a progress callback at each step,
+- with `backup_db` (online backup API, `--pages` pages per step),
+- with `backup_db(..., use_vacuum_into=True)`,
+- with `backup_db(..., differential=True)` after a review session (a few
+  cards answered, c.f. `save_changes`).
+
+Print the duration and the size of each backup.
+
+Usage: python3 benchmarks/bench_backup.py [--num-cards N] [--num-reviews-per-card M] [--pages P] [--num-modified-cards K]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+import opencal.io.connection
+import opencal.io.sqlitedb
+
+
+def make_card_list(num_cards, num_reviews_per_card):
+    creation_datetime = datetime.datetime(2020, 1, 1)
+    return [
+        Card(
+            creation_datetime=creation_datetime + datetime.timedelta(days=card_index % 365),
+            question=f"Question {card_index}",
+            answer=f"Answer {card_index}",
+            tags=["tag"],
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=card_index % 365 + 2**i), True)
+                for i in range(num_reviews_per_card)
+            ]
+        )
+        for card_index in range(num_cards)
+    ]
+
+
+def backup_db_reference(db_path, backup_file_path):
+    """The former algorithm of `opencal.io.sqlitedb.backup_db`."""
+    def progress(status, remaining, total):
+        print(".", end="")
+
+    src_db = opencal.io.connection.get_connection(db_path)
+    src_db.flush()
+    dst_db = sqlite3.connect(backup_file_path)
+    with dst_db:
+        src_db.con.backup(dst_db, pages=1, progress=progress)
+    dst_db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=125000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    parser.add_argument("--pages", type=int, default=opencal.io.sqlitedb.DEFAULT_BACKUP_PAGES, help="The number of pages copied at each step of `backup_db`")
+    parser.add_argument("--num-modified-cards", type=int, default=20, help="The number of cards answered before the differential backup")
+    args = parser.parse_args()
+
+    card_list = make_card_list(args.num_cards, args.num_reviews_per_card)
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "bench.sqlite")
+        with contextlib.redirect_stdout(io.StringIO()):
+            opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        print(f"Synthetic PKB: {args.num_cards} cards, {args.num_reviews_per_card} reviews per card, {os.path.getsize(db_path) / 1e6:.1f} MB")
+        print()
+        print(f"{'':40s} {'time (s)':>10s} {'size (MB)':>10s}")
+
+        for backup_index, (label, backup_function) in enumerate((
+                ("reference (1 page per step)", lambda backup_dir_path: backup_db_reference(db_path, os.path.join(backup_dir_path, "reference.sqlite")) or os.path.join(backup_dir_path, "reference.sqlite")),
+                (f"backup_db ({args.pages} pages per step)", lambda backup_dir_path: opencal.io.sqlitedb.backup_db(db_path, backup_dir_path, pages=args.pages, keep=1)),
+                ("backup_db (VACUUM INTO)", lambda backup_dir_path: opencal.io.sqlitedb.backup_db(db_path, backup_dir_path, use_vacuum_into=True, keep=1)),
+            )):
+            backup_dir_path = os.path.join(temp_dir_path, f"backups_{backup_index}")
+            os.mkdir(backup_dir_path)
+
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):     # Mute the progress messages
+                backup_file_path = backup_function(backup_dir_path)
+            print(f"{label:40s} {time.perf_counter() - start:10.2f} {os.path.getsize(backup_file_path) / 1e6:10.1f}")
+
+        # Review session
+        rng = random.Random(0)
+        today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+        for card in rng.sample(card_list, args.num_modified_cards):
+            card.consolidation_reviews.append(ConsolidationReview(today, rng.random() < 0.8))
+        with contextlib.redirect_stdout(io.StringIO()):
+            opencal.io.sqlitedb.save_changes(card_list, db_path)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            backup_file_path = opencal.io.sqlitedb.backup_db(db_path, backup_dir_path, differential=True, keep=1)
+        print(f"{'backup_db (differential)':40s} {time.perf_counter() - start:10.2f} {os.path.getsize(backup_file_path) / 1e6:10.3f}")
+
+        opencal.io.connection.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
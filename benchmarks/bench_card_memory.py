@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+"""Memory footprint of Card and ConsolidationReview objects.
+
+Build a synthetic PKB (200k cards by default) twice: once with dictionary
+backed classes having the same attributes than the former (non slotted)
+`Card` and `ConsolidationReview` classes, and once with the current (slotted)
+classes. Print the memory used per card and per review in both cases.
+
+Usage: python3 benchmarks/bench_card_memory.py [--num-cards N] [--num-reviews-per-card M]
+"""
+
+import argparse
+import datetime
+import gc
+import tracemalloc
+
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+
+
+class DictBackedReview:
+    """Same attributes than `ConsolidationReview` before it used `__slots__`."""
+
+    def __init__(self, review_datetime, is_right_answer, user_response_time_ms=None):
+        self.review_datetime = review_datetime
+        self.is_right_answer = is_right_answer
+        self.user_response_time_ms = user_response_time_ms
+        self.timedelta = None
+        self.last_validated_timedelta = None
+
+
+class DictBackedCard:
+    """Same attributes than `Card` before it used `__slots__`."""
+
+    def __init__(self, creation_datetime, question, answer="", is_hidden=False, tags=None, consolidation_reviews=None, id=None):
+        self.creation_datetime = creation_datetime
+        self.question = question
+        self.answer = answer
+        self.is_hidden = is_hidden
+        self.tags = [] if tags is None else tags
+        self.consolidation_reviews = [] if consolidation_reviews is None else consolidation_reviews
+        self.id = id
+        self.grade = None
+        self.priority = None
+        self.difficulty = None
+
+
+def measure(card_class, review_class, num_cards, num_reviews_per_card, with_reviews):
+    """Return the memory (in bytes) allocated to build the PKB."""
+
+    # Shared objects (dates, strings, tags) are created before the measure
+    # so that only the card and review objects themselves are counted
+    creation_datetime = datetime.datetime(2020, 1, 1)
+    review_datetime_list = [creation_datetime + datetime.timedelta(days=2**i) for i in range(num_reviews_per_card)]
+    question, answer, tags = "question", "answer", ["tag"]
+
+    gc.collect()
+    tracemalloc.start()
+
+    card_list = []
+    for card_index in range(num_cards):
+        review_list = [review_class(review_datetime, True) for review_datetime in review_datetime_list] if with_reviews else []
+        card_list.append(card_class(creation_datetime, question, answer, False, tags, review_list, card_index))
+
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del card_list
+    gc.collect()
+
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=200000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    args = parser.parse_args()
+
+    num_cards, num_reviews_per_card = args.num_cards, args.num_reviews_per_card
+    num_reviews = num_cards * num_reviews_per_card
+
+    print(f"Synthetic PKB: {num_cards} cards, {num_reviews} reviews")
+    print()
+    print(f"{'':24s} {'bytes/card':>12s} {'bytes/review':>14s} {'total (MB)':>12s}")
+
+    for label, card_class, review_class in (("dict (before)", DictBackedCard, DictBackedReview),
+                                            ("__slots__ (after)", Card, ConsolidationReview)):
+        cards_only_size = measure(card_class, review_class, num_cards, num_reviews_per_card, with_reviews=False)
+        total_size = measure(card_class, review_class, num_cards, num_reviews_per_card, with_reviews=True)
+
+        bytes_per_card = cards_only_size / num_cards
+        bytes_per_review = (total_size - cards_only_size) / num_reviews if num_reviews > 0 else 0.
+
+        print(f"{label:24s} {bytes_per_card:12.1f} {bytes_per_review:14.1f} {total_size / 1e6:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+"""Conversion of a PKB to pandas DataFrames.
+
+Build a synthetic PKB (125k cards with 8 reviews each, i.e. 1M reviews, by
+default) and convert it to a card DataFrame and a review DataFrame:
+
+- with the former algorithm of `card_list_to_dataframes` (reference): each
+  card deep-copied, then the DataFrames built from lists of dicts (it only
+  supports dict cards),
+- with `card_list_to_dataframes` on the same dict cards and on `Card` instances,
+- with `load_pkb` followed by `card_list_to_dataframes` on an SQLite database,
+- with `load_pkb_dataframes` on the same SQLite database.
+
+Print the duration of each conversion.
+
+Usage: python3 benchmarks/bench_dataframes.py [--num-cards N] [--num-reviews-per-card M]
+"""
+
+import argparse
+import contextlib
+import copy
+import datetime
+import io
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from opencal.card import Card
+from opencal.core.data import card_list_to_dataframes
+from opencal.review import ConsolidationReview
+import opencal.io.connection
+import opencal.io.sqlitedb
+
+
+def make_card_list(num_cards, num_reviews_per_card):
+    creation_datetime = datetime.datetime(2020, 1, 1)
+    return [
+        Card(
+            creation_datetime=creation_datetime + datetime.timedelta(days=card_index % 365),
+            question=f"Question {card_index} " + "x" * 200,
+            answer=f"Answer {card_index} " + "x" * 200,
+            tags=["tag", f"tag {card_index % 10}"],
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=card_index % 365 + 2**i), i % 3 != 2)
+                for i in range(num_reviews_per_card)
+            ]
+        )
+        for card_index in range(num_cards)
+    ]
+
+
+def card_to_dict(card):
+    return {
+        "cdate": card.creation_datetime,
+        "hidden": card.is_hidden,
+        "question": card.question,
+        "answer": card.answer,
+        "tags": card.tags,
+        "reviews": [{"rdate": review.review_datetime, "result": review["result"]} for review in card.consolidation_reviews]
+    }
+
+
+def card_list_to_dataframes_reference(card_list):
+    """The former algorithm of `opencal.core.data.card_list_to_dataframes`."""
+    flat_card_list = []
+    flat_review_list = []
+
+    for card_id, card in enumerate(card_list):
+        card = copy.deepcopy(card)
+        del card["question"]
+        del card["answer"]
+        del card["tags"]
+        review_list = card["reviews"]
+        for review in review_list:
+            review["card_id"] = card_id
+        flat_review_list.extend(review_list)
+        del card["reviews"]
+        flat_card_list.append(card)
+
+    return pd.DataFrame(flat_card_list), pd.DataFrame(flat_review_list)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=125000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    args = parser.parse_args()
+
+    card_list = make_card_list(args.num_cards, args.num_reviews_per_card)
+    dict_card_list = [card_to_dict(card) for card in card_list]
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "bench.sqlite")
+        with contextlib.redirect_stdout(io.StringIO()):     # Mute the table creation messages
+            opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        print(f"Synthetic PKB: {args.num_cards} cards, {args.num_reviews_per_card} reviews per card")
+        print()
+        print(f"{'':50s} {'time (s)':>10s}")
+
+        for label, function in (
+                ("reference (dict cards)", lambda: card_list_to_dataframes_reference(dict_card_list)),
+                ("card_list_to_dataframes (dict cards)", lambda: card_list_to_dataframes(dict_card_list)),
+                ("card_list_to_dataframes (Card)", lambda: card_list_to_dataframes(card_list)),
+                ("load_pkb + card_list_to_dataframes (SQLite)", lambda: card_list_to_dataframes(opencal.io.sqlitedb.load_pkb(db_path))),
+                ("load_pkb_dataframes (SQLite)", lambda: opencal.io.sqlitedb.load_pkb_dataframes(db_path)),
+            ):
+            start = time.perf_counter()
+            function()
+            print(f"{label:50s} {time.perf_counter() - start:10.2f}")
+
+        opencal.io.connection.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+"""Dumping and restoring an SQLite database.
+
+Build a synthetic PKB (125k cards with 8 reviews each, i.e. 1M reviews, by
+default) and save it with `save_pkb`, then:
+
+- dump it with `dump_db` to a plain text, a gzip and a zstd SQL file,
+- restore each dump with the former algorithm of `restore_db` (reference:
+  the whole dump file read in memory and run with `executescript`),
+  and with `restore_db` (statements streamed and committed by batches).
+
+Print the duration, the size of each dump file and the peak memory
+allocated by Python during each restore (c.f. `tracemalloc`, measured in a
+second run as tracing slows Python code down).
+
+Usage: python3 benchmarks/bench_dump_restore.py [--num-cards N] [--num-reviews-per-card M] [--batch-size B]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+import opencal.io.connection
+import opencal.io.pkb
+import opencal.io.sqlitedb
+
+
+def make_card_list(num_cards, num_reviews_per_card):
+    creation_datetime = datetime.datetime(2020, 1, 1)
+    return [
+        Card(
+            creation_datetime=creation_datetime + datetime.timedelta(days=card_index % 365),
+            question=f"Question {card_index}",
+            answer=f"Answer {card_index}",
+            tags=["tag"],
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=card_index % 365 + 2**i), True)
+                for i in range(num_reviews_per_card)
+            ]
+        )
+        for card_index in range(num_cards)
+    ]
+
+
+def restore_db_reference(db_path, dump_file_path):
+    """The former algorithm of `opencal.io.sqlitedb.restore_db` (on an empty database)."""
+    con = opencal.io.connection.get_connection(db_path)
+    with opencal.io.pkb.open_pkb_file(dump_file_path, "r") as fd:
+        sql = fd.read()
+    con.con.executescript(sql)
+
+
+def measure_time(function):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):     # Mute the progress messages
+        function()
+    return time.perf_counter() - start
+
+
+def measure_peak_memory(function):
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak_memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=125000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    parser.add_argument("--batch-size", type=int, default=opencal.io.sqlitedb.DEFAULT_RESTORE_BATCH_SIZE, help="The number of statements committed together by `restore_db`")
+    args = parser.parse_args()
+
+    card_list = make_card_list(args.num_cards, args.num_reviews_per_card)
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "bench.sqlite")
+        with contextlib.redirect_stdout(io.StringIO()):
+            opencal.io.sqlitedb.save_pkb(card_list, db_path)
+        del card_list
+
+        print(f"Synthetic PKB: {args.num_cards} cards, {args.num_reviews_per_card} reviews per card")
+        print()
+        print(f"{'':40s} {'time (s)':>10s} {'size (MB)':>10s} {'peak mem (MB)':>14s}")
+
+        for dump_file_name in ("dump.sql", "dump.sql.gz", "dump.sql.zst"):
+            dump_file_path = os.path.join(temp_dir_path, dump_file_name)
+
+            duration = measure_time(lambda: opencal.io.sqlitedb.dump_db(db_path, dump_file_path))
+            print(f"{'dump_db ' + dump_file_name:40s} {duration:10.2f} {os.path.getsize(dump_file_path) / 1e6:10.1f}")
+
+            for label, restore_function in (
+                    ("reference", restore_db_reference),
+                    ("restore_db", lambda path, dump_path: opencal.io.sqlitedb.restore_db(path, dump_path, backup_dir_path=temp_dir_path, batch_size=args.batch_size))
+                ):
+                result_list = []
+                for measure in (measure_time, measure_peak_memory):
+                    restored_db_path = os.path.join(temp_dir_path, f"restored_{label}_{measure.__name__}_{dump_file_name}.sqlite")
+                    result_list.append(measure(lambda: restore_function(restored_db_path, dump_file_path)))
+                    opencal.io.connection.close_connection(restored_db_path)
+                    os.remove(restored_db_path)
+                duration, peak_memory = result_list
+                print(f"{label + ' ' + dump_file_name:40s} {duration:10.2f} {'':10s} {peak_memory / 1e6:14.1f}")
+
+        opencal.io.connection.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
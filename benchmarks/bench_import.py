@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""Import time of the "opencal" package.
+
+Run `python -X importtime -c "import opencal"` in fresh interpreters (with a
+temporary configuration path, which must not be read at import time) and
+print the best cumulative import time of the package, with the slowest
+modules it imports. Exit with an error if the best time exceeds the budget
+(it was about 290 ms when pandas and the configuration file were loaded at
+import time).
+
+Wall-clock timings depend on the machine and its load: this is a benchmark,
+not a unit test (c.f. opencal/tests/test_import.py for the deterministic
+checks).
+
+Usage: python3 benchmarks/bench_import.py [--num-runs N] [--budget-us B] [--num-modules M]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+DEFAULT_IMPORT_TIME_BUDGET_US = 150000
+
+
+def import_times(config_path):
+    """Return the cumulative import time (in microseconds) of each module imported by `import opencal`."""
+    env = dict(os.environ, OPENCAL_CONFIG_PATH=config_path)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import opencal"], env=env, capture_output=True, text=True, check=True)
+
+    import_time_dict = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative_us, module_name = line[len("import time:"):].split("|")
+            if cumulative_us.strip().isdigit():
+                import_time_dict[module_name.strip()] = int(cumulative_us)
+    return import_time_dict
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-runs", type=int, default=5, help="The number of interpreters started (the best run is kept)")
+    parser.add_argument("--budget-us", type=int, default=DEFAULT_IMPORT_TIME_BUDGET_US, help="The maximum cumulative import time of opencal, in microseconds")
+    parser.add_argument("--num-modules", type=int, default=10, help="The number of slowest modules printed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        config_path = os.path.join(temp_dir_path, "opencal.yml")
+
+        # The first run may fill the bytecode cache
+        run_list = [import_times(config_path) for _ in range(max(1, args.num_runs))]
+
+    best_run = min(run_list, key=lambda import_time_dict: import_time_dict["opencal"])
+
+    print(f"{'module':40s} {'cumulative (ms)':>16s}")
+    for module_name, cumulative_us in sorted(best_run.items(), key=lambda item: item[1], reverse=True)[:args.num_modules]:
+        print(f"{module_name:40s} {cumulative_us / 1000:16.1f}")
+
+    print()
+    print(f"import opencal: {best_run['opencal'] / 1000:.1f} ms (budget: {args.budget_us / 1000:.1f} ms)")
+
+    if best_run["opencal"] >= args.budget_us:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
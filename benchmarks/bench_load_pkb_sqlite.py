@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""Loading a PKB from an SQLite database.
+
+Build a synthetic PKB (125k cards with 8 reviews each, i.e. 1M reviews, by
+default), save it with `save_pkb`, then load it:
+
+- with the former algorithm of `load_pkb` (reference): one query for the
+  cards and one for the reviews, every date parsed with `strptime`, reviews
+  sorted again in Python for each card,
+- with `load_pkb`: cards and reviews read in a single pass sorted by SQLite,
+  dates read as day ordinals,
+- with `load_pkb(..., columnar=True)`.
+
+Print the duration of each loading.
+
+Usage: python3 benchmarks/bench_load_pkb_sqlite.py [--num-cards N] [--num-reviews-per-card M]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import tempfile
+import time
+
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+import opencal.io.connection
+import opencal.io.sqlitedb
+from opencal.io.sqlitedb import CARD_TABLE_NAME, CONSOLIDATION_REVIEW_TABLE_NAME, PY_DATE_FORMAT
+
+
+def make_card_list(num_cards, num_reviews_per_card):
+    creation_datetime = datetime.datetime(2020, 1, 1)
+    return [
+        Card(
+            creation_datetime=creation_datetime + datetime.timedelta(days=card_index % 365),
+            question=f"Question {card_index}",
+            answer=f"Answer {card_index}",
+            tags=["tag"],
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=card_index % 365 + 2**i), True)
+                for i in range(num_reviews_per_card)
+            ]
+        )
+        for card_index in range(num_cards)
+    ]
+
+
+def load_pkb_reference(db_path):
+    """The former algorithm of `opencal.io.sqlitedb.load_pkb`."""
+    cur = opencal.io.connection.get_connection(db_path).cursor()
+
+    cards_dict = {}
+    for card_id, creation_datetime_str, is_hidden, question, answer, tags_str in cur.execute(f"SELECT id, creation_datetime, is_hidden, question, answer, tags FROM {CARD_TABLE_NAME} ORDER BY id"):
+        tags_list = tags_str.strip(" \t\r\n").split("\n")
+        cards_dict[card_id] = Card(
+            creation_datetime=datetime.datetime.strptime(creation_datetime_str, PY_DATE_FORMAT),
+            question=question,
+            answer=answer,
+            is_hidden=bool(is_hidden),
+            tags=[] if tags_list == [""] else tags_list,
+            id=card_id
+        )
+
+    for review_id, card_id, review_datetime_str, is_right_answer in cur.execute(f"SELECT id, card_id, review_datetime, is_right_answer FROM {CONSOLIDATION_REVIEW_TABLE_NAME} ORDER BY review_datetime"):
+        cards_dict[card_id]["reviews"].append(ConsolidationReview(datetime.datetime.strptime(review_datetime_str, PY_DATE_FORMAT), is_right_answer))
+
+    card_list = [card for _, card in sorted(cards_dict.items())]
+    for card in card_list:
+        card.consolidation_reviews = sorted(card.consolidation_reviews, key=lambda review: review.review_datetime)
+        card.update_last_activity_datetime()
+        card.mark_clean()
+
+    return card_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=125000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    args = parser.parse_args()
+
+    card_list = make_card_list(args.num_cards, args.num_reviews_per_card)
+
+    print(f"Synthetic PKB: {args.num_cards} cards, {args.num_cards * args.num_reviews_per_card} reviews")
+    print()
+    print(f"{'':36s} {'time (s)':>10s}")
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "bench.sqlite")
+
+        with contextlib.redirect_stdout(io.StringIO()):     # Mute the table creation messages
+            opencal.io.sqlitedb.create_all_tables(db_path)
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        expected_card_list = None
+
+        for label, load_function in [
+                    ("reference (strptime, 2 sorts)", load_pkb_reference),
+                    ("load_pkb", opencal.io.sqlitedb.load_pkb),
+                    ("load_pkb (columnar)", lambda path: opencal.io.sqlitedb.load_pkb(path, columnar=True))
+                ]:
+            start = time.perf_counter()
+            loaded_card_list = load_function(db_path)
+            print(f"{label:36s} {time.perf_counter() - start:10.2f}")
+
+            card_tuple_list = [(card.id, card.creation_datetime, [(review.review_datetime, review.is_right_answer) for review in card.consolidation_reviews]) for card in loaded_card_list[:1000]]
+            assert expected_card_list is None or card_tuple_list == expected_card_list
+            expected_card_list = card_tuple_list
+
+        opencal.io.connection.close_connection(db_path)
+
+
+if __name__ == "__main__":
+    main()
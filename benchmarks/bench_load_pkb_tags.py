@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+"""Loading the cards having a given tag from an SQLite database.
+
+Build a synthetic PKB (100k cards with 8 reviews each and 1 to 3 tags out of
+100 by default), save it with `save_pkb`, then load the cards having a given
+tag by filtering all the loaded cards in Python and with
+`load_pkb(..., tags=[...])` (the filter is applied by SQLite on the
+`t_card_tag` table). Print the duration of both loadings.
+
+Usage: python3 benchmarks/bench_load_pkb_tags.py [--num-cards N] [--num-reviews-per-card M] [--num-tags T]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import tempfile
+import time
+
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+import opencal.io.connection
+import opencal.io.sqlitedb
+
+
+def make_card_list(num_cards, num_reviews_per_card, num_tags):
+    rng = random.Random(0)
+    tag_list = [f"tag {tag_index}" for tag_index in range(num_tags)]
+    creation_datetime = datetime.datetime(2020, 1, 1)
+    return [
+        Card(
+            creation_datetime=creation_datetime,
+            question=f"Question {card_index}",
+            answer=f"Answer {card_index}",
+            tags=rng.sample(tag_list, rng.randint(1, 3)),
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=2**i), True)
+                for i in range(num_reviews_per_card)
+            ]
+        )
+        for card_index in range(num_cards)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=100000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    parser.add_argument("--num-tags", type=int, default=100, help="The number of distinct tags")
+    args = parser.parse_args()
+
+    card_list = make_card_list(args.num_cards, args.num_reviews_per_card, args.num_tags)
+
+    print(f"Synthetic PKB: {args.num_cards} cards, {args.num_cards * args.num_reviews_per_card} reviews, {args.num_tags} distinct tags")
+    print()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "bench.sqlite")
+
+        with contextlib.redirect_stdout(io.StringIO()):     # Mute the table creation messages
+            opencal.io.sqlitedb.create_all_tables(db_path)
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        start = time.perf_counter()
+        python_card_list = [card for card in opencal.io.sqlitedb.load_pkb(db_path) if "tag 0" in card.tags]
+        python_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sql_card_list = opencal.io.sqlitedb.load_pkb(db_path, tags=["tag 0"])
+        sql_duration = time.perf_counter() - start
+
+        assert [card.id for card in sql_card_list] == [card.id for card in python_card_list]
+
+        opencal.io.connection.close_connection(db_path)
+
+    print(f"{'filter in Python':36s} {python_duration * 1000:10.1f} ms   ({len(python_card_list)} cards)")
+    print(f"{'filter in SQL (tags=[...])':36s} {sql_duration * 1000:10.1f} ms")
+    print(f"{'speedup':36s} {python_duration / sql_duration:10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
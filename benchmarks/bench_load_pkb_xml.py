@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+"""Time and peak memory of the XML PKB loaders.
+
+Write a synthetic XML PKB (50k cards with long answers by default), then read
+it with `load_pkb` (list of all the cards) and with `iter_pkb` (SAX and
+iterparse streaming) while only counting the cards. Print the duration and
+the peak memory (tracemalloc) of each loader.
+
+Usage: python3 benchmarks/bench_load_pkb_xml.py [--num-cards N] [--answer-size S]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import opencal.io.pkb
+
+
+def write_pkb(pkb_path, num_cards, answer_size):
+    answer_str = ("Lorem ipsum dolor sit amet. " * (answer_size // 28 + 1))[:answer_size]
+    with open(pkb_path, "w") as fd:
+        fd.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n<pkb>\n')
+        for card_index in range(num_cards):
+            fd.write(f'<card cdate="2020-01-01" hidden="false">\n'
+                     f'<question><![CDATA[Question {card_index}]]></question>\n'
+                     f'<answer><![CDATA[{answer_str}]]></answer>\n'
+                     f'<tag>tag 1</tag>\n<tag>tag 2</tag>\n'
+                     f'<review rdate="2020-01-02" result="good"/>\n<review rdate="2020-01-04" result="bad"/>\n'
+                     f'</card>\n')
+        fd.write('</pkb>\n')
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    num_cards = function()
+    duration = time.perf_counter() - start
+    _, peak_size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return num_cards, duration, peak_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=50000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--answer-size", type=int, default=2000, help="The number of characters of each answer")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        pkb_path = os.path.join(temp_dir_path, "bench.pkb")
+        write_pkb(pkb_path, args.num_cards, args.answer_size)
+
+        print(f"Synthetic PKB: {args.num_cards} cards, {os.path.getsize(pkb_path) / 1e6:.1f} MB")
+        print()
+        print(f"{'':30s} {'time (s)':>10s} {'peak memory (MB)':>18s}")
+
+        for label, function in (
+                ("load_pkb", lambda: len(opencal.io.pkb.load_pkb(pkb_path))),
+                ("iter_pkb (SAX)", lambda: sum(1 for _ in opencal.io.pkb.iter_pkb(pkb_path))),
+                ("iter_pkb (iterparse)", lambda: sum(1 for _ in opencal.io.pkb.iter_pkb(pkb_path, use_iterparse=True))),
+            ):
+            num_cards, duration, peak_size = measure(function)
+            assert num_cards == args.num_cards
+            print(f"{label:30s} {duration:10.2f} {peak_size / 1e6:18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""Instantiation of Doreen on a very large PKB with several processes.
+
+Build a synthetic PKB (1M cards with 8 reviews each by default) and
+instantiate `ProfessorDoreen` with the per-card assessment, with the
+vectorized assessment (`use_batch_assess=True`) and with the multi-process
+assessment (`num_workers` = 2, 4, ... up to the number of CPUs). Print the
+duration of each instantiation.
+
+The database is a temporary file.
+
+Usage: python3 benchmarks/bench_parallel_assess.py [--num-cards N] [--num-reviews-per-card M] [--max-workers W]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import tempfile
+import time
+
+import yaml
+
+import opencal
+import opencal.config
+import opencal.io.connection
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+
+
+def make_card_list(num_cards, num_reviews_per_card):
+    rng = random.Random(0)
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    card_list = []
+    for card_index in range(num_cards):
+        creation_datetime = today - datetime.timedelta(days=rng.randrange(400, 800))
+        card_list.append(Card(
+            creation_datetime=creation_datetime,
+            question=f"Question {card_index}",
+            tags=[rng.choice(("important", "todo", "easy", "hard", "maths"))],
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=2**i), rng.random() < 0.8)
+                for i in range(num_reviews_per_card)
+            ]
+        ))
+    return card_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=1000000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(), help="The maximum number of worker processes")
+    args = parser.parse_args()
+
+    card_list = make_card_list(args.num_cards, args.num_reviews_per_card)
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        cfg = yaml.safe_load(opencal.config.DEFAULT_CONFIG_STR)
+        cfg["opencal"]["db_path"] = os.path.join(temp_dir_path, "bench.sqlite")
+        opencal.cfg = cfg
+
+        from opencal.core.professor.consolidation.doreen import ProfessorDoreen
+
+        tag_priorities = cfg["opencal"]["professors"]["common"]["tag_priorities"]
+        tag_difficulties = cfg["opencal"]["professors"]["common"]["tag_difficulties"]
+
+        print(f"Synthetic PKB: {args.num_cards} cards, {args.num_reviews_per_card} reviews per card, {os.cpu_count()} CPUs")
+        print()
+        print(f"{'':30s} {'time (s)':>10s}")
+
+        num_workers_list = [2 ** i for i in range(1, 8) if 2 ** i <= max(args.max_workers, 2)]
+
+        for label, kwargs in [("per-card assess", {}), ("batch assess", {"use_batch_assess": True})] + [(f"{num_workers} workers", {"num_workers": num_workers}) for num_workers in num_workers_list]:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):     # Mute the professor's messages
+                ProfessorDoreen(card_list, tag_priorities=tag_priorities, tag_difficulties=tag_difficulties, **kwargs)
+            print(f"{label:30s} {time.perf_counter() - start:10.2f}")
+
+        opencal.io.connection.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
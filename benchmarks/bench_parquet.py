@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""Analytics on a large PKB: SQLite vs Parquet.
+
+Build a synthetic PKB (200k cards with 8 reviews each by default), save it
+to an SQLite database (`opencal.io.sqlitedb.save_pkb`) and to a Parquet
+directory (`opencal.io.parquet.save_pkb`). Then compare:
+
+- the reference path: `opencal.io.sqlitedb.load_pkb` followed by
+  `card_list_to_dataframes`, which is what notebooks used to do to get a
+  review DataFrame,
+- `opencal.io.sqlitedb.load_pkb_dataframes`,
+- `opencal.io.parquet.read_reviews` (all the reviews, without the texts of the cards),
+- `opencal.io.parquet.read_reviews` on the last year only (partition pruning),
+- `opencal.io.parquet.load_pkb` (full card list).
+
+Print the duration of each path and the size of each file.
+
+Usage: python3 benchmarks/bench_parquet.py [--num-cards N] [--num-reviews-per-card M]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import tempfile
+import time
+
+import opencal.io.connection
+import opencal.io.parquet
+import opencal.io.sqlitedb
+from opencal.card import Card
+from opencal.core.data import card_list_to_dataframes
+from opencal.review import ConsolidationReview
+
+
+def make_card_list(num_cards, num_reviews_per_card):
+    rng = random.Random(0)
+    card_list = []
+    for card_index in range(num_cards):
+        creation_datetime = datetime.datetime(2015, 1, 1) + datetime.timedelta(days=rng.randrange(0, 3000))
+        card_list.append(Card(
+            creation_datetime=creation_datetime,
+            question=f"Question {card_index} " + "x" * rng.randrange(20, 200),
+            answer=f"Answer {card_index} " + "y" * rng.randrange(20, 400),
+            tags=[rng.choice(("important", "todo", "easy", "hard", "maths"))],
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=2**i), rng.random() < 0.8)
+                for i in range(num_reviews_per_card)
+            ]
+        ))
+    return card_list
+
+
+def get_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(dir_path, file_name)) for dir_path, _, file_name_list in os.walk(path) for file_name in file_name_list)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=200000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    args = parser.parse_args()
+
+    card_list = make_card_list(args.num_cards, args.num_reviews_per_card)
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "bench.sqlite")
+        pkb_path = os.path.join(temp_dir_path, "bench_pkb")
+
+        print(f"Synthetic PKB: {args.num_cards} cards, {args.num_reviews_per_card} reviews per card")
+        print()
+        print(f"{'':40s} {'time (s)':>10s}")
+
+        for label, function in [
+                ("sqlitedb.save_pkb", lambda: opencal.io.sqlitedb.save_pkb(card_list, db_path)),
+                ("parquet.save_pkb", lambda: opencal.io.parquet.save_pkb(card_list, pkb_path)),
+            ]:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                function()
+            print(f"{label:40s} {time.perf_counter() - start:10.2f}")
+
+        last_year_start_date = datetime.date(2022, 1, 1)
+
+        for label, function in [
+                ("reference", lambda: card_list_to_dataframes(opencal.io.sqlitedb.load_pkb(db_path))),
+                ("sqlitedb.load_pkb_dataframes", lambda: opencal.io.sqlitedb.load_pkb_dataframes(db_path)),
+                ("parquet.read_reviews", lambda: opencal.io.parquet.read_reviews(pkb_path).to_pandas()),
+                ("parquet.read_reviews (last year)", lambda: opencal.io.parquet.read_reviews(pkb_path, start_date=last_year_start_date).to_pandas()),
+                ("parquet.load_pkb", lambda: opencal.io.parquet.load_pkb(pkb_path)),
+            ]:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                function()
+            print(f"{label:40s} {time.perf_counter() - start:10.2f}")
+
+        opencal.io.connection.close_all_connections()
+
+        print()
+        print(f"SQLite database: {get_size(db_path) / 1e6:.1f} MB, Parquet directory: {get_size(pkb_path) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""Review history queries with and without the indexes of the review tables.
+
+Build a synthetic PKB (100k cards with 8 reviews each by default), save it
+with `save_pkb`, then measure the duration of per-card review history
+lookups and of `load_pkb` with the `(card_id, review_datetime)` index of the
+consolidation review table, and after dropping this index (i.e. the schema
+of databases created before the version 5 of the schema).
+
+Usage: python3 benchmarks/bench_review_indexes.py [--num-cards N] [--num-reviews-per-card M] [--num-lookups L]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import tempfile
+import time
+
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+import opencal.io.connection
+import opencal.io.sqlitedb
+
+
+def make_card_list(num_cards, num_reviews_per_card):
+    creation_datetime = datetime.datetime(2020, 1, 1)
+    return [
+        Card(
+            creation_datetime=creation_datetime,
+            question=f"Question {card_index}",
+            answer=f"Answer {card_index}",
+            tags=["tag"],
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=2**i), True)
+                for i in range(num_reviews_per_card)
+            ]
+        )
+        for card_index in range(num_cards)
+    ]
+
+
+def measure(db_path, card_id_list):
+    con = opencal.io.connection.get_connection(db_path)
+    sql_query_str = f"SELECT review_datetime, is_right_answer FROM {opencal.io.sqlitedb.CONSOLIDATION_REVIEW_TABLE_NAME} WHERE card_id=? ORDER BY review_datetime"
+
+    start = time.perf_counter()
+    for card_id in card_id_list:
+        con.execute(sql_query_str, (card_id,)).fetchall()
+    lookup_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    opencal.io.sqlitedb.load_pkb(db_path)
+    load_duration = time.perf_counter() - start
+
+    return lookup_duration, load_duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=100000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    parser.add_argument("--num-lookups", type=int, default=1000, help="The number of per-card review history lookups")
+    args = parser.parse_args()
+
+    card_list = make_card_list(args.num_cards, args.num_reviews_per_card)
+    card_id_list = random.Random(0).sample(range(args.num_cards), min(args.num_lookups, args.num_cards))
+
+    print(f"Synthetic PKB: {args.num_cards} cards, {args.num_cards * args.num_reviews_per_card} reviews")
+    print()
+    print(f"{'':20s} {f'{len(card_id_list)} lookups (ms)':>20s} {'load_pkb (ms)':>15s}")
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "bench.sqlite")
+
+        with contextlib.redirect_stdout(io.StringIO()):     # Mute the table creation messages
+            opencal.io.sqlitedb.create_all_tables(db_path)
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        lookup_duration, load_duration = measure(db_path, card_id_list)
+        print(f"{'with index':20s} {lookup_duration * 1000:20.1f} {load_duration * 1000:15.1f}")
+
+        opencal.io.connection.get_connection(db_path).execute("DROP INDEX i_consolidation_review_card_id_review_datetime")
+
+        lookup_duration, load_duration = measure(db_path, card_id_list)
+        print(f"{'without index':20s} {lookup_duration * 1000:20.1f} {load_duration * 1000:15.1f}")
+
+        opencal.io.connection.close_connection(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+"""Replay of 100k replies through each professor.
+
+Build a synthetic PKB (100k cards by default, all due today), then reply to
+the current card of each professor until 100k replies have been made (or the
+session is over) and print the time per reply. The queue operations
+themselves are compared first: `list.pop(0)` (the former implementation of
+the professors' queues) versus `ReviewQueue.pop`.
+
+The database written by the acquisition professors is a temporary file.
+
+Usage: python3 benchmarks/bench_review_queue.py [--num-cards N] [--num-replies M]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import tempfile
+import time
+
+import yaml
+
+import opencal
+import opencal.config
+import opencal.io.sqlitedb
+from opencal.card import Card
+from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
+from opencal.core.professor.review_queue import ReviewQueue
+
+
+def make_card_list(num_cards):
+    creation_datetime = datetime.datetime(2020, 1, 1)
+    return [
+        Card(creation_datetime=creation_datetime, question=f"Question {card_index}", answer=f"Answer {card_index}", id=card_index)
+        for card_index in range(num_cards)
+    ]
+
+
+def make_dict_card_list(num_cards):
+    """Alice, Berenice and Celia still work on dictionary cards."""
+    creation_date = datetime.date(2020, 1, 1)
+    return [
+        {"cdate": creation_date, "question": f"Question {card_index}", "answer": f"Answer {card_index}", "hidden": False, "tags": [], "reviews": []}
+        for card_index in range(num_cards)
+    ]
+
+
+def bench_queue(num_items):
+    item_list = list(range(num_items))
+    start = time.perf_counter()
+    while item_list:
+        item_list.pop(0)
+    list_duration = time.perf_counter() - start
+
+    queue = ReviewQueue(range(num_items))
+    start = time.perf_counter()
+    while queue:
+        queue.pop()
+    queue_duration = time.perf_counter() - start
+
+    return list_duration, queue_duration
+
+
+def replay(professor, num_replies, answer):
+    num_done = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):     # Mute the professors' progress messages
+        while num_done < num_replies and professor.current_card is not None:
+            professor.current_card_reply(answer)
+            num_done += 1
+    return num_done, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=100000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-replies", type=int, default=100000, help="The number of replies replayed through each professor")
+    args = parser.parse_args()
+
+    list_duration, queue_duration = bench_queue(args.num_cards)
+    print(f"Pop {args.num_cards} items: list.pop(0) {list_duration:.3f} s, ReviewQueue.pop() {queue_duration:.3f} s")
+    print()
+
+    from opencal.core.professor.acquisition.arthur import ProfessorArthur
+    from opencal.core.professor.acquisition.denis import ProfessorDenis
+    from opencal.core.professor.acquisition.ernest import ProfessorErnest
+    from opencal.core.professor.acquisition.randy import ProfessorRandy
+    from opencal.core.professor.consolidation.alice import ProfessorAlice
+    from opencal.core.professor.consolidation.berenice import ProfessorBerenice
+    from opencal.core.professor.consolidation.brutus import ProfessorBrutus
+    from opencal.core.professor.consolidation.celia import ProfessorCelia
+    from opencal.core.professor.consolidation.doreen import ProfessorDoreen
+
+    num_cards = args.num_cards
+
+    professor_list = [
+        ("alice", lambda: ProfessorAlice(make_dict_card_list(num_cards)), WRONG_ANSWER_STR),
+        ("berenice", lambda: ProfessorBerenice(make_dict_card_list(num_cards), max_cards_per_grade=num_cards), WRONG_ANSWER_STR),
+        ("celia", lambda: ProfessorCelia(make_dict_card_list(num_cards), max_cards_per_grade=num_cards), WRONG_ANSWER_STR),
+        ("doreen", lambda: ProfessorDoreen(make_card_list(num_cards), max_cards_per_grade=num_cards), WRONG_ANSWER_STR),
+        ("brutus", lambda: ProfessorBrutus(make_card_list(num_cards)), RIGHT_ANSWER_STR),
+        ("randy", lambda: ProfessorRandy(make_card_list(num_cards)), WRONG_ANSWER_STR),
+        ("arthur", lambda: ProfessorArthur(make_card_list(num_cards)), WRONG_ANSWER_STR),
+        ("denis", lambda: ProfessorDenis(make_card_list(num_cards)), WRONG_ANSWER_STR),
+        ("ernest", lambda: ProfessorErnest(make_card_list(num_cards)), WRONG_ANSWER_STR),
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        # Use a temporary database (acquisition professors save each reply)
+        cfg = yaml.safe_load(opencal.config.DEFAULT_CONFIG_STR)
+        cfg["opencal"]["db_path"] = os.path.join(temp_dir_path, "bench.sqlite")
+        opencal.cfg = cfg
+        with contextlib.redirect_stdout(io.StringIO()):
+            opencal.io.sqlitedb.create_all_tables(cfg["opencal"]["db_path"])
+
+        print(f"{'professor':12s} {'replies':>10s} {'time (s)':>10s} {'us/reply':>10s}")
+
+        for name, make_professor, answer in professor_list:
+            with contextlib.redirect_stdout(io.StringIO()):
+                professor = make_professor()
+            num_done, duration = replay(professor, args.num_replies, answer)
+            print(f"{name:12s} {num_done:10d} {duration:10.3f} {duration / max(num_done, 1) * 1e6:10.1f}")
+
+        opencal.io.connection.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+"""Full vs incremental save of a PKB in an SQLite database.
+
+Build a synthetic PKB (100k cards by default), save it with `save_pkb`
+(full rewrite of the database), then simulate a review session (a few cards
+answered) and save it with `save_changes` (only the modified cards and the
+new reviews are written). Print the duration of both saves.
+
+Usage: python3 benchmarks/bench_save_pkb.py [--num-cards N] [--num-reviews-per-card M] [--num-modified-cards K]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+import opencal.io.connection
+import opencal.io.sqlitedb
+
+
+def make_card_list(num_cards, num_reviews_per_card):
+    creation_datetime = datetime.datetime(2020, 1, 1)
+    return [
+        Card(
+            creation_datetime=creation_datetime,
+            question=f"Question {card_index}",
+            answer=f"Answer {card_index}",
+            tags=["tag"],
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=2**i), True)
+                for i in range(num_reviews_per_card)
+            ]
+        )
+        for card_index in range(num_cards)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=100000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    parser.add_argument("--num-modified-cards", type=int, default=20, help="The number of cards answered during the session")
+    args = parser.parse_args()
+
+    card_list = make_card_list(args.num_cards, args.num_reviews_per_card)
+
+    print(f"Synthetic PKB: {args.num_cards} cards, {args.num_cards * args.num_reviews_per_card} reviews")
+    print()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "bench.sqlite")
+
+        # Full save (the database must be recreated each time)
+        opencal.io.sqlitedb.create_all_tables(db_path)
+        start = time.perf_counter()
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+        full_save_duration = time.perf_counter() - start
+
+        # Review session
+        review_datetime = datetime.datetime(2021, 1, 1)
+        for card in random.Random(0).sample(card_list, args.num_modified_cards):
+            card.consolidation_reviews.append(ConsolidationReview(review_datetime, True))
+
+        start = time.perf_counter()
+        num_saved_cards = opencal.io.sqlitedb.save_changes(card_list, db_path)
+        incremental_save_duration = time.perf_counter() - start
+
+        opencal.io.connection.close_connection(db_path)
+
+    print(f"{'full save (save_pkb)':36s} {full_save_duration * 1000:10.1f} ms")
+    print(f"{'incremental save (save_changes)':36s} {incremental_save_duration * 1000:10.1f} ms   ({num_saved_cards} cards written)")
+    print(f"{'speedup':36s} {full_save_duration / incremental_save_duration:10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
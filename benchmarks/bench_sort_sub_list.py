@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+"""Sort of a level 0 bucket by Doreen and Celia.
+
+Build a synthetic bucket of cards (50k cards with 8 reviews each by default)
+and sort it with the default level 0 criteria (priority then last update
+date). The former implementation (one stable sort per criterion, the date of
+the last update being recomputed from all the reviews of each card) is
+compared to `sort_sub_list` (a single sort with a composite key, the date of
+the last update being cached on each card) and to the session budget mode
+(only the first k cards are selected by a `TopKReviewQueue`, the time to get
+the first card is measured).
+
+Usage: python3 benchmarks/bench_sort_sub_list.py [--num-cards N] [--num-reviews-per-card M] [--num-repeats R] [--session-budget K]
+"""
+
+import argparse
+import datetime
+import random
+import time
+
+from opencal.card import Card
+from opencal.core.professor.consolidation import celia, doreen
+from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
+from opencal.core.professor.review_queue import TopKReviewQueue
+from opencal.review import ConsolidationReview
+
+PRIORITY_LIST = [
+    {'sort_fn': 'tag', 'reverse': True},
+    {'sort_fn': 'date', 'reverse': True}
+]
+
+
+def make_card_list(num_cards, num_reviews_per_card):
+    rng = random.Random(0)
+    card_list = []
+    for card_index in range(num_cards):
+        creation_datetime = datetime.datetime(2020, 1, 1) + datetime.timedelta(days=rng.randrange(365))
+        card = Card(
+            creation_datetime=creation_datetime,
+            question=f"Question {card_index}",
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=2**i), rng.random() < 0.8)
+                for i in range(num_reviews_per_card)
+            ]
+        )
+        card.priority = rng.choice((-1., 0., 1., 2.))
+        card_list.append(card)
+    return card_list
+
+
+def make_dict_card_list(card_list):
+    """Celia works on dictionary cards."""
+    return [
+        {
+            "cdate": card.creation_datetime,
+            "priority": card.priority,
+            "reviews": [{"rdate": review.review_datetime, "result": RIGHT_ANSWER_STR if review.is_right_answer else WRONG_ANSWER_STR} for review in card.consolidation_reviews],
+            "last_activity_datetime": card.last_activity_datetime,
+        }
+        for card in card_list
+    ]
+
+
+def former_doreen_sort_sub_list(sub_list):
+    for priority_dict in PRIORITY_LIST:
+        if priority_dict["sort_fn"] == "tag":
+            sort_fn = lambda _card : _card.priority
+        else:
+            sort_fn = lambda _card : max([_card.creation_datetime] + [review.review_datetime for review in _card.consolidation_reviews])
+        sub_list.sort(key=sort_fn, reverse=priority_dict["reverse"])
+
+
+def former_celia_sort_sub_list(sub_list):
+    sub_list.sort(key=lambda _card : _card["priority"], reverse=True)
+    sub_list.sort(key=lambda _card : max([_card["cdate"]] + [review["rdate"] for review in _card["reviews"]]), reverse=True)
+
+
+def measure(sort_function, card_list, num_repeats):
+    """Return the best duration of `num_repeats` sorts of a shuffled copy of `card_list` and the sorted list."""
+    best_duration = float("inf")
+    for repeat_index in range(num_repeats):
+        sub_list = list(card_list)
+        random.Random(repeat_index).shuffle(sub_list)
+        start = time.perf_counter()
+        sort_function(sub_list)
+        best_duration = min(best_duration, time.perf_counter() - start)
+    return best_duration, sub_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=50000, help="The number of cards of the bucket")
+    parser.add_argument("--num-reviews-per-card", type=int, default=8, help="The number of reviews of each card")
+    parser.add_argument("--num-repeats", type=int, default=5, help="The number of sorts (the best time is printed)")
+    parser.add_argument("--session-budget", type=int, default=10, help="The number of cards selected at once in the session budget mode")
+    args = parser.parse_args()
+
+    card_list = make_card_list(args.num_cards, args.num_reviews_per_card)
+    dict_card_list = make_dict_card_list(card_list)
+
+    print(f"Bucket: {args.num_cards} cards, {args.num_reviews_per_card} reviews per card")
+    print()
+    print(f"{'':40s} {'time (ms)':>10s}")
+
+    former_duration, former_list = measure(former_doreen_sort_sub_list, card_list, args.num_repeats)
+    duration, sorted_list = measure(lambda sub_list: doreen.sort_sub_list(sub_list, 0, {}, {0: PRIORITY_LIST}), card_list, args.num_repeats)
+    assert sorted_list == former_list
+    print(f"{'doreen: one sort per criterion':40s} {former_duration * 1000:10.1f}")
+    print(f"{'doreen: composite key (sort_sub_list)':40s} {duration * 1000:10.1f}   ({former_duration / duration:.1f} x)")
+
+    def doreen_top_k(sub_list):
+        queue = TopKReviewQueue(sub_list, batch_size=args.session_budget)
+        doreen.sort_sub_list(queue, 0, {}, {0: PRIORITY_LIST})
+        sub_list[:args.session_budget] = [queue.pop() for _ in range(args.session_budget)]     # Only the first batch is selected
+
+    top_k_duration, top_k_list = measure(doreen_top_k, card_list, args.num_repeats)
+    assert top_k_list[:args.session_budget] == former_list[:args.session_budget]
+    print(f"{f'doreen: session budget (k={args.session_budget})':40s} {top_k_duration * 1000:10.1f}   ({former_duration / top_k_duration:.1f} x)")
+
+    former_duration, former_list = measure(former_celia_sort_sub_list, dict_card_list, args.num_repeats)
+    duration, sorted_list = measure(lambda sub_list: celia.sort_sub_list(sub_list, 0, {}), dict_card_list, args.num_repeats)
+    assert sorted_list == former_list
+    print(f"{'celia: one sort per criterion':40s} {former_duration * 1000:10.1f}")
+    print(f"{'celia: composite key (sort_sub_list)':40s} {duration * 1000:10.1f}   ({former_duration / duration:.1f} x)")
+
+
+if __name__ == "__main__":
+    main()
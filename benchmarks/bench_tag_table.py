@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""Estimation of the priority and the difficulty of cards from their tags.
+
+Build a synthetic PKB (1M cards with 0 to 4 tags each by default) and
+estimate the priority and the difficulty of each card with the per-card
+functions of Doreen (`estimate_card_priority` and `estimate_card_difficulty`)
+and with a `CardTagTable` (vectorized estimation). The time to build the
+table (i.e. to intern the tags, done once when the PKB is loaded) is printed
+separately.
+
+Usage: python3 benchmarks/bench_tag_table.py [--num-cards N] [--num-tags T]
+"""
+
+import argparse
+import datetime
+import random
+import time
+
+import yaml
+
+import opencal
+import opencal.config
+from opencal.card import Card
+from opencal.tag_table import CardTagTable
+
+
+def make_card_list(num_cards, num_tags):
+    rng = random.Random(0)
+    tag_list = [f"tag {tag_index}" for tag_index in range(num_tags)]
+    return [
+        Card(creation_datetime=datetime.datetime(2020, 1, 1), question=f"Question {card_index}", tags=rng.sample(tag_list, rng.randint(0, 4)))
+        for card_index in range(num_cards)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=1000000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-tags", type=int, default=200, help="The number of distinct tags")
+    args = parser.parse_args()
+
+    opencal.cfg = yaml.safe_load(opencal.config.DEFAULT_CONFIG_STR)
+
+    from opencal.core.professor.consolidation import doreen
+
+    card_list = make_card_list(args.num_cards, args.num_tags)
+
+    rng = random.Random(1)
+    tag_priority_dict = {f"tag {tag_index}": rng.choice((-1, 0.5, 2, 3)) for tag_index in range(0, args.num_tags, 3)}
+    tag_difficulty_dict = {f"tag {tag_index}": rng.choice((0.5, 2.)) for tag_index in range(0, args.num_tags, 5)}
+
+    print(f"Synthetic PKB: {args.num_cards} cards, {args.num_tags} distinct tags")
+    print()
+    print(f"{'':30s} {'time (s)':>10s}")
+
+    start = time.perf_counter()
+    priority_list = [doreen.estimate_card_priority(card, tag_priority_dict) for card in card_list]
+    difficulty_list = [doreen.estimate_card_difficulty(card, tag_difficulty_dict) for card in card_list]
+    print(f"{'per-card estimation':30s} {time.perf_counter() - start:10.3f}")
+
+    start = time.perf_counter()
+    card_tag_table = CardTagTable.from_card_list(card_list)
+    print(f"{'tag table (build)':30s} {time.perf_counter() - start:10.3f}")
+
+    start = time.perf_counter()
+    priority_array = card_tag_table.estimate_priorities(tag_priority_dict)
+    difficulty_array = card_tag_table.estimate_difficulties(tag_difficulty_dict)
+    print(f"{'tag table (estimation)':30s} {time.perf_counter() - start:10.3f}")
+
+    assert priority_array.tolist() == priority_list and difficulty_array.tolist() == difficulty_list
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+"""Conversion of a large PKB XML file to an SQLite database.
+
+Write a synthetic PKB XML file (500k cards with 4 reviews each by default)
+then convert it to SQLite:
+
+- with the former algorithm of `xml_to_sqlite` (reference): the whole XML
+  file loaded in a list of cards with `opencal.io.pkb.load_pkb`, then saved
+  with `save_pkb`,
+- with `xml_to_sqlite`: cards streamed from the XML file and inserted by
+  batches in a single transaction, without rollback journal nor synchronous writes.
+
+Each conversion runs in a new process. Print its duration and the peak
+resident memory of the process.
+
+Usage: python3 benchmarks/bench_xml_to_sqlite.py [--num-cards N] [--num-reviews-per-card M] [--batch-size B]
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import datetime
+import io
+import os
+import resource
+import tempfile
+import time
+
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+import opencal.io.connection
+import opencal.io.pkb
+import opencal.io.sqlitedb
+
+
+def iter_cards(num_cards, num_reviews_per_card):
+    creation_datetime = datetime.datetime(2020, 1, 1)
+    for card_index in range(num_cards):
+        yield Card(
+            creation_datetime=creation_datetime + datetime.timedelta(days=card_index % 365),
+            question=f"Question {card_index}",
+            answer=f"Answer {card_index}",
+            tags=["tag", f"tag {card_index % 10}"],
+            consolidation_reviews=[
+                ConsolidationReview(creation_datetime + datetime.timedelta(days=card_index % 365 + 2**i), i % 3 != 2)
+                for i in range(num_reviews_per_card)
+            ]
+        )
+
+
+def xml_to_sqlite_reference(xml_file_path, db_path, batch_size):
+    """The former algorithm of `opencal.io.sqlitedb.xml_to_sqlite` (on a new database)."""
+    card_list = opencal.io.pkb.load_pkb(xml_file_path)
+    opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+
+def xml_to_sqlite(xml_file_path, db_path, batch_size):
+    opencal.io.sqlitedb.xml_to_sqlite(xml_file_path, db_path, batch_size=batch_size)
+
+
+def run(function, xml_file_path, db_path, batch_size):
+    """Run a conversion (in a worker process) and return its duration and the peak resident memory of the process."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):     # Mute the table creation messages
+        function(xml_file_path, db_path, batch_size)
+    duration = time.perf_counter() - start
+    opencal.io.connection.close_all_connections()
+    return duration, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024     # ru_maxrss is in KiB on Linux
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-cards", type=int, default=500000, help="The number of cards of the synthetic PKB")
+    parser.add_argument("--num-reviews-per-card", type=int, default=4, help="The number of reviews of each card")
+    parser.add_argument("--batch-size", type=int, default=opencal.io.sqlitedb.DEFAULT_IMPORT_BATCH_SIZE, help="The number of cards inserted at once by `xml_to_sqlite`")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        xml_file_path = os.path.join(temp_dir_path, "bench.xml")
+        opencal.io.pkb.save_pkb(iter_cards(args.num_cards, args.num_reviews_per_card), xml_file_path)
+
+        print(f"Synthetic PKB: {args.num_cards} cards, {args.num_reviews_per_card} reviews per card, {os.path.getsize(xml_file_path) / 1e6:.1f} MB of XML")
+        print()
+        print(f"{'':30s} {'time (s)':>10s} {'peak RSS (MB)':>14s}")
+
+        for label, function in (("reference", xml_to_sqlite_reference), ("xml_to_sqlite", xml_to_sqlite)):
+            db_path = os.path.join(temp_dir_path, f"{function.__name__}.sqlite")
+
+            # A new process per conversion: the peak memory of each conversion is measured separately
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+                duration, peak_rss = executor.submit(run, function, xml_file_path, db_path, args.batch_size).result()
+
+            print(f"{label:30s} {duration:10.2f} {peak_rss / 1e6:14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,8 @@ docstring for a function, use ``opencal.get_version?<ENTER>`` (to view the
 docstring) and ``opencal.get_version??<ENTER>`` (to view the source code).
 """
 
-import importlib.metadata
+import importlib
+from typing import Any
 
 import opencal.config
 import opencal.io.sqlitedb
@@ -37,13 +38,26 @@ import opencal.path
 # Dev branch marker is: 'X.Y.dev' or 'X.Y.devN' where N is an integer.
 # 'X.Y.dev0' is the canonical version of 'X.Y.dev'
 #
-__version__ = importlib.metadata.version("opencal")
+# The version, the configuration (`opencal.cfg`) and the path of the
+# configuration file (`opencal.config_path`) are loaded on first access (c.f.
+# `__getattr__`) so that importing opencal does not parse (or write) the
+# configuration file: CLI entry points and worker processes start faster.
 
 def get_version():
     return __version__
 
 
-cfg, config_path = opencal.config.get_config()
+def __getattr__(name: str) -> Any:
+    """Lazily evaluate the `__version__`, `cfg` and `config_path` module attributes (PEP 562)."""
+    if name == "__version__":
+        value = importlib.import_module("importlib.metadata").version("opencal")
+        globals()["__version__"] = value
+        return value
+    elif name in ("cfg", "config_path"):
+        cfg, config_path = opencal.config.get_config()
+        globals().update(cfg=cfg, config_path=config_path)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = []
@@ -1,11 +1,30 @@
 from typing import List, Optional, Union, Any
-from datetime import datetime
+from datetime import date, datetime, time
 
 from opencal.review import ConsolidationReview
 
 PY_DATE_FORMAT = r"%Y-%m-%d"
 
 class Card:
+
+    # Cards are stored in (very) large numbers: slots avoid the memory overhead
+    # of a per-instance dictionary (c.f. benchmarks/bench_card_memory.py)
+    __slots__ = (
+        "creation_datetime",
+        "question",
+        "answer",
+        "is_hidden",
+        "tags",
+        "consolidation_reviews",
+        "id",
+        "grade",
+        "priority",
+        "difficulty",
+        "saved_digest",
+        "num_saved_reviews",
+        "last_activity_datetime",
+    )
+
     def __init__(
             self,
             creation_datetime: Union[datetime, str],
@@ -14,6 +33,8 @@ class Card:
             is_hidden: bool = False,
             tags: Optional[List[str]] = None,
             consolidation_reviews: Optional[List[ConsolidationReview]] = None,
+            id: Optional[int] = None,
+            last_activity_datetime: Optional[datetime] = None,
         ) -> None:
         """
         Initialize a Card instance.
@@ -32,6 +53,11 @@ class Card:
             A list of tags associated with the card (default is None, which initializes an empty list).
         consolidation_reviews : list of ConsolidationReview, optional
             A list of consolidation reviews associated with the card (default is None, which initializes an empty list).
+        id : int, optional
+            The primary key of the card in the SQLite database (default is None, i.e. the card is not stored in the database).
+        last_activity_datetime : datetime, optional
+            The date of the last activity of the card, if already known (default is None,
+            i.e. it is computed from `creation_datetime` and `consolidation_reviews`).
 
         Returns
         -------
@@ -52,10 +78,93 @@ class Card:
         else:
             self.consolidation_reviews: List[ConsolidationReview] = consolidation_reviews
 
+        self.id: Optional[int] = id
+
         self.grade: Union[float, int] = None       # TODO?
         self.priority: Union[float, int] = None    # TODO?
         self.difficulty: Union[float, int] = None  # TODO?
 
+        # Dirty tracking (the card is not saved yet)
+        self.saved_digest: Optional[int] = None
+        self.num_saved_reviews: Optional[int] = 0
+
+        # Cached max(creation_datetime, max(review_datetime)) used to sort cards by last update
+        self.last_activity_datetime: Optional[datetime] = last_activity_datetime
+        if last_activity_datetime is None:
+            self.update_last_activity_datetime()
+
+
+    @property
+    def num_consolidation_reviews(self) -> int:
+        """The number of consolidation reviews of the card."""
+        return len(self.consolidation_reviews)
+
+
+    def digest(self) -> int:
+        """A hash of the attributes of the card stored in the database (c.f. `is_dirty`)."""
+        return hash((self.creation_datetime, self.question, self.answer, self.is_hidden, tuple(self.tags)))
+
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        True if an attribute of the card stored in the database (question,
+        answer, tags, ...) has been modified since the card has been loaded or saved.
+
+        The attributes are compared to the digest computed when the card was
+        marked clean, so that assignments are plain slot writes (no tracking
+        cost when professors set `grade`, `priority`, etc. on every card).
+        """
+        return self.saved_digest is None or self.digest() != self.saved_digest
+
+
+    @property
+    def has_changes(self) -> bool:
+        """
+        True if the card has been modified since it has been loaded or saved.
+
+        The card is modified if an attribute stored in the database has been
+        modified (c.f. `is_dirty`) or if consolidation reviews have been added
+        or removed. Saved reviews that are edited or replaced in place are not
+        detected: call `mark_reviews_dirty` after such modifications.
+        """
+        return self.is_dirty or (self.num_consolidation_reviews != self.num_saved_reviews)
+
+
+    def update_last_activity_datetime(self) -> None:
+        """
+        Update the cached date of the last activity of the card.
+
+        The last activity is the creation of the card or its most recent
+        consolidation review: `max(creation_datetime, max(review_datetime))`.
+        The value is computed when the card is loaded and must be updated
+        after each review added to the card (professors do it when they
+        handle a reply). Dates are converted to datetimes (at midnight) so
+        that they can be compared.
+        """
+        last_activity_datetime = as_datetime(self.creation_datetime)
+        for review in self.consolidation_reviews:
+            review_datetime = as_datetime(review.review_datetime)
+            if review_datetime > last_activity_datetime:
+                last_activity_datetime = review_datetime
+        self.last_activity_datetime = last_activity_datetime
+
+
+    def mark_dirty(self) -> None:
+        """Mark the card as modified."""
+        self.saved_digest = None
+
+
+    def mark_reviews_dirty(self) -> None:
+        """Mark all the consolidation reviews of the card as modified (they are all rewritten by the next `save_changes`)."""
+        self.num_saved_reviews = None
+
+
+    def mark_clean(self) -> None:
+        """Mark the card as saved (i.e. identical to its record in the database)."""
+        self.saved_digest = self.digest()
+        self.num_saved_reviews = self.num_consolidation_reviews
+
 
     def __getitem__(self, key: str) -> Optional[Union[str, datetime, bool, List[str]]]:
         """
@@ -99,6 +208,8 @@ class Card:
             return self.priority
         elif key == "difficulty":
             return self.difficulty
+        elif key == "last_activity_datetime":
+            return self.last_activity_datetime
         else:
             raise KeyError(f"Key {key} not found in Card attributes")
 
@@ -174,6 +285,10 @@ class Card:
             if not isinstance(value, (float, int)):
                 raise TypeError(f"Expected float or int, got {type(value)}")
             self.difficulty = value
+        elif key == "last_activity_datetime":
+            if not isinstance(value, date):
+                raise TypeError(f"Expected datetime, got {type(value)}")
+            self.last_activity_datetime = as_datetime(value)
         else:
             raise KeyError(f"Key {key} not found in Card attributes")
 
@@ -191,3 +306,10 @@ class Card:
             A string that concatenates the question and answer attributes of the Card instance.
         """
         return f"Question: {self.question}\nAnswer: {self.answer}"
+
+
+def as_datetime(d: Union[datetime, date, str]) -> Union[datetime, str]:
+    """Convert a `datetime.date` object to a `datetime.datetime` object (at midnight); other objects are returned unchanged."""
+    if isinstance(d, date) and not isinstance(d, datetime):
+        return datetime.combine(d, time())
+    return d
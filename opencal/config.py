@@ -1,5 +1,4 @@
 import os
-import yaml
 import random
 import string
 #from dataclasses import dataclass
@@ -22,6 +21,17 @@ opencal:
     sqlite_backup_dir_path: "~/data_opencal"
     sqlite_dump_file_path: "~/data_opencal/opencal.sql"
 
+    # Number of full backups kept in `sqlite_backup_dir_path` by `opencal-backup` (older backups and the differential
+    # backups based on them are deleted); null keeps all the backups
+    sqlite_backup_retention: null
+
+    # Number of replies committed together in the SQLite database
+    # (pending replies are also committed by the first reply made more than `sqlite_max_commit_delay_s` seconds
+    # after the oldest pending one, and when the application exits).
+    # Pending replies are lost if the application crashes: the default commits each reply
+    sqlite_commit_batch_size: 1
+    sqlite_max_commit_delay_s: 2.0
+
     # Unique key of the shared memory used to prevent more than one instance of the application
     shm_key: "{ ''.join(random.choice(string.ascii_letters) for _ in range(16)) }"
 
@@ -52,6 +62,10 @@ opencal:
         doreen:
 
             max_cards_per_grade: 5
+
+            # Number of processes used to assess the cards when the professor is instantiated (for very large PKBs)
+            num_workers: 1
+
             priorities_per_level:
                 0:
                     - sort_fn: "tag"
@@ -130,6 +144,8 @@ def get_config(config_path: str = None) -> Tuple[Dict[Any, Any], str]:
     if not os.path.exists(config_path):
         make_default_config_file(config_path)
 
+    import yaml     # Imported here to keep "import opencal" fast (c.f. `opencal.__getattr__`)
+
     with open(config_path) as stream:
         config_dict = yaml.safe_load(stream)
         # config = Config(**config_dict)
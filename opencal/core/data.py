@@ -1,40 +1,69 @@
-import pandas as pd
-import copy
 from opencal.card import Card
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 RIGHT_ANSWER_STR = "good"
 WRONG_ANSWER_STR = "bad"
 
 def card_list_to_dataframes(
-        card_list: List[Card]
-    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    flat_card_list = []
-    flat_review_list = []
-
-    card_id = 0
-
-    for card in card_list:
-        card = copy.deepcopy(card)
+        card_list: List[Any]
+    ) -> Tuple["pd.DataFrame", "pd.DataFrame"]:
+    """
+    Convert a list of cards to a card DataFrame and a review DataFrame.
 
-        del card["question"]
-        del card["answer"]
-        del card["tags"]
+    The DataFrames are built column by column: cards and reviews are neither
+    copied nor converted to intermediate dicts. For PKBs stored in an SQLite
+    database, `opencal.io.sqlitedb.load_pkb_dataframes` reads the DataFrames
+    without making the cards at all.
 
-        review_list = card.consolidation_reviews
+    Parameters
+    ----------
+    card_list : List[Any]
+        A list of cards (`Card` instances or dicts with "cdate", "hidden" and "reviews" items).
 
-        for review in review_list:
-            review["card_id"] = card_id
+    Returns
+    -------
+    Tuple[pd.DataFrame, pd.DataFrame]
+        The card DataFrame ("cdate" and "hidden" columns, indexed by the
+        position of the card in `card_list`) and the review DataFrame ("rdate",
+        "result" and "card_id" columns, "result" is a categorical column).
+    """
+    import numpy as np
+    import pandas as pd     # Imported here: pandas is slow to import and only needed by this function
 
-        flat_review_list.extend(review_list)
+    cdate_list = []
+    hidden_list = []
+    rdate_list = []
+    is_right_answer_list = []
+    review_card_id_list = []
 
-        del card["reviews"]
+    for card_id, card in enumerate(card_list):
+        if isinstance(card, Card):
+            cdate_list.append(card.creation_datetime)
+            hidden_list.append(card.is_hidden)
+            review_list = card.consolidation_reviews
+            rdate_list.extend([review.review_datetime for review in review_list])
+            is_right_answer_list.extend([review.is_right_answer for review in review_list])
+        else:
+            cdate_list.append(card["cdate"])
+            hidden_list.append(card["hidden"])
+            review_list = card["reviews"]
+            rdate_list.extend([review["rdate"] for review in review_list])
+            is_right_answer_list.extend([review["result"] == RIGHT_ANSWER_STR for review in review_list])
 
-        flat_card_list.append(card)
+        review_card_id_list.extend([card_id] * len(review_list))
 
-        card_id += 1
+    card_df = pd.DataFrame({
+        "cdate": cdate_list,
+        "hidden": np.array(hidden_list, dtype=bool)
+    })
 
-    card_df = pd.DataFrame(flat_card_list)
-    review_df = pd.DataFrame(flat_review_list)
+    review_df = pd.DataFrame({
+        "rdate": rdate_list,
+        "result": pd.Categorical.from_codes(np.array(is_right_answer_list, dtype=np.int8), categories=[WRONG_ANSWER_STR, RIGHT_ANSWER_STR]),
+        "card_id": np.array(review_card_id_list, dtype=np.int64)
+    })
 
-    return card_df, review_df
\ No newline at end of file
+    return card_df, review_df
@@ -5,6 +5,7 @@ This teacher is used for the acquisition (or "learning phase"), i.e. the initial
 
 from opencal.card import Card
 from opencal.core.professor.acquisition.professor import AbstractAcquisitionProfessor
+from opencal.core.professor.review_queue import ReviewQueue
 from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
 # from opencal.review import AcquisitionReview
 
@@ -24,7 +25,7 @@ class ProfessorArthur(AbstractAcquisitionProfessor):
         super().__init__()
 
         self._cards_not_yet_reviewed_list = []
-        self._cards_in_progress_list = []
+        self._cards_in_progress_list = ReviewQueue()
         self._num_right_answers = []          # the total number of right answers for each card
         self._num_wrong_answers = []          # the total number of wrong answers for each card
 
@@ -40,7 +41,7 @@ class ProfessorArthur(AbstractAcquisitionProfessor):
             if self._last_card_in_progress_index < len(self._cards_not_yet_reviewed_list):
                 # Update the list of cards being reviewed ("cards in progress")
                 reviewed_cards_list = self._cards_not_yet_reviewed_list[:self._last_card_in_progress_index]
-                self._cards_in_progress_list = self._cards_not_yet_reviewed_list[self._last_card_in_progress_index:self._last_card_in_progress_index+self.cards_in_progress_increment_size]
+                self._cards_in_progress_list = ReviewQueue(self._cards_not_yet_reviewed_list[self._last_card_in_progress_index:self._last_card_in_progress_index+self.cards_in_progress_increment_size])
                 self._last_card_in_progress_index += self.cards_in_progress_increment_size
 
                 # Add to self._cards_in_progress_list the less well known cards from reviewed_cards_list
@@ -54,7 +55,7 @@ class ProfessorArthur(AbstractAcquisitionProfessor):
                 print("Review completed")
                 return None
 
-        return self._cards_in_progress_list[0][1]
+        return self._cards_in_progress_list.peek()[1]
 
 
     def current_card_reply(
@@ -86,12 +87,12 @@ class ProfessorArthur(AbstractAcquisitionProfessor):
 
         if len(self._cards_in_progress_list) > 0:
             # Pick the first card in progress
-            (card_index, card) = self._cards_in_progress_list.pop(0)
+            (card_index, card) = self._cards_in_progress_list.pop()
 
             if answer in ("skip", WRONG_ANSWER_STR):
                 # If the answer is right or skip, put the card back to the end of the cards in progress list
                 self._num_wrong_answers[card_index] += 1
-                self._cards_in_progress_list.append((card_index, card))
+                self._cards_in_progress_list.requeue((card_index, card))
             elif answer == RIGHT_ANSWER_STR:
                 self._num_right_answers[card_index] += 1
                 print(".", end='', flush=True)
@@ -114,7 +115,7 @@ class ProfessorArthur(AbstractAcquisitionProfessor):
             review_hidden_cards: bool = False
         ):
         self._cards_not_yet_reviewed_list = [(card_index, card) for (card_index, card) in enumerate(card_list) if ((not card.is_hidden) or review_hidden_cards)]
-        self._cards_in_progress_list = []
+        self._cards_in_progress_list = ReviewQueue()
         self._num_right_answers = [0 for card in card_list if ((not card.is_hidden) or review_hidden_cards)]          # the total number of right answers for each card
         self._num_wrong_answers = [0 for card in card_list if ((not card.is_hidden) or review_hidden_cards)]          # the total number of wrong answers for each card
         self._last_card_in_progress_index = 0
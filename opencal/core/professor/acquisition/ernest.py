@@ -4,6 +4,7 @@ This teacher is used for the acquisition (or "learning phase"), i.e. the initial
 """
 
 from opencal.core.professor.acquisition.professor import AbstractAcquisitionProfessor
+from opencal.core.professor.review_queue import ReviewQueue
 from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
 from typing import Optional
 
@@ -15,7 +16,7 @@ class ProfessorErnest(AbstractAcquisitionProfessor):
         super().__init__()
 
         self._cards_not_yet_reviewed_list = []
-        self._cards_in_progress_list = []
+        self._cards_in_progress_list = ReviewQueue()
 
         self.cards_in_progress_increment_size = cards_in_progress_increment_size
         self.update_card_list(card_list)
@@ -27,7 +28,7 @@ class ProfessorErnest(AbstractAcquisitionProfessor):
             print()
             if self._last_card_in_progress_index < len(self._cards_not_yet_reviewed_list):
                 # Update the list of cards being reviewed ("cards in progress")
-                self._cards_in_progress_list = self._cards_not_yet_reviewed_list[self._last_card_in_progress_index:self._last_card_in_progress_index+self.cards_in_progress_increment_size]
+                self._cards_in_progress_list = ReviewQueue(self._cards_not_yet_reviewed_list[self._last_card_in_progress_index:self._last_card_in_progress_index+self.cards_in_progress_increment_size])
                 self._last_card_in_progress_index += self.cards_in_progress_increment_size
                 print(f"Update the work in progress card list ; current index = {self._last_card_in_progress_index} ", end='', flush=True)
             else:
@@ -35,7 +36,7 @@ class ProfessorErnest(AbstractAcquisitionProfessor):
                 print("Review completed")
                 return None
 
-        return self._cards_in_progress_list[0]
+        return self._cards_in_progress_list.peek()
 
 
     def current_card_reply(
@@ -67,11 +68,11 @@ class ProfessorErnest(AbstractAcquisitionProfessor):
 
         if len(self._cards_in_progress_list) > 0:
             # Pick the first card in progress
-            card = self._cards_in_progress_list.pop(0)
+            card = self._cards_in_progress_list.pop()
 
             if answer in ("skip", WRONG_ANSWER_STR):
                 # If the answer is right or skip, put the card back to the end of the cards in progress list
-                self._cards_in_progress_list.append(card)
+                self._cards_in_progress_list.requeue(card)
             elif answer == RIGHT_ANSWER_STR:
                 print(".", end='', flush=True)
             else:
@@ -84,6 +85,6 @@ class ProfessorErnest(AbstractAcquisitionProfessor):
             review_hidden_cards: bool = False
         ):
         self._cards_not_yet_reviewed_list = [card for card in card_list if ((not card["hidden"]) or review_hidden_cards)]
-        self._cards_in_progress_list = []
+        self._cards_in_progress_list = ReviewQueue()
         self._last_card_in_progress_index = 0
         print(f"Review {len(card_list)} cards")
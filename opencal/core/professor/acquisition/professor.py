@@ -3,7 +3,7 @@ from typing import Optional, List, Dict
 
 from opencal.card import Card
 from opencal.core.professor.professor import AbstractProfessor
-from opencal.io.sqlitedb import ACQUISITION_REVIEW_TABLE_NAME, CARD_TABLE_NAME, PY_DATE_FORMAT
+from opencal.io.sqlitedb import ACQUISITION_REVIEW_TABLE_NAME, get_card_id
 # from opencal.review import AcquisitionReview
 
 class AbstractAcquisitionProfessor(AbstractProfessor):
@@ -43,23 +43,9 @@ class AbstractAcquisitionProfessor(AbstractProfessor):
         None
         """
 
-        import warnings
-
         # Retrieve the card ID ##################
 
-        is_hidden = int(card.is_hidden)
-        tags_str = "\n".join(card.tags)
-
-        sql_query = f"SELECT id FROM {CARD_TABLE_NAME} WHERE creation_datetime=? AND question=? AND answer=? AND is_hidden=? AND tags=?"
-        self.cur.execute(sql_query, (card.creation_datetime.strftime(PY_DATE_FORMAT), card.question, card.answer, is_hidden, tags_str))
-        rows = self.cur.fetchall()
-
-        if rows:
-            card_id = rows[0][0]
-            if len(rows) > 1:
-                warnings.warn("More than one record found for the (creation_datetime, question, answer, is_hidden, tags) tuple.")
-        else:
-            raise ValueError("No card ID found in the database.")
+        card_id = get_card_id(self.con, card)
 
         # Save the reply in the database ########
 
@@ -78,6 +64,6 @@ class AbstractAcquisitionProfessor(AbstractProfessor):
         (:card_id, :review_datetime, :user_response_time_ms, :is_right_answer)
         """
 
-        # This is the qmark style:
-        self.cur.execute(sql_request, sql_request_values_dict)
-        self.con.commit()
+        # This is the named style
+        # (the reply can be committed with the next ones, c.f. the "sqlite_commit_batch_size" option)
+        self.con.write(sql_request, sql_request_values_dict)
@@ -3,9 +3,9 @@ This teacher is used for the acquisition (or "learning phase"), i.e. the initial
 """
 
 import copy
-import random
 
 from opencal.core.professor.acquisition.professor import AbstractAcquisitionProfessor
+from opencal.core.professor.review_queue import ReviewQueue
 from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
 from typing import Optional
 
@@ -16,12 +16,12 @@ class ProfessorRandy(AbstractAcquisitionProfessor):
 
         self.update_card_list(card_list)
 
-        # Shuffle list `self._card_list` in place and return None
-        random.shuffle(self._card_list)
+        # Shuffle queue `self._card_list` in place and return None
+        self._card_list.shuffle()
 
     @property
     def current_card(self):
-        return self._card_list[0] if len(self._card_list) > 0 else None
+        return self._card_list.peek()
 
     def current_card_reply(
             self,
@@ -51,14 +51,14 @@ class ProfessorRandy(AbstractAcquisitionProfessor):
         """
 
         if len(self._card_list) > 0:
-            card = self._card_list.pop(0)
+            card = self._card_list.pop()
 
             if answer == "skip":
-                self._card_list.append(card)
+                self._card_list.requeue(card)
             elif answer == RIGHT_ANSWER_STR:
                 pass
             elif answer == WRONG_ANSWER_STR:
-                self._card_list.append(card)
+                self._card_list.requeue(card)
             else:
                 raise ValueError(f"Unknown answer : {answer}")
 
@@ -67,4 +67,4 @@ class ProfessorRandy(AbstractAcquisitionProfessor):
             card_list: list,
             review_hidden_cards: bool = False
         ):
-        self._card_list = [card for card in card_list if ((not card["hidden"]) or review_hidden_cards)]
+        self._card_list = ReviewQueue(card for card in card_list if ((not card["hidden"]) or review_hidden_cards))
@@ -6,7 +6,9 @@ import copy
 import datetime
 import math
 
+from opencal.core.professor.consolidation import batch
 from opencal.core.professor.consolidation.professor import AbstractConsolidationProfessor
+from opencal.core.professor.review_queue import ReviewQueue
 from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
 from typing import Optional
 
@@ -14,6 +16,12 @@ GRADE_CARD_NEVER_REVIEWED = -1
 GRADE_CARD_WRONG_YESTERDAY = -2
 GRADE_DONT_REVIEW_THIS_CARD_TODAY = -3
 
+BATCH_GRADE_RULES = batch.GradeRules(
+    dont_review_this_card_today=GRADE_DONT_REVIEW_THIS_CARD_TODAY,
+    card_wrong_yesterday=GRADE_CARD_WRONG_YESTERDAY,
+    card_never_reviewed=GRADE_CARD_NEVER_REVIEWED
+)
+
 DEBUG = False
 
 if DEBUG:
@@ -21,19 +29,25 @@ if DEBUG:
 
 class ProfessorAlice(AbstractConsolidationProfessor):
 
-    def __init__(self, card_list, date_mock=None):
+    def __init__(self, card_list, date_mock=None, use_batch_assess=False):
         super().__init__()
 
-        self._card_list = []
+        self._card_list = ReviewQueue()
 
         if date_mock is None:
             self._date = datetime.date
         else:
             self._date = date_mock
 
-        for card in card_list:
+        if use_batch_assess:
+            grade_array = assess_batch(card_list, date_mock=date_mock)
+
+        for card_index, card in enumerate(card_list):
             if not card["hidden"]:
-                grade = assess(card, date_mock=date_mock)
+                if use_batch_assess:
+                    grade = int(grade_array[card_index])
+                else:
+                    grade = assess(card, date_mock=date_mock)
                 card["grade"] = grade
 
                 if grade != GRADE_DONT_REVIEW_THIS_CARD_TODAY:
@@ -51,7 +65,7 @@ class ProfessorAlice(AbstractConsolidationProfessor):
 
     @property
     def current_card(self):
-        return self._card_list[0] if len(self._card_list) > 0 else None
+        return self._card_list.peek()
 
     def current_card_reply(
             self,
@@ -81,11 +95,11 @@ class ProfessorAlice(AbstractConsolidationProfessor):
         """
 
         if len(self._card_list) > 0:
-            card = self._card_list.pop(0)
+            card = self._card_list.pop()
 
             if answer == "skip":
                 if not hide:
-                    self._card_list.append(card)
+                    self._card_list.requeue(card)
             elif answer == RIGHT_ANSWER_STR:
                 review = {
                     "rdate": self._date.today(),
@@ -169,6 +183,17 @@ def assess(card, date_mock=None):
     return grade
 
 
+def assess_batch(card_list, date_mock=None):
+    '''Same as `assess` but for all the cards of `card_list` at once (c.f. `opencal.core.professor.consolidation.batch`).'''
+
+    if date_mock is None:
+        today = datetime.date.today()
+    else:
+        today = date_mock.today()
+
+    return batch.assess_card_list(card_list, today, BATCH_GRADE_RULES)
+
+
 def get_expected_revision_date(last_revision_date, grade):
     """Get the expected (next) revision date knowing the last revision date and the grade."""
     return last_revision_date + datetime.timedelta(days=delta_days(grade))
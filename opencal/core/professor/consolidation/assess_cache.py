@@ -0,0 +1,227 @@
+"""Memoization of the `assess` function of consolidation professors.
+
+The grade computed by `assess` only depends on the creation date of the card,
+its review history, the current date and the `ignore_today_answers` flag.
+Reviews are only appended to the history of a card, so the history is
+identified by the number of reviews and the date of the last review: a grade
+computed for a card (ID) with the same creation date, number of reviews, last
+review date and current date can be reused. Dates are encoded as day ordinals
+(c.f. `datetime.date.toordinal`) in the keys and in the database.
+
+`AssessCache` keeps the grades of a professor in an in-memory LRU cache and in
+an SQLite side table (`t_assess_cache`), so that professors instantiated
+several times in the same day (e.g. when the UI recreates them) don't have to
+replay the review history of each card, even after a restart of the
+application. Cache hits and misses are counted (c.f. `AssessCache.stats`).
+
+Use `get_assess_cache` to get the shared cache of a professor.
+"""
+
+import collections
+import datetime
+import os
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import opencal.path
+from opencal.io.connection import get_connection
+from opencal.io.sqlitedb import ASSESS_CACHE_TABLE_NAME, create_assess_cache_table, load_assess_cache, save_assess_cache, table_exists
+
+DEFAULT_MAX_SIZE = 1000000       # Number of grades kept in memory
+
+NO_REVIEW_DAY = 0                # Last review day of cards without review
+
+# (card ID, ignore_today_answers, creation day, number of reviews, last review day)
+AssessCacheKey = Tuple[int, int, int, int, int]
+
+
+class AssessCache:
+
+    def __init__(
+            self,
+            professor_name: str,
+            assess_function: Callable[..., int],
+            opencal_db_path: Optional[os.PathLike] = None,
+            max_size: int = DEFAULT_MAX_SIZE
+        ) -> None:
+        """
+        Initialize an AssessCache instance.
+
+        Parameters
+        ----------
+        professor_name : str
+            The name of the professor (grades computed by different professors are stored separately).
+        assess_function : Callable[..., int]
+            The `assess` function of the professor, called as `assess_function(card, date_mock=..., ignore_today_answers=...)`.
+        opencal_db_path : os.PathLike, optional
+            The SQLite database where grades are persisted (default is None, i.e. grades are only kept in memory).
+        max_size : int, optional
+            The maximum number of grades kept in memory (default is `DEFAULT_MAX_SIZE`).
+
+        Returns
+        -------
+        None
+        """
+        self.professor_name: str = professor_name
+        self.assess_function: Callable[..., int] = assess_function
+        self.opencal_db_path: Optional[str] = opencal.path.expand_path(opencal_db_path) if opencal_db_path is not None else None
+        self.max_size: int = max_size
+
+        self._today: Optional[datetime.date] = None
+        self._lru_dict: "collections.OrderedDict[AssessCacheKey, int]" = collections.OrderedDict()
+        self._disk_dict: Dict[AssessCacheKey, int] = {}       # Grades loaded from the database for `_today`
+        self._pending_list: List[Tuple[int, int, int, int, int, int]] = []   # Keys and grades to save in the database
+
+        # Counters (for monitoring)
+        self.num_hits: int = 0
+        self.num_disk_hits: int = 0
+        self.num_misses: int = 0
+
+
+    def _set_today(self, today: datetime.date) -> None:
+        """Drop the grades computed for another day and load the grades of `today` from the database."""
+        if today == self._today:
+            return
+
+        self.flush()
+        self._today = today
+        self._lru_dict.clear()
+        self._disk_dict = {}
+
+        if self.opencal_db_path is not None:
+            cur = get_connection(self.opencal_db_path).cursor()
+            if table_exists(cur, ASSESS_CACHE_TABLE_NAME):
+                self._disk_dict = {row[:-1]: row[-1] for row in load_assess_cache(cur, self.professor_name, today)}
+
+
+    def assess(
+            self,
+            card: Any,
+            date_mock: Any = None,
+            ignore_today_answers: bool = False
+        ) -> int:
+        """
+        Same as the `assess` function of the professor, but return the cached grade when it is known.
+
+        Cards without ID (i.e. not stored in the database) are not cached.
+
+        Parameters
+        ----------
+        card : Card
+            The card to assess.
+        date_mock : optional
+            The object used to get the current date (default is None, i.e. `datetime.date`).
+        ignore_today_answers : bool, optional
+            Ignore the reviews made today (default is False).
+
+        Returns
+        -------
+        int
+            The grade of the card.
+        """
+        if card.id is None:
+            self.num_misses += 1
+            return self.assess_function(card, date_mock=date_mock, ignore_today_answers=ignore_today_answers)
+
+        today = datetime.date.today() if date_mock is None else date_mock.today()
+        self._set_today(today)
+
+        num_reviews = card.num_consolidation_reviews
+        last_review_day = card.consolidation_reviews[-1].review_datetime.toordinal() if num_reviews > 0 else NO_REVIEW_DAY
+        key = (card.id, int(ignore_today_answers), card.creation_datetime.toordinal(), num_reviews, last_review_day)
+
+        grade = self._lru_dict.get(key)
+        if grade is not None:
+            self.num_hits += 1
+            self._lru_dict.move_to_end(key)
+            return grade
+
+        grade = self._disk_dict.get(key)
+        if grade is not None:
+            self.num_disk_hits += 1
+        else:
+            self.num_misses += 1
+            grade = self.assess_function(card, date_mock=date_mock, ignore_today_answers=ignore_today_answers)
+            if self.opencal_db_path is not None:
+                self._pending_list.append(key + (grade,))
+
+        self._lru_dict[key] = grade
+        if len(self._lru_dict) > self.max_size:
+            self._lru_dict.popitem(last=False)     # Least recently used grade
+
+        return grade
+
+
+    def flush(self) -> None:
+        """Save the new grades in the database (in a single transaction)."""
+        if self.opencal_db_path is None or len(self._pending_list) == 0:
+            return
+
+        con = get_connection(self.opencal_db_path)
+        if not table_exists(con.cursor(), ASSESS_CACHE_TABLE_NAME):
+            create_assess_cache_table(self.opencal_db_path)
+
+        with con.transaction() as cur:
+            save_assess_cache(cur, self.professor_name, self._today, self._pending_list)
+
+        self._pending_list = []
+
+
+    def clear(self) -> None:
+        """Remove all the grades kept in memory (the grades saved in the database are kept) and reset the counters."""
+        self._today = None
+        self._lru_dict.clear()
+        self._disk_dict = {}
+        self._pending_list = []
+        self.num_hits = self.num_disk_hits = self.num_misses = 0
+
+
+    @property
+    def hit_rate(self) -> float:
+        """The ratio of grades found in the cache (in memory or in the database)."""
+        num_calls = self.num_hits + self.num_disk_hits + self.num_misses
+        return (self.num_hits + self.num_disk_hits) / num_calls if num_calls > 0 else 0.
+
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters of the cache (for monitoring)."""
+        return {
+            "hits": self.num_hits,
+            "disk_hits": self.num_disk_hits,
+            "misses": self.num_misses,
+            "hit_rate": self.hit_rate,
+            "size": len(self._lru_dict),
+        }
+
+
+_ASSESS_CACHE_DICT: Dict[Tuple[str, Optional[str]], AssessCache] = {}
+
+
+def get_assess_cache(
+        professor_name: str,
+        assess_function: Callable[..., int],
+        opencal_db_path: Optional[os.PathLike] = None
+    ) -> AssessCache:
+    """
+    Get the assess cache shared by all the instances of a professor (it is created on the first call).
+
+    Parameters
+    ----------
+    professor_name : str
+        The name of the professor.
+    assess_function : Callable[..., int]
+        The `assess` function of the professor.
+    opencal_db_path : os.PathLike, optional
+        The SQLite database where grades are persisted (default is None, i.e. grades are only kept in memory).
+
+    Returns
+    -------
+    AssessCache
+        The shared cache.
+    """
+    key = (professor_name, opencal.path.expand_path(opencal_db_path) if opencal_db_path is not None else None)
+
+    if key not in _ASSESS_CACHE_DICT:
+        _ASSESS_CACHE_DICT[key] = AssessCache(professor_name, assess_function, opencal_db_path)
+
+    return _ASSESS_CACHE_DICT[key]
@@ -0,0 +1,270 @@
+"""Vectorized assessment of consolidation cards.
+
+The `assess` function of each consolidation professor walks the review history
+of one card at a time. This module computes the same grades for all the cards
+of a PKB at once, from a columnar representation of the reviews (NumPy arrays).
+
+The review history of each card is a sequential fold (the effect of a review
+depends on the expected revision date computed from the previous ones) so it
+can't be vectorized along the reviews of a card. Instead, the k-th review of
+every card is processed at the same time: the number of vectorized steps is
+the length of the longest review history, not the total number of reviews.
+
+Each professor describes its special grades with a `GradeRules` instance
+(see the `BATCH_GRADE_RULES` constant of each professor module).
+"""
+
+import datetime
+
+import numpy as np
+
+from typing import Any, List, Optional, Tuple
+
+from opencal.core.data import RIGHT_ANSWER_STR
+
+
+class GradeRules:
+    def __init__(
+            self,
+            dont_review_this_card_today: int,
+            reviewed_today_with_right_answer: Optional[int] = None,
+            card_wrong_yesterday: Optional[int] = None,
+            card_never_reviewed: Optional[int] = None
+        ) -> None:
+        """
+        Initialize a GradeRules instance.
+
+        Parameters
+        ----------
+        dont_review_this_card_today : int
+            The grade given to cards that should not be reviewed today.
+        reviewed_today_with_right_answer : int, optional
+            The grade given to cards whose last review was a right answer given today
+            (default is None, i.e. the professor has no such rule).
+        card_wrong_yesterday : int, optional
+            The grade given to cards whose last review was a wrong answer given yesterday
+            (default is None, i.e. the professor has no such rule).
+        card_never_reviewed : int, optional
+            The grade given to cards that should be reviewed but have never been reviewed
+            (default is None, i.e. these cards get the grade 0).
+
+        Returns
+        -------
+        None
+        """
+        self.dont_review_this_card_today = dont_review_this_card_today
+        self.reviewed_today_with_right_answer = reviewed_today_with_right_answer
+        self.card_wrong_yesterday = card_wrong_yesterday
+        self.card_never_reviewed = card_never_reviewed
+
+
+def card_list_to_review_arrays(
+        card_list: List[Any]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert a list of cards to the columnar representation used by `assess_batch`.
+
+    Cards are identified by their index in `card_list`.
+    Both `Card` objects and (legacy) card dictionaries are supported.
+
+    Parameters
+    ----------
+    card_list : List[Any]
+        A list of cards.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        The creation day of each card (day ordinals), then the card index,
+        the day ordinal and the result (True for right answers) of each review.
+    """
+    creation_day_list = []
+    card_index_list = []
+    review_day_list = []
+    is_right_answer_list = []
+
+    for card_index, card in enumerate(card_list):
+        creation_day_list.append(card["cdate"].toordinal())
+
+        review_list = card["reviews"] if (not isinstance(card, dict) or "reviews" in card) else []
+
+        for review in review_list:
+            card_index_list.append(card_index)
+            review_day_list.append(review["rdate"].toordinal())
+            is_right_answer_list.append(review["result"] == RIGHT_ANSWER_STR)
+
+    return (np.array(creation_day_list, dtype=np.int64),
+            np.array(card_index_list, dtype=np.int64),
+            np.array(review_day_list, dtype=np.int64),
+            np.array(is_right_answer_list, dtype=bool))
+
+
+def review_table_to_review_arrays(
+        card_list: List[Any],
+        review_table: Any
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Same as `card_list_to_review_arrays` but reviews are read from a `ReviewTable`
+    (c.f. `opencal.review_table`) instead of the review objects of each card.
+
+    Cards must have an ID (`Card.id`); reviews of cards missing in `card_list` are ignored.
+
+    Parameters
+    ----------
+    card_list : List[Any]
+        A list of cards.
+    review_table : ReviewTable
+        The consolidation reviews of the cards.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        The creation day of each card (day ordinals), then the card index,
+        the day ordinal and the result (True for right answers) of each review.
+    """
+    creation_day = np.array([card.creation_datetime.toordinal() for card in card_list], dtype=np.int64)
+    card_id = np.array([card.id for card in card_list], dtype=np.int64)
+
+    # Map the card ID of each review to the index of the card in card_list
+    order = np.argsort(card_id, kind="stable")
+    sorted_card_id = card_id[order]
+    position = np.searchsorted(sorted_card_id, review_table.card_id)
+    position = np.minimum(position, max(len(sorted_card_id) - 1, 0))
+    mask = (sorted_card_id[position] == review_table.card_id) if len(sorted_card_id) > 0 else np.zeros(len(review_table), dtype=bool)
+
+    return (creation_day,
+            order[position[mask]],
+            review_table.day[mask].astype(np.int64),
+            review_table.is_right_answer[mask])
+
+
+def assess_batch(
+        creation_day: np.ndarray,
+        card_index: np.ndarray,
+        review_day: np.ndarray,
+        is_right_answer: np.ndarray,
+        today: datetime.date,
+        grade_rules: GradeRules,
+        ignore_today_answers: bool = False
+    ) -> np.ndarray:
+    """
+    Compute the grade of every card in one vectorized pass.
+
+    Reviews of each card must be given in chronological order
+    (reviews of different cards may be interleaved).
+
+    Parameters
+    ----------
+    creation_day : np.ndarray
+        The creation day (day ordinal) of each card.
+    card_index : np.ndarray
+        The index of the card of each review.
+    review_day : np.ndarray
+        The day (day ordinal) of each review.
+    is_right_answer : np.ndarray
+        The result of each review (True for right answers).
+    today : datetime.date
+        The current date.
+    grade_rules : GradeRules
+        The special grades of the professor.
+    ignore_today_answers : bool, optional
+        Ignore reviews made today (default is False).
+
+    Returns
+    -------
+    np.ndarray
+        The grade of each card.
+    """
+    today_day = today.toordinal()
+
+    creation_day = np.asarray(creation_day, dtype=np.int64)
+    card_index = np.asarray(card_index, dtype=np.int64)
+    review_day = np.asarray(review_day, dtype=np.int64)
+    is_right_answer = np.asarray(is_right_answer, dtype=bool)
+
+    if ignore_today_answers:
+        mask = review_day < today_day
+        card_index, review_day, is_right_answer = card_index[mask], review_day[mask], is_right_answer[mask]
+
+    num_cards = len(creation_day)
+
+    # Group reviews by card (the sort is stable so the chronological order of each card is kept)
+    order = np.argsort(card_index, kind="stable")
+    card_index, review_day, is_right_answer = card_index[order], review_day[order], is_right_answer[order]
+
+    num_reviews = np.bincount(card_index, minlength=num_cards)
+    first_review = np.cumsum(num_reviews) - num_reviews
+
+    # Replay the review histories (the k-th review of every card at once)
+    grade = np.zeros(num_cards, dtype=np.int64)
+    expected_revision_day = creation_day + 1        # delta_days(0) = 1
+
+    cards_by_num_reviews = np.argsort(-num_reviews, kind="stable")
+    sorted_num_reviews = num_reviews[cards_by_num_reviews]
+
+    for k in range(int(sorted_num_reviews[0]) if num_cards > 0 else 0):
+        cards = cards_by_num_reviews[:np.count_nonzero(sorted_num_reviews > k)]
+        rows = first_review[cards] + k
+
+        rday = review_day[rows]
+        right = is_right_answer[rows]
+        past = rday <= today_day                     # Ignore future reviews
+
+        upgrade = past & right & (rday >= expected_revision_day[cards])   # Ignore premature right answers
+        reset = past & ~right
+
+        new_grade = np.where(upgrade, grade[cards] + 1, np.where(reset, 0, grade[cards]))
+        new_expected_revision_day = np.where(upgrade | reset, rday + np.left_shift(1, new_grade), expected_revision_day[cards])
+
+        grade[cards] = new_grade
+        expected_revision_day[cards] = new_expected_revision_day
+
+    # Apply the special rules of the professor
+    has_reviews = num_reviews > 0
+    last_review = np.where(has_reviews, first_review + num_reviews - 1, 0)
+    last_review_day = review_day[last_review] if len(review_day) > 0 else np.zeros(num_cards, dtype=np.int64)
+    last_review_is_right = is_right_answer[last_review] if len(is_right_answer) > 0 else np.zeros(num_cards, dtype=bool)
+
+    result = grade.copy()
+
+    if grade_rules.card_never_reviewed is not None:
+        result[~has_reviews] = grade_rules.card_never_reviewed
+
+    result[expected_revision_day > today_day] = grade_rules.dont_review_this_card_today
+
+    if grade_rules.reviewed_today_with_right_answer is not None:
+        result[has_reviews & last_review_is_right & (last_review_day == today_day)] = grade_rules.reviewed_today_with_right_answer
+
+    if grade_rules.card_wrong_yesterday is not None:
+        result[has_reviews & ~last_review_is_right & (last_review_day == today_day - 1)] = grade_rules.card_wrong_yesterday
+
+    return result
+
+
+def assess_card_list(
+        card_list: List[Any],
+        today: datetime.date,
+        grade_rules: GradeRules,
+        ignore_today_answers: bool = False
+    ) -> np.ndarray:
+    """
+    Compute the grade of every card of `card_list` with `assess_batch`.
+
+    Parameters
+    ----------
+    card_list : List[Any]
+        A list of cards.
+    today : datetime.date
+        The current date.
+    grade_rules : GradeRules
+        The special grades of the professor.
+    ignore_today_answers : bool, optional
+        Ignore reviews made today (default is False).
+
+    Returns
+    -------
+    np.ndarray
+        The grade of each card (in the same order than `card_list`).
+    """
+    creation_day, card_index, review_day, is_right_answer = card_list_to_review_arrays(card_list)
+    return assess_batch(creation_day, card_index, review_day, is_right_answer, today, grade_rules, ignore_today_answers)
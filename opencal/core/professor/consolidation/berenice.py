@@ -5,8 +5,11 @@ import math
 
 from typing import Optional, Union
 
+from opencal.core.professor.consolidation import batch
 from opencal.core.professor.consolidation.professor import AbstractConsolidationProfessor
+from opencal.core.professor.review_queue import GradeBuckets, ReviewQueue
 from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
+from opencal.tag_table import CardTagTable
 from typing import Optional
 
 GRADE_CARD_NEVER_REVIEWED = -1
@@ -14,6 +17,13 @@ GRADE_CARD_WRONG_YESTERDAY = -2
 GRADE_DONT_REVIEW_THIS_CARD_TODAY = -3
 GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER = -4
 
+BATCH_GRADE_RULES = batch.GradeRules(
+    dont_review_this_card_today=GRADE_DONT_REVIEW_THIS_CARD_TODAY,
+    reviewed_today_with_right_answer=GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER,
+    card_wrong_yesterday=GRADE_CARD_WRONG_YESTERDAY,
+    card_never_reviewed=GRADE_CARD_NEVER_REVIEWED
+)
+
 DEFAULT_MAX_CARDS_PER_GRADE = 5
 
 DEFAULT_PRIORITY = 1.
@@ -29,12 +39,15 @@ class ProfessorBerenice(AbstractConsolidationProfessor):
                  max_cards_per_grade: int = DEFAULT_MAX_CARDS_PER_GRADE,
                  tag_priorities: Optional[dict] = None,
                  tag_difficulties: Optional[dict] = None,
-                 reverse_level_0: bool = False):
+                 reverse_level_0: bool = False,
+                 use_batch_assess: bool = False,
+                 card_tag_table: Optional[CardTagTable] = None):
         super().__init__()
 
         self.max_cards_per_grade = max_cards_per_grade
         self.tag_priority_dict = tag_priorities if tag_priorities is not None else {}
         self.tag_difficulty_dict = tag_difficulties if tag_difficulties is not None else {}
+        self.reverse_level_0 = reverse_level_0
 
         if VERBOSE:
             print("Professor Berenice")
@@ -42,7 +55,7 @@ class ProfessorBerenice(AbstractConsolidationProfessor):
             print("tag_priority_dict =", self.tag_priority_dict)
             print("tag_difficulty_dict =", self.tag_difficulty_dict)
 
-        self._card_list_dict = {}
+        self._card_list_dict = GradeBuckets()     # Buckets are sorted only when they become the current sub list
         self.num_right_answers_per_grade = {}
         self.num_wrong_answers = 0             # TODO: BUG -> doesn't take into account wrong answers from previous executions...
 
@@ -51,16 +64,42 @@ class ProfessorBerenice(AbstractConsolidationProfessor):
         else:
             self._date = date_mock
 
-        for card in card_list:
+        if use_batch_assess:
+            grade_array = assess_batch(card_list, date_mock=date_mock)
+            grade_without_today_answers_array = assess_batch(card_list, date_mock=date_mock, ignore_today_answers=True)
+
+        # Priorities and difficulties are estimated for all the cards at once from their interned tags (c.f. opencal.tag_table)
+        self._use_tag_table = use_batch_assess or card_tag_table is not None
+
+        if self._use_tag_table:
+            if card_tag_table is None:
+                card_tag_table = CardTagTable.from_card_list(card_list)
+            elif len(card_tag_table) != len(card_list):
+                # The table must be loaded with the same filter than the cards (c.f. the "tags" parameter of opencal.io.sqlitedb.load_card_tag_table)
+                raise ValueError(f"The tag table contains {len(card_tag_table)} cards but the card list contains {len(card_list)} cards")
+            priority_list = card_tag_table.estimate_priorities(self.tag_priority_dict, DEFAULT_PRIORITY).tolist()
+            difficulty_list = card_tag_table.estimate_difficulties(self.tag_difficulty_dict, DEFAULT_DIFFICULTY).tolist()
+
+        for card_index, card in enumerate(card_list):
             if not card["hidden"]:
-                grade = assess(card, date_mock=date_mock)
+                if use_batch_assess:
+                    grade = int(grade_array[card_index])
+                else:
+                    grade = assess(card, date_mock=date_mock)
                 card["grade"] = grade
 
-                card["difficulty"] = estimate_card_difficulty(card, self.tag_difficulty_dict)
+                if self._use_tag_table:
+                    card["priority"] = priority_list[card_index]
+                    card["difficulty"] = difficulty_list[card_index]
+                else:
+                    card["difficulty"] = estimate_card_difficulty(card, self.tag_difficulty_dict)
 
                 if grade == GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER:
 
-                    grade_without_today_answers = assess(card, date_mock=date_mock, ignore_today_answers=True)
+                    if use_batch_assess:
+                        grade_without_today_answers = int(grade_without_today_answers_array[card_index])
+                    else:
+                        grade_without_today_answers = assess(card, date_mock=date_mock, ignore_today_answers=True)
 
                     if grade_without_today_answers in (GRADE_CARD_NEVER_REVIEWED, GRADE_CARD_WRONG_YESTERDAY): 
                         grade_without_today_answers = 0
@@ -74,22 +113,11 @@ class ProfessorBerenice(AbstractConsolidationProfessor):
                     if grade in (GRADE_CARD_NEVER_REVIEWED, GRADE_CARD_WRONG_YESTERDAY): 
                         grade = 0
 
-                    if grade not in self._card_list_dict:
-                        self._card_list_dict[grade] = []
-                    self._card_list_dict[grade].append(card)
+                    self._card_list_dict.add(grade, card)
 
                     if grade not in self.num_right_answers_per_grade:
                         self.num_right_answers_per_grade[grade] = 0
 
-        # Another special rule for level 0
-        if 0 in self._card_list_dict:
-            # Sort level 0 cards by descending date
-            if reverse_level_0:
-                self._card_list_dict[0].sort(key=lambda item: item["cdate"], reverse=True)
-
-            # Sort level 0 cards by ascending (actual) grade : GRADE_CARD_WRONG_YESTERDAY < GRADE_CARD_NEVER_REVIEWED < GRADE 0
-            self._card_list_dict[0].sort(key=lambda item: item["grade"])
-
         self._switch_grade_loop()
 
 
@@ -102,13 +130,24 @@ class ProfessorBerenice(AbstractConsolidationProfessor):
 
 
     def _switch_grade(self):
-        if len(self._card_list_dict.keys()) > 0:
-            self.current_grade = sorted(self._card_list_dict.keys())[0]
-            self.current_sub_list = self._card_list_dict.pop(self.current_grade)  # rem: this remove current_grade from _card_list_dict
+        if len(self._card_list_dict) > 0:
+            # The smallest grade is popped from the heap of grades (this remove current_grade from _card_list_dict)
+            self.current_grade, sub_list = self._card_list_dict.pop_min()
+            self.current_sub_list = ReviewQueue(sub_list)
+
+            # Another special rule for level 0
+            if self.current_grade == 0:
+                # Sort level 0 cards by descending date
+                if self.reverse_level_0:
+                    self.current_sub_list.sort(key=lambda item: item["cdate"], reverse=True)
 
-            # Estimate the priority of each card
-            for card in self.current_sub_list:
-                card["priority"] = estimate_card_priority(card, self.tag_priority_dict)
+                # Sort level 0 cards by ascending (actual) grade : GRADE_CARD_WRONG_YESTERDAY < GRADE_CARD_NEVER_REVIEWED < GRADE 0
+                self.current_sub_list.sort(key=lambda item: item["grade"])
+
+            # Estimate the priority of each card (unless all priorities have been estimated at once in __init__)
+            if not self._use_tag_table:
+                for card in self.current_sub_list:
+                    card["priority"] = estimate_card_priority(card, self.tag_priority_dict)
 
             # Sort current_sub_list according to the priority level of each card
             self.current_sub_list.sort(key=lambda _card : _card["priority"], reverse=True)
@@ -133,7 +172,7 @@ class ProfessorBerenice(AbstractConsolidationProfessor):
             if len(self.current_sub_list) == 0 or self.num_right_answers_per_grade[self.current_grade] >= self.max_cards_per_grade:
                 self._switch_grade_loop()
 
-        return self.current_sub_list[0] if self.current_sub_list is not None else None
+        return self.current_sub_list.peek() if self.current_sub_list is not None else None
 
 
     def current_card_reply(
@@ -164,7 +203,7 @@ class ProfessorBerenice(AbstractConsolidationProfessor):
         """
 
         if len(self.current_sub_list) > 0:
-            card = self.current_sub_list.pop(0)
+            card = self.current_sub_list.pop()
 
             if answer == RIGHT_ANSWER_STR:
                 review = {
@@ -183,7 +222,7 @@ class ProfessorBerenice(AbstractConsolidationProfessor):
             elif answer == "skip":
                 pass
             elif answer == "skip level":
-                self.current_sub_list = []
+                self.current_sub_list.clear()
             else:
                 raise ValueError(f"Unknown answer : {answer}")
 
@@ -263,6 +302,17 @@ def assess(card, date_mock=None, ignore_today_answers=False):
     return grade
 
 
+def assess_batch(card_list, date_mock=None, ignore_today_answers=False):
+    '''Same as `assess` but for all the cards of `card_list` at once (c.f. `opencal.core.professor.consolidation.batch`).'''
+
+    if date_mock is None:
+        today = datetime.date.today()
+    else:
+        today = date_mock.today()
+
+    return batch.assess_card_list(card_list, today, BATCH_GRADE_RULES, ignore_today_answers=ignore_today_answers)
+
+
 def get_expected_revision_date(last_revision_date, grade):
     """Get the expected (next) revision date knowing the last revision date and the grade."""
     return last_revision_date + datetime.timedelta(days=delta_days(grade))
@@ -7,6 +7,7 @@ from typing import Any, Optional, Union, List, Dict
 
 from opencal.card import Card
 from opencal.core.professor.professor import AbstractProfessor
+from opencal.core.professor.review_queue import ReviewQueue
 from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
 from opencal.review import ConsolidationReview
 
@@ -29,7 +30,7 @@ class ProfessorBrutus(AbstractProfessor):
 
     @property
     def current_card(self):
-        return self._card_list[0] if len(self._card_list) > 0 else None
+        return self._card_list.peek()
 
 
     def current_card_reply(
@@ -60,7 +61,7 @@ class ProfessorBrutus(AbstractProfessor):
         """
 
         if len(self._card_list) > 0:
-            card = self._card_list.pop(0)
+            card = self._card_list.pop()
 
             if answer == RIGHT_ANSWER_STR:
                 review = ConsolidationReview(review_datetime=self._date.today(), is_right_answer=True)  # TODO: use datetime instead date
@@ -75,6 +76,9 @@ class ProfessorBrutus(AbstractProfessor):
             else:
                 raise ValueError(f"Unknown answer : {answer}")
 
+            if answer in (RIGHT_ANSWER_STR, WRONG_ANSWER_STR):
+                card.update_last_activity_datetime()
+
             if hide:
                 card.is_hidden = True
 
@@ -86,7 +90,7 @@ class ProfessorBrutus(AbstractProfessor):
             card_list: List[Card],
             review_hidden_cards: bool = False
         ):
-        self._card_list = [card for card in card_list if ((not card.is_hidden) or review_hidden_cards)]
+        self._card_list = ReviewQueue(card for card in card_list if ((not card.is_hidden) or review_hidden_cards))
         #self.notify_observers()
 
 
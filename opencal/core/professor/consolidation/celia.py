@@ -9,13 +9,22 @@ import warnings
 
 from typing import Optional, Union
 
+from opencal.card import as_datetime
+from opencal.core.professor.consolidation import batch
 from opencal.core.professor.consolidation.professor import AbstractConsolidationProfessor
+from opencal.core.professor.review_queue import GradeBuckets, ReviewQueue, TopKReviewQueue
 from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
+from opencal.tag_table import CardTagTable
 from typing import Optional
 
 GRADE_DONT_REVIEW_THIS_CARD_TODAY = -1
 GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER = -2
 
+BATCH_GRADE_RULES = batch.GradeRules(
+    dont_review_this_card_today=GRADE_DONT_REVIEW_THIS_CARD_TODAY,
+    reviewed_today_with_right_answer=GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER
+)
+
 DEFAULT_MAX_CARDS_PER_GRADE = 5
 
 DEFAULT_PRIORITY = 1.
@@ -30,10 +39,14 @@ class ProfessorCelia(AbstractConsolidationProfessor):
                  date_mock: Optional[datetime.date] = None,
                  max_cards_per_grade: int = DEFAULT_MAX_CARDS_PER_GRADE,
                  tag_priorities: Optional[dict] = None,                   # TODO: Python > 3.8: dict | None = None
-                 tag_difficulties: Optional[dict] = None):
+                 tag_difficulties: Optional[dict] = None,
+                 use_batch_assess: bool = False,
+                 session_budget: Optional[int] = None,
+                 card_tag_table: Optional[CardTagTable] = None):
         super().__init__()
 
         self.max_cards_per_grade = max_cards_per_grade
+        self.session_budget = session_budget     # If not None, only the `session_budget` first cards of the current grade are sorted (the next ones are selected on demand)
         self.tag_priority_dict = tag_priorities if tag_priorities is not None else {}
         self.tag_difficulty_dict = tag_difficulties if tag_difficulties is not None else {}
 
@@ -43,7 +56,7 @@ class ProfessorCelia(AbstractConsolidationProfessor):
             print("tag_priority_dict =", self.tag_priority_dict)
             print("tag_difficulty_dict =", self.tag_difficulty_dict)
 
-        self._card_list_dict = {}
+        self._card_list_dict = GradeBuckets()     # Buckets are sorted only when they become the current sub list
         self.num_right_answers_per_grade = {}
         self.num_wrong_answers = 0             # TODO: BUG -> doesn't take into account wrong answers from previous executions...
 
@@ -56,22 +69,51 @@ class ProfessorCelia(AbstractConsolidationProfessor):
         # Set card's grade and card's difficulty
         # Initialize and update self.num_right_answers_per_grade
         # Initialize and update self._card_list_dict
-        for card in card_list:
+        if use_batch_assess:
+            grade_array = assess_batch(card_list, date_mock=date_mock)
+            grade_without_today_answers_array = assess_batch(card_list, date_mock=date_mock, ignore_today_answers=True)
+
+        # Priorities and difficulties are estimated for all the cards at once from their interned tags (c.f. opencal.tag_table)
+        use_tag_table = use_batch_assess or card_tag_table is not None
+
+        if use_tag_table:
+            if card_tag_table is None:
+                card_tag_table = CardTagTable.from_card_list(card_list)
+            elif len(card_tag_table) != len(card_list):
+                # The table must be loaded with the same filter than the cards (c.f. the "tags" parameter of opencal.io.sqlitedb.load_card_tag_table)
+                raise ValueError(f"The tag table contains {len(card_tag_table)} cards but the card list contains {len(card_list)} cards")
+            priority_list = card_tag_table.estimate_priorities(self.tag_priority_dict, DEFAULT_PRIORITY).tolist()
+            difficulty_list = card_tag_table.estimate_difficulties(self.tag_difficulty_dict, DEFAULT_DIFFICULTY).tolist()
+
+        for card_index, card in enumerate(card_list):
             if not card["hidden"]:
                 # Set card's grade
-                grade = assess(card, date_mock=date_mock)
+                if use_batch_assess:
+                    grade = int(grade_array[card_index])
+                else:
+                    grade = assess(card, date_mock=date_mock)
                 card["grade"] = grade
 
-                # Estimate the priority of each card
-                card["priority"] = estimate_card_priority(card, self.tag_priority_dict)
+                if use_tag_table:
+                    card["priority"] = priority_list[card_index]
+                    card["difficulty"] = difficulty_list[card_index]
+                else:
+                    # Estimate the priority of each card
+                    card["priority"] = estimate_card_priority(card, self.tag_priority_dict)
+
+                    # Set card's difficulty
+                    card["difficulty"] = estimate_card_difficulty(card, self.tag_difficulty_dict)
 
-                # Set card's difficulty
-                card["difficulty"] = estimate_card_difficulty(card, self.tag_difficulty_dict)
+                # Cache the date of the last update of the card (used to sort level 0 cards)
+                card["last_activity_datetime"] = compute_last_activity_datetime(card)
 
                 # Initialize and update self.num_right_answers_per_grade
                 if grade == GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER:
 
-                    grade_without_today_answers = assess(card, date_mock=date_mock, ignore_today_answers=True)
+                    if use_batch_assess:
+                        grade_without_today_answers = int(grade_without_today_answers_array[card_index])
+                    else:
+                        grade_without_today_answers = assess(card, date_mock=date_mock, ignore_today_answers=True)
 
                     if grade_without_today_answers not in self.num_right_answers_per_grade:
                         self.num_right_answers_per_grade[grade_without_today_answers] = 0
@@ -80,9 +122,7 @@ class ProfessorCelia(AbstractConsolidationProfessor):
                 elif grade != GRADE_DONT_REVIEW_THIS_CARD_TODAY:
 
                     # Initialize and update self._card_list_dict
-                    if grade not in self._card_list_dict:
-                        self._card_list_dict[grade] = []
-                    self._card_list_dict[grade].append(card)
+                    self._card_list_dict.add(grade, card)
 
                     # Initialize self.num_right_answers_per_grade
                     if grade not in self.num_right_answers_per_grade:
@@ -101,8 +141,14 @@ class ProfessorCelia(AbstractConsolidationProfessor):
 
     def _switch_grade(self):
         if len(self._card_list_dict) > 0:
-            self.current_grade = sorted(self._card_list_dict.keys())[0]
-            self.current_sub_list = self._card_list_dict.pop(self.current_grade)  # rem: this remove current_grade from _card_list_dict
+            # The smallest grade is popped from the heap of grades (this remove current_grade from _card_list_dict)
+            self.current_grade, sub_list = self._card_list_dict.pop_min()
+            if self.session_budget is None:
+                self.current_sub_list = ReviewQueue(sub_list)
+            else:
+                # Session budget mode: only a few cards are presented per grade, so the top-k cards are selected
+                # in O(n log k) instead of sorting the whole bucket (the next ones are selected when needed)
+                self.current_sub_list = TopKReviewQueue(sub_list, batch_size=self.session_budget)
 
             # Sort the current sub_list
             sort_sub_list(self.current_sub_list, self.current_grade, self.tag_priority_dict)
@@ -122,7 +168,7 @@ class ProfessorCelia(AbstractConsolidationProfessor):
             if len(self.current_sub_list) == 0 or self.num_right_answers_per_grade[self.current_grade] >= self.max_cards_per_grade:
                 self._switch_grade_loop()
 
-        return self.current_sub_list[0] if self.current_sub_list is not None else None
+        return self.current_sub_list.peek() if self.current_sub_list is not None else None
 
 
     def _print_number_of_cards_to_review_per_grade(self):
@@ -163,7 +209,7 @@ class ProfessorCelia(AbstractConsolidationProfessor):
             This function does not return any value.
         """
         if len(self.current_sub_list) > 0:
-            card = self.current_sub_list.pop(0)
+            card = self.current_sub_list.pop()
 
             if answer == RIGHT_ANSWER_STR:
                 review = {
@@ -182,10 +228,13 @@ class ProfessorCelia(AbstractConsolidationProfessor):
             elif answer == "skip":
                 pass
             elif answer == "skip level":
-                self.current_sub_list = []
+                self.current_sub_list.clear()
             else:
                 raise ValueError(f"Unknown answer : {answer}")
 
+            if answer in (RIGHT_ANSWER_STR, WRONG_ANSWER_STR):
+                card["last_activity_datetime"] = compute_last_activity_datetime(card)
+
             if hide:
                 card["hidden"] = True
 
@@ -260,6 +309,17 @@ def assess(card, date_mock=None, ignore_today_answers=False):
     return grade
 
 
+def assess_batch(card_list, date_mock=None, ignore_today_answers=False):
+    '''Same as `assess` but for all the cards of `card_list` at once (c.f. `opencal.core.professor.consolidation.batch`).'''
+
+    if date_mock is None:
+        today = datetime.date.today()
+    else:
+        today = date_mock.today()
+
+    return batch.assess_card_list(card_list, today, BATCH_GRADE_RULES, ignore_today_answers=ignore_today_answers)
+
+
 def get_expected_revision_date(last_revision_date, grade):
     """Get the expected (next) revision date knowing the last revision date and the grade."""
     return last_revision_date + datetime.timedelta(days=delta_days(grade))
@@ -309,20 +369,31 @@ def estimate_card_difficulty(card, tag_difficulty_dict):
     return card_difficulty
 
 
+def compute_last_activity_datetime(card):
+    """Return the date of the last update of a card: max(cdate, max(rdate)).
+
+    Dates are converted to datetimes (at midnight) so that they can be compared."""
+    return max([as_datetime(card["cdate"])] + [as_datetime(review["rdate"]) for review in card["reviews"]])
+
+
+def get_last_activity_datetime(card):
+    """Return the date of the last update of a card, cached in card["last_activity_datetime"] by the professor (computed if not cached)."""
+    try:
+        return card["last_activity_datetime"]
+    except KeyError:
+        return compute_last_activity_datetime(card)
+
+
 def sort_sub_list(sub_list, sub_list_grade, tag_priority_dict):
     """Une "sub_list" est un liste de cartes où toutes les cartes ont le même "grade"
 
     mis dans une fonction à part pour pouvoir être testé plus facilement dans des tests unitaires
     """
     if sub_list_grade == 0:
-        # Sort level 2 (minor sort level i.e. to sort cards having the same "last update date"):
-        # Sort current_sub_list according to the priority level of each card
-        sub_list.sort(key=lambda _card : _card["priority"], reverse=True)
-
-        # Sort level 1 (major sort level):
         # Apply some special rules for cards having a grade equals to 0
-        # Sort level 0 cards by descending date
-        sub_list.sort(key=lambda _card : max([_card["cdate"]] + [review["rdate"] for review in _card["reviews"]]), reverse=True)
+        # Sort level 0 cards by descending date (major sort level) then according to the priority level of each card
+        # (minor sort level i.e. to sort cards having the same "last update date"), in a single sort
+        sub_list.sort(key=lambda _card : (get_last_activity_datetime(_card), _card["priority"]), reverse=True)
     else:
         # Sort current_sub_list according to the priority level of each card
         sub_list.sort(key=lambda _card : _card["priority"], reverse=True)
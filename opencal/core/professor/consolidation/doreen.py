@@ -4,23 +4,38 @@ Doreen est similaire à Celia excepté que chaque niveau peut être triés selon
 
 import datetime
 import math
+import operator
 import warnings
 
-from typing import Any, Optional, Union, List, Dict
+from typing import Any, Optional, Union, List, Dict, Set
 
 from opencal.card import Card
+import opencal
+from opencal.core.professor.consolidation import batch, parallel
+from opencal.core.professor.consolidation.assess_cache import AssessCache, get_assess_cache
 from opencal.core.professor.consolidation.professor import AbstractConsolidationProfessor
+from opencal.core.professor.review_queue import GradeBuckets, ReviewQueue, TopKReviewQueue
+from opencal.core.professor.consolidation.schedule import CardSchedule, make_schedule, update_schedule
 from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
 from opencal.review import ConsolidationReview
+from opencal.tag_table import CardTagTable
 
 GRADE_DONT_REVIEW_THIS_CARD_TODAY = -1
 GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER = -2
 
+BATCH_GRADE_RULES = batch.GradeRules(
+    dont_review_this_card_today=GRADE_DONT_REVIEW_THIS_CARD_TODAY,
+    reviewed_today_with_right_answer=GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER
+)
+
 DEFAULT_MAX_CARDS_PER_GRADE = 5
 
 DEFAULT_PRIORITY = 1.
 DEFAULT_DIFFICULTY = 1.
 
+DEFAULT_NUM_WORKERS = 1
+MIN_CARDS_PER_WORKER = 10000      # Smaller PKBs are assessed in the main process (starting workers would cost more)
+
 VERBOSE = True
 
 class ProfessorDoreen(AbstractConsolidationProfessor):
@@ -31,12 +46,20 @@ class ProfessorDoreen(AbstractConsolidationProfessor):
                  max_cards_per_grade: int = DEFAULT_MAX_CARDS_PER_GRADE,
                  tag_priorities: Optional[Dict[str, float]] = None,                   # TODO: Python > 3.8: dict | None = None
                  tag_difficulties: Optional[Dict[str, float]] = None,                 # TODO
-                 priorities_per_level: Optional[Dict[Union[int, str], List[Dict[str, Any]]]] = None):            # TODO
+                 priorities_per_level: Optional[Dict[Union[int, str], List[Dict[str, Any]]]] = None,            # TODO
+                 due_card_schedules: Optional[Dict[int, CardSchedule]] = None,
+                 scheduled_card_ids: Optional[Set[int]] = None,
+                 use_batch_assess: bool = False,
+                 session_budget: Optional[int] = None,
+                 use_assess_cache: bool = False,
+                 num_workers: Optional[int] = None,
+                 card_tag_table: Optional[CardTagTable] = None):
         super().__init__()
 
-        self.current_sub_list : Optional[List[Card]] = None
+        self.current_sub_list : Optional[ReviewQueue] = None
 
         self.max_cards_per_grade = max_cards_per_grade
+        self.session_budget = session_budget     # If not None, only the `session_budget` first cards of the current grade are sorted (the next ones are selected on demand)
         self.tag_priority_dict = tag_priorities if tag_priorities is not None else {}
         self.tag_difficulty_dict = tag_difficulties if tag_difficulties is not None else {}
         self.priorities_per_level = priorities_per_level
@@ -58,7 +81,7 @@ class ProfessorDoreen(AbstractConsolidationProfessor):
             print("tag_priority_dict =", self.tag_priority_dict)
             print("tag_difficulty_dict =", self.tag_difficulty_dict)
 
-        self._card_list_dict : Dict[int, List[Card]] = {}
+        self._card_list_dict : GradeBuckets = GradeBuckets()     # Buckets are sorted only when they become the current sub list
         self.num_right_answers_per_grade : Dict[int, int] = {}
         self.num_wrong_answers = 0             # TODO: BUG -> doesn't take into account wrong answers from previous executions...
 
@@ -68,25 +91,91 @@ class ProfessorDoreen(AbstractConsolidationProfessor):
         else:
             self._date = date_mock
 
+        # The scheduling state of the cards stored in the database (indexed by card ID)
+        # makes it possible to get the grade of each card without replaying its review history.
+        # It is loaded by the caller (c.f. opencal.io.sqlitedb.load_card_schedules)
+        self.use_card_schedule = due_card_schedules is not None
+        self._card_schedule_dict: Dict[int, CardSchedule] = due_card_schedules if due_card_schedules is not None else {}
+        scheduled_card_id_set = scheduled_card_ids if scheduled_card_ids is not None else set()
+
+        # Grades computed by previous instances of the professor (the same day) are reused (c.f. opencal.core.professor.consolidation.assess_cache)
+        self.assess_cache: Optional[AssessCache] = get_assess_cache("doreen", assess, self.opencal_db_path) if use_assess_cache else None
+        assess_function = self.assess_cache.assess if self.assess_cache is not None else assess
+
+        # The number of processes used to assess the cards (c.f. the "num_workers" option of the "professors.doreen" config block)
+        if num_workers is None:
+            num_workers = opencal.cfg['opencal'].get('professors', {}).get('doreen', {}).get('num_workers', DEFAULT_NUM_WORKERS)
+        self.num_workers = max(1, int(num_workers))
+
+        use_parallel_assess = self.num_workers > 1 and len(card_list) >= MIN_CARDS_PER_WORKER * self.num_workers
+
+        if use_parallel_assess:
+            # Grades, priorities and difficulties are computed by several processes (c.f. opencal.core.professor.consolidation.parallel)
+            today = datetime.date.today() if date_mock is None else date_mock.today()
+            grade_array, grade_without_today_answers_array, priority_list, difficulty_list = parallel.assess_card_list(
+                card_list, today, BATCH_GRADE_RULES,
+                estimate_tags_priority, self.tag_priority_dict,
+                estimate_tags_difficulty, self.tag_difficulty_dict,
+                num_workers=self.num_workers
+            )
+            use_batch_assess = True
+        elif use_batch_assess:
+            grade_array = assess_batch(card_list, date_mock=date_mock)
+            grade_without_today_answers_array = assess_batch(card_list, date_mock=date_mock, ignore_today_answers=True)
+
+        # Priorities and difficulties are estimated for all the cards at once from their interned tags (c.f. opencal.tag_table).
+        # A given tag table is used on the parallel path too (its estimates replace the ones computed by the workers)
+        use_tag_table = card_tag_table is not None or (use_batch_assess and not use_parallel_assess)
+
+        if use_tag_table:
+            if card_tag_table is None:
+                card_tag_table = CardTagTable.from_card_list(card_list)
+            elif len(card_tag_table) != len(card_list):
+                # The table must be loaded with the same filter than the cards (c.f. the "tags" parameter of opencal.io.sqlitedb.load_card_tag_table)
+                raise ValueError(f"The tag table contains {len(card_tag_table)} cards but the card list contains {len(card_list)} cards")
+            priority_list = card_tag_table.estimate_priorities(self.tag_priority_dict, DEFAULT_PRIORITY).tolist()
+            difficulty_list = card_tag_table.estimate_difficulties(self.tag_difficulty_dict, DEFAULT_DIFFICULTY).tolist()
+
         # Set card's grade and card's difficulty
         # Initialize and update self.num_right_answers_per_grade
         # Initialize and update self._card_list_dict
-        for card in card_list:
+        for card_index, card in enumerate(card_list):
             if not card.is_hidden:
                 # Set card's grade
-                grade = assess(card, date_mock=date_mock)
+                if card.id in self._card_schedule_dict:
+                    schedule = self._card_schedule_dict[card.id]
+                    grade = assess_schedule(schedule, date_mock=date_mock)
+                    if grade is None:
+                        # The schedule contains future reviews: fall back to the full assessment
+                        grade = assess_function(card, date_mock=date_mock)
+                elif card.id in scheduled_card_id_set:
+                    # The card is not due today
+                    continue
+                elif use_batch_assess:
+                    grade = int(grade_array[card_index])
+                else:
+                    grade = assess_function(card, date_mock=date_mock)
                 card.grade = grade
 
-                # Estimate the priority of each card
-                card.priority = estimate_card_priority(card, self.tag_priority_dict)
+                if use_parallel_assess or use_tag_table:
+                    card.priority = priority_list[card_index]
+                    card.difficulty = difficulty_list[card_index]
+                else:
+                    # Estimate the priority of each card
+                    card.priority = estimate_card_priority(card, self.tag_priority_dict)
 
-                # Set card's difficulty
-                card.difficulty = estimate_card_difficulty(card, self.tag_difficulty_dict)
+                    # Set card's difficulty
+                    card.difficulty = estimate_card_difficulty(card, self.tag_difficulty_dict)
 
                 # Initialize and update self.num_right_answers_per_grade
                 if grade == GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER:
 
-                    grade_without_today_answers = assess(card, date_mock=date_mock, ignore_today_answers=True)
+                    if card.id in self._card_schedule_dict:
+                        grade_without_today_answers = assess_schedule(self._card_schedule_dict[card.id], date_mock=date_mock, ignore_today_answers=True)
+                    elif use_batch_assess:
+                        grade_without_today_answers = int(grade_without_today_answers_array[card_index])
+                    else:
+                        grade_without_today_answers = assess_function(card, date_mock=date_mock, ignore_today_answers=True)
 
                     if grade_without_today_answers not in self.num_right_answers_per_grade:
                         self.num_right_answers_per_grade[grade_without_today_answers] = 0
@@ -95,14 +184,15 @@ class ProfessorDoreen(AbstractConsolidationProfessor):
                 elif grade != GRADE_DONT_REVIEW_THIS_CARD_TODAY:
 
                     # Initialize and update self._card_list_dict
-                    if grade not in self._card_list_dict:
-                        self._card_list_dict[grade] = []
-                    self._card_list_dict[grade].append(card)
+                    self._card_list_dict.add(grade, card)
 
                     # Initialize self.num_right_answers_per_grade
                     if grade not in self.num_right_answers_per_grade:
                         self.num_right_answers_per_grade[grade] = 0
 
+        if self.assess_cache is not None:
+            self.assess_cache.flush()
+
         self._switch_grade_loop()
 
 
@@ -116,8 +206,14 @@ class ProfessorDoreen(AbstractConsolidationProfessor):
 
     def _switch_grade(self):
         if len(self._card_list_dict) > 0:
-            self.current_grade = sorted(self._card_list_dict.keys())[0]
-            self.current_sub_list = self._card_list_dict.pop(self.current_grade)  # rem: this remove current_grade from _card_list_dict
+            # The smallest grade is popped from the heap of grades (this remove current_grade from _card_list_dict)
+            self.current_grade, sub_list = self._card_list_dict.pop_min()
+            if self.session_budget is None:
+                self.current_sub_list = ReviewQueue(sub_list)
+            else:
+                # Session budget mode: only a few cards are presented per grade, so the top-k cards are selected
+                # in O(n log k) instead of sorting the whole bucket (the next ones are selected when needed)
+                self.current_sub_list = TopKReviewQueue(sub_list, batch_size=self.session_budget)
 
             # Sort the current sub_list
             sort_sub_list(self.current_sub_list, self.current_grade, self.tag_priority_dict, self.priorities_per_level)
@@ -137,7 +233,7 @@ class ProfessorDoreen(AbstractConsolidationProfessor):
             if len(self.current_sub_list) == 0 or self.num_right_answers_per_grade[self.current_grade] >= self.max_cards_per_grade:
                 self._switch_grade_loop()
 
-        return self.current_sub_list[0] if self.current_sub_list is not None else None
+        return self.current_sub_list.peek() if self.current_sub_list is not None else None
 
 
     def _print_number_of_cards_to_review_per_grade(self):
@@ -179,7 +275,7 @@ class ProfessorDoreen(AbstractConsolidationProfessor):
         """
 
         if len(self.current_sub_list) > 0:
-            card = self.current_sub_list.pop(0)
+            card = self.current_sub_list.pop()
 
             if answer == RIGHT_ANSWER_STR:
                 review = ConsolidationReview(review_datetime=self._date.today(), is_right_answer=True)  # TODO: use datetime instead date
@@ -192,13 +288,45 @@ class ProfessorDoreen(AbstractConsolidationProfessor):
             elif answer == "skip":
                 pass
             elif answer == "skip level":
-                self.current_sub_list = []
+                self.current_sub_list.clear()
             else:
                 raise ValueError(f"Unknown answer : {answer}")
 
+            if answer in (RIGHT_ANSWER_STR, WRONG_ANSWER_STR):
+                card.update_last_activity_datetime()
+
             if hide:
                 card.is_hidden = True
 
+            if self.use_card_schedule and (card.id is not None) and answer in (RIGHT_ANSWER_STR, WRONG_ANSWER_STR):
+                self._update_card_schedule(card)
+
+
+    def _update_card_schedule(self, card: Card) -> None:
+        """
+        Update the scheduling state of a card with its last review.
+
+        The schedule is only updated in memory: the row of the card in the
+        schedule table is written by `opencal.io.sqlitedb.save_changes` (or
+        `save_pkb`) in the same transaction as the review it reflects.
+        Otherwise, if the reviews were not saved, the next instance of the
+        professor would read a schedule ahead of the review history of the card.
+
+        Parameters
+        ----------
+        card : Card
+            The card that has just been reviewed.
+
+        Returns
+        -------
+        None
+        """
+        if card.id in self._card_schedule_dict:
+            last_review = card.consolidation_reviews[-1]
+            update_schedule(self._card_schedule_dict[card.id], last_review.review_datetime, last_review.is_right_answer)
+        else:
+            self._card_schedule_dict[card.id] = make_schedule(card)
+
 
 def datetime_to_date(
         d: Union[datetime.datetime, datetime.date]
@@ -273,6 +401,56 @@ def assess(
     return grade
 
 
+def assess_batch(
+        card_list: List[Card],
+        date_mock: Optional[datetime.date] = None,
+        ignore_today_answers: bool = False
+    ):
+    '''Same as `assess` but for all the cards of `card_list` at once (c.f. `opencal.core.professor.consolidation.batch`).'''
+
+    if date_mock is None:
+        today = datetime.date.today()
+    else:
+        today = date_mock.today()
+
+    return batch.assess_card_list(card_list, today, BATCH_GRADE_RULES, ignore_today_answers=ignore_today_answers)
+
+
+def assess_schedule(
+        schedule: CardSchedule,
+        date_mock: Optional[datetime.date] = None,
+        ignore_today_answers: bool = False
+    ) -> Optional[int]:
+    """Same as `assess` but computed in O(1) from the scheduling state of the card.
+
+    Return None if the result can't be deduced from the scheduling state
+    (i.e. when the card has been reviewed after the current date)."""
+
+    if date_mock is None:
+        today = datetime.date.today()
+    else:
+        today = date_mock.today()
+
+    if schedule.last_review_date is not None and schedule.last_review_date > today:
+        return None
+
+    grade = schedule.grade
+    expected_revision_date = schedule.expected_revision_date
+
+    if schedule.last_review_date == today:
+        if ignore_today_answers:
+            grade = schedule.previous_grade
+            expected_revision_date = schedule.previous_expected_revision_date
+        elif schedule.last_review_is_right_answer:
+            return GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER
+
+    if expected_revision_date > today:
+        # It's too early to review this card. The card will be hide
+        grade = GRADE_DONT_REVIEW_THIS_CARD_TODAY
+
+    return grade
+
+
 def get_expected_revision_date(last_revision_date, grade):
     """Get the expected (next) revision date knowing the last revision date and the grade."""
     return last_revision_date + datetime.timedelta(days=delta_days(grade))
@@ -295,7 +473,16 @@ def estimate_card_priority(
     # prof_berebice_low_priority_tags = [[...], ...] -> chaque sous liste est un ensemble de tags équivalant ;
     # chaque tag ds high priority => card priority += 1 ; chaque tag dans low_prio_list => card priority -= 1
 
-    tag_priority_list = [tag_priority_dict.get(tag, DEFAULT_PRIORITY) for tag in card.tags]
+    return estimate_tags_priority(card.tags, tag_priority_dict)
+
+
+def estimate_tags_priority(
+        tags: List[str],
+        tag_priority_dict: Dict[str, float]
+    ):
+    """Same as `estimate_card_priority` but from the tags of the card (c.f. `opencal.core.professor.consolidation.parallel`)."""
+
+    tag_priority_list = [tag_priority_dict.get(tag, DEFAULT_PRIORITY) for tag in tags]
 
     if len(tag_priority_list) == 0:
         card_priority = DEFAULT_PRIORITY
@@ -314,9 +501,18 @@ def estimate_card_difficulty(
     ):
     # TODO: tags (+ maybe rate of right answer and avg response time)
 
+    return estimate_tags_difficulty(card.tags, tag_difficulty_dict)
+
+
+def estimate_tags_difficulty(
+        tags: List[str],
+        tag_difficulty_dict: Dict[str, float]
+    ):
+    """Same as `estimate_card_difficulty` but from the tags of the card (c.f. `opencal.core.professor.consolidation.parallel`)."""
+
     tag_difficulty_list = []
 
-    for tag in card.tags:
+    for tag in tags:
         if tag in tag_difficulty_dict:
             tag_difficulty_list.append(tag_difficulty_dict[tag])
 
@@ -328,6 +524,60 @@ def estimate_card_difficulty(
     return card_difficulty
 
 
+class ReversedSortKey:
+    """Wrap a sort key to sort it in descending order within an ascending composite key (and vice versa)."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __eq__(self, other: "ReversedSortKey") -> bool:
+        return self.value == other.value
+
+    def __lt__(self, other: "ReversedSortKey") -> bool:
+        return other.value < self.value
+
+
+# The card attribute used by each function available in the "sort_fn" items of "priorities_per_level"
+SORT_KEY_ATTRIBUTES = {
+    "tag": "priority",
+    "date": "last_activity_datetime",    # Cached max(cdate, max(rdate)), c.f. `Card.update_last_activity_datetime`
+}
+
+
+def make_sort_key(
+        priority_list: List[Dict[str, Any]]
+    ):
+    """Make a composite sort key equivalent to one stable sort per item of `priority_list` (applied in order).
+
+    The last item of `priority_list` is the major sort level and the first item
+    is the minor sort level. Return a (key function, reverse) pair to use with
+    `list.sort`: the criteria sorted in the opposite direction of the major one
+    are wrapped in `ReversedSortKey`."""
+
+    for priority_dict in priority_list:
+        if priority_dict["sort_fn"] not in SORT_KEY_ATTRIBUTES:
+            raise Exception(f'Unknown sort function {priority_dict["sort_fn"]}; available functions are: "tag" or "date"')
+
+    reverse = priority_list[-1]["reverse"]
+    attribute_name_list = [SORT_KEY_ATTRIBUTES[priority_dict["sort_fn"]] for priority_dict in reversed(priority_list)]
+
+    if all(priority_dict["reverse"] == reverse for priority_dict in priority_list):
+        # All the criteria are sorted in the same direction: the key tuple is built by attrgetter (in C)
+        return operator.attrgetter(*attribute_name_list), reverse
+
+    key_fn_list = []
+
+    for priority_dict, attribute_name in zip(reversed(priority_list), attribute_name_list):
+        key_fn = operator.attrgetter(attribute_name)
+        if priority_dict["reverse"] != reverse:
+            key_fn = lambda _card, _key_fn=key_fn : ReversedSortKey(_key_fn(_card))
+        key_fn_list.append(key_fn)
+
+    return (lambda _card : tuple([key_fn(_card) for key_fn in key_fn_list])), reverse
+
+
 def sort_sub_list(
         sub_list: List[Card],
         sub_list_grade: int,
@@ -343,12 +593,7 @@ def sort_sub_list(
 
     priority_list = priorities_per_level[sub_list_grade]
 
-    for priority_dict in priority_list:
-        if priority_dict["sort_fn"] == "tag":
-            sort_fn = lambda _card : _card.priority
-        elif priority_dict["sort_fn"] == "date":
-            sort_fn = lambda _card : max([_card.creation_datetime] + [review.review_datetime for review in _card.consolidation_reviews])
-        else:
-            raise Exception(f'Unknown sort function {priority_dict["sort_fn"]}; available functions are: "tag" or "date"')
-        
-        sub_list.sort(key=sort_fn, reverse=priority_dict["reverse"])
+    if len(priority_list) > 0:
+        # A single sort with a composite key instead of one (stable) sort per criterion
+        sort_fn, reverse = make_sort_key(priority_list)
+        sub_list.sort(key=sort_fn, reverse=reverse)
@@ -0,0 +1,245 @@
+"""Multi-process assessment of consolidation cards.
+
+For very large PKBs the assessment of the cards (grade, priority and
+difficulty of each card) made when a professor is instantiated is CPU-bound.
+This module splits the cards in shards processed by a pool of worker
+processes (`concurrent.futures.ProcessPoolExecutor`):
+
+- the review histories of all the cards are converted once to the columnar
+  representation of `opencal.core.professor.consolidation.batch` and copied
+  in shared memory blocks (`multiprocessing.shared_memory`): workers read the
+  reviews of their shard without copying (nor pickling) them,
+- each worker computes the grades of its shard with `batch.assess_batch`
+  and the priority and difficulty of each card from its tags,
+- the results of the shards are concatenated in the order of the cards so
+  that the professor builds the same per-grade buckets as in a single process.
+"""
+
+import concurrent.futures
+import datetime
+
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from opencal.core.professor.consolidation import batch
+
+DEFAULT_NUM_SHARDS_PER_WORKER = 4       # More shards than workers to balance the load
+
+
+class SharedArray:
+
+    def __init__(self, array: np.ndarray) -> None:
+        """
+        Copy a NumPy array in a new shared memory block.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            The array to share (1D).
+
+        Returns
+        -------
+        None
+        """
+        # Shared memory blocks can't be empty
+        self.shm: shared_memory.SharedMemory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.shape: Tuple[int, ...] = array.shape
+        self.dtype: np.dtype = array.dtype
+        np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)[:] = array
+
+
+    @property
+    def descriptor(self) -> Tuple[str, Tuple[int, ...], str]:
+        """The (name, shape, dtype) of the block, used by worker processes to attach it (c.f. `attach_shared_array`)."""
+        return self.shm.name, self.shape, self.dtype.str
+
+
+    def release(self) -> None:
+        """Free the shared memory block."""
+        self.shm.close()
+        self.shm.unlink()
+
+
+def attach_shared_array(
+        descriptor: Tuple[str, Tuple[int, ...], str]
+    ) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Attach a shared memory block created by `SharedArray` (the block must be closed by the caller once the array is no longer used)."""
+    name, shape, dtype = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def assess_shard(
+        descriptor_list: List[Tuple[str, Tuple[int, ...], str]],
+        card_range: Tuple[int, int],
+        review_range: Tuple[int, int],
+        tags_list: List[List[str]],
+        today: datetime.date,
+        grade_rules: batch.GradeRules,
+        estimate_tags_priority: Callable[[List[str], Dict[str, float]], float],
+        tag_priority_dict: Dict[str, float],
+        estimate_tags_difficulty: Callable[[List[str], Dict[str, float]], float],
+        tag_difficulty_dict: Dict[str, float]
+    ) -> Tuple[np.ndarray, np.ndarray, List[float], List[float]]:
+    """
+    Assess the cards of one shard (this function is run by worker processes).
+
+    Parameters
+    ----------
+    descriptor_list : List[Tuple[str, Tuple[int, ...], str]]
+        The shared creation day, review card index, review day and review result arrays (c.f. `SharedArray.descriptor`).
+    card_range : Tuple[int, int]
+        The (start, stop) indexes of the cards of the shard.
+    review_range : Tuple[int, int]
+        The (start, stop) indexes of the reviews of the shard (reviews are sorted by card index).
+    tags_list : List[List[str]]
+        The tags of each card of the shard.
+    today : datetime.date
+        The current date.
+    grade_rules : batch.GradeRules
+        The special grades of the professor.
+    estimate_tags_priority : Callable[[List[str], Dict[str, float]], float]
+        The function estimating the priority of a card from its tags.
+    tag_priority_dict : Dict[str, float]
+        The priority of each tag.
+    estimate_tags_difficulty : Callable[[List[str], Dict[str, float]], float]
+        The function estimating the difficulty of a card from its tags.
+    tag_difficulty_dict : Dict[str, float]
+        The difficulty of each tag.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, List[float], List[float]]
+        The grade, the grade without today answers, the priority and the difficulty of each card of the shard.
+    """
+    card_start, card_stop = card_range
+    review_start, review_stop = review_range
+
+    shm_list = []
+    array_list = []
+
+    try:
+        for descriptor in descriptor_list:
+            shm, array = attach_shared_array(descriptor)
+            shm_list.append(shm)
+            array_list.append(array)
+
+        creation_day, card_index, review_day, is_right_answer = array_list
+
+        shard_arrays = (
+            creation_day[card_start:card_stop],
+            card_index[review_start:review_stop] - card_start,
+            review_day[review_start:review_stop],
+            is_right_answer[review_start:review_stop]
+        )
+
+        grade_array = batch.assess_batch(*shard_arrays, today, grade_rules)
+        grade_without_today_answers_array = batch.assess_batch(*shard_arrays, today, grade_rules, ignore_today_answers=True)
+    finally:
+        # Views on the shared buffers must be released before closing the blocks
+        array = creation_day = card_index = review_day = is_right_answer = shard_arrays = None
+        array_list.clear()
+        for shm in shm_list:
+            shm.close()
+
+    priority_list = [estimate_tags_priority(tags, tag_priority_dict) for tags in tags_list]
+    difficulty_list = [estimate_tags_difficulty(tags, tag_difficulty_dict) for tags in tags_list]
+
+    return grade_array, grade_without_today_answers_array, priority_list, difficulty_list
+
+
+def assess_card_list(
+        card_list: List[Any],
+        today: datetime.date,
+        grade_rules: batch.GradeRules,
+        estimate_tags_priority: Callable[[List[str], Dict[str, float]], float],
+        tag_priority_dict: Dict[str, float],
+        estimate_tags_difficulty: Callable[[List[str], Dict[str, float]], float],
+        tag_difficulty_dict: Dict[str, float],
+        num_workers: int,
+        num_shards: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, List[float], List[float]]:
+    """
+    Assess all the cards of `card_list` in `num_workers` processes.
+
+    Parameters
+    ----------
+    card_list : List[Any]
+        A list of cards.
+    today : datetime.date
+        The current date.
+    grade_rules : batch.GradeRules
+        The special grades of the professor.
+    estimate_tags_priority : Callable[[List[str], Dict[str, float]], float]
+        The function estimating the priority of a card from its tags (a module-level function, it is sent to the workers).
+    tag_priority_dict : Dict[str, float]
+        The priority of each tag.
+    estimate_tags_difficulty : Callable[[List[str], Dict[str, float]], float]
+        The function estimating the difficulty of a card from its tags (a module-level function, it is sent to the workers).
+    tag_difficulty_dict : Dict[str, float]
+        The difficulty of each tag.
+    num_workers : int
+        The number of worker processes.
+    num_shards : int, optional
+        The number of shards (default is None, i.e. `DEFAULT_NUM_SHARDS_PER_WORKER` shards per worker).
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, List[float], List[float]]
+        The grade, the grade without today answers, the priority and the difficulty of each card (in the same order than `card_list`).
+    """
+    num_cards = len(card_list)
+
+    if num_cards == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), [], []
+
+    if num_shards is None:
+        num_shards = num_workers * DEFAULT_NUM_SHARDS_PER_WORKER
+    num_shards = max(1, min(num_shards, num_cards))
+
+    creation_day, card_index, review_day, is_right_answer = batch.card_list_to_review_arrays(card_list)
+
+    # Sort reviews by card (the sort is stable so the chronological order of each card is kept):
+    # the reviews of each shard are contiguous
+    order = np.argsort(card_index, kind="stable")
+    card_index, review_day, is_right_answer = card_index[order], review_day[order], is_right_answer[order]
+
+    card_bounds = np.linspace(0, num_cards, num_shards + 1).astype(np.int64)
+    review_bounds = np.searchsorted(card_index, card_bounds, side="left")
+
+    shared_array_list = [SharedArray(array) for array in (creation_day, card_index, review_day, is_right_answer)]
+    descriptor_list = [shared_array.descriptor for shared_array in shared_array_list]
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+            future_list = [
+                executor.submit(
+                    assess_shard,
+                    descriptor_list,
+                    (int(card_bounds[shard_index]), int(card_bounds[shard_index + 1])),
+                    (int(review_bounds[shard_index]), int(review_bounds[shard_index + 1])),
+                    [card["tags"] for card in card_list[card_bounds[shard_index]:card_bounds[shard_index + 1]]],
+                    today,
+                    grade_rules,
+                    estimate_tags_priority,
+                    tag_priority_dict,
+                    estimate_tags_difficulty,
+                    tag_difficulty_dict
+                )
+                for shard_index in range(num_shards)
+            ]
+
+            # Merge the results in the order of the shards (i.e. the order of the cards)
+            result_list = [future.result() for future in future_list]
+    finally:
+        for shared_array in shared_array_list:
+            shared_array.release()
+
+    grade_array = np.concatenate([result[0] for result in result_list])
+    grade_without_today_answers_array = np.concatenate([result[1] for result in result_list])
+    priority_list = [priority for result in result_list for priority in result[2]]
+    difficulty_list = [difficulty for result in result_list for difficulty in result[3]]
+
+    return grade_array, grade_without_today_answers_array, priority_list, difficulty_list
@@ -0,0 +1,184 @@
+"""Incremental scheduling state of consolidation cards.
+
+The grade of a card (as computed by the `assess` function of consolidation professors)
+is the result of a fold over the whole review history of the card:
+each review either increments the grade (right answer given after the expected revision date),
+resets it (wrong answer) or leaves it unchanged (premature right answer).
+
+This module keeps the result of this fold in a small `CardSchedule` object
+that can be updated review after review and persisted in the database,
+so that professors don't have to replay the full review history of each card every time they are instantiated.
+"""
+
+import datetime
+import math
+
+from typing import Optional, Union
+
+from opencal.card import Card
+
+
+class CardSchedule:
+    def __init__(
+            self,
+            grade: int,
+            expected_revision_date: datetime.date,
+            last_review_date: Optional[datetime.date] = None,
+            last_review_is_right_answer: Optional[bool] = None,
+            previous_grade: Optional[int] = None,
+            previous_expected_revision_date: Optional[datetime.date] = None
+        ) -> None:
+        """
+        Initialize a CardSchedule instance.
+
+        Parameters
+        ----------
+        grade : int
+            The grade of the card after its last review.
+        expected_revision_date : datetime.date
+            The date from which the card should be reviewed again.
+        last_review_date : datetime.date, optional
+            The date of the last review of the card (default is None, i.e. the card has never been reviewed).
+        last_review_is_right_answer : bool, optional
+            A flag indicating whether the last review was a right answer (default is None).
+        previous_grade : int, optional
+            The grade of the card before the reviews made on `last_review_date`
+            (default is None, which means `grade`).
+        previous_expected_revision_date : datetime.date, optional
+            The expected revision date of the card before the reviews made on `last_review_date`
+            (default is None, which means `expected_revision_date`).
+
+        Returns
+        -------
+        None
+        """
+        self.grade: int = grade
+        self.expected_revision_date: datetime.date = expected_revision_date
+        self.last_review_date: Optional[datetime.date] = last_review_date
+        self.last_review_is_right_answer: Optional[bool] = last_review_is_right_answer
+        self.previous_grade: int = grade if previous_grade is None else previous_grade
+        self.previous_expected_revision_date: datetime.date = expected_revision_date if previous_expected_revision_date is None else previous_expected_revision_date
+
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the CardSchedule instance.
+
+        Returns
+        -------
+        str
+            A string containing the grade, the expected revision date and the last review date.
+        """
+        return f"{self.grade}, {self.expected_revision_date}, {self.last_review_date}"
+
+
+def datetime_to_date(
+        d: Union[datetime.datetime, datetime.date]
+    ) -> datetime.date:
+    '''If the object is an instance of datetime.datetime then convert it to a datetime.datetime.date object.
+
+    If it's already a date object, do nothing.'''
+
+    if isinstance(d, datetime.datetime):
+        d = d.date()
+
+    return d
+
+
+def delta_days(grade: int) -> int:
+    """Return the delta day (time between expectedRevisionDate and rdate) knowing the grade.
+
+    delta = 2^grade.
+    """
+    return int(math.pow(2, grade))
+
+
+def init_schedule(
+        creation_date: Union[datetime.datetime, datetime.date]
+    ) -> CardSchedule:
+    """
+    Make the scheduling state of a card that has never been reviewed.
+
+    Parameters
+    ----------
+    creation_date : Union[datetime.datetime, datetime.date]
+        The creation date of the card.
+
+    Returns
+    -------
+    CardSchedule
+        The initial scheduling state of the card.
+    """
+    creation_date = datetime_to_date(creation_date)
+    return CardSchedule(
+        grade=0,
+        expected_revision_date=creation_date + datetime.timedelta(days=delta_days(0))
+    )
+
+
+def update_schedule(
+        schedule: CardSchedule,
+        review_date: Union[datetime.datetime, datetime.date],
+        is_right_answer: bool
+    ) -> CardSchedule:
+    """
+    Update ("in-place") the scheduling state of a card with a new review.
+
+    Reviews are supposed to be applied in chronological order.
+
+    Parameters
+    ----------
+    schedule : CardSchedule
+        The scheduling state to update.
+    review_date : Union[datetime.datetime, datetime.date]
+        The date of the new review.
+    is_right_answer : bool
+        A flag indicating whether the new review is a right answer.
+
+    Returns
+    -------
+    CardSchedule
+        The updated scheduling state (i.e. `schedule`).
+    """
+    review_date = datetime_to_date(review_date)
+
+    # Keep the state of the card as it was before the first review of the day
+    # (used to compute the grade of a card ignoring today answers)
+    if schedule.last_review_date is None or review_date > schedule.last_review_date:
+        schedule.previous_grade = schedule.grade
+        schedule.previous_expected_revision_date = schedule.expected_revision_date
+
+    if is_right_answer:
+        if review_date >= schedule.expected_revision_date:   # Premature right answers are ignored
+            schedule.grade += 1
+            schedule.expected_revision_date = review_date + datetime.timedelta(days=delta_days(schedule.grade))
+    else:
+        schedule.grade = 0
+        schedule.expected_revision_date = review_date + datetime.timedelta(days=delta_days(schedule.grade))
+
+    schedule.last_review_date = review_date
+    schedule.last_review_is_right_answer = is_right_answer
+
+    return schedule
+
+
+def make_schedule(card: Card) -> CardSchedule:
+    """
+    Compute the scheduling state of a card from its full review history.
+
+    Parameters
+    ----------
+    card : Card
+        The card to schedule. Its consolidation reviews are supposed to be sorted.
+
+    Returns
+    -------
+    CardSchedule
+        The scheduling state of the card after its last review.
+    """
+    schedule = init_schedule(card.creation_datetime)
+
+    for review in card.consolidation_reviews:
+        update_schedule(schedule, review.review_datetime, review.is_right_answer)
+
+    return schedule
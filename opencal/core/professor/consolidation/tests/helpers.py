@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains helpers shared by the unit tests of the consolidation professors.
+"""
+
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+
+import datetime
+import random
+
+from typing import Optional, Sequence
+
+BOGUS_CURRENT_DATE = datetime.date(year=2000, month=1, day=1)
+
+# HELPERS #################################################
+
+def make_random_card(
+        rng: random.Random,
+        card_id: Optional[int] = None,
+        min_age_days: int = 0,
+        include_today_reviews: bool = True,
+        tag_list: Sequence[str] = ()
+    ) -> Card:
+    """
+    Make a card created at most 200 days before `BOGUS_CURRENT_DATE`, with up to 12 sorted random reviews.
+
+    Parameters
+    ----------
+    rng : random.Random
+        The random number generator.
+    card_id : int, optional
+        The ID of the card (default is None).
+    min_age_days : int, optional
+        The minimum number of days between the creation of the card and `BOGUS_CURRENT_DATE` (default is 0).
+    include_today_reviews : bool, optional
+        Whether reviews can be made on `BOGUS_CURRENT_DATE` (default is True).
+    tag_list : Sequence[str], optional
+        The card gets up to 2 tags randomly chosen in this list (default is no tag).
+
+    Returns
+    -------
+    Card
+        The random card.
+    """
+    creation_date = BOGUS_CURRENT_DATE - datetime.timedelta(days=rng.randint(min_age_days, 200))
+
+    max_review_day = (BOGUS_CURRENT_DATE - creation_date).days - (0 if include_today_reviews else 1)
+    review_date_list = sorted(creation_date + datetime.timedelta(days=rng.randint(0, max_review_day)) for _ in range(rng.randint(0, 12)))
+    review_list = [ConsolidationReview(review_datetime=review_date, is_right_answer=rng.random() < 0.7) for review_date in review_date_list]
+
+    return Card(
+        creation_datetime=creation_date,
+        question='foo',
+        answer='bar',
+        tags=rng.sample(list(tag_list), rng.randint(0, min(2, len(tag_list)))),
+        consolidation_reviews=review_list,
+        id=card_id
+    )
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains unit tests for the "opencal.core.professor.consolidation.assess_cache" module.
+"""
+
+from opencal.core.professor.consolidation import doreen
+from opencal.core.professor.consolidation.assess_cache import AssessCache
+from opencal.core.professor.consolidation.tests.helpers import BOGUS_CURRENT_DATE, make_random_card
+from opencal.review import ConsolidationReview
+import opencal.io.connection
+
+from opencal.core.mocks import DateMock
+
+import datetime
+import os
+import random
+import tempfile
+
+# TEST FUNCTIONS ##########################################
+
+def test_assess_cache():
+    DateMock.set_today(BOGUS_CURRENT_DATE)
+    rng = random.Random(0)
+    card_list = [make_random_card(rng, card_id, min_age_days=1, include_today_reviews=False) for card_id in range(1, 101)]
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+
+        cache = AssessCache("doreen", doreen.assess, db_path)
+        for ignore_today_answers in (False, True):
+            assert [cache.assess(card, DateMock, ignore_today_answers) for card in card_list] == [doreen.assess(card, DateMock, ignore_today_answers) for card in card_list]
+        assert cache.num_misses == 200 and cache.num_hits == 0
+
+        assert [cache.assess(card, DateMock) for card in card_list] == [doreen.assess(card, DateMock) for card in card_list]
+        assert cache.num_hits == 100
+        cache.flush()
+
+        # A new cache (e.g. after a restart of the application) reads the grades saved in the database
+        cache = AssessCache("doreen", doreen.assess, db_path)
+        assert [cache.assess(card, DateMock) for card in card_list] == [doreen.assess(card, DateMock) for card in card_list]
+        assert cache.num_disk_hits == 100 and cache.num_misses == 0
+        assert cache.stats()["hit_rate"] == 1.
+
+        # A new review invalidates the cached grade
+        card_list[0].consolidation_reviews.append(ConsolidationReview(review_datetime=BOGUS_CURRENT_DATE, is_right_answer=True))
+        assert cache.assess(card_list[0], DateMock) == doreen.GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER
+        assert cache.num_misses == 1
+
+        # Grades are not reused another day
+        DateMock.set_today(BOGUS_CURRENT_DATE + datetime.timedelta(days=1))
+        assert [cache.assess(card, DateMock) for card in card_list] == [doreen.assess(card, DateMock) for card in card_list]
+        assert cache.num_misses == 101
+
+        opencal.io.connection.close_connection(db_path)
+
+    DateMock.set_today(BOGUS_CURRENT_DATE)
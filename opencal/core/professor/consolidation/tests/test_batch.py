@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains unit tests for the "opencal.core.professor.consolidation.batch" module.
+
+The grades computed by the vectorized `assess_batch` functions are compared to
+the ones computed by the scalar `assess` functions of each professor.
+"""
+
+from opencal.card import Card
+from opencal.core.professor.consolidation import alice, berenice, celia, doreen
+from opencal.core.professor.consolidation.tests import test_alice, test_berenice, test_celia, test_doreen
+from opencal.review import ConsolidationReview
+
+from opencal.core.mocks import DateMock
+
+from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
+
+import datetime
+import random
+
+BOGUS_CURRENT_DATE = datetime.date(year=2000, month=1, day=1)
+
+# HELPERS #################################################
+
+def fixture_card_list(test_module):
+    """Return the card fixtures (dictionaries) defined in a test module, except the ones having unsorted reviews."""
+    card_list = []
+    for name, value in vars(test_module).items():
+        if name.startswith("CARD_") and isinstance(value, dict) and "cdate" in value:
+            review_list = value.get("reviews", [])
+            if all(review_list[i]["rdate"] <= review_list[i+1]["rdate"] for i in range(len(review_list)-1)):
+                card_list.append(value)
+    return card_list
+
+
+def dict_to_card(card_dict):
+    return Card(
+        creation_datetime=card_dict["cdate"],
+        question=card_dict["question"],
+        answer=card_dict["answer"],
+        is_hidden=card_dict["hidden"],
+        tags=card_dict["tags"],
+        consolidation_reviews=[ConsolidationReview(review["rdate"], review["result"] == RIGHT_ANSWER_STR) for review in card_dict.get("reviews", [])]
+    )
+
+
+def random_card_list(seed, num_cards=2000):
+    rng = random.Random(seed)
+    card_list = []
+
+    for _ in range(num_cards):
+        creation_date = BOGUS_CURRENT_DATE - datetime.timedelta(days=rng.randint(0, 300))
+        max_day = (BOGUS_CURRENT_DATE - creation_date).days + 2      # Some reviews are in the future
+        review_date_list = sorted(creation_date + datetime.timedelta(days=rng.randint(0, max_day)) for _ in range(rng.randint(0, 15)))
+
+        card_list.append({
+            "cdate": creation_date,
+            "reviews": [{"rdate": review_date, "result": RIGHT_ANSWER_STR if rng.random() < 0.7 else WRONG_ANSWER_STR} for review_date in review_date_list],
+            "tags": [],
+            "hidden": False,
+            "question": "foo",
+            "answer": "bar"
+        })
+
+    return card_list
+
+
+def check_professor(module, card_list, ignore_today_answers_list=(False, True)):
+    DateMock.set_today(BOGUS_CURRENT_DATE)
+
+    for ignore_today_answers in ignore_today_answers_list:
+        kwargs = {"ignore_today_answers": True} if ignore_today_answers else {}
+
+        expected_grade_list = [module.assess(card, DateMock, **kwargs) for card in card_list]
+        grade_list = module.assess_batch(card_list, DateMock, **kwargs).tolist()
+
+        assert grade_list == expected_grade_list
+
+# TEST FUNCTIONS ##########################################
+
+def test_empty_card_list():
+    assert doreen.assess_batch([], DateMock).tolist() == []
+
+def test_alice_fixtures():
+    check_professor(alice, fixture_card_list(test_alice), ignore_today_answers_list=(False,))
+
+def test_berenice_fixtures():
+    check_professor(berenice, fixture_card_list(test_berenice))
+
+def test_celia_fixtures():
+    check_professor(celia, fixture_card_list(test_celia))
+
+def test_doreen_fixtures():
+    check_professor(doreen, [dict_to_card(card) for card in fixture_card_list(test_doreen)])
+
+def test_alice_random_histories():
+    check_professor(alice, random_card_list(seed=1), ignore_today_answers_list=(False,))
+
+def test_berenice_random_histories():
+    check_professor(berenice, random_card_list(seed=2))
+
+def test_celia_random_histories():
+    check_professor(celia, random_card_list(seed=3))
+
+def test_doreen_random_histories():
+    check_professor(doreen, [dict_to_card(card) for card in random_card_list(seed=4)])
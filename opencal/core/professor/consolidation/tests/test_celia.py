@@ -11,9 +11,11 @@ from opencal.core.professor.consolidation import celia
 from opencal.core.mocks import DateMock
 
 from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
+from opencal.tag_table import CardTagTable
 
 import copy
 import datetime
+import random
 import pytest
 
 BOGUS_CURRENT_DATE = datetime.date(year=2000, month=1, day=1)
@@ -903,6 +905,14 @@ def test_empty_card_list():
     prof = celia.ProfessorCelia(EMPTY_CARD_LIST)
     assert prof.current_card == None
 
+def test_card_tag_table_size_mismatch():
+    """Check that the constructor rejects a tag table that doesn't match the card list."""
+    card_list = [copy.deepcopy(CARD_BASIC_LEVEL0_1), copy.deepcopy(CARD_BASIC_LEVEL0_2)]
+    card_tag_table = CardTagTable.from_card_list(card_list[:1])
+
+    with pytest.raises(ValueError):
+        celia.ProfessorCelia(card_list, date_mock=DateMock, card_tag_table=card_tag_table)
+
 def test_one_card_skip():
     """Test `professor.current_card`, `professor._switch_grade_loop()` and `professor.current_card_reply()`.
 
@@ -1439,3 +1449,37 @@ def test_several_cards():
 
     current_card = prof.current_card
     assert current_card == None
+
+
+def test_session_budget():
+    """Check that the session budget mode presents the cards in the same order as the default mode."""
+    rng = random.Random(0)
+    card_list = []
+    for card_index in range(60):
+        cdate = BOGUS_CURRENT_DATE - datetime.timedelta(days=rng.randrange(1, 30))
+        card_list.append({
+            "cdate": cdate,
+            "reviews": [{"rdate": cdate + datetime.timedelta(days=1), "result": RIGHT_ANSWER_STR}] if card_index % 2 == 0 else [],
+            "tags": [rng.choice(["low", "high", "default"])],
+            "hidden": False,
+            "question": str(card_index),
+            "answer": "bar"
+        })
+
+    tag_priorities = {"low": -1, "high": 2}
+    answer_list = [rng.choice([RIGHT_ANSWER_STR, WRONG_ANSWER_STR, "skip"]) for _ in range(200)]
+
+    question_list_per_mode = []
+    for session_budget in (None, 3):
+        prof = celia.ProfessorCelia(copy.deepcopy(card_list), date_mock=DateMock, max_cards_per_grade=10,
+                                    tag_priorities=tag_priorities, session_budget=session_budget)
+        question_list = []
+        for answer in answer_list:
+            if prof.current_card is None:
+                break
+            question_list.append(prof.current_card["question"])
+            prof.current_card_reply(answer=answer)
+        question_list_per_mode.append(question_list)
+
+    assert len(question_list_per_mode[0]) > 3
+    assert question_list_per_mode[0] == question_list_per_mode[1]
@@ -11,6 +11,7 @@ from opencal.core.professor.consolidation import doreen
 from opencal.core.mocks import DateMock
 
 from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
+from opencal.review import ConsolidationReview
 
 import copy
 import datetime
@@ -900,6 +901,39 @@ def test_sort_sub_list():
     assert sub_list == [CARD_LOW_PRIORITY_C15_R2, CARD_HIGH_PRIORITY_C10_R5, CARD_DEFAULT_PRIORITY_C9_R6]
 
 
+
+def test_sort_sub_list_composite_key():
+    """Check that the single composite-key sort gives the same order as one stable sort per criterion."""
+    creation_datetime = datetime.datetime(2000, 1, 1)
+    card_list = []
+    for card_index in range(40):
+        card = Card(creation_datetime=creation_datetime, question=str(card_index),
+                    consolidation_reviews=[ConsolidationReview(creation_datetime + datetime.timedelta(days=card_index % 4), False)])
+        card.priority = card_index % 3
+        card_list.append(card)
+
+    # The last activity date is cached when the card is created
+    assert card_list[5].last_activity_datetime == datetime.datetime(2000, 1, 2)
+
+    for reverse_tag in (True, False):
+        for reverse_date in (True, False):
+            priority_list = [
+                {'sort_fn': 'tag', 'reverse': reverse_tag},
+                {'sort_fn': 'date', 'reverse': reverse_date}
+            ]
+
+            expected_list = list(card_list)
+            expected_list.sort(key=lambda _card : _card.priority, reverse=reverse_tag)
+            expected_list.sort(key=lambda _card : max([_card.creation_datetime] + [review.review_datetime for review in _card.consolidation_reviews]), reverse=reverse_date)
+
+            sub_list = list(card_list)
+            doreen.sort_sub_list(sub_list, 0, {}, priorities_per_level={0: priority_list})
+            assert sub_list == expected_list
+
+    with pytest.raises(Exception):
+        doreen.sort_sub_list(list(card_list), 0, {}, priorities_per_level={0: [{'sort_fn': 'foo', 'reverse': True}]})
+
+
 ###############################################################################
 # TEST THE PROFESSOR'S CONSTRUCTOR,                                           #
 # PLUS THE "current_card" AND "current_card_reply" METHODS                    #
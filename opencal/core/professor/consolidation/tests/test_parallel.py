@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains unit tests for the "opencal.core.professor.consolidation.parallel" module.
+"""
+
+from opencal.core.professor.consolidation import doreen, parallel
+from opencal.core.professor.consolidation.tests.helpers import BOGUS_CURRENT_DATE, make_random_card
+
+from opencal.core.mocks import DateMock
+from opencal.tag_table import CardTagTable
+
+import random
+
+# TEST FUNCTIONS ##########################################
+
+def test_assess_card_list():
+    DateMock.set_today(BOGUS_CURRENT_DATE)
+
+    rng = random.Random(0)
+    card_list = [make_random_card(rng, tag_list=['easy', 'hard', 'important', 'todo']) for _ in range(500)]
+
+    tag_priority_dict = {'important': 3, 'todo': 0.5}
+    tag_difficulty_dict = {'easy': 0.5, 'hard': 2.}
+
+    grade_array, grade_without_today_answers_array, priority_list, difficulty_list = parallel.assess_card_list(
+        card_list, BOGUS_CURRENT_DATE, doreen.BATCH_GRADE_RULES,
+        doreen.estimate_tags_priority, tag_priority_dict,
+        doreen.estimate_tags_difficulty, tag_difficulty_dict,
+        num_workers=2, num_shards=7
+    )
+
+    assert grade_array.tolist() == [doreen.assess(card, DateMock) for card in card_list]
+    assert grade_without_today_answers_array.tolist() == [doreen.assess(card, DateMock, ignore_today_answers=True) for card in card_list]
+    assert priority_list == [doreen.estimate_card_priority(card, tag_priority_dict) for card in card_list]
+    assert difficulty_list == [doreen.estimate_card_difficulty(card, tag_difficulty_dict) for card in card_list]
+
+
+def test_assess_empty_card_list():
+    grade_array, grade_without_today_answers_array, priority_list, difficulty_list = parallel.assess_card_list(
+        [], BOGUS_CURRENT_DATE, doreen.BATCH_GRADE_RULES,
+        doreen.estimate_tags_priority, {},
+        doreen.estimate_tags_difficulty, {},
+        num_workers=2
+    )
+
+    assert len(grade_array) == len(grade_without_today_answers_array) == len(priority_list) == len(difficulty_list) == 0
+
+
+def test_doreen_parallel_card_tag_table(monkeypatch):
+    """Check that Doreen uses the given tag table when the cards are assessed in parallel."""
+    DateMock.set_today(BOGUS_CURRENT_DATE)
+    monkeypatch.setattr(doreen, "MIN_CARDS_PER_WORKER", 1)
+
+    rng = random.Random(0)
+    card_list = [make_random_card(rng, card_id=card_id, tag_list=['easy', 'hard']) for card_id in range(50)]
+
+    # The table doesn't match the tags of the cards: only its tags must be used
+    card_tag_table = CardTagTable.from_card_list([{'tags': ['important']}] * len(card_list))
+
+    doreen.ProfessorDoreen(card_list, date_mock=DateMock, tag_priorities={'important': 3}, num_workers=2, card_tag_table=card_tag_table)
+
+    assert all(card.priority == 3 for card in card_list if not card.is_hidden)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains unit tests for the "opencal.core.professor.consolidation.schedule" module.
+"""
+
+from opencal.card import Card
+from opencal.core.professor.consolidation import doreen
+from opencal.core.professor.consolidation.schedule import make_schedule
+from opencal.core.professor.consolidation.tests.helpers import BOGUS_CURRENT_DATE, make_random_card
+from opencal.review import ConsolidationReview
+
+from opencal.core.mocks import DateMock
+import opencal
+import opencal.config
+import opencal.io.connection
+import opencal.io.sqlitedb
+
+import datetime
+import os
+import random
+import tempfile
+import yaml
+
+# TEST FUNCTIONS ##########################################
+
+def test_assess_schedule_card_without_review():
+    DateMock.set_today(BOGUS_CURRENT_DATE)
+
+    card = Card(creation_datetime=BOGUS_CURRENT_DATE - datetime.timedelta(days=1), question='foo')
+    assert doreen.assess_schedule(make_schedule(card), DateMock) == doreen.assess(card, DateMock) == 0
+
+    card = Card(creation_datetime=BOGUS_CURRENT_DATE, question='foo')
+    assert doreen.assess_schedule(make_schedule(card), DateMock) == doreen.GRADE_DONT_REVIEW_THIS_CARD_TODAY
+
+def test_assess_schedule_card_reviewed_today():
+    DateMock.set_today(BOGUS_CURRENT_DATE)
+
+    card = Card(
+        creation_datetime=BOGUS_CURRENT_DATE - datetime.timedelta(days=3),
+        question='foo',
+        consolidation_reviews=[
+            ConsolidationReview(review_datetime=BOGUS_CURRENT_DATE - datetime.timedelta(days=2), is_right_answer=True),
+            ConsolidationReview(review_datetime=BOGUS_CURRENT_DATE, is_right_answer=True),
+        ]
+    )
+    schedule = make_schedule(card)
+
+    assert doreen.assess_schedule(schedule, DateMock) == doreen.GRADE_REVIEWED_TODAY_WITH_RIGHT_ANSWER
+    assert doreen.assess_schedule(schedule, DateMock, ignore_today_answers=True) == 1
+
+def test_assess_schedule_future_reviews():
+    DateMock.set_today(BOGUS_CURRENT_DATE)
+
+    card = Card(
+        creation_datetime=BOGUS_CURRENT_DATE - datetime.timedelta(days=3),
+        question='foo',
+        consolidation_reviews=[
+            ConsolidationReview(review_datetime=BOGUS_CURRENT_DATE + datetime.timedelta(days=1), is_right_answer=True),
+        ]
+    )
+
+    assert doreen.assess_schedule(make_schedule(card), DateMock) is None
+
+def test_assess_schedule_random_histories():
+    DateMock.set_today(BOGUS_CURRENT_DATE)
+    rng = random.Random(0)
+
+    for _ in range(2000):
+        card = make_random_card(rng)
+        schedule = make_schedule(card)
+
+        assert doreen.assess_schedule(schedule, DateMock) == doreen.assess(card, DateMock)
+        assert doreen.assess_schedule(schedule, DateMock, ignore_today_answers=True) == doreen.assess(card, DateMock, ignore_today_answers=True)
+
+
+def test_card_schedule_follows_saved_reviews(monkeypatch):
+    DateMock.set_today(BOGUS_CURRENT_DATE)
+
+    def make_professor(card_list):
+        due_card_schedules, scheduled_card_ids = opencal.io.sqlitedb.load_card_schedules(db_path, DateMock.today())
+        return doreen.ProfessorDoreen(card_list, date_mock=DateMock, due_card_schedules=due_card_schedules, scheduled_card_ids=scheduled_card_ids)
+
+    def reviewed_card_ids(professor):
+        card_id_list = []
+        while professor.current_card is not None:
+            card_id_list.append(professor.current_card.id)
+            professor.current_card_reply("skip")
+        return sorted(card_id_list)
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+
+        cfg = yaml.safe_load(opencal.config.DEFAULT_CONFIG_STR)
+        cfg["opencal"]["db_path"] = db_path
+        monkeypatch.setattr(opencal, "cfg", cfg, raising=False)
+
+        card_list = [Card(creation_datetime=BOGUS_CURRENT_DATE - datetime.timedelta(days=10), question=f"Question {card_index}") for card_index in range(3)]
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        reviewed_card_list = opencal.io.sqlitedb.load_pkb(db_path)
+        professor = make_professor(reviewed_card_list)
+        card = professor.current_card
+        professor.current_card_reply("bad")
+        professor.con.flush()
+
+        # The review has not been saved: the card is still due
+        card_list = opencal.io.sqlitedb.load_pkb(db_path)
+        assert reviewed_card_ids(make_professor(card_list)) == [0, 1, 2]
+
+        # The review and the schedule are saved together
+        opencal.io.sqlitedb.save_changes(reviewed_card_list, db_path)
+        card_list = opencal.io.sqlitedb.load_pkb(db_path)
+        assert reviewed_card_ids(make_professor(card_list)) == sorted({0, 1, 2} - {card.id})
+
+        opencal.io.connection.close_connection(db_path)
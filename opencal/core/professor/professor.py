@@ -3,6 +3,7 @@ from typing import Optional
 import warnings
 
 import opencal
+from opencal.io.connection import DatabaseConnection, get_connection, DEFAULT_COMMIT_BATCH_SIZE, DEFAULT_MAX_COMMIT_DELAY_S
 from opencal.io.sqlitedb import ACQUISITION_REVIEW_TABLE_NAME
 
 class AbstractProfessor:
@@ -13,11 +14,17 @@ class AbstractProfessor:
         self.opencal_db_path: str = opencal.cfg['opencal']['db_path']
         self.opencal_db_path = opencal.path.expand_path(self.opencal_db_path)
 
-        self.con: sqlite3.Connection = sqlite3.connect(self.opencal_db_path)
+        # All professors share the same long-lived connection (c.f. opencal.io.connection)
+        self.con: DatabaseConnection = get_connection(
+            self.opencal_db_path,
+            commit_batch_size=opencal.cfg['opencal'].get('sqlite_commit_batch_size', DEFAULT_COMMIT_BATCH_SIZE),
+            max_commit_delay_s=opencal.cfg['opencal'].get('sqlite_max_commit_delay_s', DEFAULT_MAX_COMMIT_DELAY_S)
+        )
         self.cur: sqlite3.Cursor = self.con.cursor()
     
     def __del__(self):
-        self.con.close()
+        # The connection is shared: only commit pending writes (it is closed when the application exits)
+        self.con.flush()
 
     # ANSWER CALLBACK #################
 
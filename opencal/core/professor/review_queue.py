@@ -0,0 +1,384 @@
+"""Queues of cards to review shared by professors.
+
+Professors used to store the cards to review in Python lists and to pick the
+current card with `list.pop(0)`, which is O(n) per answer (all the other
+cards are shifted).
+
+- `ReviewQueue` is a FIFO queue based on `collections.deque`: picking the
+  current card (`pop`) and putting it back at the end of the queue (`requeue`)
+  are O(1).
+- `PriorityReviewQueue` is a priority queue based on `heapq`: cards are
+  inserted with a priority (`push`, O(log n)) and the card with the smallest
+  priority is picked first (`pop`, O(log n)); cards with the same priority are
+  picked in insertion order.
+- `TopKReviewQueue` is a `ReviewQueue` sorted lazily: only the first k items
+  (in sort order) are selected with `heapq.nsmallest`/`heapq.nlargest` and
+  the next ones are selected when they are needed, which reduces the cost of
+  a sort from O(n log n) to O(n log k) when only a few items are picked.
+- `GradeBuckets` groups the cards to review by grade and keeps a heap of the
+  grades: the smallest grade is found in O(log g) (g = number of grades)
+  instead of sorting all the grades at each switch.
+"""
+
+import collections
+import heapq
+import itertools
+import random
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+class ReviewQueue:
+
+    __slots__ = ("_deque",)
+
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        """
+        Initialize a ReviewQueue instance.
+
+        Parameters
+        ----------
+        items : Iterable[Any], optional
+            The initial items of the queue, the first one is picked first (default is an empty queue).
+
+        Returns
+        -------
+        None
+        """
+        self._deque: collections.deque = collections.deque(items)
+
+
+    def __len__(self) -> int:
+        return len(self._deque)
+
+
+    def __bool__(self) -> bool:
+        return len(self._deque) > 0
+
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._deque)
+
+
+    def __getitem__(self, index: int) -> Any:
+        # O(1) for the first and the last items
+        return self._deque[index]
+
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ReviewQueue):
+            return self._deque == other._deque
+        return list(self._deque) == other
+
+
+    def __repr__(self) -> str:
+        return f"ReviewQueue({list(self._deque)!r})"
+
+
+    def peek(self) -> Optional[Any]:
+        """Return the first item of the queue (None if the queue is empty) without removing it."""
+        return self._deque[0] if len(self._deque) > 0 else None
+
+
+    def pop(self) -> Any:
+        """Remove and return the first item of the queue (O(1))."""
+        return self._deque.popleft()
+
+
+    def push(self, item: Any) -> None:
+        """Add an item at the end of the queue (O(1))."""
+        self._deque.append(item)
+
+
+    # An item put back in the queue is added at the end of the queue
+    requeue = push
+    append = push
+
+
+    def push_front(self, item: Any) -> None:
+        """Add an item at the beginning of the queue (O(1)), i.e. it will be picked next."""
+        self._deque.appendleft(item)
+
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """Add items at the end of the queue."""
+        self._deque.extend(items)
+
+
+    def clear(self) -> None:
+        """Remove all the items of the queue."""
+        self._deque.clear()
+
+
+    def sort(self, key: Optional[Callable[[Any], Any]] = None, reverse: bool = False) -> None:
+        """Sort the queue in place, like `list.sort` (the sort is stable)."""
+        item_list = list(self._deque)
+        item_list.sort(key=key, reverse=reverse)
+        self._deque = collections.deque(item_list)
+
+
+    def shuffle(self, rng: Optional[random.Random] = None) -> None:
+        """Shuffle the queue in place, like `random.shuffle`."""
+        item_list = list(self._deque)
+        (random if rng is None else rng).shuffle(item_list)
+        self._deque = collections.deque(item_list)
+
+
+class TopKReviewQueue(ReviewQueue):
+
+    __slots__ = ("_pending_list", "_key", "_reverse", "_batch_size")
+
+    def __init__(self, items: Iterable[Any] = (), batch_size: int = 10) -> None:
+        """
+        Initialize a TopKReviewQueue instance.
+
+        Items are kept in a pending list until they are needed: `sort` only
+        records the sort key and the first `batch_size` items (in sort order)
+        are selected when the queue is read. The next `batch_size` items are
+        selected when the selected ones have all been picked. The order of the
+        items is the same as with `ReviewQueue` (the selection is stable).
+
+        Parameters
+        ----------
+        items : Iterable[Any], optional
+            The initial items of the queue (default is an empty queue).
+        batch_size : int, optional
+            The number of items selected (and sorted) at once (default is 10).
+
+        Returns
+        -------
+        None
+        """
+        super().__init__()
+        if batch_size < 1:
+            raise ValueError(f"Invalid batch size: {batch_size}")
+        self._pending_list: List[Any] = list(items)
+        self._key: Optional[Callable[[Any], Any]] = None
+        self._reverse: bool = False
+        self._batch_size: int = batch_size
+
+
+    def _select_next_items(self) -> None:
+        """Move the next `batch_size` items (in sort order) of the pending list to the queue, in O(n log k)."""
+        if len(self._deque) > 0 or len(self._pending_list) == 0:
+            return
+
+        if len(self._pending_list) <= self._batch_size:
+            item_list = self._pending_list
+            if self._key is not None:
+                item_list.sort(key=self._key, reverse=self._reverse)
+            self._pending_list = []
+        else:
+            if self._key is None:
+                item_list = self._pending_list[:self._batch_size]
+                del self._pending_list[:self._batch_size]
+            else:
+                # Like sorted(...)[:k], nsmallest and nlargest are stable
+                select = heapq.nlargest if self._reverse else heapq.nsmallest
+                item_list = select(self._batch_size, self._pending_list, key=self._key)
+                selected_id_set = {id(item) for item in item_list}
+                self._pending_list = [item for item in self._pending_list if id(item) not in selected_id_set]
+
+        self._deque.extend(item_list)
+
+
+    def __len__(self) -> int:
+        return len(self._deque) + len(self._pending_list)
+
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over all the items in queue order (the pending items are sorted but not selected)."""
+        pending_list = self._pending_list if self._key is None else sorted(self._pending_list, key=self._key, reverse=self._reverse)
+        return itertools.chain(self._deque, pending_list)
+
+
+    def __getitem__(self, index: int) -> Any:
+        if index == 0:
+            self._select_next_items()
+            return self._deque[0]
+        return list(self)[index]
+
+
+    def __eq__(self, other: Any) -> bool:
+        return list(self) == list(other)
+
+
+    def __repr__(self) -> str:
+        return f"TopKReviewQueue({list(self)!r})"
+
+
+    def peek(self) -> Optional[Any]:
+        """Return the first item of the queue (None if the queue is empty) without removing it."""
+        self._select_next_items()
+        return super().peek()
+
+
+    def pop(self) -> Any:
+        """Remove and return the first item of the queue (O(1) except when the next items are selected)."""
+        self._select_next_items()
+        return super().pop()
+
+
+    def push(self, item: Any) -> None:
+        """Add an item at the end of the queue (the item is sorted with the pending items, if any)."""
+        if len(self._pending_list) > 0:
+            self._pending_list.append(item)
+        else:
+            self._deque.append(item)
+
+
+    requeue = push
+    append = push
+
+
+    def push_front(self, item: Any) -> None:
+        """Add an item at the beginning of the queue (O(1)), i.e. it will be picked next."""
+        self._deque.appendleft(item)
+
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """Add items at the end of the queue (the items are sorted with the pending items, if any)."""
+        for item in items:
+            self.push(item)
+
+
+    def clear(self) -> None:
+        """Remove all the items of the queue."""
+        self._deque.clear()
+        self._pending_list.clear()
+
+
+    def sort(self, key: Optional[Callable[[Any], Any]] = None, reverse: bool = False) -> None:
+        """Sort the queue lazily, like `list.sort` (the sort is stable): the items are selected in this order when they are needed."""
+        if self._key is not None:
+            # Apply the previous sort so that the new one is stable with respect to it
+            self._pending_list.sort(key=self._key, reverse=self._reverse)
+        self._pending_list[0:0] = self._deque
+        self._deque.clear()
+        self._key = (lambda item: item) if key is None else key
+        self._reverse = reverse
+
+
+    def shuffle(self, rng: Optional[random.Random] = None) -> None:
+        """Shuffle the queue in place, like `random.shuffle`."""
+        item_list = list(self)
+        (random if rng is None else rng).shuffle(item_list)
+        self._deque.clear()
+        self._pending_list = item_list
+        self._key = None
+
+
+class PriorityReviewQueue:
+
+    __slots__ = ("_heap", "_counter")
+
+    def __init__(self, items: Iterable[Tuple[Any, Any]] = ()) -> None:
+        """
+        Initialize a PriorityReviewQueue instance.
+
+        Parameters
+        ----------
+        items : Iterable[Tuple[Any, Any]], optional
+            The initial (priority, item) pairs of the queue (default is an empty queue).
+
+        Returns
+        -------
+        None
+        """
+        # Heap of (priority, insertion counter, item) entries: the counter makes
+        # the order stable and avoids comparing the items themselves
+        self._counter: Iterator[int] = itertools.count()
+        self._heap: List[Tuple[Any, int, Any]] = [(priority, next(self._counter), item) for priority, item in items]
+        heapq.heapify(self._heap)
+
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+    def __bool__(self) -> bool:
+        return len(self._heap) > 0
+
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the items in priority order (without removing them)."""
+        return (item for _, _, item in sorted(self._heap))
+
+
+    def __repr__(self) -> str:
+        return f"PriorityReviewQueue({[(priority, item) for priority, _, item in sorted(self._heap)]!r})"
+
+
+    def peek(self) -> Optional[Any]:
+        """Return the item with the smallest priority (None if the queue is empty) without removing it."""
+        return self._heap[0][2] if len(self._heap) > 0 else None
+
+
+    def peek_priority(self) -> Optional[Any]:
+        """Return the smallest priority of the queue (None if the queue is empty)."""
+        return self._heap[0][0] if len(self._heap) > 0 else None
+
+
+    def pop(self) -> Any:
+        """Remove and return the item with the smallest priority (O(log n))."""
+        return heapq.heappop(self._heap)[2]
+
+
+    def push(self, item: Any, priority: Any) -> None:
+        """Insert an item with the given priority (O(log n))."""
+        heapq.heappush(self._heap, (priority, next(self._counter), item))
+
+
+    def clear(self) -> None:
+        """Remove all the items of the queue."""
+        self._heap.clear()
+
+
+class GradeBuckets(dict):
+    """
+    A dictionary of card lists ("buckets") indexed by grade, with a heap of the grades.
+
+    Buckets are plain (unsorted) lists: professors sort a bucket only when it
+    becomes the current one. Grades are pushed in the heap when a bucket is
+    added with `d[grade] = bucket` or `add` (`setdefault` and `update` are not
+    tracked); grades removed with `pop` or `del` are lazily dropped from the
+    heap.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._grade_heap: List[int] = []
+
+
+    def __setitem__(self, grade: int, bucket: List[Any]) -> None:
+        if grade not in self:
+            heapq.heappush(self._grade_heap, grade)
+        super().__setitem__(grade, bucket)
+
+
+    def add(self, grade: int, card: Any) -> None:
+        """Add a card to the bucket of its grade (the bucket is created if needed)."""
+        bucket = self.get(grade)
+        if bucket is None:
+            bucket = []
+            self[grade] = bucket
+        bucket.append(card)
+
+
+    def min_grade(self) -> Optional[int]:
+        """Return the smallest grade having a bucket (None if there is no bucket), in O(log g)."""
+        while len(self._grade_heap) > 0 and self._grade_heap[0] not in self:
+            heapq.heappop(self._grade_heap)     # Stale grade (its bucket has been removed)
+        return self._grade_heap[0] if len(self._grade_heap) > 0 else None
+
+
+    def pop_min(self) -> Tuple[int, List[Any]]:
+        """Remove and return the smallest grade and its bucket, in O(log g)."""
+        grade = self.min_grade()
+        if grade is None:
+            raise KeyError("pop_min(): no bucket")
+        heapq.heappop(self._grade_heap)
+        return grade, super().pop(grade)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains unit tests for the "opencal.core.professor.review_queue" module.
+"""
+
+from opencal.core.professor.review_queue import GradeBuckets, PriorityReviewQueue, ReviewQueue, TopKReviewQueue
+
+import random
+
+# TEST FUNCTIONS ##############################################################
+
+def test_review_queue():
+    queue = ReviewQueue([1, 2, 3])
+
+    assert len(queue) == 3
+    assert queue.peek() == 1
+    assert queue[0] == 1 and queue[-1] == 3
+
+    assert queue.pop() == 1
+    queue.requeue(1)
+    assert queue == [2, 3, 1]
+
+    queue.push_front(0)
+    assert queue.pop() == 0
+
+    queue.sort(key=lambda item: -item)
+    assert queue == [3, 2, 1]
+
+    queue.clear()
+    assert len(queue) == 0 and not queue
+    assert queue.peek() is None
+
+
+def test_review_queue_shuffle():
+    queue = ReviewQueue(range(100))
+    queue.shuffle(random.Random(0))
+
+    assert sorted(queue) == list(range(100))
+    assert list(queue) != list(range(100))
+
+
+
+def test_top_k_review_queue():
+    rng = random.Random(0)
+    item_list = [(rng.randrange(5), index) for index in range(50)]
+
+    for reverse in (False, True):
+        expected_queue = ReviewQueue(item_list)
+        queue = TopKReviewQueue(item_list, batch_size=4)
+
+        # Sort on the first item only to check that the selection is stable
+        for key in (lambda item: item[1] % 7, lambda item: item[0]):
+            expected_queue.sort(key=key, reverse=reverse)
+            queue.sort(key=key, reverse=reverse)
+
+        assert len(queue) == 50
+        assert queue == expected_queue
+
+        popped_list = []
+        while queue:
+            assert queue.peek() == expected_queue.peek()
+            popped_list.append(queue.pop())
+            expected_queue.pop()
+
+        assert popped_list == sorted(popped_list, key=lambda item: item[0], reverse=reverse)
+        assert queue.peek() is None
+
+def test_priority_review_queue():
+    queue = PriorityReviewQueue([(2, "b"), (1, "a1")])
+    queue.push("c", 3)
+    queue.push("a2", 1)     # Same priority than "a1": picked after it
+
+    assert len(queue) == 4
+    assert queue.peek() == "a1" and queue.peek_priority() == 1
+    assert list(queue) == ["a1", "a2", "b", "c"]
+    assert [queue.pop() for _ in range(4)] == ["a1", "a2", "b", "c"]
+    assert queue.peek() is None and queue.peek_priority() is None
+
+
+def test_grade_buckets():
+    buckets = GradeBuckets()
+    for grade, card in [(3, "c"), (0, "a1"), (5, "d"), (0, "a2")]:
+        buckets.add(grade, card)
+
+    assert buckets[0] == ["a1", "a2"]
+    assert buckets.min_grade() == 0
+
+    assert buckets.pop_min() == (0, ["a1", "a2"])
+
+    # A bucket removed as a dictionary item is ignored by the heap of grades
+    del buckets[3]
+    assert buckets.min_grade() == 5
+
+    buckets[1] = ["b"]
+    assert buckets.pop_min() == (1, ["b"])
+    assert buckets.pop_min() == (5, ["d"])
+    assert buckets.min_grade() is None and len(buckets) == 0
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains unit tests for the "opencal.core.data" module.
+"""
+
+from opencal.card import Card
+from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR, card_list_to_dataframes
+from opencal.review import ConsolidationReview
+
+import datetime
+
+# TEST FUNCTIONS ##############################################################
+
+def test_card_list_to_dataframes():
+    card_list = [
+        Card(datetime.datetime(2020, 1, 1), "Question 1", "Answer 1", tags=["foo"], consolidation_reviews=[
+            ConsolidationReview(datetime.datetime(2020, 1, 2), True),
+            ConsolidationReview(datetime.datetime(2020, 1, 4), False)
+        ]),
+        Card(datetime.datetime(2020, 1, 2), "Question 2", "Answer 2", is_hidden=True),
+        {
+            "cdate": datetime.datetime(2020, 1, 3),
+            "hidden": False,
+            "question": "Question 3",
+            "answer": "Answer 3",
+            "tags": [],
+            "reviews": [{"rdate": datetime.datetime(2020, 1, 5), "result": RIGHT_ANSWER_STR}]
+        }
+    ]
+
+    card_df, review_df = card_list_to_dataframes(card_list)
+
+    assert list(card_df.columns) == ["cdate", "hidden"]
+    assert card_df["cdate"].tolist() == [datetime.datetime(2020, 1, 1), datetime.datetime(2020, 1, 2), datetime.datetime(2020, 1, 3)]
+    assert card_df["hidden"].tolist() == [False, True, False]
+
+    assert list(review_df.columns) == ["rdate", "result", "card_id"]
+    assert review_df["rdate"].tolist() == [datetime.datetime(2020, 1, 2), datetime.datetime(2020, 1, 4), datetime.datetime(2020, 1, 5)]
+    assert review_df["result"].tolist() == [RIGHT_ANSWER_STR, WRONG_ANSWER_STR, RIGHT_ANSWER_STR]
+    assert review_df["card_id"].tolist() == [0, 0, 2]
+
+    # Cards are not modified
+    assert card_list[0].question == "Question 1" and card_list[0].tags == ["foo"]
+    assert set(card_list[2]) == {"cdate", "hidden", "question", "answer", "tags", "reviews"}
+
+
+def test_card_list_to_dataframes_empty():
+    card_df, review_df = card_list_to_dataframes([])
+
+    assert len(card_df) == len(review_df) == 0
+    assert list(review_df.columns) == ["rdate", "result", "card_id"]
@@ -0,0 +1,268 @@
+"""Long-lived SQLite connections shared by professors and `opencal.io.sqlitedb` functions.
+
+Opening a new connection for each professor (and committing after each reply,
+i.e. one fsync per answer) is slow. This module keeps one connection per
+database file for the whole life of the process:
+
+- the database is opened in WAL journal mode with a tuned `synchronous` level,
+- SQL statements are prepared once and cached by the connection
+  (c.f. the `cached_statements` parameter of `sqlite3.connect`),
+- writes can be committed by batches (`commit_batch_size`); pending writes are
+  also committed by the first write made more than `max_commit_delay_s`
+  seconds after the oldest pending one, by `flush` (e.g. called by the
+  application when it becomes idle, c.f. `flush_all_connections`), when the
+  connection is closed and when the Python interpreter exits.
+
+Pending writes are only committed from the thread that uses the connection
+(there is no background flush): a sequence of statements run on a cursor of
+the connection can't be committed halfway by another thread.
+
+Use `get_connection` to get the shared connection of a database file.
+"""
+
+import atexit
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+
+from typing import Any, Dict, Iterator, Optional
+
+import opencal.path
+
+DEFAULT_JOURNAL_MODE = "WAL"
+DEFAULT_SYNCHRONOUS = "NORMAL"       # Safe with WAL: a power loss can only roll back the last transactions
+DEFAULT_COMMIT_BATCH_SIZE = 1        # Commit after each write
+DEFAULT_MAX_COMMIT_DELAY_S = 2.
+DEFAULT_CACHED_STATEMENTS = 256      # Number of prepared statements kept by each connection
+
+
+class DatabaseConnection:
+    def __init__(
+            self,
+            opencal_db_path: os.PathLike,
+            journal_mode: str = DEFAULT_JOURNAL_MODE,
+            synchronous: str = DEFAULT_SYNCHRONOUS,
+            commit_batch_size: int = DEFAULT_COMMIT_BATCH_SIZE,
+            max_commit_delay_s: Optional[float] = DEFAULT_MAX_COMMIT_DELAY_S
+        ) -> None:
+        """
+        Open a long-lived connection to an SQLite database.
+
+        Parameters
+        ----------
+        opencal_db_path : os.PathLike
+            The path to the SQLite database file.
+        journal_mode : str, optional
+            The SQLite journal mode (default is "WAL").
+        synchronous : str, optional
+            The SQLite synchronous level (default is "NORMAL").
+        commit_batch_size : int, optional
+            The number of writes (c.f. `write`) committed together (default is 1).
+        max_commit_delay_s : float, optional
+            Pending writes are committed by the first write made more than this
+            delay after the oldest pending write (default is 2 seconds).
+            None only commits full batches.
+
+        Returns
+        -------
+        None
+        """
+        self.opencal_db_path: str = opencal.path.expand_path(opencal_db_path)
+        self.commit_batch_size: int = max(1, int(commit_batch_size))
+        self.max_commit_delay_s: Optional[float] = max_commit_delay_s
+
+        # The lock serializes the statements run through this object when the application uses the connection from several threads
+        self.con: sqlite3.Connection = sqlite3.connect(self.opencal_db_path, check_same_thread=False, cached_statements=DEFAULT_CACHED_STATEMENTS)
+        self.lock = threading.RLock()
+
+        self.con.execute(f"PRAGMA journal_mode={journal_mode}")
+        self.con.execute(f"PRAGMA synchronous={synchronous}")
+
+        self.num_pending_writes: int = 0
+        self.first_pending_write_time: Optional[float] = None
+
+
+    @property
+    def is_closed(self) -> bool:
+        return self.con is None
+
+
+    def cursor(self) -> sqlite3.Cursor:
+        """Return a raw cursor (its statements are not serialized by `lock`: use `transaction` to run a group of statements atomically)."""
+        return self.con.cursor()
+
+
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        """Execute an SQL statement (with a prepared statement cached by the connection)."""
+        with self.lock:
+            return self.con.execute(sql, parameters)
+
+
+    def executemany(self, sql: str, parameters: Any) -> sqlite3.Cursor:
+        """Execute an SQL statement for each item of `parameters`."""
+        with self.lock:
+            return self.con.executemany(sql, parameters)
+
+
+    def write(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        """
+        Execute an SQL statement that modifies the database and commit it by batches.
+
+        The transaction is committed every `commit_batch_size` writes, or by
+        the first write made more than `max_commit_delay_s` seconds after the
+        oldest pending write, or when `flush` or `close` is called.
+
+        Parameters
+        ----------
+        sql : str
+            The SQL statement.
+        parameters : Any, optional
+            The parameters of the SQL statement.
+
+        Returns
+        -------
+        sqlite3.Cursor
+            The cursor used to execute the statement.
+        """
+        with self.lock:
+            cur = self.con.execute(sql, parameters)
+            self.num_pending_writes += 1
+
+            now = time.monotonic()
+            if self.first_pending_write_time is None:
+                self.first_pending_write_time = now
+
+            is_delay_expired = self.max_commit_delay_s is not None and now - self.first_pending_write_time >= self.max_commit_delay_s
+
+            if self.num_pending_writes >= self.commit_batch_size or is_delay_expired:
+                self.flush()
+
+            return cur
+
+
+    def flush(self) -> None:
+        """Commit the pending writes."""
+        with self.lock:
+            if self.con is not None:
+                self.con.commit()
+            self.num_pending_writes = 0
+            self.first_pending_write_time = None
+
+
+    # Alias used by the code written for `sqlite3.Connection`
+    commit = flush
+
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Run a group of statements in a single transaction.
+
+        The transaction (including the pending writes) is committed at the end
+        of the `with` block, or rolled back if an exception is raised.
+        """
+        with self.lock:
+            cur = self.con.cursor()
+            try:
+                yield cur
+            except BaseException:
+                self.con.rollback()
+                self.num_pending_writes = 0
+                self.first_pending_write_time = None
+                raise
+            else:
+                self.flush()
+
+
+    def close(self) -> None:
+        """Commit the pending writes and close the connection."""
+        with self.lock:
+            if self.con is not None:
+                self.flush()
+                self.con.close()
+                self.con = None
+
+
+# CONNECTION POOL #############################################################
+
+_connection_dict: Dict[str, DatabaseConnection] = {}
+_connection_dict_lock = threading.Lock()
+
+
+def get_connection(
+        opencal_db_path: os.PathLike,
+        **kwargs: Any
+    ) -> DatabaseConnection:
+    """
+    Get the shared connection of a database file (open it if necessary).
+
+    Parameters
+    ----------
+    opencal_db_path : os.PathLike
+        The path to the SQLite database file.
+    **kwargs : Any
+        The parameters of `DatabaseConnection`, only used when the connection is opened.
+        `commit_batch_size` and `max_commit_delay_s` are updated on the existing connection too.
+
+    Returns
+    -------
+    DatabaseConnection
+        The shared connection.
+    """
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    with _connection_dict_lock:
+        connection = _connection_dict.get(opencal_db_path)
+
+        # The database file may have been deleted (and recreated) since the connection has been opened
+        if connection is not None and (connection.is_closed or not os.path.exists(opencal_db_path)):
+            connection.close()
+            connection = None
+
+        if connection is None:
+            connection = DatabaseConnection(opencal_db_path, **kwargs)
+            _connection_dict[opencal_db_path] = connection
+        else:
+            if "commit_batch_size" in kwargs:
+                connection.commit_batch_size = max(1, int(kwargs["commit_batch_size"]))
+            if "max_commit_delay_s" in kwargs:
+                connection.max_commit_delay_s = kwargs["max_commit_delay_s"]
+
+    return connection
+
+
+def close_connection(opencal_db_path: os.PathLike) -> None:
+    """Commit the pending writes and close the shared connection of a database file (if any)."""
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    with _connection_dict_lock:
+        connection = _connection_dict.pop(opencal_db_path, None)
+
+    if connection is not None:
+        connection.close()
+
+
+def flush_all_connections() -> None:
+    """Commit the pending writes of all the shared connections."""
+    with _connection_dict_lock:
+        connection_list = list(_connection_dict.values())
+
+    for connection in connection_list:
+        if not connection.is_closed:
+            connection.flush()
+
+
+def close_all_connections() -> None:
+    """Commit the pending writes and close all the shared connections."""
+    with _connection_dict_lock:
+        connection_list = list(_connection_dict.values())
+        _connection_dict.clear()
+
+    for connection in connection_list:
+        connection.close()
+
+
+# Flush-on-close guarantee: pending writes are committed when the interpreter exits
+atexit.register(close_all_connections)
@@ -0,0 +1,332 @@
+"""Parquet export of the personal knowledge base (PKB) for analytics workloads.
+
+A PKB is saved in a directory containing two Parquet datasets:
+
+- "cards": one row per card ("card_id", "cdate", "hidden", "question",
+  "answer" and "tags" columns),
+- "reviews": one row per consolidation review ("card_id", "rdate",
+  "is_right_answer" and "user_response_time_ms" columns), sorted by card and date.
+
+Both datasets are partitioned by year (hive partitioning, e.g.
+"reviews/year=2024/part-0.parquet", on the creation date of cards and on
+the date of reviews). Reading a date range only opens the partitions of the
+range, and the row groups of these partitions are filtered with their
+statistics (predicate pushdown). Columns that are not needed (e.g. the
+question and answer texts) are not read at all (column projection).
+
+This module requires the optional `pyarrow` package (pip install pyarrow).
+"""
+
+import datetime
+import os
+import shutil
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Union
+
+import opencal
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+CARD_DATASET_NAME = "cards"
+REVIEW_DATASET_NAME = "reviews"
+PARTITION_COLUMN_NAME = "year"
+
+CARD_COLUMN_LIST = ["card_id", "cdate", "hidden", "question", "answer", "tags"]
+REVIEW_COLUMN_LIST = ["card_id", "rdate", "is_right_answer", "user_response_time_ms"]
+
+UNIX_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()      # Parquet dates are days since the Unix epoch
+
+
+def import_pyarrow() -> Any:
+    """Import the optional `pyarrow` package (with a helpful error message if it is not installed)."""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+    except ImportError as e:
+        raise ImportError('The "pyarrow" package is required to read or write Parquet PKB files (pip install pyarrow)') from e
+    return pyarrow
+
+
+# SAVE PKB ####################################################################
+
+def save_pkb(
+        card_list: Iterable[Card],
+        pkb_path: str,
+        compression: str = "zstd"
+    ) -> None:
+    """
+    Save the personal knowledge base (PKB) to a directory of Parquet datasets.
+
+    The "cards" and "reviews" datasets of the directory are replaced. Card
+    IDs are the positions of the cards in `card_list` (as in
+    `opencal.io.sqlitedb.save_pkb`).
+
+    Parameters
+    ----------
+    card_list : Iterable[Card]
+        The cards to save.
+    pkb_path : str
+        The path of the PKB directory (created if it doesn't exist).
+    compression : str, optional
+        The compression codec of the Parquet files (default is "zstd").
+
+    Returns
+    -------
+    None
+    """
+    pa = import_pyarrow()
+
+    pkb_path = opencal.path.expand_path(pkb_path)
+
+    # The tables are built column by column (no intermediate dict per card or review)
+    card_id_list, cdate_list, hidden_list, question_list, answer_list, tags_list = [], [], [], [], [], []
+    review_card_id_list, rdate_list, is_right_answer_list, user_response_time_ms_list = [], [], [], []
+
+    for card_id, card in enumerate(card_list):
+        card_id_list.append(card_id)
+        cdate_list.append(card.creation_datetime.toordinal() - UNIX_EPOCH_ORDINAL)
+        hidden_list.append(card.is_hidden)
+        question_list.append(card.question)
+        answer_list.append(card.answer)
+        tags_list.append(card.tags)
+
+        review_list = card.consolidation_reviews
+        review_card_id_list.extend([card_id] * len(review_list))
+        rdate_list.extend([review.review_datetime.toordinal() - UNIX_EPOCH_ORDINAL for review in review_list])
+        is_right_answer_list.extend([bool(review.is_right_answer) for review in review_list])
+        user_response_time_ms_list.extend([review.user_response_time_ms for review in review_list])
+
+    cdate_array = pa.array(cdate_list, type=pa.int32()).cast(pa.date32())
+    rdate_array = pa.array(rdate_list, type=pa.int32()).cast(pa.date32())
+
+    card_table = pa.table({
+        "card_id": pa.array(card_id_list, type=pa.int64()),
+        "cdate": cdate_array,
+        "hidden": pa.array(hidden_list, type=pa.bool_()),
+        "question": pa.array(question_list, type=pa.string()),
+        "answer": pa.array(answer_list, type=pa.string()),
+        "tags": pa.array(tags_list, type=pa.list_(pa.string())),
+        PARTITION_COLUMN_NAME: pa.compute.year(cdate_array).cast(pa.int16()),
+    })
+
+    review_table = pa.table({
+        "card_id": pa.array(review_card_id_list, type=pa.int64()),
+        "rdate": rdate_array,
+        "is_right_answer": pa.array(is_right_answer_list, type=pa.bool_()),
+        "user_response_time_ms": pa.array(user_response_time_ms_list, type=pa.int32()),
+        PARTITION_COLUMN_NAME: pa.compute.year(rdate_array).cast(pa.int16()),
+    })
+
+    os.makedirs(pkb_path, exist_ok=True)
+
+    for dataset_name, table in ((CARD_DATASET_NAME, card_table), (REVIEW_DATASET_NAME, review_table)):
+        dataset_path = os.path.join(pkb_path, dataset_name)
+
+        # Partitions of the previous save that are not in the new one must not remain
+        if os.path.exists(dataset_path):
+            shutil.rmtree(dataset_path)
+
+        pa.dataset.write_dataset(
+            table,
+            dataset_path,
+            format="parquet",
+            partitioning=[PARTITION_COLUMN_NAME],
+            partitioning_flavor="hive",
+            basename_template="part-{i}.parquet",
+            file_options=pa.dataset.ParquetFileFormat().make_write_options(compression=compression),
+            preserve_order=True
+        )
+
+
+# READ DATASETS ###############################################################
+
+def read_dataset(
+        pkb_path: str,
+        dataset_name: str,
+        date_column: str,
+        columns: Optional[List[str]] = None,
+        start_date: Optional[Union[datetime.date, datetime.datetime]] = None,
+        end_date: Optional[Union[datetime.date, datetime.datetime]] = None
+    ) -> "pa.Table":
+    """
+    Read a dataset of a Parquet PKB directory (c.f. `read_cards` and `read_reviews`).
+
+    Parameters
+    ----------
+    pkb_path : str
+        The path of the PKB directory.
+    dataset_name : str
+        The name of the dataset ("cards" or "reviews").
+    date_column : str
+        The date column the dataset is partitioned on ("cdate" or "rdate").
+    columns : List[str], optional
+        The columns to read (default is None, i.e. all the columns except the partition column).
+    start_date : datetime.date, optional
+        Only read the rows whose date is greater than or equal to `start_date` (default is None).
+    end_date : datetime.date, optional
+        Only read the rows whose date is lower than `end_date` (default is None).
+
+    Returns
+    -------
+    pa.Table
+        The rows of the dataset, grouped by partition (use `sort_by` for a specific order).
+    """
+    pa = import_pyarrow()
+
+    pkb_path = opencal.path.expand_path(pkb_path)
+
+    dataset = pa.dataset.dataset(
+        os.path.join(pkb_path, dataset_name),
+        format="parquet",
+        partitioning=pa.dataset.partitioning(pa.schema([(PARTITION_COLUMN_NAME, pa.int16())]), flavor="hive")
+    )
+
+    if columns is None:
+        columns = [name for name in dataset.schema.names if name != PARTITION_COLUMN_NAME]
+
+    # The conditions on the partition column skip the files of other years,
+    # the conditions on the date column skip row groups using their statistics
+    filter_expression = None
+
+    if start_date is not None:
+        if isinstance(start_date, datetime.datetime):
+            start_date = start_date.date()
+        start_expression = (pa.dataset.field(PARTITION_COLUMN_NAME) >= start_date.year) & (pa.dataset.field(date_column) >= start_date)
+        filter_expression = start_expression
+
+    if end_date is not None:
+        if isinstance(end_date, datetime.datetime):
+            end_date = end_date.date()
+        end_expression = (pa.dataset.field(PARTITION_COLUMN_NAME) <= end_date.year) & (pa.dataset.field(date_column) < end_date)
+        filter_expression = end_expression if filter_expression is None else filter_expression & end_expression
+
+    return dataset.to_table(columns=columns, filter=filter_expression)
+
+
+def read_cards(
+        pkb_path: str,
+        columns: Optional[List[str]] = None,
+        start_date: Optional[Union[datetime.date, datetime.datetime]] = None,
+        end_date: Optional[Union[datetime.date, datetime.datetime]] = None
+    ) -> "pa.Table":
+    """
+    Read the cards of a Parquet PKB directory in a `pyarrow.Table` (e.g. `read_cards(path).to_pandas()`).
+
+    Parameters
+    ----------
+    pkb_path : str
+        The path of the PKB directory.
+    columns : List[str], optional
+        The columns to read (default is None, i.e. `CARD_COLUMN_LIST`).
+        E.g. `["card_id", "cdate", "tags"]` doesn't read the question and answer texts.
+    start_date : datetime.date, optional
+        Only read the cards created on or after `start_date` (default is None).
+    end_date : datetime.date, optional
+        Only read the cards created before `end_date` (default is None).
+
+    Returns
+    -------
+    pa.Table
+        The cards, grouped by creation year.
+    """
+    return read_dataset(pkb_path, CARD_DATASET_NAME, "cdate", columns=columns, start_date=start_date, end_date=end_date)
+
+
+def read_reviews(
+        pkb_path: str,
+        columns: Optional[List[str]] = None,
+        start_date: Optional[Union[datetime.date, datetime.datetime]] = None,
+        end_date: Optional[Union[datetime.date, datetime.datetime]] = None
+    ) -> "pa.Table":
+    """
+    Read the consolidation reviews of a Parquet PKB directory in a `pyarrow.Table` (e.g. `read_reviews(path).to_pandas()`).
+
+    Parameters
+    ----------
+    pkb_path : str
+        The path of the PKB directory.
+    columns : List[str], optional
+        The columns to read (default is None, i.e. `REVIEW_COLUMN_LIST`).
+    start_date : datetime.date, optional
+        Only read the reviews made on or after `start_date` (default is None).
+    end_date : datetime.date, optional
+        Only read the reviews made before `end_date` (default is None).
+
+    Returns
+    -------
+    pa.Table
+        The reviews, grouped by year (and sorted by card and date within each year).
+    """
+    return read_dataset(pkb_path, REVIEW_DATASET_NAME, "rdate", columns=columns, start_date=start_date, end_date=end_date)
+
+
+# LOAD PKB ####################################################################
+
+def load_pkb(pkb_path: str) -> List[Card]:
+    """
+    Load the personal knowledge base (PKB) from a directory of Parquet datasets.
+
+    Parameters
+    ----------
+    pkb_path : str
+        The path of the PKB directory (c.f. `save_pkb`).
+
+    Returns
+    -------
+    List[Card]
+        The cards, sorted by ID (i.e. in the order of the save), with their reviews sorted by date.
+    """
+    from opencal.io.sqlitedb import DayDatetimeDict
+
+    pa = import_pyarrow()
+
+    # Dates are read as day numbers: a single datetime is made for each day (c.f. `DayDatetimeDict`)
+    card_table = read_cards(pkb_path).sort_by("card_id")
+    review_table = read_reviews(pkb_path, columns=["card_id", "rdate", "is_right_answer", "user_response_time_ms"])
+
+    # The sort is stable: reviews of the same day keep the order of the save
+    review_table = review_table.sort_by([("card_id", "ascending"), ("rdate", "ascending")])
+
+    day_datetime_dict = DayDatetimeDict()
+
+    review_card_id_list = review_table.column("card_id").to_pylist()
+    review_list = [
+        ConsolidationReview(day_datetime_dict[day + UNIX_EPOCH_ORDINAL], is_right_answer, user_response_time_ms)
+        for day, is_right_answer, user_response_time_ms in zip(
+            review_table.column("rdate").cast(pa.int32()).to_pylist(),
+            review_table.column("is_right_answer").to_pylist(),
+            review_table.column("user_response_time_ms").to_pylist()
+        )
+    ]
+
+    card_list = []
+    review_index = 0
+    num_reviews = len(review_list)
+
+    for card_id, day, is_hidden, question, answer, tags in zip(
+            card_table.column("card_id").to_pylist(),
+            card_table.column("cdate").cast(pa.int32()).to_pylist(),
+            card_table.column("hidden").to_pylist(),
+            card_table.column("question").to_pylist(),
+            card_table.column("answer").to_pylist(),
+            card_table.column("tags").to_pylist()
+        ):
+
+        # Reviews are sorted by card ID: the reviews of this card are the next ones
+        first_review_index = review_index
+        while review_index < num_reviews and review_card_id_list[review_index] == card_id:
+            review_index += 1
+
+        card_list.append(Card(
+            creation_datetime=day_datetime_dict[day + UNIX_EPOCH_ORDINAL],
+            question=question,
+            answer=answer,
+            is_hidden=is_hidden,
+            tags=tags,
+            consolidation_reviews=review_list[first_review_index:review_index]
+        ))
+
+    return card_list
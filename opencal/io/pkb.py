@@ -1,10 +1,12 @@
 import datetime
+import gzip
 import opencal
 from opencal.card import Card
 from opencal.review import ConsolidationReview
 import os
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional
 import warnings
+import xml.etree.ElementTree as ET
 import xml.sax
 from xml.sax.handler import ContentHandler, ErrorHandler
 
@@ -23,11 +25,80 @@ class XmlPkbError(Exception):
     pass
 
 
+# COMPRESSED FILES ############################################################
+
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".zst": "zstd",
+}
+
+def infer_compression(pkb_path: str) -> Optional[str]:
+    """
+    Infer the compression of a PKB file from its extension (".gz" or ".zst").
+
+    Parameters
+    ----------
+    pkb_path : str
+        The path of the PKB file.
+
+    Returns
+    -------
+    Optional[str]
+        "gzip", "zstd" or None (uncompressed file).
+    """
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(pkb_path)[1].lower())
+
+
+def open_pkb_file(
+        pkb_path: str,
+        mode: str = "rb",
+        compression: Optional[str] = "infer"
+    ) -> IO:
+    """
+    Open a PKB file, possibly compressed with gzip or zstd.
+
+    Parameters
+    ----------
+    pkb_path : str
+        The path of the PKB file.
+    mode : str, optional
+        "rb" (read bytes), "r" (read text) or "w" (write text); text is UTF-8 encoded. Default is "rb".
+    compression : str, optional
+        "gzip", "zstd", None (uncompressed file) or "infer" to infer the
+        compression from the file extension (default is "infer").
+        zstd requires the optional `zstandard` package.
+
+    Returns
+    -------
+    IO
+        The file object.
+    """
+    if compression == "infer":
+        compression = infer_compression(pkb_path)
+
+    encoding = None if "b" in mode else "utf-8"
+
+    if compression is None:
+        return open(pkb_path, mode, encoding=encoding)
+    elif compression == "gzip":
+        return gzip.open(pkb_path, mode if "b" in mode else mode + "t", encoding=encoding)
+    elif compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError('The "zstandard" package is required to read or write zstd compressed PKB files (pip install zstandard)') from e
+        return zstandard.open(pkb_path, mode, encoding=encoding)
+    else:
+        raise ValueError(f'Unknown compression "{compression}" (expected "gzip", "zstd", None or "infer")')
+
+
 # SAVE PKB ####################################################################
 
 def save_pkb(
-        card_list: List[Card],
-        pkb_path: str
+        card_list: Iterable[Card],
+        pkb_path: str,
+        compression: Optional[str] = "infer",
+        chunk_size: int = 1000
     ) -> None:
     """
     Save the personal knowledge base (PKB) to an XML file.
@@ -36,13 +107,22 @@ def save_pkb(
     PKB path in XML format. Each card contains information such as creation
     date, hidden status, question, answer, tags, and reviews.
 
+    Cards are formatted by chunks in a single buffer written at once, so
+    `card_list` can be any iterable (e.g. a generator of cards, c.f. `iter_pkb`):
+    the whole list of cards is not required in memory.
+
     Parameters
     ----------
-    card_list : List[Card]
-        A list of cards.
+    card_list : Iterable[Card]
+        A list (or any iterable) of cards.
     pkb_path : str
         The file path where the PKB should be saved. This path can include
         user home directory shortcuts (e.g., "~/...") and relative paths.
+    compression : str, optional
+        "gzip", "zstd", None (uncompressed file) or "infer" to infer the
+        compression from the file extension, e.g. "pkb.gz" (default is "infer").
+    chunk_size : int, optional
+        The number of cards formatted before each write (default is 1000).
 
     Returns
     -------
@@ -51,14 +131,27 @@ def save_pkb(
 
     pkb_path = opencal.path.expand_path(pkb_path)
 
-    with open(pkb_path, 'w') as fd:
+    # Cards and reviews share a small number of distinct dates: format each of them only once
+    date_str_dict: Dict[datetime.datetime, str] = {}
+
+    def date_to_str(date: datetime.datetime) -> str:
+        date_str = date_str_dict.get(date)
+        if date_str is None:
+            date_str = date_str_dict[date] = date.strftime(PY_DATE_FORMAT)
+        return date_str
+
+    with open_pkb_file(pkb_path, 'w', compression=compression) as fd:
         fd.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
         fd.write('<pkb>\n')
-        for card in card_list:
-            cdate_str = card.creation_datetime.strftime(PY_DATE_FORMAT)
+
+        buffer: List[str] = []
+        append = buffer.append
+
+        for card_index, card in enumerate(card_list, start=1):
+            cdate_str = date_to_str(card.creation_datetime)
             hidden_str = 'true' if card.is_hidden else 'false'
 
-            fd.write(f'<card cdate="{cdate_str}" hidden="{hidden_str}">\n')
+            append(f'<card cdate="{cdate_str}" hidden="{hidden_str}">\n')
 
             # In the following code, the "]]>" is replaced by "]]]]><![CDATA[>"
             # to avoid premature end of the CDATA section by XML parser ("CDATA nesting").
@@ -68,28 +161,34 @@ def save_pkb(
             # - https://stackoverflow.com/questions/223652/is-there-a-way-to-escape-a-cdata-end-token-in-xml
 
             question_str = card.question.replace("]]>", "]]]]><![CDATA[>")
-            fd.write(f'<question><![CDATA[{question_str}]]></question>\n')
+            append(f'<question><![CDATA[{question_str}]]></question>\n')
             if card.answer == '':
-                fd.write('<answer/>\n')
+                append('<answer/>\n')
             else:
                 answer_str = card.answer.replace("]]>", "]]]]><![CDATA[>")
-                fd.write(f'<answer><![CDATA[{answer_str}]]></answer>\n')
+                append(f'<answer><![CDATA[{answer_str}]]></answer>\n')
 
             for tag in card.tags:
-                fd.write(f'<tag>{tag}</tag>\n')
-            
+                append(f'<tag>{tag}</tag>\n')
+
             for review in card.consolidation_reviews:
                 if isinstance(review, ConsolidationReview):
-                    rdate_str = review.review_datetime.strftime(PY_DATE_FORMAT)
+                    rdate_str = date_to_str(review.review_datetime)
                     result_str = "good" if review.is_right_answer else "bad"
-                    fd.write(f'<review rdate="{rdate_str}" result="{result_str}"/>\n')
+                    append(f'<review rdate="{rdate_str}" result="{result_str}"/>\n')
                 # elif isinstance(review, dict): # TODO: Temporary workaround for backward compatibility
                 #     rdate_str = review['rdate'].strftime(PY_DATE_FORMAT)
-                #     fd.write(f'<review rdate="{rdate_str}" result="{review["result"]}"/>\n')
+                #     append(f'<review rdate="{rdate_str}" result="{review["result"]}"/>\n')
                 else:
                     raise ValueError(f"Unexpected review type: {type(review)}")
 
-            fd.write('</card>\n')
+            append('</card>\n')
+
+            if card_index % chunk_size == 0:
+                fd.write("".join(buffer))
+                buffer.clear()
+
+        fd.write("".join(buffer))
         fd.write('</pkb>\n')
 
 
@@ -100,7 +199,8 @@ def load_pkb(pkb_path: str) -> List[Card]:
     Load the personal knowledge base (PKB) from an XML file.
 
     This function reads the PKB from the specified XML file path and parses
-    it into a list of cards.
+    it into a list of cards. Files compressed with gzip (".gz") or zstd
+    (".zst") are decompressed on the fly.
 
     Parameters
     ----------
@@ -122,17 +222,230 @@ def load_pkb(pkb_path: str) -> List[Card]:
     xml_reader.setContentHandler(pkb_handler)
     xml_reader.setErrorHandler(pkb_handler)
 
-    # Parse XML files
-    inputsource = xml.sax.InputSource("file://" + pkb_path)
-    xml_reader.parse(inputsource)
+    # Parse XML files (possibly compressed, c.f. `open_pkb_file`)
+    with open_pkb_file(pkb_path, "rb") as fd:
+        inputsource = xml.sax.InputSource("file://" + pkb_path)
+        inputsource.setByteStream(fd)
+        xml_reader.parse(inputsource)
 
     return pkb_handler.card_list
 
 
+def iter_pkb(
+        pkb_path: str,
+        use_iterparse: bool = False,
+        chunk_size: int = 64 * 1024
+    ) -> Iterator[Card]:
+    """
+    Iterate over the cards of a personal knowledge base (PKB) XML file.
+
+    Contrary to `load_pkb`, cards are yielded as soon as they are parsed:
+    the file is read by chunks and the memory used does not depend on the
+    size of the PKB (as long as the caller does not keep the cards).
+
+    Parameters
+    ----------
+    pkb_path : str
+        The file path from which the PKB should be loaded. This path can include
+        user home directory shortcuts (e.g., "~/...") and relative paths.
+    use_iterparse : bool, optional
+        If True, parse the file with `xml.etree.ElementTree.iterparse` (each
+        card element is cleared once converted), otherwise with the SAX
+        parser used by `load_pkb` (default is False).
+    chunk_size : int, optional
+        The number of bytes read from the file at once by the SAX parser (default is 64 KiB).
+
+    Yields
+    ------
+    Card
+        The cards of the PKB, in the order of the file.
+    """
+
+    pkb_path = opencal.path.expand_path(pkb_path)
+
+    if use_iterparse:
+        with open_pkb_file(pkb_path, "rb") as fd:
+            context = ET.iterparse(fd, events=("start", "end"))
+            _, root_element = next(context)
+
+            for event, element in context:
+                if event == "end" and element.tag == "card":
+                    yield element_to_card(element)
+
+                    # Drop the parsed elements so that the tree does not grow
+                    root_element.clear()
+    else:
+        card_buffer: List[Card] = []
+
+        # Make XML parser (the handler pushes each parsed card in the buffer)
+        xml_reader = xml.sax.make_parser()
+        pkb_handler = PKBHandler(card_callback=card_buffer.append)
+        xml_reader.setContentHandler(pkb_handler)
+        xml_reader.setErrorHandler(pkb_handler)
+
+        with open_pkb_file(pkb_path, "rb") as fd:
+            for chunk in iter(lambda: fd.read(chunk_size), b""):
+                xml_reader.feed(chunk)
+
+                yield from card_buffer
+                card_buffer.clear()
+
+        xml_reader.close()
+        yield from card_buffer
+
+
+def parse_card_attributes(attr: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Parse the attributes of a "card" XML element.
+
+    Parameters
+    ----------
+    attr : Dict[str, str]
+        The attributes of the XML element.
+
+    Returns
+    -------
+    Dict[str, Any]
+        A card dictionary with the "cdate" and "hidden" items and empty "reviews" and "tags" lists.
+    """
+    card_dict: Dict[str, Any] = {"reviews": [], "tags": []}
+
+    for key, value in list(attr.items()):
+        if key == "cdate":
+            card_dict[key] = datetime.datetime.strptime(value, PY_DATE_FORMAT) #.date()
+        elif key == "hidden":
+            if value == "true":
+                card_dict[key] = True
+            elif value == "false":
+                card_dict[key] = False
+            else:
+                raise Exception(f'Unexpected value for the "hidden" attribute: got {value} (expected "true" or "false")')
+        else:
+            raise ValueError(key)
+
+    return card_dict
+
+
+def parse_review_attributes(attr: Dict[str, str]) -> ConsolidationReview:
+    """
+    Parse the attributes of a "review" XML element.
+
+    Parameters
+    ----------
+    attr : Dict[str, str]
+        The attributes of the XML element.
+
+    Returns
+    -------
+    ConsolidationReview
+        The review.
+    """
+    review_date = None
+    is_right_answer = None
+
+    for key, value in list(attr.items()):
+        if key == "rdate":
+            review_date = datetime.datetime.strptime(value, PY_DATE_FORMAT) #.date()
+        elif key == "result":
+            if value == 'good':
+                is_right_answer = True
+            elif value == 'bad':
+                is_right_answer = False
+            else:
+                raise ValueError(f'Unknown result value "{value}"')
+        else:
+            raise ValueError(f"Unknown XML attribute {key}")
+
+    if (review_date is not None) and (is_right_answer is not None):
+        return ConsolidationReview(
+            review_datetime=review_date,
+            is_right_answer=is_right_answer
+        )
+    else:
+        raise ValueError('"rdate" and "result" must be defined')
+
+
+def make_card(card_dict: Dict[str, Any]) -> Card:
+    """
+    Make a card from the items parsed in a "card" XML element.
+
+    Reviews are sorted by date and their "timedelta" and
+    "last_validated_timedelta" attributes are computed.
+
+    Parameters
+    ----------
+    card_dict : Dict[str, Any]
+        The "cdate", "hidden", "question", "answer", "tags" and "reviews" items of the card.
+
+    Returns
+    -------
+    Card
+        The card.
+    """
+    card = Card(
+        creation_datetime=card_dict["cdate"],
+        question=card_dict["question"],
+        answer=card_dict["answer"],
+        is_hidden=card_dict["hidden"],
+        tags=card_dict["tags"],
+        consolidation_reviews=card_dict["reviews"]
+    )
+
+    # Sort reviews ("in-place")
+    card.consolidation_reviews.sort(key=lambda review: review.review_datetime)
+
+    # TODO: IS THE FOLLOWING CODE REALLY USEFUL???
+    # Add the "timedelta" and "last_validated_timedelta" attributes to each "review"
+    if len(card.consolidation_reviews) > 0:
+        card.consolidation_reviews[0].timedelta = TIME_DELTA_OF_FIRST_REVIEWS
+        card.consolidation_reviews[0].last_validated_timedelta = INIT_VALIDATED_TIME_DELTA
+
+        for i in range(1, len(card.consolidation_reviews)):
+            previous_timedelta = card.consolidation_reviews[i-1].timedelta
+            is_right_previous_answer = card.consolidation_reviews[i-1].is_right_answer
+            card.consolidation_reviews[i].last_validated_timedelta = previous_timedelta if is_right_previous_answer else INIT_VALIDATED_TIME_DELTA
+
+            dt1 = card.consolidation_reviews[i-1].review_datetime
+            dt2 = card.consolidation_reviews[i].review_datetime
+            card.consolidation_reviews[i].timedelta = dt2 - dt1
+
+    return card
+
+
+def element_to_card(element: ET.Element) -> Card:
+    """
+    Make a card from a "card" XML element (c.f. `iter_pkb`).
+
+    Parameters
+    ----------
+    element : xml.etree.ElementTree.Element
+        The "card" XML element.
+
+    Returns
+    -------
+    Card
+        The card.
+    """
+    card_dict = parse_card_attributes(element.attrib)
+
+    for child_element in element:
+        if child_element.tag in ("question", "answer"):
+            card_dict[child_element.tag] = child_element.text or ""
+        elif child_element.tag == "tag":
+            card_dict["tags"].append(child_element.text or "")
+        elif child_element.tag == "review":
+            card_dict["reviews"].append(parse_review_attributes(child_element.attrib))
+
+    return make_card(card_dict)
+
+
 class PKBHandler(ContentHandler, ErrorHandler):
     """A content handler"""
 
-    def __init__(self) -> None:
+    def __init__(
+            self,
+            card_callback: Optional[Callable[[Card], Any]] = None
+        ) -> None:
         """
         Initialize the PKBHandler.
 
@@ -143,19 +456,24 @@ class PKBHandler(ContentHandler, ErrorHandler):
 
         Parameters
         ----------
-        None
+        card_callback : Callable[[Card], Any], optional
+            A function called with each parsed card. Default is None, i.e.
+            cards are appended to `card_list`.
 
         Returns
         -------
         None
         """
         self._card_list: List[Card] = []
+        self._card_callback: Callable[[Card], Any] = self._card_list.append if card_callback is None else card_callback
 
-        self._current_card: Optional[Card] = None
-        self._current_question: Optional[str] = None
-        self._current_answer: Optional[str] = None
+        # Character data may be delivered in many pieces (e.g. long CDATA sections):
+        # pieces are accumulated in lists and joined at the end of the element
+        self._current_card: Optional[Dict[str, Any]] = None
+        self._current_question: Optional[List[str]] = None
+        self._current_answer: Optional[List[str]] = None
         self._current_review: Optional[ConsolidationReview] = None
-        self._current_tag: Optional[str] = None
+        self._current_tag: Optional[List[str]] = None
 
     @property
     def card_list(self) -> List[Card]:
@@ -209,55 +527,19 @@ class PKBHandler(ContentHandler, ErrorHandler):
          
         if name == "card":
             assert self._current_card is None
-            self._current_card = {"reviews": [], "tags": []}
-
-            for key, value in list(attr.items()):
-                if key == "cdate":
-                    self._current_card[key] = datetime.datetime.strptime(value, PY_DATE_FORMAT) #.date()
-                elif key == "hidden":
-                    if value == "true":
-                        self._current_card[key] = True
-                    elif value == "false":
-                        self._current_card[key] = False
-                    else:
-                        raise Exception(f'Unexpected value for the "hidden" attribute: got {value} (expected "true" or "false")')
-                else:
-                    raise ValueError(key)
+            self._current_card = parse_card_attributes(attr)
         elif name == "question":
             assert self._current_question is None and self._current_card is not None
-            self._current_question = ""
+            self._current_question = []
         elif name == "answer":
             assert self._current_answer is None and self._current_card is not None
-            self._current_answer = ""
+            self._current_answer = []
         elif name == "review":
             assert self._current_review is None and self._current_card is not None
-
-            review_date = None
-            is_right_answer = None
-
-            for key, value in list(attr.items()):
-                if key == "rdate":
-                    review_date = datetime.datetime.strptime(value, PY_DATE_FORMAT) #.date()
-                elif key == "result":
-                    if value == 'good':
-                        is_right_answer = True
-                    elif value == 'bad':
-                        is_right_answer = False
-                    else:
-                        raise ValueError(f'Unknown result value "{value}"')
-                else:
-                    raise ValueError(f"Unknown XML attribute {key}")
-
-            if (review_date is not None) and (is_right_answer is not None):
-                self._current_review =  ConsolidationReview(
-                    review_datetime=review_date,
-                    is_right_answer=is_right_answer
-                )
-            else:
-                raise ValueError('"rdate" and "result" must be defined')
+            self._current_review = parse_review_attributes(attr)
         elif name == "tag":
             assert self._current_tag is None and self._current_card is not None
-            self._current_tag = ""
+            self._current_tag = []
 
     def endElement(
             self,
@@ -283,43 +565,15 @@ class PKBHandler(ContentHandler, ErrorHandler):
 
         if name == "card":
             assert self._current_card is not None
-
-            current_card = Card(
-                creation_datetime=self._current_card["cdate"],
-                question=self._current_card["question"],
-                answer=self._current_card["answer"],
-                is_hidden=self._current_card["hidden"],
-                tags=self._current_card["tags"],
-                consolidation_reviews=self._current_card["reviews"]
-            )
-
-            # Sort reviews ("in-place")
-            current_card.consolidation_reviews.sort(key=lambda review: review.review_datetime)
-
-            # TODO: IS THE FOLLOWING CODE REALLY USEFUL???
-            # Add the "timedelta" and "last_validated_timedelta" attributes to each "review"
-            if len(current_card.consolidation_reviews) > 0:
-                current_card.consolidation_reviews[0].timedelta = TIME_DELTA_OF_FIRST_REVIEWS
-                current_card.consolidation_reviews[0].last_validated_timedelta = INIT_VALIDATED_TIME_DELTA
-
-                for i in range(1, len(current_card.consolidation_reviews)):
-                    previous_timedelta = current_card.consolidation_reviews[i-1].timedelta
-                    is_right_previous_answer = current_card.consolidation_reviews[i-1].is_right_answer
-                    current_card.consolidation_reviews[i].last_validated_timedelta = previous_timedelta if is_right_previous_answer else INIT_VALIDATED_TIME_DELTA
-
-                    dt1 = current_card.consolidation_reviews[i-1].review_datetime
-                    dt2 = current_card.consolidation_reviews[i].review_datetime
-                    current_card.consolidation_reviews[i].timedelta = dt2 - dt1
-
-            self._card_list.append(current_card)
+            self._card_callback(make_card(self._current_card))
             self._current_card = None
         elif name == "question":
             assert self._current_question is not None and self._current_card is not None
-            self._current_card["question"] = self._current_question
+            self._current_card["question"] = "".join(self._current_question)
             self._current_question = None
         elif name == "answer":
             assert self._current_answer is not None and self._current_card is not None
-            self._current_card["answer"] = self._current_answer
+            self._current_card["answer"] = "".join(self._current_answer)
             self._current_answer = None
         elif name == "review":
             assert self._current_review is not None and self._current_card is not None
@@ -327,7 +581,7 @@ class PKBHandler(ContentHandler, ErrorHandler):
             self._current_review = None
         elif name == "tag":
             assert self._current_tag is not None and self._current_card is not None
-            self._current_card["tags"].append(self._current_tag)
+            self._current_card["tags"].append("".join(self._current_tag))
             self._current_tag = None
 
 
@@ -350,13 +604,13 @@ class PKBHandler(ContentHandler, ErrorHandler):
         #print("Characters:", ch)
 
         if self._current_question is not None:
-            self._current_question += ch
+            self._current_question.append(ch)
 
         elif self._current_answer is not None:
-            self._current_answer += ch
+            self._current_answer.append(ch)
 
         elif self._current_tag is not None:
-            self._current_tag += ch
+            self._current_tag.append(ch)
 
     # ErrorHandler ##############################
 
@@ -1,19 +1,42 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import contextlib
 import datetime
+import gc
+import hashlib
+import itertools
 import opencal
 import opencal.io.pkb
+from opencal.io.connection import close_connection, get_connection
 from opencal.card import Card
+from opencal.core.professor.consolidation.schedule import CardSchedule, make_schedule
 from opencal.review import ConsolidationReview
 import os
+import re
+import shutil
 import sqlite3
-from typing import Any, Dict, List, Optional
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import uuid
+import warnings
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from opencal.review_table import ReviewTable
+    from opencal.tag_table import CardTagTable, TagVocabulary
 
 # from opencal.core.data import RIGHT_ANSWER_STR        # TODO: USE IT (OR REMOVE IT IN "pkb.py")!
 
 PY_DATE_FORMAT = r"%Y-%m-%d"
 
+DEFAULT_RESTORE_BATCH_SIZE = 10000       # Number of statements committed together by `restore_db`
+DEFAULT_PROGRESS_INTERVAL_S = 5.         # Delay between two progress messages of `backup_db`, `dump_db` and `restore_db`
+DEFAULT_IMPORT_BATCH_SIZE = 5000         # Number of cards inserted at once by `xml_to_sqlite`
+DEFAULT_BACKUP_PAGES = 4096              # Number of database pages copied at each step of `backup_db` (-1 copies the whole database in one step)
+
 # TIME_DELTA_OF_FIRST_REVIEWS = datetime.timedelta()    # Null time delta (0 day)    # TODO: USE IT (OR REMOVE IT IN "pkb.py")!
 # INIT_VALIDATED_TIME_DELTA = datetime.timedelta()      # Null time delta (0 day)    # TODO: USE IT (OR REMOVE IT IN "pkb.py")!
 
@@ -21,6 +44,12 @@ CONFIG_TABLE_NAME = "t_config"
 CARD_TABLE_NAME = "t_card"
 ACQUISITION_REVIEW_TABLE_NAME = "t_acquisition_review"
 CONSOLIDATION_REVIEW_TABLE_NAME = "t_consolidation_review"
+CARD_SCHEDULE_TABLE_NAME = "t_card_schedule"
+ASSESS_CACHE_TABLE_NAME = "t_assess_cache"
+TAG_TABLE_NAME = "t_tag"
+CARD_TAG_TABLE_NAME = "t_card_tag"
+CHANGE_LOG_TABLE_NAME = "t_change_log"
+DELETED_ROW_TABLE_NAME = "t_deleted_row"    # Only in differential backups
 
 
 # SAVE PKB ####################################################################
@@ -56,68 +85,276 @@ def save_pkb(
     if not os.path.exists(opencal_db_path):
         create_all_tables(opencal_db_path)
 
+    migrate_db(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+    cur = con.cursor()
+
+    # INSERT SQL DATA INTO THE TABLES #########################################
+
+    with unlogged_changes(opencal_db_path):
+        insert_card_batch(cur, card_list, first_card_id=0, first_review_id=0)
+        con.commit()
+
+    # Cards now carry their primary key in the database
+    for card_id, card in enumerate(card_list):
+        card.id = card_id
+        card.mark_clean()
+
+
+SQL_INSERT_CARD_REQUEST = f"""INSERT INTO {CARD_TABLE_NAME}
+( id,  creation_datetime,  is_hidden,  question,  answer,  tags,  content_digest) VALUES
+(:id, :creation_datetime, :is_hidden, :question, :answer, :tags, :content_digest)
+"""
+
+SQL_INSERT_CONSOLIDATION_REVIEW_WITH_ID_REQUEST = f"""INSERT INTO {CONSOLIDATION_REVIEW_TABLE_NAME}
+( id,  card_id,  review_datetime,  is_right_answer) VALUES
+(:id, :card_id, :review_datetime, :is_right_answer)
+"""
+
+
+def insert_card_batch(
+        cur: sqlite3.Cursor,
+        card_list: List[Card],
+        first_card_id: int,
+        first_review_id: int
+    ) -> int:
+    """
+    Insert new cards, their reviews, their scheduling state and their tags in the database.
+
+    Cards get consecutive IDs from `first_card_id` and their reviews
+    consecutive IDs from `first_review_id` (the IDs must not be used yet).
+    The transaction is not committed: this is the responsibility of the caller.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        A cursor on the OpenCAL database.
+    card_list : List[Card]
+        The cards to insert.
+    first_card_id : int
+        The ID of the first card.
+    first_review_id : int
+        The ID of the first review.
+
+    Returns
+    -------
+    int
+        The number of reviews inserted.
+    """
+
     # CONVERT THE CARD LIST TO SQL DATA #######################################
 
     sql_card_table_insert_params = []
     sql_review_table_insert_params = []
+    sql_schedule_table_insert_params = []
+    card_tags_list = []
 
-    last_review_id = 0
+    review_id = first_review_id
 
-    for card_id, card in enumerate(card_list):
+    for card_id, card in enumerate(card_list, start=first_card_id):
 
         # Card ########################
 
-        sql_card_table_insert_params.append({
-            "id": int(card_id),
-            "creation_datetime": card.creation_datetime.strftime(PY_DATE_FORMAT),
-            "is_hidden": int(card.is_hidden),
-            "question": card.question,        #.strip() # remove strip() because it generates fake differences with the original XML file
-            "answer": card.answer,            #.strip() # remove strip() because it generates fake differences with the original XML file
-            "tags": "\n".join(card.tags)
-        })
+        sql_card_table_insert_params.append(card_to_sql_params(card, card_id=card_id))
+        card_tags_list.append((card_id, card.tags))
 
         # Reviews #####################
 
         for review in card.consolidation_reviews:
-
-            review_id = last_review_id
-            last_review_id += 1
-
             sql_review_table_insert_params.append({
-                "id": int(review_id),
+                "id": review_id,
                 "card_id": card_id,
                 "review_datetime": review.review_datetime.strftime(PY_DATE_FORMAT),
                 "is_right_answer": review.is_right_answer
             })
+            review_id += 1
 
-    # INSERT SQL DATA INTO THE CARD TABLE #####################################
+        # Scheduling state ############
 
-    con = sqlite3.connect(opencal_db_path)
-    cur = con.cursor()
+        sql_schedule_table_insert_params.append(
+            schedule_to_sql_params(card_id, make_schedule(card))
+        )
+
+    # INSERT SQL DATA INTO THE TABLES #########################################
+
+    cur.executemany(SQL_INSERT_CARD_REQUEST, sql_card_table_insert_params)
+    cur.executemany(SQL_INSERT_CONSOLIDATION_REVIEW_WITH_ID_REQUEST, sql_review_table_insert_params)
+    cur.executemany(SQL_UPSERT_CARD_SCHEDULE_REQUEST, sql_schedule_table_insert_params)
+    save_card_tags(cur, card_tags_list, replace=False)
+
+    return review_id - first_review_id
 
-    sql_request = f"""INSERT INTO {CARD_TABLE_NAME}
-    ( id,  creation_datetime,  is_hidden,  question,  answer,  tags) VALUES
-    (:id, :creation_datetime, :is_hidden, :question, :answer, :tags)
+
+def card_to_sql_params(
+        card: Card,
+        card_id: Optional[int] = None
+    ) -> Dict[str, Any]:
     """
+    Convert a card to the parameters of the SQL requests on the card table.
 
-    cur.executemany(sql_request, sql_card_table_insert_params)
+    Parameters
+    ----------
+    card : Card
+        The card.
+    card_id : int, optional
+        The ID of the card in the database (default is None, i.e. use `card.id`).
 
-    # INSERT SQL DATA INTO THE REVIEW TABLE #####
+    Returns
+    -------
+    Dict[str, Any]
+        The named parameters of the SQL requests.
+    """
+    return {
+        "id": card.id if card_id is None else int(card_id),
+        "creation_datetime": card.creation_datetime.strftime(PY_DATE_FORMAT),
+        "is_hidden": int(card.is_hidden),
+        "question": card.question,        #.strip() # remove strip() because it generates fake differences with the original XML file
+        "answer": card.answer,            #.strip() # remove strip() because it generates fake differences with the original XML file
+        "tags": "\n".join(card.tags),
+        "content_digest": card_content_digest(card)
+    }
+
+
+SQL_UPSERT_CARD_REQUEST = f"""INSERT INTO {CARD_TABLE_NAME}
+    ( id,  creation_datetime,  is_hidden,  question,  answer,  tags,  content_digest) VALUES
+    (:id, :creation_datetime, :is_hidden, :question, :answer, :tags, :content_digest)
+    ON CONFLICT(id) DO UPDATE SET
+        creation_datetime=excluded.creation_datetime,
+        is_hidden=excluded.is_hidden,
+        question=excluded.question,
+        answer=excluded.answer,
+        tags=excluded.tags,
+        content_digest=excluded.content_digest
+    """
 
-    sql_request = f"""INSERT INTO {CONSOLIDATION_REVIEW_TABLE_NAME}
-    ( id,  card_id,  review_datetime,  is_right_answer) VALUES
-    (:id, :card_id, :review_datetime, :is_right_answer)
+SQL_INSERT_CONSOLIDATION_REVIEW_REQUEST = f"""INSERT INTO {CONSOLIDATION_REVIEW_TABLE_NAME}
+    ( card_id,  review_datetime,  user_response_time_ms,  is_right_answer) VALUES
+    (:card_id, :review_datetime, :user_response_time_ms, :is_right_answer)
     """
 
-    cur.executemany(sql_request, sql_review_table_insert_params)
 
-    con.commit()
-    con.close()
+def save_changes(
+        card_list: List[Card],
+        opencal_db_path: os.PathLike
+    ) -> int:
+    """
+    Save the modifications of a list of cards to an SQLite database.
+
+    Contrary to `save_pkb` which writes the whole PKB in an empty database,
+    this function only writes the cards modified since they have been loaded
+    or saved (c.f. `Card.has_changes`), in a single transaction:
+
+    - new cards (i.e. `card.id` is None) are inserted and get their ID,
+    - modified cards are updated (upsert),
+    - new consolidation reviews are appended to the review table
+      (if some reviews of a card have been removed, or marked as modified
+      with `Card.mark_reviews_dirty`, all its reviews are rewritten),
+    - the scheduling state of the modified cards is updated.
+
+    Cards removed from `card_list` are not deleted from the database.
+
+    Parameters
+    ----------
+    card_list : List[Card]
+        A list of cards, typically loaded with `load_pkb`.
+    opencal_db_path : os.PathLike
+        The SQLite database where the changes should be saved.
+
+    Returns
+    -------
+    int
+        The number of cards written.
+    """
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    # Make sure the database exists otherwise create it
+    if not os.path.exists(opencal_db_path):
+        create_all_tables(opencal_db_path)
+
+    modified_card_list = [card for card in card_list if card.has_changes]
+
+    if len(modified_card_list) == 0:
+        return 0
+
+    migrate_db(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+
+    with con.transaction() as cur:
+        for card in modified_card_list:
+
+            # Card ########################
+
+            if card.is_dirty:
+                cur.execute(SQL_UPSERT_CARD_REQUEST, card_to_sql_params(card))
+                if card.id is None:
+                    card.id = cur.lastrowid
+                save_card_tags(cur, [(card.id, card.tags)])
+
+            # Reviews #####################
+
+            if card.num_saved_reviews is None or card.num_consolidation_reviews < card.num_saved_reviews:
+                # Some reviews have been removed or modified: rewrite all the reviews of the card
+                cur.execute(f"DELETE FROM {CONSOLIDATION_REVIEW_TABLE_NAME} WHERE card_id=?", (card.id,))
+                new_review_list = card.consolidation_reviews
+            else:
+                new_review_list = card.consolidation_reviews[card.num_saved_reviews:]
+
+            cur.executemany(SQL_INSERT_CONSOLIDATION_REVIEW_REQUEST, [
+                {
+                    "card_id": card.id,
+                    "review_datetime": review.review_datetime.strftime(PY_DATE_FORMAT),
+                    "user_response_time_ms": review.user_response_time_ms,
+                    "is_right_answer": review.is_right_answer
+                }
+                for review in new_review_list
+            ])
+
+            # Scheduling state ############
+
+            cur.execute(SQL_UPSERT_CARD_SCHEDULE_REQUEST, schedule_to_sql_params(card.id, make_schedule(card)))
+
+    # The transaction is committed: the cards are now identical to their records
+    for card in modified_card_list:
+        card.mark_clean()
+
+    return len(modified_card_list)
 
 
 # LOAD PKB ####################################################################
 
-def load_pkb(opencal_db_path: os.PathLike) -> List[Card]:
+@contextlib.contextmanager
+def paused_garbage_collector() -> Iterator[None]:
+    """
+    Pause the cyclic garbage collector while a large number of long-lived objects (e.g. cards and reviews) are created.
+
+    Each collection traverses all the objects already created: when millions of
+    objects are created in a row (none of which is garbage), the collections
+    triggered by the allocations take a large part of the loading time.
+    """
+    is_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if is_enabled:
+            gc.enable()
+
+
+class DayDatetimeDict(dict):
+    """A cache of the datetime (at midnight) of each day ordinal (c.f. `datetime.datetime.fromordinal`)."""
+
+    def __missing__(self, day: int) -> datetime.datetime:
+        day_datetime = self[day] = datetime.datetime.fromordinal(day)
+        return day_datetime
+
+
+def load_pkb(
+        opencal_db_path: os.PathLike,
+        columnar: bool = False,
+        tags: Optional[List[str]] = None
+    ) -> List[Card]:
     """
     Load the personal knowledge base (PKB) from an SQLite database.
 
@@ -130,12 +367,23 @@ def load_pkb(opencal_db_path: os.PathLike) -> List[Card]:
     ----------
     opencal_db_path : os.PathLike
         The file path from which the PKB should be loaded.
+    columnar : bool, optional
+        If True, consolidation reviews are loaded in a `ReviewTable` and the
+        returned cards are `LazyCard` views on this table (c.f. `load_pkb_columnar`).
+        Default is False.
+    tags : List[str], optional
+        If not None, only the cards having at least one of these tags are
+        loaded (the filter is applied by SQLite on the `t_card_tag` table).
+        Default is None, i.e. all the cards are loaded.
 
     Returns
     -------
     List[Card]
         A list of cards.
     """
+    if columnar:
+        card_list, _ = load_pkb_columnar(opencal_db_path, tags=tags)
+        return card_list
 
     # opencal_db_path = opencal.path.expand_path(opencal.cfg['opencal']['db_path'])    # TODO: remove this line to the caller
     opencal_db_path = opencal.path.expand_path(opencal_db_path)
@@ -144,27 +392,135 @@ def load_pkb(opencal_db_path: os.PathLike) -> List[Card]:
     if not os.path.exists(opencal_db_path):
         create_all_tables(opencal_db_path)
 
-    con = sqlite3.connect(opencal_db_path)
+    migrate_db(opencal_db_path)
+
+    card_filter_str, card_filter_params = card_tag_filter(tags, "id")
+    review_filter_str, review_filter_params = card_tag_filter(tags, "card_id")
+
+    con = get_connection(opencal_db_path)
+
+    # Cards and reviews are read in a single pass: both queries are sorted by card ID (reviews are then sorted
+    # by date with the (card_id, review_day) index of the review table, no sort is needed), so the reviews of
+    # each card are read right after the card. Two queries are merged rather than joined to avoid copying the
+    # question and the answer of each card for each of its reviews.
+    # Dates are read as day ordinals (c.f. the "creation_day" and "review_day" columns) instead of being parsed.
+    card_cur = con.execute(f"SELECT id, creation_day, is_hidden, question, answer, tags FROM {CARD_TABLE_NAME} WHERE {card_filter_str} ORDER BY id", card_filter_params)
+    review_cur = con.execute(f"SELECT card_id, review_day, is_right_answer FROM {CONSOLIDATION_REVIEW_TABLE_NAME} WHERE {review_filter_str} ORDER BY card_id, review_day, id", review_filter_params)
+
+    day_datetime_dict = DayDatetimeDict()     # Dates are shared by many cards and reviews
+
+    cards_list: List[Card] = []
+
+    review_row_iterator = iter(review_cur)
+    review_row = next(review_row_iterator, None)
+
+    # Cards are built with the garbage collector paused (c.f. `paused_garbage_collector`)
+    with paused_garbage_collector():
+        # For each card in the database
+        for row in card_cur:
+            card_id: int
+            creation_day: int
+            is_hidden: int          # This boolean variable is stored as an integer as SQLite does not have a boolean type
+            question: str
+            answer: str
+            tags_str: str
+
+            card_id, creation_day, is_hidden, question, answer, tags_str = row
+
+            tags_str = tags_str.strip(" \t\r\n")        # Remove leading and trailing whitespaces, tabulations, and newlines
+            tags_list = tags_str.split("\n")
+
+            if tags_list == [""]:
+                tags_list = []
+
+            # LOAD THE REVIEWS OF THE CARD
+
+            review_list: List[ConsolidationReview] = []
+
+            # Reviews of cards missing in the card table (i.e. with a smaller card ID) are skipped
+            while review_row is not None and review_row[0] <= card_id:
+                if review_row[0] == card_id:
+                    review_list.append(ConsolidationReview(
+                        review_datetime=day_datetime_dict[review_row[1]],
+                        is_right_answer=review_row[2]
+                    ))
+                review_row = next(review_row_iterator, None)
+
+            cards_list.append(Card(
+                creation_datetime=day_datetime_dict[creation_day],
+                question=question,
+                answer=answer,
+                is_hidden=bool(is_hidden),
+                tags=tags_list,
+                consolidation_reviews=review_list,
+                id=card_id
+            ))
+
+    # The date of the last activity of each card is computed by the Card constructor
+    for card in cards_list:
+        card.mark_clean()
+
+    return cards_list
+
+
+def load_pkb_columnar(
+        opencal_db_path: os.PathLike,
+        tags: Optional[List[str]] = None
+    ) -> Tuple[List[Card], "ReviewTable"]:
+    """
+    Load the personal knowledge base (PKB) from an SQLite database in columnar mode.
+
+    Consolidation reviews are loaded in a single `ReviewTable` (a few bytes
+    per review) and each card is a `LazyCard` which builds its
+    `ConsolidationReview` objects only when they are accessed.
+
+    Parameters
+    ----------
+    opencal_db_path : os.PathLike
+        The file path from which the PKB should be loaded.
+    tags : List[str], optional
+        If not None, only the cards having at least one of these tags are loaded (c.f. `load_pkb`).
+
+    Returns
+    -------
+    Tuple[List[Card], ReviewTable]
+        A list of cards (sorted by ID) and the table of their consolidation reviews.
+    """
+    import numpy as np      # NumPy (and the columnar classes) are imported on demand to keep "import opencal" fast
+    from opencal.review_table import LazyCard
+
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    # Make sure the database exists otherwise create it
+    if not os.path.exists(opencal_db_path):
+        create_all_tables(opencal_db_path)
+
+    migrate_db(opencal_db_path)
+
+    review_table = load_review_table(opencal_db_path, tags=tags)
+
+    con = get_connection(opencal_db_path)
     cur = con.cursor()
 
-    # LOAD CARDS ######################
+    card_filter_str, card_filter_params = card_tag_filter(tags, "id")
+
+    sql_query_str = f"SELECT id, creation_day, is_hidden, question, answer, tags FROM {CARD_TABLE_NAME} WHERE {card_filter_str} ORDER BY id"
+    cur.execute(sql_query_str, card_filter_params)
+    rows = cur.fetchall()
 
-    cards_dict: Dict[int, Card] = {}   # A dictionary containing all the cards
+    # Rows of the review table containing the reviews of each card (reviews are sorted by card ID)
+    card_id_array = np.array([row[0] for row in rows], dtype=np.int32)
+    review_start_list = np.searchsorted(review_table.card_id, card_id_array, side="left").tolist()
+    review_stop_list = np.searchsorted(review_table.card_id, card_id_array, side="right").tolist()
 
-    sql_query_str = f"SELECT id, creation_datetime, is_hidden, question, answer, tags FROM {CARD_TABLE_NAME} ORDER BY id"
+    card_list: List[Card] = []
 
-    # For each card in the database
-    for row in cur.execute(sql_query_str):
-        card_id: int
-        card_creation_date_str: str
-        is_hidden: int          # This boolean variable is stored as an integer as SQLite does not have a boolean type
-        question: str
-        answer: str
-        tags_str: str
+    day_datetime_dict = DayDatetimeDict()     # Dates are shared by many cards
 
-        card_id, card_creation_date_str, is_hidden, question, answer, tags_str = row
+    for card_index, row in enumerate(rows):
+        card_id, creation_day, is_hidden, question, answer, tags_str = row
 
-        card_creation_date = datetime.datetime.strptime(card_creation_date_str, PY_DATE_FORMAT) #.date()
+        card_creation_date = day_datetime_dict[creation_day]
 
         tags_str = tags_str.strip(" \t\r\n")        # Remove leading and trailing whitespaces, tabulations, and newlines
         tags_list = tags_str.split("\n")
@@ -172,220 +528,1414 @@ def load_pkb(opencal_db_path: os.PathLike) -> List[Card]:
         if tags_list == [""]:
             tags_list = []
 
-        cards_dict[card_id] = Card(
+        card = LazyCard(
             creation_datetime=card_creation_date,
             question=question,
             answer=answer,
             is_hidden=bool(is_hidden),
-            tags=tags_list
+            tags=tags_list,
+            id=card_id,
+            review_table=review_table,
+            review_rows=slice(review_start_list[card_index], review_stop_list[card_index])
         )
+        card.mark_clean()
+        card_list.append(card)
 
-    # LOAD REVIEWS ####################
+    return card_list, review_table
 
-    sql_query_str = f"SELECT id, card_id, review_datetime, is_right_answer FROM {CONSOLIDATION_REVIEW_TABLE_NAME} ORDER BY review_datetime"
 
-    # For each *consolidation review* in the database
-    for row in cur.execute(sql_query_str):
-        review_id, card_id, review_date_str, is_right_answer = row
+def fetch_int64_array(
+        cur: sqlite3.Cursor,
+        num_columns: int,
+        chunk_size: int = 100000
+    ) -> "np.ndarray":
+    """
+    Fetch the rows of an executed query whose columns are all integers in a NumPy array.
 
-        review_date = datetime.datetime.strptime(review_date_str, PY_DATE_FORMAT) #.date()
+    Rows are converted by chunks: the whole result is never held in a list of tuples.
 
-        consolidation_review = ConsolidationReview(
-            review_datetime=review_date,
-            is_right_answer=is_right_answer
-        )
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        The cursor of the executed query.
+    num_columns : int
+        The number of columns of the query.
+    chunk_size : int, optional
+        The number of rows converted at once (default is 100000).
 
-        cards_dict[card_id]["reviews"].append(consolidation_review)
+    Returns
+    -------
+    np.ndarray
+        The rows (int64, shape `(num_rows, num_columns)`).
+    """
+    import numpy as np
 
-    con.close()
+    chunk_list = []
+    rows = cur.fetchmany(chunk_size)
+    while rows:
+        chunk_list.append(np.array(rows, dtype=np.int64))
+        rows = cur.fetchmany(chunk_size)
 
-    # Sort the dictionary items **by key** and then extracts the values, resulting in a list of cards **sorted by their IDs**.
-    cards_list = [card for _, card in sorted(cards_dict.items())]
+    return np.concatenate(chunk_list) if chunk_list else np.zeros((0, num_columns), dtype=np.int64)
 
-    # Sort reviews for each card by date
-    for card in cards_list:
-        card.consolidation_reviews = sorted(card.consolidation_reviews, key=lambda consolidation_review: consolidation_review.review_datetime)
 
-    return cards_list
+def load_review_table(
+        opencal_db_path: os.PathLike,
+        chunk_size: int = 100000,
+        tags: Optional[List[str]] = None
+    ) -> "ReviewTable":
+    """
+    Load all the consolidation reviews of the database in a `ReviewTable`.
 
+    Dates are converted to day ordinals and reviews are sorted by card ID
+    and date by SQLite (no `strptime` call and no sort in Python).
 
-###############################################################################
+    Parameters
+    ----------
+    opencal_db_path : os.PathLike
+        The SQLite database to read.
+    chunk_size : int, optional
+        The number of rows converted to NumPy arrays at once (default is 100000).
+    tags : List[str], optional
+        If not None, only the reviews of the cards having at least one of these tags are loaded (c.f. `load_pkb`).
+
+    Returns
+    -------
+    ReviewTable
+        The consolidation reviews.
+    """
+    import numpy as np
+    from opencal.review_table import NO_RESPONSE_TIME, ReviewTable
 
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
 
-def create_all_tables(opencal_db_path: os.PathLike) -> None:
+    review_filter_str, review_filter_params = card_tag_filter(tags, "card_id")
+
+    con = get_connection(opencal_db_path)
+    cur = con.cursor()
+
+    # Dates are read as day ordinals (c.f. the "review_day" column)
+    sql_query_str = f"""SELECT card_id,
+        review_day,
+        is_right_answer,
+        IFNULL(user_response_time_ms, {NO_RESPONSE_TIME})
+    FROM {CONSOLIDATION_REVIEW_TABLE_NAME}
+    WHERE {review_filter_str}
+    ORDER BY card_id, review_day, id"""
+
+    cur.execute(sql_query_str, review_filter_params)
+
+    data = fetch_int64_array(cur, 4, chunk_size)
+    user_response_time_ms = data[:, 3]
+
+    return ReviewTable(
+        card_id=data[:, 0],
+        day=data[:, 1],
+        is_right_answer=data[:, 2].astype(bool),
+        user_response_time_ms=user_response_time_ms if np.any(user_response_time_ms != NO_RESPONSE_TIME) else None
+    )
+
+
+def load_card_tag_table(
+        opencal_db_path: os.PathLike,
+        vocabulary: Optional["TagVocabulary"] = None,
+        tags: Optional[List[str]] = None
+    ) -> "CardTagTable":
     """
-    Create all necessary tables in the SQLite database.
+    Load the tags of all the cards of the database in a `CardTagTable`.
+
+    Cards are in the same order than the cards returned by `load_pkb` (i.e.
+    sorted by ID) so that the table can be given to professors (c.f. the
+    `card_tag_table` parameter of Berenice, Celia and Doreen). The same `tags`
+    filter must be given to both functions.
+
+    Parameters
+    ----------
+    opencal_db_path : os.PathLike
+        The SQLite database to read.
+    vocabulary : TagVocabulary, optional
+        The vocabulary to extend (default is None, i.e. a new vocabulary).
+    tags : List[str], optional
+        If not None, only the cards having at least one of these tags are
+        loaded (c.f. the `tags` parameter of `load_pkb`). Default is None.
+
+    Returns
+    -------
+    CardTagTable
+        The interned tags of each card.
+    """
+    import numpy as np
+    from opencal.tag_table import CardTagTable, TagVocabulary
+
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    if vocabulary is None:
+        vocabulary = TagVocabulary()
+
+    migrate_db(opencal_db_path)
+
+    card_filter_str, card_filter_params = card_tag_filter(tags, "id")
+
+    con = get_connection(opencal_db_path)
+    cur = con.cursor()
+
+    intern = vocabulary.intern
+    offset_list = [0]
+    tag_id_list = []
+
+    for (tags_str,) in cur.execute(f"SELECT tags FROM {CARD_TABLE_NAME} WHERE {card_filter_str} ORDER BY id", card_filter_params):
+        tags_str = tags_str.strip(" \t\r\n")        # Remove leading and trailing whitespaces, tabulations, and newlines
+        if tags_str != "":
+            tag_id_list.extend(intern(tag) for tag in tags_str.split("\n"))
+        offset_list.append(len(tag_id_list))
+
+    return CardTagTable(vocabulary, np.array(offset_list, dtype=np.int64), np.array(tag_id_list, dtype=np.int32))
+
+
+def load_pkb_dataframes(
+        opencal_db_path: os.PathLike,
+        tags: Optional[List[str]] = None
+    ) -> Tuple["pd.DataFrame", "pd.DataFrame", "pd.DataFrame"]:
+    """
+    Load the cards, the consolidation reviews and the tags of the database in pandas DataFrames (e.g. for analytics notebooks).
+
+    The columns of the DataFrames are read directly from SQLite: no `Card` is
+    made. The card and review DataFrames have the same columns than the ones
+    made by `opencal.core.data.card_list_to_dataframes`.
+
+    Parameters
+    ----------
+    opencal_db_path : os.PathLike
+        The SQLite database to read.
+    tags : List[str], optional
+        Only load the cards with at least one of these tags (default is None, i.e. all the cards).
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]
+        The card DataFrame ("cdate" and "hidden" columns, indexed by card ID),
+        the review DataFrame ("rdate", "result" and "card_id" columns, "result"
+        is a categorical column; reviews are sorted by card and date) and the
+        tag DataFrame ("card_id" and "tag" columns, "tag" is a categorical
+        column; one row per tag of each card).
+    """
+    import numpy as np
+    import pandas as pd     # Imported here: pandas is slow to import and only needed by this function
+
+    from opencal.core.data import RIGHT_ANSWER_STR, WRONG_ANSWER_STR
+
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    migrate_db(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+    cur = con.cursor()
+
+    # Only integer columns are read (dates as day ordinals, tags as tag IDs): rows are converted to NumPy
+    # arrays without making intermediate Python objects for each value (c.f. `fetch_int64_array`)
+    unix_epoch_ordinal = datetime.date(1970, 1, 1).toordinal()
+
+    card_filter_str, card_filter_params = card_tag_filter(tags, "id")
+    cur.execute(f"SELECT id, creation_day, is_hidden FROM {CARD_TABLE_NAME} WHERE {card_filter_str} ORDER BY id", card_filter_params)
+    card_data = fetch_int64_array(cur, 3)
+
+    card_df = pd.DataFrame(
+        {
+            "cdate": pd.to_datetime(card_data[:, 1] - unix_epoch_ordinal, unit="D"),
+            "hidden": card_data[:, 2].astype(bool)
+        },
+        index=pd.Index(card_data[:, 0], name="card_id")
+    )
+
+    # The query is covered by the (card_id, review_day, id, is_right_answer) index
+    review_filter_str, review_filter_params = card_tag_filter(tags, "card_id")
+    cur.execute(f"""SELECT card_id, review_day, is_right_answer FROM {CONSOLIDATION_REVIEW_TABLE_NAME}
+        WHERE {review_filter_str} ORDER BY card_id, review_day, id""", review_filter_params)
+    review_data = fetch_int64_array(cur, 3)
+
+    review_df = pd.DataFrame({
+        "rdate": pd.to_datetime(review_data[:, 1] - unix_epoch_ordinal, unit="D"),
+        "result": pd.Categorical.from_codes((review_data[:, 2] != 0).astype(np.int8), categories=[WRONG_ANSWER_STR, RIGHT_ANSWER_STR]),
+        "card_id": review_data[:, 0]
+    })
+
+    tag_id_list, tag_name_list = [], []
+    for tag_id, tag_name in cur.execute(f"SELECT id, name FROM {TAG_TABLE_NAME} ORDER BY id"):
+        tag_id_list.append(tag_id)
+        tag_name_list.append(tag_name)
+
+    tag_filter_str, tag_filter_params = card_tag_filter(tags, "card_id")
+    cur.execute(f"SELECT card_id, tag_id FROM {CARD_TAG_TABLE_NAME} WHERE {tag_filter_str} ORDER BY card_id, tag_id", tag_filter_params)
+    card_tag_data = fetch_int64_array(cur, 2)
+
+    # Tag IDs are converted to the codes of the categories (the positions of the tags in `tag_name_list`)
+    tag_df = pd.DataFrame({
+        "card_id": card_tag_data[:, 0],
+        "tag": pd.Categorical.from_codes(np.searchsorted(np.array(tag_id_list, dtype=np.int64), card_tag_data[:, 1]), categories=tag_name_list)
+    })
+
+    return card_df, review_df, tag_df
+
+
+# TAGS ########################################################################
+
+SQL_INSERT_TAG_REQUEST = f"INSERT OR IGNORE INTO {TAG_TABLE_NAME} (name) VALUES (?)"
+
+SQL_INSERT_CARD_TAG_REQUEST = f"""INSERT OR IGNORE INTO {CARD_TAG_TABLE_NAME} (card_id, tag_id)
+    SELECT ?, id FROM {TAG_TABLE_NAME} WHERE name=?
+    """
+
+
+def card_tag_filter(
+        tags: Optional[List[str]],
+        card_id_column: str
+    ) -> Tuple[str, List[str]]:
+    """
+    Make the SQL condition selecting the rows of the cards having at least one of the given tags.
+
+    Parameters
+    ----------
+    tags : List[str], optional
+        The tags. If None, the condition is always true.
+    card_id_column : str
+        The column containing the card ID in the filtered table (e.g. "id" in the card table, "card_id" in the review tables).
+
+    Returns
+    -------
+    Tuple[str, List[str]]
+        The condition (to put in a WHERE clause) and its parameters.
+    """
+    if tags is None:
+        return "1", []
+
+    placeholders_str = ", ".join("?" * len(tags))
+
+    sql_condition_str = f"""{card_id_column} IN (
+        SELECT {CARD_TAG_TABLE_NAME}.card_id
+        FROM {CARD_TAG_TABLE_NAME} JOIN {TAG_TABLE_NAME} ON {TAG_TABLE_NAME}.id = {CARD_TAG_TABLE_NAME}.tag_id
+        WHERE {TAG_TABLE_NAME}.name IN ({placeholders_str})
+    )"""
+
+    return sql_condition_str, list(tags)
+
+
+def save_card_tags(
+        cur: sqlite3.Cursor,
+        card_tags_list: List[Tuple[int, List[str]]],
+        replace: bool = True
+    ) -> None:
+    """
+    Write the tags of some cards in the tag tables (`t_tag` and `t_card_tag`).
+
+    The transaction is not committed: this is the responsibility of the caller.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        A cursor on the OpenCAL database.
+    card_tags_list : List[Tuple[int, List[str]]]
+        The (card ID, tags) of each card.
+    replace : bool, optional
+        If True (the default), the tags previously associated with these cards are removed.
+
+    Returns
+    -------
+    None
+    """
+    if replace:
+        cur.executemany(f"DELETE FROM {CARD_TAG_TABLE_NAME} WHERE card_id=?", [(card_id,) for card_id, _ in card_tags_list])
+
+    cur.executemany(SQL_INSERT_TAG_REQUEST, [(tag,) for tag in {tag for _, tags in card_tags_list for tag in tags}])
+    cur.executemany(SQL_INSERT_CARD_TAG_REQUEST, [(card_id, tag) for card_id, tags in card_tags_list for tag in tags])
+
+
+def ensure_card_tag_tables(opencal_db_path: os.PathLike) -> None:
+    """
+    Create (and fill from the `tags` column of the card table) the tag tables of databases created before these tables existed.
+
+    Parameters
+    ----------
+    opencal_db_path : os.PathLike
+        The path to the SQLite database file.
+
+    Returns
+    -------
+    None
+    """
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+
+    with con.transaction() as cur:
+        if table_exists(cur, TAG_TABLE_NAME) and table_exists(cur, CARD_TAG_TABLE_NAME):
+            return
+
+        create_tag_table(opencal_db_path)
+        create_card_tag_table(opencal_db_path)
+
+        card_tags_list = []
+        for card_id, tags_str in cur.execute(f"SELECT id, tags FROM {CARD_TABLE_NAME}").fetchall():
+            tags_str = tags_str.strip(" \t\r\n")        # Remove leading and trailing whitespaces, tabulations, and newlines
+            if tags_str != "":
+                card_tags_list.append((card_id, tags_str.split("\n")))
+
+        save_card_tags(cur, card_tags_list, replace=False)
+
+
+# CARD IDS ####################################################################
+
+def card_content_digest(card: Card) -> str:
+    """
+    Compute a digest of the content (creation date, question and answer) of a card.
+
+    This digest is stored (and indexed) in the card table to find the ID of
+    cards that have not been loaded from the database (i.e. `card.id` is None).
+
+    Parameters
+    ----------
+    card : Card
+        The card.
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA-1 digest of the card content.
+    """
+    content_str = "\0".join((card.creation_datetime.strftime(PY_DATE_FORMAT), card.question, card.answer or ""))
+    return hashlib.sha1(content_str.encode("utf-8")).hexdigest()
+
+
+def ensure_card_content_digest_column(con: Any) -> None:
+    """
+    Add (and fill) the `content_digest` column to the card table of databases created before this column existed.
+
+    Parameters
+    ----------
+    con : DatabaseConnection or sqlite3.Connection
+        A connection to the OpenCAL database.
+
+    Returns
+    -------
+    None
+    """
+    column_list = [row[1] for row in con.execute(f"PRAGMA table_info({CARD_TABLE_NAME})")]
+
+    if "content_digest" not in column_list:
+        con.execute(f"ALTER TABLE {CARD_TABLE_NAME} ADD COLUMN content_digest TEXT")
+        con.execute(f"CREATE INDEX IF NOT EXISTS i_card_content_digest ON {CARD_TABLE_NAME}(content_digest)")
+
+        # Creation dates are truncated to the day like in `card_content_digest` (older databases may contain a time)
+        update_params = []
+        for card_id, creation_date_str, question, answer in con.execute(f"SELECT id, substr(creation_datetime, 1, 10), question, answer FROM {CARD_TABLE_NAME}").fetchall():
+            content_str = "\0".join((creation_date_str, question, answer or ""))
+            update_params.append((hashlib.sha1(content_str.encode("utf-8")).hexdigest(), card_id))
+
+        con.executemany(f"UPDATE {CARD_TABLE_NAME} SET content_digest=? WHERE id=?", update_params)
+        con.commit()
+
+
+def get_card_id(
+        con: Any,
+        card: Card
+    ) -> int:
+    """
+    Get the primary key of a card in the database.
+
+    The primary key carried by the card (`card.id`, set by `load_pkb` and
+    `save_pkb`) is used when available, otherwise the card is looked up by
+    the digest of its content (indexed lookup); the ID found is then stored
+    in `card.id` so that the lookup is made only once.
+
+    Parameters
+    ----------
+    con : DatabaseConnection or sqlite3.Connection
+        A connection to the OpenCAL database.
+    card : Card
+        The card.
+
+    Returns
+    -------
+    int
+        The ID of the card in the database.
+
+    Raises
+    ------
+    ValueError
+        If the card is not in the database.
+    """
+    if card.id is None:
+        ensure_card_content_digest_column(con)
+
+        sql_query = f"SELECT id FROM {CARD_TABLE_NAME} WHERE content_digest=? ORDER BY id"
+        rows = con.execute(sql_query, (card_content_digest(card),)).fetchall()
+
+        if rows:
+            card.id = rows[0][0]
+            if len(rows) > 1:
+                warnings.warn("More than one record found for the (creation_datetime, question, answer) tuple.")
+        else:
+            raise ValueError("No card ID found in the database.")
+
+    return card.id
+
+
+# CARD SCHEDULES ##############################################################
+
+SQL_UPSERT_CARD_SCHEDULE_REQUEST = f"""INSERT OR REPLACE INTO {CARD_SCHEDULE_TABLE_NAME}
+( card_id,  grade,  expected_revision_date,  last_review_date,  last_review_is_right_answer,  previous_grade,  previous_expected_revision_date) VALUES
+(:card_id, :grade, :expected_revision_date, :last_review_date, :last_review_is_right_answer, :previous_grade, :previous_expected_revision_date)
+"""
+
+
+def schedule_to_sql_params(
+        card_id: int,
+        schedule: CardSchedule
+    ) -> Dict[str, Any]:
+    """
+    Convert the scheduling state of a card to the parameters of `SQL_UPSERT_CARD_SCHEDULE_REQUEST`.
+
+    Parameters
+    ----------
+    card_id : int
+        The ID of the card in the database.
+    schedule : CardSchedule
+        The scheduling state of the card.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The named parameters of the SQL request.
+    """
+    return {
+        "card_id": int(card_id),
+        "grade": schedule.grade,
+        "expected_revision_date": schedule.expected_revision_date.strftime(PY_DATE_FORMAT),
+        "last_review_date": schedule.last_review_date.strftime(PY_DATE_FORMAT) if schedule.last_review_date is not None else None,
+        "last_review_is_right_answer": schedule.last_review_is_right_answer,
+        "previous_grade": schedule.previous_grade,
+        "previous_expected_revision_date": schedule.previous_expected_revision_date.strftime(PY_DATE_FORMAT)
+    }
+
+
+def save_card_schedule(
+        cur: sqlite3.Cursor,
+        card_id: int,
+        schedule: CardSchedule
+    ) -> None:
+    """
+    Insert or update the scheduling state of one card.
+
+    The caller is responsible for committing the transaction.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        A cursor on the OpenCAL database.
+    card_id : int
+        The ID of the card in the database.
+    schedule : CardSchedule
+        The new scheduling state of the card.
+
+    Returns
+    -------
+    None
+    """
+    cur.execute(SQL_UPSERT_CARD_SCHEDULE_REQUEST, schedule_to_sql_params(card_id, schedule))
+
+
+def load_due_card_schedules(
+        cur: sqlite3.Cursor,
+        today: datetime.date
+    ) -> Dict[int, CardSchedule]:
+    """
+    Load the scheduling state of the cards that are relevant for a consolidation session.
+
+    Only cards that should be reviewed today (i.e. cards whose expected
+    revision date is over) and cards that have already been reviewed today
+    are returned. Both conditions are resolved by the indexes of the
+    schedule table, the review history of the cards is not read.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        A cursor on the OpenCAL database.
+    today : datetime.date
+        The current date.
+
+    Returns
+    -------
+    Dict[int, CardSchedule]
+        The scheduling state of the selected cards, indexed by card ID.
+    """
+    today_str = today.strftime(PY_DATE_FORMAT)
+
+    sql_query_str = f"""SELECT card_id, grade, expected_revision_date, last_review_date, last_review_is_right_answer, previous_grade, previous_expected_revision_date
+    FROM {CARD_SCHEDULE_TABLE_NAME}
+    WHERE expected_revision_date <= ? OR last_review_date = ?"""
+
+    schedule_dict: Dict[int, CardSchedule] = {}
+
+    for row in cur.execute(sql_query_str, (today_str, today_str)):
+        card_id, grade, expected_revision_date_str, last_review_date_str, last_review_is_right_answer, previous_grade, previous_expected_revision_date_str = row
+
+        schedule_dict[card_id] = CardSchedule(
+            grade=grade,
+            expected_revision_date=datetime.datetime.strptime(expected_revision_date_str, PY_DATE_FORMAT).date(),
+            last_review_date=datetime.datetime.strptime(last_review_date_str, PY_DATE_FORMAT).date() if last_review_date_str is not None else None,
+            last_review_is_right_answer=bool(last_review_is_right_answer) if last_review_is_right_answer is not None else None,
+            previous_grade=previous_grade,
+            previous_expected_revision_date=datetime.datetime.strptime(previous_expected_revision_date_str, PY_DATE_FORMAT).date()
+        )
+
+    return schedule_dict
+
+
+def load_scheduled_card_ids(cur: sqlite3.Cursor) -> set:
+    """
+    Get the ID of all the cards having a scheduling state in the database.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        A cursor on the OpenCAL database.
+
+    Returns
+    -------
+    set
+        The set of scheduled card IDs.
+    """
+    return {row[0] for row in cur.execute(f"SELECT card_id FROM {CARD_SCHEDULE_TABLE_NAME}")}
+
+
+def load_card_schedules(
+        opencal_db_path: os.PathLike,
+        today: datetime.date
+    ) -> Tuple[Optional[Dict[int, CardSchedule]], Optional[Set[int]]]:
+    """
+    Load the scheduling state given to Doreen (c.f. the `due_card_schedules` and `scheduled_card_ids` parameters of `ProfessorDoreen`).
+
+    Parameters
+    ----------
+    opencal_db_path : os.PathLike
+        The SQLite database to read.
+    today : datetime.date
+        The current date.
+
+    Returns
+    -------
+    Tuple[Optional[Dict[int, CardSchedule]], Optional[Set[int]]]
+        The scheduling state of the due cards (c.f. `load_due_card_schedules`)
+        and the ID of all the scheduled cards, or (None, None) if the
+        database has no schedule table.
+    """
+    cur = get_connection(opencal_db_path).cursor()
+
+    if not table_exists(cur, CARD_SCHEDULE_TABLE_NAME):
+        return None, None
+
+    return load_due_card_schedules(cur, today), load_scheduled_card_ids(cur)
+
+
+# ASSESS CACHE ################################################################
+
+SQL_UPSERT_ASSESS_CACHE_REQUEST = f"""INSERT OR REPLACE INTO {ASSESS_CACHE_TABLE_NAME}
+(professor, card_id, ignore_today_answers, creation_day, num_reviews, last_review_day, today, grade) VALUES
+(?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def load_assess_cache(
+        cur: sqlite3.Cursor,
+        professor_name: str,
+        today: datetime.date
+    ) -> List[Tuple[int, int, int, int, int, int]]:
+    """
+    Load the grades computed today by the `assess` function of a professor.
+
+    Dates are stored as day ordinals (c.f. `datetime.date.toordinal`), so rows
+    are returned as they are read (no date parsing).
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        A cursor on the OpenCAL database.
+    professor_name : str
+        The name of the professor (e.g. "doreen").
+    today : datetime.date
+        The current date.
+
+    Returns
+    -------
+    List[Tuple[int, int, int, int, int, int]]
+        The (card ID, ignore_today_answers, creation day, number of reviews, last review day, grade) of each cached grade
+        (the last review day is 0 for cards without review).
+    """
+    sql_query_str = f"""SELECT card_id, ignore_today_answers, creation_day, num_reviews, last_review_day, grade
+    FROM {ASSESS_CACHE_TABLE_NAME}
+    WHERE professor = ? AND today = ?"""
+
+    return cur.execute(sql_query_str, (professor_name, today.toordinal())).fetchall()
+
+
+def save_assess_cache(
+        cur: sqlite3.Cursor,
+        professor_name: str,
+        today: datetime.date,
+        entry_list: List[Tuple[int, int, int, int, int, int]]
+    ) -> None:
+    """
+    Insert or update grades computed today by the `assess` function of a professor.
+
+    Grades computed on previous days are useless (the grade of a card depends
+    on the current date): they are deleted. The caller is responsible for
+    committing the transaction.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        A cursor on the OpenCAL database.
+    professor_name : str
+        The name of the professor (e.g. "doreen").
+    today : datetime.date
+        The current date.
+    entry_list : List[Tuple[int, int, int, int, int, int]]
+        The (card ID, ignore_today_answers, creation day, number of reviews, last review day, grade) of each grade to save,
+        with the same encoding as `load_assess_cache`.
+
+    Returns
+    -------
+    None
+    """
+    today_day = today.toordinal()
+
+    cur.execute(f"DELETE FROM {ASSESS_CACHE_TABLE_NAME} WHERE professor = ? AND today <> ?", (professor_name, today_day))
+    cur.executemany(SQL_UPSERT_ASSESS_CACHE_REQUEST, ((professor_name,) + entry[:-1] + (today_day, entry[-1]) for entry in entry_list))
+
+
+def table_exists(
+        cur: sqlite3.Cursor,
+        table_name: str
+    ) -> bool:
+    """
+    Check whether a table exists in the database.
+
+    Parameters
+    ----------
+    cur : sqlite3.Cursor
+        A cursor on the OpenCAL database.
+    table_name : str
+        The name of the table.
+
+    Returns
+    -------
+    bool
+        True if the table exists, False otherwise.
+    """
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+    return cur.fetchone() is not None
+
+
+# CHANGE LOG ##################################################################
+
+# The rows inserted, updated or deleted in these tables since the last full backup are logged in the change log table
+# (by triggers) to make differential backups (c.f. `backup_db`). Tag tables are rebuilt from the card table and the
+# assess cache is cleared when a differential backup is restored.
+# The triggers add an insert to each write of these tables: they are only created by the first differential backup
+# of a database (c.f. `ensure_change_log`), databases that are never backed up differentially don't pay this cost.
+CHANGE_LOG_TABLE_LIST = [
+    CARD_TABLE_NAME,
+    CONSOLIDATION_REVIEW_TABLE_NAME,
+    ACQUISITION_REVIEW_TABLE_NAME,
+    CARD_SCHEDULE_TABLE_NAME,
+]
+
+LAST_FULL_BACKUP_ID_CONFIG_KEY = "last_full_backup_id"
+LAST_FULL_BACKUP_FILE_CONFIG_KEY = "last_full_backup_file"
+BASE_BACKUP_ID_CONFIG_KEY = "base_backup_id"               # Only in differential backups
+BASE_BACKUP_FILE_CONFIG_KEY = "base_backup_file"           # Only in differential backups
+
+
+def ensure_change_log_table(opencal_db_path: os.PathLike) -> None:
+    """Create the change log table (without the triggers filling it, c.f. `ensure_change_log`) if it doesn't exist yet."""
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+
+    with con.transaction() as cur:
+        # A row is logged once, whatever the number of changes
+        cur.execute(f"""CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE_NAME} (
+            table_name  TEXT NOT NULL,
+            row_id      INTEGER NOT NULL,
+            PRIMARY KEY(table_name, row_id)
+        ) WITHOUT ROWID""")
+
+
+def ensure_change_log(opencal_db_path: os.PathLike) -> bool:
+    """
+    Create the change log table and the triggers filling it, if they don't exist yet.
+
+    This function is called by `backup_db` when a differential backup is
+    requested: the triggers make every write of the tables of
+    `CHANGE_LOG_TABLE_LIST` slower, they are not created by `create_all_tables`
+    and `migrate_db`.
+
+    Tables are recreated without their triggers by the `create_X_table` functions: this function must be called again after them.
+
+    Parameters
+    ----------
+    opencal_db_path : os.PathLike
+        The path to the SQLite database file.
+
+    Returns
+    -------
+    bool
+        True if the change log table or some of its triggers have been created
+        (i.e. changes made before may be missing from the log), False otherwise.
+    """
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+
+    ensure_change_log_table(opencal_db_path)
+
+    with con.transaction() as cur:
+        is_created = False
+
+        trigger_set = {row[0] for row in cur.execute("SELECT name FROM sqlite_master WHERE type='trigger'")}
+
+        for table_name in CHANGE_LOG_TABLE_LIST:
+            if not table_exists(cur, table_name):
+                continue
+
+            for operation, row_list in (("INSERT", ["NEW"]), ("UPDATE", ["OLD", "NEW"]), ("DELETE", ["OLD"])):
+                trigger_name = f"tr_{table_name}_{operation.lower()}_change_log"
+                if trigger_name not in trigger_set:
+                    # The conflict clause of the statement firing a trigger overrides the ones of the trigger: "INSERT OR IGNORE" can't be used
+                    insert_str = "".join(f"""INSERT INTO {CHANGE_LOG_TABLE_NAME} (table_name, row_id) SELECT '{table_name}', {row}.rowid
+                        WHERE NOT EXISTS (SELECT 1 FROM {CHANGE_LOG_TABLE_NAME} WHERE table_name='{table_name}' AND row_id={row}.rowid); """ for row in row_list)
+                    cur.execute(f"CREATE TRIGGER {trigger_name} AFTER {operation} ON {table_name} FOR EACH ROW BEGIN {insert_str}END")
+                    is_created = True
+
+    return is_created
+
+
+@contextlib.contextmanager
+def unlogged_changes(opencal_db_path: os.PathLike) -> Iterator[None]:
+    """
+    Don't log the changes made in the `with` block (e.g. a full rewrite of the database, where triggers would log every row).
+
+    The changes can't be in a differential backup: the last full backup is
+    forgotten, the next differential backup is a full backup. The triggers
+    are only recreated if the database had them.
+    """
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+    cur = con.cursor()
+
+    has_change_log_triggers = False
+    for (trigger_name,) in cur.execute("SELECT name FROM sqlite_master WHERE type='trigger'").fetchall():
+        if trigger_name.endswith("_change_log"):
+            cur.execute(f"DROP TRIGGER {trigger_name}")
+            has_change_log_triggers = True
+
+    try:
+        yield
+    finally:
+        if table_exists(cur, CONFIG_TABLE_NAME):
+            cur.execute(f"DELETE FROM {CONFIG_TABLE_NAME} WHERE key IN (?, ?)", (LAST_FULL_BACKUP_ID_CONFIG_KEY, LAST_FULL_BACKUP_FILE_CONFIG_KEY))
+        if has_change_log_triggers:
+            ensure_change_log(opencal_db_path)
+
+
+# SCHEMA MIGRATIONS ###########################################################
+
+SCHEMA_VERSION_CONFIG_KEY = "schema_version"
+
+SQL_CREATE_CONSOLIDATION_REVIEW_INDEX_REQUEST = f"""CREATE INDEX IF NOT EXISTS i_consolidation_review_card_id_review_datetime
+    ON {CONSOLIDATION_REVIEW_TABLE_NAME}(card_id, review_datetime, is_right_answer)"""
+
+SQL_CREATE_ACQUISITION_REVIEW_INDEX_REQUEST = f"""CREATE INDEX IF NOT EXISTS i_acquisition_review_card_id_review_datetime
+    ON {ACQUISITION_REVIEW_TABLE_NAME}(card_id, review_datetime, is_right_answer)"""
+
+# Dates are stored as ISO text (e.g. "2024-01-31") and exposed as day ordinals (c.f. datetime.date.toordinal) by
+# virtual generated columns: julianday("0001-01-01") = 1721425.5 and datetime.date(1, 1, 1).toordinal() = 1
+# (the time and timezone parts of the dates are ignored). The text stays the only stored (and human readable)
+# value, so that all the writers (and the SQL dumps) keep working; the day ordinals of the reviews are stored
+# in the (card_id, review_day) index, which is used to load the PKB without parsing any date.
+SQL_CREATION_DAY_COLUMN_TYPE = "INTEGER GENERATED ALWAYS AS (CAST(julianday(substr(creation_datetime, 1, 10)) - 1721424.5 AS INTEGER)) VIRTUAL"
+SQL_REVIEW_DAY_COLUMN_TYPE = "INTEGER GENERATED ALWAYS AS (CAST(julianday(substr(review_datetime, 1, 10)) - 1721424.5 AS INTEGER)) VIRTUAL"
+
+SQL_CREATE_CONSOLIDATION_REVIEW_DAY_INDEX_REQUEST = f"""CREATE INDEX IF NOT EXISTS i_consolidation_review_card_id_review_day
+    ON {CONSOLIDATION_REVIEW_TABLE_NAME}(card_id, review_day, id, is_right_answer)"""
+
+
+def ensure_card_schedule_table(opencal_db_path: os.PathLike) -> None:
+    """Create the card schedule table of databases created before this table existed."""
+    if not table_exists(get_connection(opencal_db_path).cursor(), CARD_SCHEDULE_TABLE_NAME):
+        create_card_schedule_table(opencal_db_path)
+
+
+def ensure_assess_cache_table(opencal_db_path: os.PathLike) -> None:
+    """Create the assess cache table of databases created before this table existed."""
+    if not table_exists(get_connection(opencal_db_path).cursor(), ASSESS_CACHE_TABLE_NAME):
+        create_assess_cache_table(opencal_db_path)
+
+
+def ensure_review_indexes(opencal_db_path: os.PathLike) -> None:
+    """
+    Create the `(card_id, review_datetime)` indexes of the review tables of databases created before these indexes existed.
+
+    The `is_right_answer` column is appended to the indexes so that they
+    cover the queries reading the review history of cards (the review ID is
+    the rowid, which is part of all the indexes).
+    """
+    con = get_connection(opencal_db_path)
+    cur = con.cursor()
+
+    if table_exists(cur, CONSOLIDATION_REVIEW_TABLE_NAME):
+        cur.execute(SQL_CREATE_CONSOLIDATION_REVIEW_INDEX_REQUEST)
+    if table_exists(cur, ACQUISITION_REVIEW_TABLE_NAME):
+        cur.execute(SQL_CREATE_ACQUISITION_REVIEW_INDEX_REQUEST)
+
+    con.commit()
+
+
+def ensure_day_columns(opencal_db_path: os.PathLike) -> None:
+    """Add the day ordinal columns (and their index) to the card and consolidation review tables of databases created before these columns existed."""
+    con = get_connection(opencal_db_path)
+    cur = con.cursor()
+
+    # Generated columns are only listed by "table_xinfo"
+    for table_name, column_name, column_type in ((CARD_TABLE_NAME, "creation_day", SQL_CREATION_DAY_COLUMN_TYPE),
+                                                 (CONSOLIDATION_REVIEW_TABLE_NAME, "review_day", SQL_REVIEW_DAY_COLUMN_TYPE)):
+        column_list = [row[1] for row in cur.execute(f"PRAGMA table_xinfo({table_name})")]
+        if column_name not in column_list:
+            cur.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
+
+    cur.execute(SQL_CREATE_CONSOLIDATION_REVIEW_DAY_INDEX_REQUEST)
+    con.commit()
+
+
+# The migrations are applied in order to bring databases created by previous versions of OpenCAL to the
+# current schema (c.f. `migrate_db`). Each migration must be idempotent (a database may already be partially
+# migrated, e.g. if the application stopped during a migration) and must modify the schema in place (existing
+# tables are never dropped). New migrations are appended to the list; `create_all_tables` creates databases
+# with the latest schema.
+MIGRATION_LIST: List[Tuple[int, str, Callable[[os.PathLike], None]]] = [
+    (1, "add the content_digest column to the card table", lambda opencal_db_path: ensure_card_content_digest_column(get_connection(opencal_db_path))),
+    (2, "create the card schedule table", ensure_card_schedule_table),
+    (3, "create the assess cache table", ensure_assess_cache_table),
+    (4, "create the tag tables", ensure_card_tag_tables),
+    (5, "create the (card_id, review_datetime) indexes of the review tables", ensure_review_indexes),
+    (6, "add the day ordinal columns to the card and consolidation review tables", ensure_day_columns),
+    (7, "create the change log table of differential backups", ensure_change_log_table),
+]
+
+SCHEMA_VERSION = MIGRATION_LIST[-1][0]
+
+
+def get_config_value(con: Any, key: str) -> Optional[str]:
+    """
+    Get a value of the configuration table of a database.
+
+    Parameters
+    ----------
+    con : DatabaseConnection or sqlite3.Connection
+        A connection to the OpenCAL database.
+    key : str
+        The configuration key.
+
+    Returns
+    -------
+    str or None
+        The value of `key` (None if the configuration table or the key doesn't exist).
+    """
+    if not table_exists(con.cursor(), CONFIG_TABLE_NAME):
+        return None
+
+    row = con.execute(f"SELECT value FROM {CONFIG_TABLE_NAME} WHERE key=?", (key,)).fetchone()
+
+    return None if row is None else row[0]
+
+
+def set_config_value(con: Any, key: str, value: Any) -> None:
+    """
+    Set a value of the configuration table of a database (the table is created if needed).
+
+    The transaction is not committed: this is the responsibility of the caller.
+
+    Parameters
+    ----------
+    con : DatabaseConnection or sqlite3.Connection
+        A connection to the OpenCAL database.
+    key : str
+        The configuration key.
+    value : Any
+        The value (stored as a string).
+
+    Returns
+    -------
+    None
+    """
+    con.execute(f"CREATE TABLE IF NOT EXISTS {CONFIG_TABLE_NAME} (key TEXT PRIMARY KEY, value TEXT)")
+    con.execute(f"INSERT OR REPLACE INTO {CONFIG_TABLE_NAME} (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def get_schema_version(con: Any) -> int:
+    """
+    Get the version of the schema of a database (c.f. `MIGRATION_LIST`).
+
+    Parameters
+    ----------
+    con : DatabaseConnection or sqlite3.Connection
+        A connection to the OpenCAL database.
+
+    Returns
+    -------
+    int
+        The schema version stored in the configuration table (0 if no version has been stored yet).
+    """
+    schema_version = get_config_value(con, SCHEMA_VERSION_CONFIG_KEY)
+
+    return 0 if schema_version is None else int(schema_version)
+
+
+def set_schema_version(con: Any, version: int) -> None:
+    """
+    Store the version of the schema of a database in the configuration table.
+
+    The transaction is not committed: this is the responsibility of the caller.
+
+    Parameters
+    ----------
+    con : DatabaseConnection or sqlite3.Connection
+        A connection to the OpenCAL database.
+    version : int
+        The schema version.
+
+    Returns
+    -------
+    None
+    """
+    set_config_value(con, SCHEMA_VERSION_CONFIG_KEY, version)
+
+
+def migrate_db(opencal_db_path: os.PathLike) -> int:
+    """
+    Apply the migrations of `MIGRATION_LIST` that have not been applied to a database yet.
+
+    The version of the schema is stored in the configuration table after each
+    migration. Databases without card table (i.e. whose schema has not been
+    created) are not migrated.
+
+    Parameters
+    ----------
+    opencal_db_path : os.PathLike
+        The path to the SQLite database file.
+
+    Returns
+    -------
+    int
+        The number of migrations applied.
+    """
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+
+    if not table_exists(con.cursor(), CARD_TABLE_NAME):
+        return 0
+
+    schema_version = get_schema_version(con)
+    num_migrations = 0
+
+    for version, description, migration_function in MIGRATION_LIST:
+        if version > schema_version:
+            print(f"Migrating database {opencal_db_path} to schema version {version}: {description}")
+            migration_function(opencal_db_path)
+            set_schema_version(con, version)
+            con.commit()
+            num_migrations += 1
+
+    return num_migrations
+
+
+###############################################################################
+
+
+def create_all_tables(opencal_db_path: os.PathLike) -> None:
+    """
+    Create all necessary tables in the SQLite database.
+
+    This function creates the configuration, card, acquisition review,
+    consolidation review, card schedule, assess cache, tag and change log tables in the SQLite database located at the specified
+    path.
+
+    Parameters
+    ----------
+    opencal_db_path : os.PathLike
+        The path to the SQLite database file.
+
+    Returns
+    -------
+    None
+    """
+    create_config_table(opencal_db_path)
+    create_card_table(opencal_db_path)
+    create_consolidation_review_table(opencal_db_path)
+    create_acquisition_review_table(opencal_db_path)
+    create_card_schedule_table(opencal_db_path)
+    create_assess_cache_table(opencal_db_path)
+    create_tag_table(opencal_db_path)
+    create_card_tag_table(opencal_db_path)
+    ensure_change_log_table(opencal_db_path)
+
+    # The new database has the latest schema: no migration is needed
+    con = get_connection(opencal.path.expand_path(opencal_db_path))
+    set_schema_version(con, SCHEMA_VERSION)
+    con.commit()
+
+
+def create_config_table(opencal_db_path: os.PathLike) -> None:
+    print(f"Initializing table {CONFIG_TABLE_NAME} in database {opencal_db_path}")
+
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+    cur = con.cursor()
+
+    # DELETE TABLE ##############
+
+    print(f"Deleting table {CONFIG_TABLE_NAME} before re-creating it...")
+
+    try:
+        cur.execute(f"DROP TABLE {CONFIG_TABLE_NAME}")
+    except sqlite3.OperationalError as e:
+        # The database does not exist
+        print(e)
+
+    # CREATE TABLE ##############
+
+    print(f"Creating table {CONFIG_TABLE_NAME}...")
+
+    sql_query_str = f"""CREATE TABLE {CONFIG_TABLE_NAME} (
+        key            TEXT PRIMARY KEY,
+        value          TEXT
+    )"""
+
+    cur.execute(sql_query_str)
+    con.commit()
+
+
+def create_card_table(opencal_db_path: os.PathLike) -> None:
+    print(f"Initializing table {CARD_TABLE_NAME} in database {opencal_db_path}")
+
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+    cur = con.cursor()
+
+    # DELETE TABLE ##############
+
+    print(f"Deleting table {CARD_TABLE_NAME} before re-creating it...")
+
+    try:
+        cur.execute(f"DROP TABLE {CARD_TABLE_NAME}")
+    except sqlite3.OperationalError as e:
+        # The database does not exist
+        print(e)
+
+    # CREATE TABLE ##############
+
+    print(f"Creating table {CARD_TABLE_NAME}...")
+
+    sql_query_str = f"""CREATE TABLE {CARD_TABLE_NAME} (
+        id                 INTEGER PRIMARY KEY AUTOINCREMENT,
+        creation_datetime  TEXT DEFAULT CURRENT_TIMESTAMP,
+        is_hidden          INTEGER DEFAULT 0,
+        question           TEXT NOT NULL,
+        answer             TEXT,
+        tags               TEXT NOT NULL,
+        content_digest     TEXT,
+        creation_day       {SQL_CREATION_DAY_COLUMN_TYPE}
+    )"""
+
+    cur.execute(sql_query_str)
+
+    # CREATE INDEXES ############
+
+    cur.execute(f"CREATE INDEX i_card_content_digest ON {CARD_TABLE_NAME}(content_digest)")
+    con.commit()
+
+
+def create_consolidation_review_table(opencal_db_path: os.PathLike) -> None:
+    print(f"Initializing table {CONSOLIDATION_REVIEW_TABLE_NAME} in database {opencal_db_path}")
+
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+    cur = con.cursor()
+
+    # DELETE TABLE ##############
+
+    print(f"Deleting table {CONSOLIDATION_REVIEW_TABLE_NAME} before re-creating it...")
+
+    try:
+        cur.execute(f"DROP TABLE {CONSOLIDATION_REVIEW_TABLE_NAME}")
+    except sqlite3.OperationalError as e:
+        # The database does not exist
+        print(e)
+
+    # CREATE TABLE ##############
+
+    print(f"Creating table {CONSOLIDATION_REVIEW_TABLE_NAME}...")
+
+    sql_query_str = f"""CREATE TABLE {CONSOLIDATION_REVIEW_TABLE_NAME} (
+        id                     INTEGER PRIMARY KEY AUTOINCREMENT,
+        card_id                INTEGER NOT NULL,
+        review_datetime        TEXT DEFAULT CURRENT_TIMESTAMP,
+        user_response_time_ms  INTEGER,
+        is_right_answer        INTEGER NOT NULL,
+        review_day             {SQL_REVIEW_DAY_COLUMN_TYPE},
+        FOREIGN KEY(card_id)   REFERENCES {CARD_TABLE_NAME}(id)
+    )"""
+
+    cur.execute(sql_query_str)
+
+    # CREATE INDEXES ############
+
+    cur.execute(SQL_CREATE_CONSOLIDATION_REVIEW_INDEX_REQUEST)
+    cur.execute(SQL_CREATE_CONSOLIDATION_REVIEW_DAY_INDEX_REQUEST)
+    con.commit()
+
+
+def create_acquisition_review_table(opencal_db_path: os.PathLike) -> None:
+    print(f"Initializing table {ACQUISITION_REVIEW_TABLE_NAME} in database {opencal_db_path}")
+
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+
+    con = get_connection(opencal_db_path)
+    cur = con.cursor()
+
+    # DELETE TABLE ##############
+
+    print(f"Deleting table {ACQUISITION_REVIEW_TABLE_NAME} before re-creating it...")
+
+    try:
+        cur.execute(f"DROP TABLE {ACQUISITION_REVIEW_TABLE_NAME}")
+    except sqlite3.OperationalError as e:
+        # The database does not exist
+        print(e)
+
+    # CREATE TABLE ##############
+
+    print(f"Creating table {ACQUISITION_REVIEW_TABLE_NAME}...")
+
+    sql_query_str = f"""CREATE TABLE {ACQUISITION_REVIEW_TABLE_NAME} (
+        id                     INTEGER PRIMARY KEY AUTOINCREMENT,
+        card_id                INTEGER NOT NULL,
+        review_datetime        TEXT DEFAULT CURRENT_TIMESTAMP,
+        user_response_time_ms  INTEGER,
+        is_right_answer        INTEGER NOT NULL,
+        FOREIGN KEY(card_id)   REFERENCES {CARD_TABLE_NAME}(id)
+    )"""
 
-    This function creates the configuration, card, acquisition and
-    consolidation review tables in the SQLite database located at the specified
-    path.
+    cur.execute(sql_query_str)
 
-    Parameters
-    ----------
-    opencal_db_path : os.PathLike
-        The path to the SQLite database file.
+    # CREATE INDEXES ############
 
-    Returns
-    -------
-    None
-    """
-    create_config_table(opencal_db_path)
-    create_card_table(opencal_db_path)
-    create_consolidation_review_table(opencal_db_path)
-    create_acquisition_review_table(opencal_db_path)
+    cur.execute(SQL_CREATE_ACQUISITION_REVIEW_INDEX_REQUEST)
+    con.commit()
 
 
-def create_config_table(opencal_db_path: os.PathLike) -> None:
-    print(f"Initializing table {CONFIG_TABLE_NAME} in database {opencal_db_path}")
+def create_card_schedule_table(opencal_db_path: os.PathLike) -> None:
+    print(f"Initializing table {CARD_SCHEDULE_TABLE_NAME} in database {opencal_db_path}")
 
     opencal_db_path = opencal.path.expand_path(opencal_db_path)
 
-    con = sqlite3.connect(opencal_db_path)
+    con = get_connection(opencal_db_path)
     cur = con.cursor()
 
     # DELETE TABLE ##############
 
-    print(f"Deleting table {CONFIG_TABLE_NAME} before re-creating it...")
+    print(f"Deleting table {CARD_SCHEDULE_TABLE_NAME} before re-creating it...")
 
     try:
-        cur.execute(f"DROP TABLE {CONFIG_TABLE_NAME}")
+        cur.execute(f"DROP TABLE {CARD_SCHEDULE_TABLE_NAME}")
     except sqlite3.OperationalError as e:
         # The database does not exist
         print(e)
 
     # CREATE TABLE ##############
 
-    print(f"Creating table {CONFIG_TABLE_NAME}...")
-
-    sql_query_str = f"""CREATE TABLE {CONFIG_TABLE_NAME} (
-        key            TEXT PRIMARY KEY,
-        value          TEXT
+    print(f"Creating table {CARD_SCHEDULE_TABLE_NAME}...")
+
+    # The "previous_*" columns contain the state of the card before the reviews made on "last_review_date"
+    sql_query_str = f"""CREATE TABLE {CARD_SCHEDULE_TABLE_NAME} (
+        card_id                          INTEGER PRIMARY KEY,
+        grade                            INTEGER NOT NULL,
+        expected_revision_date           TEXT NOT NULL,
+        last_review_date                 TEXT,
+        last_review_is_right_answer      INTEGER,
+        previous_grade                   INTEGER NOT NULL,
+        previous_expected_revision_date  TEXT NOT NULL,
+        FOREIGN KEY(card_id)             REFERENCES {CARD_TABLE_NAME}(id)
     )"""
 
     cur.execute(sql_query_str)
+
+    # CREATE INDEXES ############
+
+    cur.execute(f"CREATE INDEX i_card_schedule_expected_revision_date ON {CARD_SCHEDULE_TABLE_NAME}(expected_revision_date)")
+    cur.execute(f"CREATE INDEX i_card_schedule_last_review_date ON {CARD_SCHEDULE_TABLE_NAME}(last_review_date)")
+
     con.commit()
-    con.close()
 
 
-def create_card_table(opencal_db_path: os.PathLike) -> None:
-    print(f"Initializing table {CARD_TABLE_NAME} in database {opencal_db_path}")
+def create_assess_cache_table(opencal_db_path: os.PathLike) -> None:
+    print(f"Initializing table {ASSESS_CACHE_TABLE_NAME} in database {opencal_db_path}")
 
     opencal_db_path = opencal.path.expand_path(opencal_db_path)
 
-    con = sqlite3.connect(opencal_db_path)
+    con = get_connection(opencal_db_path)
     cur = con.cursor()
 
     # DELETE TABLE ##############
 
-    print(f"Deleting table {CARD_TABLE_NAME} before re-creating it...")
+    print(f"Deleting table {ASSESS_CACHE_TABLE_NAME} before re-creating it...")
 
     try:
-        cur.execute(f"DROP TABLE {CARD_TABLE_NAME}")
+        cur.execute(f"DROP TABLE {ASSESS_CACHE_TABLE_NAME}")
     except sqlite3.OperationalError as e:
         # The database does not exist
         print(e)
 
     # CREATE TABLE ##############
 
-    print(f"Creating table {CARD_TABLE_NAME}...")
-
-    sql_query_str = f"""CREATE TABLE {CARD_TABLE_NAME} (
-        id                 INTEGER PRIMARY KEY AUTOINCREMENT,
-        creation_datetime  TEXT DEFAULT CURRENT_TIMESTAMP,
-        is_hidden          INTEGER DEFAULT 0,
-        question           TEXT NOT NULL,
-        answer             TEXT,
-        tags               TEXT NOT NULL
+    print(f"Creating table {ASSESS_CACHE_TABLE_NAME}...")
+
+    # Grades computed by the "assess" function of each professor (c.f. opencal.core.professor.consolidation.assess_cache);
+    # the "creation_day", "num_reviews", "last_review_day" and "today" columns are used to check that a grade is still valid.
+    # Dates are stored as day ordinals (c.f. datetime.date.toordinal) to be loaded without parsing.
+    sql_query_str = f"""CREATE TABLE {ASSESS_CACHE_TABLE_NAME} (
+        professor             TEXT NOT NULL,
+        card_id               INTEGER NOT NULL,
+        ignore_today_answers  INTEGER NOT NULL,
+        creation_day          INTEGER NOT NULL,
+        num_reviews           INTEGER NOT NULL,
+        last_review_day       INTEGER NOT NULL,
+        today                 INTEGER NOT NULL,
+        grade                 INTEGER NOT NULL,
+        PRIMARY KEY(professor, card_id, ignore_today_answers),
+        FOREIGN KEY(card_id)  REFERENCES {CARD_TABLE_NAME}(id)
     )"""
 
     cur.execute(sql_query_str)
     con.commit()
-    con.close()
 
 
-def create_consolidation_review_table(opencal_db_path: os.PathLike) -> None:
-    print(f"Initializing table {CONSOLIDATION_REVIEW_TABLE_NAME} in database {opencal_db_path}")
+def create_tag_table(opencal_db_path: os.PathLike) -> None:
+    print(f"Initializing table {TAG_TABLE_NAME} in database {opencal_db_path}")
 
     opencal_db_path = opencal.path.expand_path(opencal_db_path)
 
-    con = sqlite3.connect(opencal_db_path)
+    con = get_connection(opencal_db_path)
     cur = con.cursor()
 
     # DELETE TABLE ##############
 
-    print(f"Deleting table {CONSOLIDATION_REVIEW_TABLE_NAME} before re-creating it...")
+    print(f"Deleting table {TAG_TABLE_NAME} before re-creating it...")
 
     try:
-        cur.execute(f"DROP TABLE {CONSOLIDATION_REVIEW_TABLE_NAME}")
+        cur.execute(f"DROP TABLE {TAG_TABLE_NAME}")
     except sqlite3.OperationalError as e:
         # The database does not exist
         print(e)
 
     # CREATE TABLE ##############
 
-    print(f"Creating table {CONSOLIDATION_REVIEW_TABLE_NAME}...")
+    print(f"Creating table {TAG_TABLE_NAME}...")
 
-    sql_query_str = f"""CREATE TABLE {CONSOLIDATION_REVIEW_TABLE_NAME} (
-        id                     INTEGER PRIMARY KEY AUTOINCREMENT,
-        card_id                INTEGER NOT NULL,
-        review_datetime        TEXT DEFAULT CURRENT_TIMESTAMP,
-        user_response_time_ms  INTEGER,
-        is_right_answer        INTEGER NOT NULL,
-        FOREIGN KEY(card_id)   REFERENCES {CARD_TABLE_NAME}(id)
+    # The UNIQUE constraint creates the index used to find tags by name
+    sql_query_str = f"""CREATE TABLE {TAG_TABLE_NAME} (
+        id                 INTEGER PRIMARY KEY AUTOINCREMENT,
+        name               TEXT NOT NULL UNIQUE
     )"""
 
     cur.execute(sql_query_str)
     con.commit()
-    con.close()
 
 
-def create_acquisition_review_table(opencal_db_path: os.PathLike) -> None:
-    print(f"Initializing table {ACQUISITION_REVIEW_TABLE_NAME} in database {opencal_db_path}")
+def create_card_tag_table(opencal_db_path: os.PathLike) -> None:
+    print(f"Initializing table {CARD_TAG_TABLE_NAME} in database {opencal_db_path}")
 
     opencal_db_path = opencal.path.expand_path(opencal_db_path)
 
-    con = sqlite3.connect(opencal_db_path)
+    con = get_connection(opencal_db_path)
     cur = con.cursor()
 
     # DELETE TABLE ##############
 
-    print(f"Deleting table {ACQUISITION_REVIEW_TABLE_NAME} before re-creating it...")
+    print(f"Deleting table {CARD_TAG_TABLE_NAME} before re-creating it...")
 
     try:
-        cur.execute(f"DROP TABLE {ACQUISITION_REVIEW_TABLE_NAME}")
+        cur.execute(f"DROP TABLE {CARD_TAG_TABLE_NAME}")
     except sqlite3.OperationalError as e:
         # The database does not exist
         print(e)
 
     # CREATE TABLE ##############
 
-    print(f"Creating table {ACQUISITION_REVIEW_TABLE_NAME}...")
+    print(f"Creating table {CARD_TAG_TABLE_NAME}...")
 
-    sql_query_str = f"""CREATE TABLE {ACQUISITION_REVIEW_TABLE_NAME} (
-        id                     INTEGER PRIMARY KEY AUTOINCREMENT,
-        card_id                INTEGER NOT NULL,
-        review_datetime        TEXT DEFAULT CURRENT_TIMESTAMP,
-        user_response_time_ms  INTEGER,
-        is_right_answer        INTEGER NOT NULL,
-        FOREIGN KEY(card_id)   REFERENCES {CARD_TABLE_NAME}(id)
-    )"""
+    # The tags of each card (the "tags" column of the card table, normalized to filter cards by tag in SQL)
+    sql_query_str = f"""CREATE TABLE {CARD_TAG_TABLE_NAME} (
+        card_id               INTEGER NOT NULL,
+        tag_id                INTEGER NOT NULL,
+        PRIMARY KEY(card_id, tag_id),
+        FOREIGN KEY(card_id)  REFERENCES {CARD_TABLE_NAME}(id),
+        FOREIGN KEY(tag_id)   REFERENCES {TAG_TABLE_NAME}(id)
+    ) WITHOUT ROWID"""
 
     cur.execute(sql_query_str)
+
+    # CREATE INDEXES ############
+
+    cur.execute(f"CREATE INDEX i_card_tag_tag_id ON {CARD_TAG_TABLE_NAME}(tag_id, card_id)")
     con.commit()
-    con.close()
+
+
+def backup_file_name_regex(prefix: str = "") -> "re.Pattern":
+    """The regular expression matching the names of the full and differential backup files made by `backup_db` with `prefix`."""
+    return re.compile(rf"^{re.escape(prefix)}(?P<date>\d{{4}}-\d{{2}}-\d{{2}})(_(?P<time>\d{{2}}-\d{{2}}-\d{{2}}(-\d{{6}})?))?_opencal(?P<differential>_diff)?\.sqlite$")
 
 
 def backup_db(
         opencal_db_path: Optional[os.PathLike] = None,
         backup_dir_path: Optional[os.PathLike] = None,
-        prefix: str = ""
-    ) -> None:
+        prefix: str = "",
+        pages: int = DEFAULT_BACKUP_PAGES,
+        use_vacuum_into: bool = False,
+        differential: bool = False,
+        keep: Optional[int] = None
+    ) -> str:
     """
     Create a backup of the SQLite database.
 
     This function creates a backup of the SQLite database located at the specified
     path and saves it to the specified backup directory with an optional prefix
-    and the current date appended to the filename.
+    and the current date and time appended to the filename. An existing
+    backup file is never replaced.
+
+    A full backup is a copy of the database, made with the SQLite online
+    backup API (`pages` pages at a time) or with `VACUUM INTO` (in a single
+    step, the copy is also defragmented). After a full backup, the change log
+    of the database (c.f. `ensure_change_log`) is cleared.
+
+    A differential backup only contains the rows changed since the last full
+    backup (c.f. `CHANGE_LOG_TABLE_LIST`); it is restored with the full backup
+    it is based on by `restore_backup`. If there is no full backup to build a
+    differential backup on, a full backup is made instead.
 
     Parameters
     ----------
@@ -395,46 +1945,476 @@ def backup_db(
         The path to the directory where the backup file will be saved.
     prefix : str, optional
         An optional prefix to add to the backup file name (default is "").
+    pages : int, optional
+        The number of pages copied at each step of a full backup made with
+        the online backup API (default is `DEFAULT_BACKUP_PAGES`; -1 copies the
+        whole database in one step).
+    use_vacuum_into : bool, optional
+        Make full backups with `VACUUM INTO` instead of the online backup API (default is False).
+    differential : bool, optional
+        Make a differential backup (default is False).
+    keep : int, optional
+        The number of full backups kept in `backup_dir_path`, c.f. `prune_backups`
+        (default is None, i.e. the `sqlite_backup_retention` configuration option;
+        all the backups are kept if it is not set).
 
     Returns
     -------
-    None
+    str
+        The path of the backup file.
     """
-    today_str = datetime.datetime.now().strftime(r"%Y-%m-%d")
+    now = datetime.datetime.now()
 
     if opencal_db_path is None:
         opencal_db_path = opencal.cfg['opencal']['db_path']
     if backup_dir_path is None:
         backup_dir_path = opencal.cfg['opencal']['sqlite_backup_dir_path']
+    if keep is None:
+        keep = opencal.cfg['opencal'].get('sqlite_backup_retention')
 
     opencal_db_path = opencal.path.expand_path(opencal_db_path)
-    backup_file_path = os.path.join(opencal.path.expand_path(backup_dir_path), prefix + today_str + "_opencal.sqlite")
+    backup_dir_path = opencal.path.expand_path(backup_dir_path)
 
-    def progress(status, remaining, total):
-        # print(f'Copied {total-remaining} of {total} pages...')
-        print(".", end="")
+    src_db = get_connection(opencal_db_path)
 
-    src_db = sqlite3.connect(opencal_db_path)
-    dst_db = sqlite3.connect(backup_file_path)
+    with src_db.lock:
+        src_db.flush()                               # Make sure pending writes are in the backup
 
-    with dst_db:
-        src_db.backup(dst_db, pages=1, progress=progress)
+        if differential:
+            # Changes made while the change log didn't exist are missing from the log
+            is_change_log_created = ensure_change_log(opencal_db_path)
+            base_backup_file_name = get_config_value(src_db, LAST_FULL_BACKUP_FILE_CONFIG_KEY)
+            if is_change_log_created or base_backup_file_name is None or not os.path.exists(os.path.join(backup_dir_path, base_backup_file_name)):
+                print("No full backup to make a differential backup from: making a full backup")
+                differential = False
 
-    dst_db.close()
-    src_db.close()
+        # Several backups can be made the same day: the file name has a microsecond resolution
+        backup_file_path = os.path.join(backup_dir_path, prefix + now.strftime(r"%Y-%m-%d_%H-%M-%S-%f") + ("_opencal_diff.sqlite" if differential else "_opencal.sqlite"))
+        if os.path.exists(backup_file_path):
+            raise FileExistsError(f"The backup file {backup_file_path} already exists")
+
+        if differential:
+            make_differential_backup(src_db, backup_file_path)
+        else:
+            make_full_backup(src_db, backup_file_path, pages=pages, use_vacuum_into=use_vacuum_into)
 
     print("Database cloned in", backup_file_path)
 
+    if keep is not None:
+        prune_backups(backup_dir_path, keep=keep, prefix=prefix)
 
-def dump_db(
+    return backup_file_path
+
+
+def make_full_backup(
+        src_db: Any,
+        backup_file_path: os.PathLike,
+        pages: int = DEFAULT_BACKUP_PAGES,
+        use_vacuum_into: bool = False
+    ) -> None:
+    """
+    Copy a database to a backup file (c.f. `backup_db`) and clear its change log.
+
+    Parameters
+    ----------
+    src_db : DatabaseConnection
+        The connection to the database to back up (without pending writes).
+    backup_file_path : os.PathLike
+        The path of the backup file (an existing file is replaced).
+    pages : int, optional
+        The number of pages copied at each step of the online backup API (default is `DEFAULT_BACKUP_PAGES`).
+    use_vacuum_into : bool, optional
+        Copy the database with `VACUUM INTO` instead of the online backup API (default is False).
+
+    Returns
+    -------
+    None
+    """
+    if use_vacuum_into:
+        # "VACUUM INTO" fails if the file exists
+        if os.path.exists(backup_file_path):
+            os.remove(backup_file_path)
+        src_db.con.execute("VACUUM INTO ?", (backup_file_path,))
+        dst_db = sqlite3.connect(backup_file_path)
+    else:
+        last_report_time = time.perf_counter()
+
+        def progress(status, remaining, total):
+            nonlocal last_report_time
+            if time.perf_counter() - last_report_time >= DEFAULT_PROGRESS_INTERVAL_S:
+                last_report_time = time.perf_counter()
+                print(f'Copied {total-remaining} of {total} pages...')
+
+        dst_db = sqlite3.connect(backup_file_path)
+        src_db.con.backup(dst_db, pages=pages, progress=progress)
+
+    # The copy inherits the WAL mode of the database: a backup is a single file
+    dst_db.execute("PRAGMA journal_mode=DELETE")
+
+    # The backup and the database share an ID: differential backups refer to it
+    backup_id = uuid.uuid4().hex
+    backup_file_name = os.path.basename(backup_file_path)
+
+    for con in (dst_db, src_db):
+        if table_exists(con.cursor(), CHANGE_LOG_TABLE_NAME):
+            con.execute(f"DELETE FROM {CHANGE_LOG_TABLE_NAME}")
+        set_config_value(con, LAST_FULL_BACKUP_ID_CONFIG_KEY, backup_id)
+        set_config_value(con, LAST_FULL_BACKUP_FILE_CONFIG_KEY, backup_file_name)
+        con.commit()
+
+    dst_db.close()
+
+
+def make_differential_backup(
+        src_db: Any,
+        backup_file_path: os.PathLike
+    ) -> None:
+    """
+    Copy the rows of a database changed since its last full backup to a differential backup file (c.f. `backup_db`).
+
+    The differential backup contains the changed rows of each table of
+    `CHANGE_LOG_TABLE_LIST`, the deleted rows (in the `t_deleted_row` table)
+    and the ID and the file name of the full backup it is based on (in the
+    configuration table).
+
+    Parameters
+    ----------
+    src_db : DatabaseConnection
+        The connection to the database to back up (without pending writes).
+    backup_file_path : os.PathLike
+        The path of the backup file (an existing file is replaced).
+
+    Returns
+    -------
+    None
+    """
+    if os.path.exists(backup_file_path):
+        os.remove(backup_file_path)
+
+    con = src_db.con
+    cur = con.cursor()
+    con.execute("ATTACH DATABASE ? AS diff", (backup_file_path,))
+
+    try:
+        con.execute(f"CREATE TABLE diff.{CONFIG_TABLE_NAME} (key TEXT PRIMARY KEY, value TEXT)")
+        con.executemany(f"INSERT INTO diff.{CONFIG_TABLE_NAME} (key, value) VALUES (?, ?)", [
+            (BASE_BACKUP_ID_CONFIG_KEY, get_config_value(src_db, LAST_FULL_BACKUP_ID_CONFIG_KEY)),
+            (BASE_BACKUP_FILE_CONFIG_KEY, get_config_value(src_db, LAST_FULL_BACKUP_FILE_CONFIG_KEY)),
+            (SCHEMA_VERSION_CONFIG_KEY, str(get_schema_version(src_db))),
+        ])
+        con.execute(f"CREATE TABLE diff.{DELETED_ROW_TABLE_NAME} (table_name TEXT NOT NULL, row_id INTEGER NOT NULL)")
+
+        for table_name in CHANGE_LOG_TABLE_LIST:
+            if not table_exists(cur, table_name):
+                continue
+
+            # Generated columns are not listed by "table_info"
+            column_str = ", ".join(row[1] for row in cur.execute(f"PRAGMA main.table_info({table_name})").fetchall())
+
+            con.execute(f"""CREATE TABLE diff.{table_name} AS SELECT {column_str} FROM main.{table_name}
+                WHERE rowid IN (SELECT row_id FROM main.{CHANGE_LOG_TABLE_NAME} WHERE table_name='{table_name}')""")
+            con.execute(f"""INSERT INTO diff.{DELETED_ROW_TABLE_NAME} (table_name, row_id)
+                SELECT table_name, row_id FROM main.{CHANGE_LOG_TABLE_NAME}
+                WHERE table_name='{table_name}' AND row_id NOT IN (SELECT rowid FROM main.{table_name})""")
+
+        con.commit()
+    finally:
+        if con.in_transaction:
+            con.rollback()
+        con.execute("DETACH DATABASE diff")
+
+
+def restore_backup(
+        backup_file_path: os.PathLike,
         opencal_db_path: Optional[os.PathLike] = None,
-        dump_file_path: Optional[os.PathLike] = None
+        backup_dir_path: Optional[os.PathLike] = None
+    ) -> None:
+    """
+    Restore the SQLite database from a full or a differential backup made by `backup_db`.
+
+    A differential backup is applied on the full backup it is based on, which
+    must be in the same directory. If the original database exists, it is
+    backed up before restoring.
+
+    Parameters
+    ----------
+    backup_file_path : os.PathLike
+        The path to the backup file (full or differential).
+    opencal_db_path : os.PathLike
+        The path to the SQLite database file to be restored.
+    backup_dir_path : os.PathLike
+        The path to the directory where the backup of the original database will be saved.
+
+    Returns
+    -------
+    None
+    """
+    if opencal_db_path is None:
+        opencal_db_path = opencal.cfg['opencal']['db_path']
+    if backup_dir_path is None:
+        backup_dir_path = opencal.cfg['opencal']['sqlite_backup_dir_path']
+
+    backup_file_path = opencal.path.expand_path(backup_file_path)
+    opencal_db_path = opencal.path.expand_path(opencal_db_path)
+    backup_dir_path = opencal.path.expand_path(backup_dir_path)
+
+    with contextlib.closing(sqlite3.connect(f"file:{backup_file_path}?mode=ro", uri=True)) as backup_con:
+        base_backup_file_name = get_config_value(backup_con, BASE_BACKUP_FILE_CONFIG_KEY)
+        base_backup_id = get_config_value(backup_con, BASE_BACKUP_ID_CONFIG_KEY)
+
+    if base_backup_file_name is None:
+        full_backup_file_path = backup_file_path
+    else:
+        full_backup_file_path = os.path.join(os.path.dirname(backup_file_path), base_backup_file_name)
+
+        if not os.path.exists(full_backup_file_path):
+            raise ValueError(f"The full backup {full_backup_file_path} of the differential backup {backup_file_path} doesn't exist")
+
+        with contextlib.closing(sqlite3.connect(f"file:{full_backup_file_path}?mode=ro", uri=True)) as full_backup_con:
+            if get_config_value(full_backup_con, LAST_FULL_BACKUP_ID_CONFIG_KEY) != base_backup_id:
+                raise ValueError(f"The full backup {full_backup_file_path} has been replaced since the differential backup {backup_file_path} was made")
+
+    # Backup the original database if it exists
+    if os.path.exists(opencal_db_path):
+        backup_db(
+            opencal_db_path=opencal_db_path,
+            backup_dir_path=backup_dir_path,
+            prefix="before_restore_"
+        )
+
+    # Restore the full backup
+
+    con = get_connection(opencal_db_path)
+
+    with con.lock:
+        con.flush()
+        with contextlib.closing(sqlite3.connect(full_backup_file_path)) as full_backup_con:
+            full_backup_con.backup(con.con, pages=-1)
+
+    # Apply the differential backup
+
+    if base_backup_file_name is not None:
+        migrate_db(opencal_db_path)
+        apply_differential_backup(con, backup_file_path)
+
+    print(f"Database restored at {opencal_db_path} from the {backup_file_path} backup file")
+
+
+def apply_differential_backup(
+        con: Any,
+        backup_file_path: os.PathLike
     ) -> None:
     """
+    Apply a differential backup on a database restored from the full backup it is based on.
+
+    Parameters
+    ----------
+    con : DatabaseConnection
+        The connection to the restored database.
+    backup_file_path : os.PathLike
+        The path to the differential backup file.
+
+    Returns
+    -------
+    None
+    """
+    with con.lock:
+        con.flush()
+        raw_con = con.con
+        cur = raw_con.cursor()
+        raw_con.execute("ATTACH DATABASE ? AS diff", (backup_file_path,))
+
+        try:
+            diff_table_set = {row[0] for row in cur.execute("SELECT name FROM diff.sqlite_master WHERE type='table'")}
+
+            for table_name in CHANGE_LOG_TABLE_LIST:
+                if table_name not in diff_table_set or not table_exists(cur, table_name):
+                    continue
+
+                column_str = ", ".join(row[1] for row in cur.execute(f"PRAGMA diff.table_info({table_name})").fetchall())
+
+                raw_con.execute(f"DELETE FROM main.{table_name} WHERE rowid IN (SELECT row_id FROM diff.{DELETED_ROW_TABLE_NAME} WHERE table_name=?)", (table_name,))
+                raw_con.execute(f"INSERT OR REPLACE INTO main.{table_name} ({column_str}) SELECT {column_str} FROM diff.{table_name}")
+
+            # Derived tables: the tags of the changed cards are rebuilt, the assess cache is cleared
+            if CARD_TABLE_NAME in diff_table_set and table_exists(cur, CARD_TAG_TABLE_NAME):
+                card_tags_list = []
+                for card_id, tags_str in cur.execute(f"SELECT id, tags FROM diff.{CARD_TABLE_NAME}").fetchall():
+                    tags_str = tags_str.strip(" \t\r\n")        # Remove leading and trailing whitespaces, tabulations, and newlines
+                    card_tags_list.append((card_id, tags_str.split("\n") if tags_str != "" else []))
+                cur.execute(f"DELETE FROM {CARD_TAG_TABLE_NAME} WHERE card_id IN (SELECT row_id FROM diff.{DELETED_ROW_TABLE_NAME} WHERE table_name=?)", (CARD_TABLE_NAME,))
+                save_card_tags(cur, card_tags_list, replace=True)
+
+            if table_exists(cur, ASSESS_CACHE_TABLE_NAME):
+                cur.execute(f"DELETE FROM {ASSESS_CACHE_TABLE_NAME}")
+
+            raw_con.commit()
+        finally:
+            if raw_con.in_transaction:
+                raw_con.rollback()
+            raw_con.execute("DETACH DATABASE diff")
+
+
+def prune_backups(
+        backup_dir_path: Optional[os.PathLike] = None,
+        keep: int = 1,
+        prefix: str = ""
+    ) -> List[str]:
+    """
+    Delete the old backups made by `backup_db` with `prefix` in a backup directory.
+
+    The `keep` most recent full backups are kept, as well as the differential
+    backups based on them. Differential backups whose full backup is deleted
+    (or has been replaced) are deleted.
+
+    Parameters
+    ----------
+    backup_dir_path : os.PathLike
+        The path to the backup directory.
+    keep : int, optional
+        The number of full backups to keep (default is 1).
+    prefix : str, optional
+        The prefix of the backup file names (default is ""); other files are ignored.
+
+    Returns
+    -------
+    List[str]
+        The paths of the deleted files.
+    """
+    if backup_dir_path is None:
+        backup_dir_path = opencal.cfg['opencal']['sqlite_backup_dir_path']
+
+    backup_dir_path = opencal.path.expand_path(backup_dir_path)
+    file_name_regex = backup_file_name_regex(prefix)
+
+    full_backup_date_dict = {}
+    differential_backup_file_name_list = []
+    for file_name in os.listdir(backup_dir_path):
+        match = file_name_regex.match(file_name)
+        if match is not None:
+            if match.group("differential") is None:
+                full_backup_date_dict[file_name] = (match.group("date"), match.group("time") or "")
+            else:
+                differential_backup_file_name_list.append(file_name)
+
+    # File names contain the backup date and time (older backups only have a date)
+    full_backup_file_name_list = sorted(full_backup_date_dict, key=full_backup_date_dict.__getitem__, reverse=True)
+    removed_file_name_list = full_backup_file_name_list[max(keep, 0):]
+
+    kept_backup_id_dict = {}
+    for file_name in full_backup_file_name_list[:max(keep, 0)]:
+        with contextlib.closing(sqlite3.connect(f"file:{os.path.join(backup_dir_path, file_name)}?mode=ro", uri=True)) as backup_con:
+            kept_backup_id_dict[file_name] = get_config_value(backup_con, LAST_FULL_BACKUP_ID_CONFIG_KEY)
+
+    for file_name in differential_backup_file_name_list:
+        with contextlib.closing(sqlite3.connect(f"file:{os.path.join(backup_dir_path, file_name)}?mode=ro", uri=True)) as backup_con:
+            base_backup_file_name = get_config_value(backup_con, BASE_BACKUP_FILE_CONFIG_KEY)
+            base_backup_id = get_config_value(backup_con, BASE_BACKUP_ID_CONFIG_KEY)
+        if base_backup_file_name not in kept_backup_id_dict or kept_backup_id_dict[base_backup_file_name] != base_backup_id:
+            removed_file_name_list.append(file_name)
+
+    removed_file_path_list = [os.path.join(backup_dir_path, file_name) for file_name in removed_file_name_list]
+    for file_path in removed_file_path_list:
+        os.remove(file_path)
+        print("Old backup removed:", file_path)
+
+    return removed_file_path_list
+
+
+class ProgressReport:
+
+    def __init__(
+            self,
+            label: str,
+            interval_s: Optional[float] = DEFAULT_PROGRESS_INTERVAL_S
+        ) -> None:
+        """
+        Print the progress and the throughput of a long operation (dump, restore, ...).
+
+        Parameters
+        ----------
+        label : str
+            The name of the operation (e.g. "Dumped").
+        interval_s : float, optional
+            The minimum delay between two progress messages, in seconds
+            (default is `DEFAULT_PROGRESS_INTERVAL_S`). None disables the progress messages.
+
+        Returns
+        -------
+        None
+        """
+        self.label = label
+        self.interval_s = interval_s
+        self.num_statements = 0
+        self.num_bytes = 0          # Size of the uncompressed SQL text (1 character ~ 1 byte)
+        self.start_time = time.perf_counter()
+        self._last_report_time = self.start_time
+
+
+    def update(self, num_statements: int, num_bytes: int) -> None:
+        """Count processed statements and print the progress if the last message is older than `interval_s`."""
+        self.num_statements += num_statements
+        self.num_bytes += num_bytes
+
+        if self.interval_s is not None:
+            current_time = time.perf_counter()
+            if current_time - self._last_report_time >= self.interval_s:
+                self._last_report_time = current_time
+                print(self.summary())
+
+
+    def summary(self) -> str:
+        """The number of statements processed so far and the throughput."""
+        duration = max(time.perf_counter() - self.start_time, 1e-9)
+        return (f"{self.label} {self.num_statements} statements ({self.num_bytes / 1e6:.1f} MB of SQL) in {duration:.1f} s: "
+                f"{self.num_statements / duration:.0f} statements/s, {self.num_bytes / 1e6 / duration:.1f} MB/s")
+
+
+def iter_sql_statements(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Split an SQL script (e.g. a dump file) in statements, without reading it entirely.
+
+    Statements may span several lines (e.g. a card whose question contains new lines).
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        The lines of the script (e.g. a text file object).
+
+    Yields
+    ------
+    str
+        Each complete SQL statement (with its trailing semicolon).
+    """
+    buffer_list: List[str] = []
+
+    for line in lines:
+        buffer_list.append(line)
+
+        # A statement can only end on a line ending with a semicolon (which may also be in a string literal)
+        if line.rstrip().endswith(";"):
+            statement = "".join(buffer_list) if len(buffer_list) > 1 else line
+            if sqlite3.complete_statement(statement):
+                yield statement
+                buffer_list = []
+
+    if "".join(buffer_list).strip() != "":
+        raise ValueError("The SQL script ends with an incomplete statement")
+
+
+def dump_db(
+        opencal_db_path: Optional[os.PathLike] = None,
+        dump_file_path: Optional[os.PathLike] = None,
+        compression: Optional[str] = "infer",
+        progress_interval_s: Optional[float] = DEFAULT_PROGRESS_INTERVAL_S
+    ) -> int:
+    """
     Dump the SQLite database to a SQL file.
 
     This function creates a SQL dump of the SQLite database located at the specified
-    path and saves it to the specified dump directory.
+    path and saves it to the specified dump directory. The dump is written
+    statement by statement (the database is never loaded in memory) and can be
+    compressed with gzip or zstd.
 
     Parameters
     ----------
@@ -442,10 +2422,18 @@ def dump_db(
         The path to the SQLite database file to be dumped.
     dump_file_path : os.PathLike
         The path to the SQL dump file (plain text file) will be saved.
+    compression : str, optional
+        "gzip", "zstd", None (plain text file) or "infer" to infer the
+        compression from the file extension, ".gz" or ".zst" (default is "infer").
+        zstd requires the optional `zstandard` package.
+    progress_interval_s : float, optional
+        The delay between two progress messages, in seconds (default is
+        `DEFAULT_PROGRESS_INTERVAL_S`). None disables the progress messages.
 
     Returns
     -------
-    None
+    int
+        The number of SQL statements written.
     """
     if opencal_db_path is None:
         opencal_db_path = opencal.cfg['opencal']['db_path']
@@ -455,22 +2443,31 @@ def dump_db(
     opencal_db_path = opencal.path.expand_path(opencal_db_path)
     dump_file_path = opencal.path.expand_path(dump_file_path)
 
-    con = sqlite3.connect(opencal_db_path)
+    con = get_connection(opencal_db_path)
+    con.flush()                                      # Make sure pending writes are in the dump
 
-    with open(dump_file_path, 'w') as f:
-        for line in con.iterdump():
-            f.write('%s\n' % line)
+    progress = ProgressReport("Dumped", progress_interval_s)
 
-    con.close()
+    with opencal.io.pkb.open_pkb_file(dump_file_path, "w", compression=compression) as fd:
+        for statement in con.con.iterdump():
+            fd.write(statement)
+            fd.write("\n")
+            progress.update(1, len(statement) + 1)
 
+    print(progress.summary())
     print("Database dumped in", dump_file_path)
 
+    return progress.num_statements
+
 
 def restore_db(
         opencal_db_path: Optional[os.PathLike] = None,
         dump_file_path: Optional[os.PathLike] = None,
-        backup_dir_path: Optional[os.PathLike] = None
-    ) -> None:
+        backup_dir_path: Optional[os.PathLike] = None,
+        compression: Optional[str] = "infer",
+        batch_size: int = DEFAULT_RESTORE_BATCH_SIZE,
+        progress_interval_s: Optional[float] = DEFAULT_PROGRESS_INTERVAL_S
+    ) -> int:
     """
     Restore the SQLite database from a SQL dump file.
 
@@ -478,6 +2475,11 @@ def restore_db(
     from a SQL dump file located in the specified dump directory. If the
     original database exists, it creates a backup before restoring.
 
+    The dump file is read statement by statement (it is never loaded entirely
+    in memory); statements are executed by batches of `batch_size` statements
+    in a temporary database, which atomically replaces the original database
+    (`os.replace`) once the whole dump has been restored.
+
     Parameters
     ----------
     opencal_db_path : os.PathLike
@@ -486,10 +2488,20 @@ def restore_db(
         The path to the SQL dump file (plain text file) to restore.
     backup_dir_path : os.PathLike
         The path to the directory where the backup SQLite (binary) file will be saved.
+    compression : str, optional
+        "gzip", "zstd", None (plain text file) or "infer" to infer the
+        compression from the file extension, ".gz" or ".zst" (default is "infer").
+        zstd requires the optional `zstandard` package.
+    batch_size : int, optional
+        The number of statements executed in each transaction (default is `DEFAULT_RESTORE_BATCH_SIZE`).
+    progress_interval_s : float, optional
+        The delay between two progress messages, in seconds (default is
+        `DEFAULT_PROGRESS_INTERVAL_S`). None disables the progress messages.
 
     Returns
     -------
-    None
+    int
+        The number of SQL statements executed.
     """
     if opencal_db_path is None:
         opencal_db_path = opencal.cfg['opencal']['db_path']
@@ -502,6 +2514,8 @@ def restore_db(
     dump_file_path = opencal.path.expand_path(dump_file_path)
     backup_dir_path = opencal.path.expand_path(backup_dir_path)
 
+    batch_size = max(1, int(batch_size))
+
     # Backup the original database if it exists
     if os.path.exists(opencal_db_path):
         backup_db(
@@ -511,39 +2525,122 @@ def restore_db(
         )
         print("Backup created")
 
-    con = sqlite3.connect(opencal_db_path)
+    # The dump is restored in a temporary database next to the original one, which is
+    # replaced only when the whole dump has been restored: a malformed statement or a
+    # crash during the restore leaves the original database untouched
+    temp_fd, temp_db_path = tempfile.mkstemp(prefix=os.path.basename(opencal_db_path) + ".", suffix=".restoring", dir=os.path.dirname(opencal_db_path))
+    os.close(temp_fd)
 
-    # Delete all tables in the database
-    cursor = con.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
+    progress = ProgressReport("Restored", progress_interval_s)
 
-    # tables = [
-    #     "t_config",
-    #     "t_card",
-    #     "t_acquisition_review",
-    #     "t_consolidation_review"
-    # ]
+    try:
+        temp_con = sqlite3.connect(temp_db_path)
+
+        try:
+            # The temporary database is deleted if the restore fails: it doesn't need a journal
+            with bulk_import_pragmas(temp_con), opencal.io.pkb.open_pkb_file(dump_file_path, "r", compression=compression) as fd:
+                statement_list: List[str] = []
+
+                def execute_batch() -> None:
+                    # Running the whole batch as one script avoids compiling (and caching) each statement from Python
+                    temp_con.executescript("BEGIN;\n" + "".join(statement_list) + "\nCOMMIT;")
+                    progress.update(len(statement_list), sum(map(len, statement_list)))
+                    statement_list.clear()
+
+                for statement in iter_sql_statements(fd):
+                    # The transactions of the dump are replaced by batches of statements
+                    if statement.strip() in ("BEGIN TRANSACTION;", "COMMIT;"):
+                        continue
+
+                    statement_list.append(statement)
+                    if len(statement_list) >= batch_size:
+                        execute_batch()
+
+                execute_batch()
+        finally:
+            temp_con.close()
+
+        # The restored database must be on disk before it replaces the original one
+        with open(temp_db_path, "rb+") as temp_db_file:
+            os.fsync(temp_db_file.fileno())
+
+        # `mkstemp` creates the file with mode 0600: the restored database gets the permissions of the
+        # original one (or the default permissions of new files if there is no original database)
+        if os.path.exists(opencal_db_path):
+            shutil.copymode(opencal_db_path, temp_db_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_db_path, 0o666 & ~umask)
+
+        # The shared connection is closed (pending writes are committed, the WAL file is checkpointed and deleted)
+        close_connection(opencal_db_path)
+
+        os.replace(temp_db_path, opencal_db_path)
+    except BaseException:
+        if os.path.exists(temp_db_path):
+            os.remove(temp_db_path)
+        raise
+
+    print(progress.summary())
+    print(f"Database restored at {opencal_db_path} from the {dump_file_path} dump file")
 
-    for table_name in tables:
-        if table_name[0] != "sqlite_sequence":
-            cursor.execute(f'DROP TABLE IF EXISTS {table_name[0]};')
-    con.commit()
+    return progress.num_statements
 
-    # Restore the database from the dump file
-    with open(dump_file_path, 'r') as fd:
-        sql = fd.read()
-        con.executescript(sql)
 
-    con.close()
+@contextlib.contextmanager
+def bulk_import_pragmas(con: sqlite3.Connection) -> Iterator[None]:
+    """
+    Disable the rollback journal and the synchronous writes of a database during a bulk import.
 
-    print(f"Database restored at {opencal_db_path} from the {dump_file_path} dump file")
+    The previous journal mode and synchronous setting are restored at the end
+    of the `with` block. If the application stops during the import, the
+    database may be corrupted: the import must be made again.
+    """
+    journal_mode = con.execute("PRAGMA journal_mode").fetchone()[0]
+    synchronous = con.execute("PRAGMA synchronous").fetchone()[0]
+
+    con.execute("PRAGMA journal_mode=OFF")
+    con.execute("PRAGMA synchronous=OFF")
+
+    try:
+        yield
+    finally:
+        if con.in_transaction:
+            con.rollback()
+        con.execute(f"PRAGMA synchronous={synchronous}")
+        con.execute(f"PRAGMA journal_mode={journal_mode}")
 
 
 def xml_to_sqlite(
         xml_file_path: Optional[os.PathLike] = None,
-        sqlite_file_path: Optional[os.PathLike] = None
-    ) -> None:
+        sqlite_file_path: Optional[os.PathLike] = None,
+        batch_size: int = DEFAULT_IMPORT_BATCH_SIZE
+    ) -> int:
+    """
+    Convert a PKB XML file to an SQLite database.
+
+    The tables of the SQLite database (except the acquisition review table,
+    which does not exist in the XML database) are dropped and recreated.
+    Cards are parsed one at a time (c.f. `opencal.io.pkb.iter_pkb`) and
+    inserted by batches of `batch_size` cards in a single transaction,
+    without rollback journal nor synchronous writes (c.f. `bulk_import_pragmas`):
+    the XML database is never loaded entirely in memory.
+
+    Parameters
+    ----------
+    xml_file_path : os.PathLike
+        The path to the PKB XML file (possibly compressed, c.f. `opencal.io.pkb.open_pkb_file`).
+    sqlite_file_path : os.PathLike
+        The path to the SQLite database file.
+    batch_size : int, optional
+        The number of cards inserted at once (default is `DEFAULT_IMPORT_BATCH_SIZE`).
+
+    Returns
+    -------
+    int
+        The number of cards imported.
+    """
 
     if xml_file_path is None:
         xml_file_path = opencal.cfg["opencal"]["pkb_path"]
@@ -553,10 +2650,7 @@ def xml_to_sqlite(
     xml_file_path = opencal.path.expand_path(xml_file_path)
     sqlite_file_path = opencal.path.expand_path(sqlite_file_path)
 
-    # Load the XML database ###################################################
-
-    print("Loading XML PKB file", xml_file_path)
-    card_list = opencal.io.pkb.load_pkb(xml_file_path)
+    batch_size = max(1, int(batch_size))
 
     # Drop and recreate the SQLite database ###################################
 
@@ -564,14 +2658,71 @@ def xml_to_sqlite(
     create_config_table(sqlite_file_path)
     create_card_table(sqlite_file_path)
     create_consolidation_review_table(sqlite_file_path)
+    create_card_schedule_table(sqlite_file_path)
+    create_assess_cache_table(sqlite_file_path)
+    create_tag_table(sqlite_file_path)
+    create_card_tag_table(sqlite_file_path)
 
-    # Save the database to SQLite #############################################
+    con = get_connection(sqlite_file_path)
+    cur = con.cursor()
 
-    print("Saving to SQLite database", sqlite_file_path)
-    save_pkb(
-        card_list=card_list,
-        opencal_db_path=sqlite_file_path
-    )
+    if not table_exists(cur, ACQUISITION_REVIEW_TABLE_NAME):
+        create_acquisition_review_table(sqlite_file_path)
+
+    # The configuration table has been recreated: the (idempotent) migrations bring the kept tables to the current schema
+    migrate_db(sqlite_file_path)
+
+    # Stream the XML database to SQLite #######################################
+
+    print("Converting XML PKB file", xml_file_path, "to SQLite database", sqlite_file_path)
+
+    start_time = time.perf_counter()
+    num_cards = 0
+    num_reviews = 0
+
+    card_iterator = opencal.io.pkb.iter_pkb(xml_file_path)
+
+    with con.lock, unlogged_changes(sqlite_file_path), bulk_import_pragmas(con.con):
+        con.con.execute("BEGIN")
+
+        while True:
+            card_batch = list(itertools.islice(card_iterator, batch_size))
+            if len(card_batch) == 0:
+                break
+
+            num_reviews += insert_card_batch(cur, card_batch, first_card_id=num_cards, first_review_id=num_reviews)
+            num_cards += len(card_batch)
+
+        con.con.commit()
+
+    duration = time.perf_counter() - start_time
+    print(f"Imported {num_cards} cards and {num_reviews} reviews in {duration:.1f} s ({num_cards / max(duration, 1e-9):.0f} cards/s)")
+
+    return num_cards
+
+# COMMAND LINE ENTRY POINTS ###################################################
+
+# Console scripts run `sys.exit(entry_point())`: the entry points must return
+# None (exit status 0), not the results of the library functions they call
+
+def backup_db_main() -> None:
+    """Entry point of the `opencal-backup` command (c.f. `backup_db`)."""
+    backup_db()
+
+
+def dump_db_main() -> None:
+    """Entry point of the `opencal-dump` command (c.f. `dump_db`)."""
+    dump_db()
+
+
+def restore_db_main() -> None:
+    """Entry point of the `opencal-restore` command (c.f. `restore_db`)."""
+    restore_db()
+
+
+def xml_to_sqlite_main() -> None:
+    """Entry point of the `opencal-xml-to-sqlite` command (c.f. `xml_to_sqlite`)."""
+    xml_to_sqlite()
 
 # DEBUG #######################################################################
 
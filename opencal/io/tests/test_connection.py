@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains unit tests for the "opencal.io.connection" module.
+"""
+
+import opencal.io.connection
+
+import os
+import sqlite3
+import tempfile
+import time
+
+# HELPERS #####################################################################
+
+def count_rows(db_path):
+    """Count the committed rows using an independent connection."""
+    con = sqlite3.connect(db_path)
+    num_rows = con.execute("SELECT COUNT(*) FROM t_test").fetchone()[0]
+    con.close()
+    return num_rows
+
+# TEST FUNCTIONS ##############################################################
+
+def test_get_connection_is_shared():
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+
+        connection1 = opencal.io.connection.get_connection(db_path)
+        connection2 = opencal.io.connection.get_connection(db_path)
+        assert connection1 is connection2
+
+        assert connection1.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        opencal.io.connection.close_connection(db_path)
+        assert connection1.is_closed
+
+
+def test_commit_batch():
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+
+        connection = opencal.io.connection.get_connection(db_path, commit_batch_size=3, max_commit_delay_s=None)
+        with connection.transaction() as cur:
+            cur.execute("CREATE TABLE t_test (id INTEGER PRIMARY KEY, value INTEGER)")
+
+        connection.write("INSERT INTO t_test (value) VALUES (?)", (1,))
+        connection.write("INSERT INTO t_test (value) VALUES (?)", (2,))
+        assert count_rows(db_path) == 0
+
+        connection.write("INSERT INTO t_test (value) VALUES (?)", (3,))
+        assert count_rows(db_path) == 3
+
+        # Flush on close
+        connection.write("INSERT INTO t_test (value) VALUES (?)", (4,))
+        opencal.io.connection.close_connection(db_path)
+        assert count_rows(db_path) == 4
+
+
+def test_max_commit_delay():
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+
+        connection = opencal.io.connection.get_connection(db_path, commit_batch_size=100, max_commit_delay_s=0.05)
+        with connection.transaction() as cur:
+            cur.execute("CREATE TABLE t_test (id INTEGER PRIMARY KEY, value INTEGER)")
+
+        connection.write("INSERT INTO t_test (value) VALUES (?)", (1,))
+
+        # There is no background flush: pending writes are only committed by the thread using the connection
+        time.sleep(0.1)
+        assert count_rows(db_path) == 0
+
+        connection.write("INSERT INTO t_test (value) VALUES (?)", (2,))
+        assert count_rows(db_path) == 2
+
+        opencal.io.connection.close_connection(db_path)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains unit tests for the "opencal.io.parquet" module.
+"""
+
+from opencal.io.tests.test_sqlitedb import card_to_tuple, make_card_list
+
+import datetime
+import os
+import pytest
+import tempfile
+
+pytest.importorskip("pyarrow")
+
+import opencal.io.parquet
+
+# TEST FUNCTIONS ##############################################################
+
+def test_save_load_pkb():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        pkb_path = os.path.join(temp_dir_path, "pkb")
+        opencal.io.parquet.save_pkb(card_list, pkb_path)
+
+        # Datasets are partitioned by year
+        assert sorted(os.listdir(os.path.join(pkb_path, "cards"))) == ["year=2020"]
+        assert "year=2021" in os.listdir(os.path.join(pkb_path, "reviews"))
+
+        loaded_card_list = opencal.io.parquet.load_pkb(pkb_path)
+
+        # A new save replaces the previous one
+        opencal.io.parquet.save_pkb(card_list[:10], pkb_path)
+        assert len(opencal.io.parquet.load_pkb(pkb_path)) == 10
+
+    assert [card_to_tuple(card) for card in loaded_card_list] == [card_to_tuple(card) for card in card_list]
+
+
+def test_read_reviews():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        pkb_path = os.path.join(temp_dir_path, "pkb")
+        opencal.io.parquet.save_pkb(card_list, pkb_path)
+
+        # Column projection: the question and answer texts are not read
+        card_table = opencal.io.parquet.read_cards(pkb_path, columns=["card_id", "cdate", "tags"])
+        assert card_table.column_names == ["card_id", "cdate", "tags"]
+        assert card_table.num_rows == len(card_list)
+
+        review_table = opencal.io.parquet.read_reviews(pkb_path)
+        assert review_table.column_names == opencal.io.parquet.REVIEW_COLUMN_LIST
+        assert review_table.num_rows == sum(len(card.consolidation_reviews) for card in card_list)
+
+        # Date range filters (start date included, end date excluded), across several partitions
+        start_date = datetime.date(2020, 6, 1)
+        end_date = datetime.date(2021, 2, 1)
+        review_table = opencal.io.parquet.read_reviews(pkb_path, columns=["card_id", "rdate"], start_date=start_date, end_date=datetime.datetime.combine(end_date, datetime.time()))
+
+        expected_review_list = sorted(
+            (card_id, review.review_datetime.date())
+            for card_id, card in enumerate(card_list)
+            for review in card.consolidation_reviews
+            if start_date <= review.review_datetime.date() < end_date
+        )
+        assert len(expected_review_list) > 0
+        assert sorted(zip(review_table.column("card_id").to_pylist(), review_table.column("rdate").to_pylist())) == expected_review_list
+
+        card_table = opencal.io.parquet.read_cards(pkb_path, columns=["card_id"], end_date=datetime.date(2020, 2, 1))
+        assert sorted(card_table.column("card_id").to_pylist()) == [card_id for card_id, card in enumerate(card_list) if card.creation_datetime < datetime.datetime(2020, 2, 1)]
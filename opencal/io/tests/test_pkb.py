@@ -435,3 +435,65 @@ def test_load_pkb_review_last_validated_timedelta():
                                                                              expected_last_validated_timedelta_list):
         assert review.timedelta == expected_timedelta
         assert review.last_validated_timedelta == expected_last_validated_timedelta
+
+
+# Test the "iter_pkb" function ################################################
+
+def card_to_tuple(card):
+    return (card.creation_datetime, card.question, card.answer, card.is_hidden, card.tags,
+            [(review.review_datetime, review.is_right_answer, review.timedelta, review.last_validated_timedelta) for review in card.consolidation_reviews])
+
+
+@pytest.mark.parametrize("pkb_str", [
+    PKB_1_BASIC_STR,
+    PKB_2_MULTILINES_STR,
+    PKB_3_UTF8_STR,
+    PKB_4_XML_TAGS_EMBEDDED_STR,
+    PKB_5_EMPTY_ANSWER_STR,
+    PKB_6_EMPTY_CARD_LIST_STR,
+    PKB_7_CDATA_NESTING_STR,
+    PKB_8_SOME_SPECIAL_CHARS_STR,
+    PKB_9_REVIEWS_NOT_SORTED_PROVIDED_INPUT,
+])
+@pytest.mark.parametrize("use_iterparse", [False, True])
+def test_iter_pkb(pkb_str, use_iterparse):
+    """Check whether "iter_pkb" yields the same cards than "load_pkb" (with a tiny chunk size to split CDATA sections)."""
+
+    with tempfile.NamedTemporaryFile(mode='w') as tf:
+        tf.write(pkb_str)
+        tf.file.flush()
+
+        pkb_path = tf.name
+
+        card_list = opencal.io.pkb.load_pkb(pkb_path)
+        streamed_card_list = list(opencal.io.pkb.iter_pkb(pkb_path, use_iterparse=use_iterparse, chunk_size=7))
+
+    assert [card_to_tuple(card) for card in streamed_card_list] == [card_to_tuple(card) for card in card_list]
+
+
+# Test compressed files #######################################################
+
+@pytest.mark.parametrize("extension", ["", ".gz", ".zst"])
+def test_save_pkb_compressed_from_generator(extension):
+    """Check whether a PKB saved from a generator (and possibly compressed) is identical to the original one."""
+
+    if extension == ".zst":
+        pytest.importorskip("zstandard")
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        pkb_path = os.path.join(temp_dir_path, "test.pkb")
+
+        with open(pkb_path, "w") as fd:
+            fd.write(PKB_8_SOME_SPECIAL_CHARS_STR)
+
+        saved_pkb_path = os.path.join(temp_dir_path, "saved.pkb" + extension)
+        opencal.io.pkb.save_pkb(opencal.io.pkb.iter_pkb(pkb_path), saved_pkb_path, chunk_size=2)
+
+        card_list = opencal.io.pkb.load_pkb(pkb_path)
+        saved_card_list = opencal.io.pkb.load_pkb(saved_pkb_path)
+
+        with opencal.io.pkb.open_pkb_file(saved_pkb_path, "rb") as fd:
+            saved_str = fd.read().decode("utf-8")
+
+    assert saved_str == PKB_8_SOME_SPECIAL_CHARS_STR
+    assert [card_to_tuple(card) for card in saved_card_list] == [card_to_tuple(card) for card in card_list]
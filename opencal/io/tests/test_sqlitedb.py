@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains unit tests for the "opencal.io.sqlitedb" module.
+"""
+
+from opencal.card import Card
+from opencal.review import ConsolidationReview
+from opencal.review_table import LazyCard
+import opencal.io.connection
+import opencal.io.pkb
+import opencal.io.sqlitedb
+
+import datetime
+import os
+import pytest
+import random
+import sqlite3
+import stat
+import tempfile
+
+# HELPERS #####################################################################
+
+def make_card_list(num_cards=50, seed=0):
+    rng = random.Random(seed)
+    card_list = []
+
+    for card_index in range(num_cards):
+        creation_datetime = datetime.datetime(2020, 1, 1) + datetime.timedelta(days=rng.randint(0, 100))
+        review_datetime_list = sorted(creation_datetime + datetime.timedelta(days=rng.randint(0, 300)) for _ in range(rng.randint(0, 8)))
+
+        card_list.append(Card(
+            creation_datetime=creation_datetime,
+            question=f"Question {card_index}",
+            answer=f"Answer {card_index}",
+            is_hidden=rng.random() < 0.1,
+            tags=rng.sample(["tag 1", "tag 2", "tag 3"], k=rng.randint(0, 2)),
+            consolidation_reviews=[ConsolidationReview(review_datetime, rng.random() < 0.7) for review_datetime in review_datetime_list]
+        ))
+
+    return card_list
+
+
+def card_to_tuple(card):
+    return (card.creation_datetime, card.question, card.answer, card.is_hidden, card.tags,
+            [(review.review_datetime, bool(review.is_right_answer)) for review in card.consolidation_reviews])
+
+# TEST FUNCTIONS ##############################################################
+
+def test_load_pkb_columnar():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        loaded_card_list = opencal.io.sqlitedb.load_pkb(db_path)
+        columnar_card_list, review_table = opencal.io.sqlitedb.load_pkb_columnar(db_path)
+
+    assert len(review_table) == sum(len(card.consolidation_reviews) for card in card_list)
+    assert all(isinstance(card, LazyCard) and not card.is_materialized for card in columnar_card_list)
+    assert [card.num_consolidation_reviews for card in columnar_card_list] == [len(card.consolidation_reviews) for card in card_list]
+    assert [card.last_activity_datetime for card in columnar_card_list] == [card.last_activity_datetime for card in loaded_card_list]
+    assert not any(card.is_materialized for card in columnar_card_list)
+
+    assert [card.id for card in columnar_card_list] == [card.id for card in loaded_card_list]
+    assert [card_to_tuple(card) for card in columnar_card_list] == [card_to_tuple(card) for card in loaded_card_list]
+    assert [card_to_tuple(card) for card in columnar_card_list] == [card_to_tuple(card) for card in card_list]
+
+
+def test_load_pkb_columnar_empty_db():
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        columnar_card_list, review_table = opencal.io.sqlitedb.load_pkb_columnar(db_path)
+
+    assert columnar_card_list == []
+    assert len(review_table) == 0
+
+
+def test_get_card_id():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        assert [card.id for card in card_list] == list(range(len(card_list)))
+
+        con = opencal.io.connection.get_connection(db_path)
+
+        # Cards without primary key are found by their content digest
+        for card in card_list:
+            card_copy = Card(card.creation_datetime, card.question, card.answer)
+            assert opencal.io.sqlitedb.get_card_id(con, card_copy) == card.id
+            assert card_copy.id == card.id
+
+        unknown_card = Card(datetime.datetime(2020, 1, 1), "Unknown question", "Unknown answer")
+        with pytest.raises(ValueError):
+            opencal.io.sqlitedb.get_card_id(con, unknown_card)
+
+        opencal.io.connection.close_connection(db_path)
+
+
+def test_card_content_digest_migration():
+    # Databases created before the content_digest column existed may store the creation time
+    con = sqlite3.connect(":memory:")
+    con.execute(f"CREATE TABLE {opencal.io.sqlitedb.CARD_TABLE_NAME} (id INTEGER PRIMARY KEY, creation_datetime TEXT, question TEXT, answer TEXT)")
+    con.execute(f"INSERT INTO {opencal.io.sqlitedb.CARD_TABLE_NAME} VALUES (1, '2020-01-02 10:11:12', 'Question', 'Answer')")
+
+    opencal.io.sqlitedb.ensure_card_content_digest_column(con)
+
+    card = Card(datetime.datetime(2020, 1, 2, 10, 11, 12), "Question", "Answer")
+    assert con.execute(f"SELECT content_digest FROM {opencal.io.sqlitedb.CARD_TABLE_NAME}").fetchone()[0] == opencal.io.sqlitedb.card_content_digest(card)
+    assert opencal.io.sqlitedb.get_card_id(con, card) == 1
+
+    con.close()
+
+
+def test_save_changes():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        loaded_card_list = opencal.io.sqlitedb.load_pkb(db_path)
+        assert not any(card.has_changes for card in loaded_card_list)
+        assert opencal.io.sqlitedb.save_changes(loaded_card_list, db_path) == 0
+
+        # Modify a card, add reviews to another one and create a new card
+        loaded_card_list[3].question = "New question"
+        loaded_card_list[7].consolidation_reviews.append(ConsolidationReview(datetime.datetime(2021, 1, 1), True))
+        loaded_card_list[9].consolidation_reviews.pop()
+        loaded_card_list[5].tags.append("tag 4")          # In-place modifications of the attributes are detected
+        loaded_card_list[13].grade = 2                    # Attributes that are not stored in the database are ignored
+
+        # Saved reviews edited in place must be marked as modified
+        edited_card = next(card for card in loaded_card_list[10:] if card.num_consolidation_reviews > 0)
+        edited_card.consolidation_reviews[0].is_right_answer = not edited_card.consolidation_reviews[0].is_right_answer
+        edited_card.mark_reviews_dirty()
+
+        loaded_card_list.append(Card(datetime.datetime(2021, 1, 2), "New card", "New answer",
+                                     consolidation_reviews=[ConsolidationReview(datetime.datetime(2021, 1, 3), False)]))
+
+        assert [card.has_changes for card in loaded_card_list].count(True) == 6
+        assert opencal.io.sqlitedb.save_changes(loaded_card_list, db_path) == 6
+        assert not any(card.has_changes for card in loaded_card_list)
+        assert loaded_card_list[-1].id is not None
+
+        reloaded_card_list = opencal.io.sqlitedb.load_pkb(db_path)
+
+        opencal.io.connection.close_connection(db_path)
+
+    assert [card.id for card in reloaded_card_list] == [card.id for card in loaded_card_list]
+    assert [card_to_tuple(card) for card in reloaded_card_list] == [card_to_tuple(card) for card in loaded_card_list]
+
+
+def test_load_card_tag_table():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        loaded_card_list = opencal.io.sqlitedb.load_pkb(db_path)
+        card_tag_table = opencal.io.sqlitedb.load_card_tag_table(db_path)
+
+        tag_card_list = opencal.io.sqlitedb.load_pkb(db_path, tags=["tag 1", "tag 3"])
+        tag_card_tag_table = opencal.io.sqlitedb.load_card_tag_table(db_path, tags=["tag 1", "tag 3"])
+
+        opencal.io.connection.close_connection(db_path)
+
+    assert len(card_tag_table) == len(loaded_card_list)
+    assert [card_tag_table.card_tags(card_index) for card_index in range(len(card_tag_table))] == [card.tags for card in loaded_card_list]
+
+    assert 0 < len(tag_card_tag_table) < len(card_tag_table)
+    assert [tag_card_tag_table.card_tags(card_index) for card_index in range(len(tag_card_tag_table))] == [card.tags for card in tag_card_list]
+
+
+def test_load_pkb_tags():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        expected_card_list = [card for card in card_list if {"tag 1", "tag 3"} & set(card.tags)]
+
+        tag_card_list = opencal.io.sqlitedb.load_pkb(db_path, tags=["tag 1", "tag 3"])
+        assert [card_to_tuple(card) for card in tag_card_list] == [card_to_tuple(card) for card in expected_card_list]
+
+        columnar_card_list = opencal.io.sqlitedb.load_pkb(db_path, columnar=True, tags=["tag 1", "tag 3"])
+        assert [card_to_tuple(card) for card in columnar_card_list] == [card_to_tuple(card) for card in expected_card_list]
+
+        assert opencal.io.sqlitedb.load_pkb(db_path, tags=[]) == []
+        assert opencal.io.sqlitedb.load_pkb(db_path, tags=["unknown tag"]) == []
+
+        # Tags modified after the loading are updated in the tag tables
+        tag_card_list[0].tags = ["tag 2"]
+        opencal.io.sqlitedb.save_changes(tag_card_list, db_path)
+        assert len(opencal.io.sqlitedb.load_pkb(db_path, tags=["tag 1", "tag 3"])) == len(expected_card_list) - 1
+
+        opencal.io.connection.close_connection(db_path)
+
+
+def test_card_tag_tables_migration():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        # Databases created before the tag tables existed only have the "tags" column of the card table
+        con = opencal.io.connection.get_connection(db_path)
+        con.execute(f"DROP TABLE {opencal.io.sqlitedb.CARD_TAG_TABLE_NAME}")
+        con.execute(f"DROP TABLE {opencal.io.sqlitedb.TAG_TABLE_NAME}")
+        opencal.io.sqlitedb.set_schema_version(con, 3)
+        con.commit()
+
+        tag_card_list = opencal.io.sqlitedb.load_pkb(db_path, tags=["tag 2"])
+
+        opencal.io.connection.close_connection(db_path)
+
+    assert [card_to_tuple(card) for card in tag_card_list] == [card_to_tuple(card) for card in card_list if "tag 2" in card.tags]
+
+
+def test_migrate_db():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        con = opencal.io.connection.get_connection(db_path)
+        assert opencal.io.sqlitedb.get_schema_version(con) == opencal.io.sqlitedb.SCHEMA_VERSION
+        assert opencal.io.sqlitedb.migrate_db(db_path) == 0
+
+        # Databases created before the schema was versioned have no version and no review index
+        con.execute("DROP INDEX i_consolidation_review_card_id_review_datetime")
+        con.execute("DROP INDEX i_acquisition_review_card_id_review_datetime")
+        con.execute(f"DELETE FROM {opencal.io.sqlitedb.CONFIG_TABLE_NAME}")
+        con.commit()
+        assert opencal.io.sqlitedb.get_schema_version(con) == 0
+
+        # Migrations modify the schema in place (no data is lost)
+        assert opencal.io.sqlitedb.migrate_db(db_path) == len(opencal.io.sqlitedb.MIGRATION_LIST)
+        assert opencal.io.sqlitedb.get_schema_version(con) == opencal.io.sqlitedb.SCHEMA_VERSION
+
+        index_name_set = {row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert {"i_consolidation_review_card_id_review_datetime", "i_acquisition_review_card_id_review_datetime"} <= index_name_set
+
+        query_plan_str = " ".join(row[3] for row in con.execute(f"EXPLAIN QUERY PLAN SELECT review_datetime, is_right_answer FROM {opencal.io.sqlitedb.CONSOLIDATION_REVIEW_TABLE_NAME} WHERE card_id=?", (1,)))
+        assert "COVERING INDEX i_consolidation_review_card_id_review_datetime" in query_plan_str
+
+        loaded_card_list = opencal.io.sqlitedb.load_pkb(db_path)
+
+        opencal.io.connection.close_connection(db_path)
+
+    assert [card_to_tuple(card) for card in loaded_card_list] == [card_to_tuple(card) for card in card_list]
+
+
+def test_load_pkb_review_order():
+    review_datetime = datetime.datetime(2021, 1, 1)
+    card_list = [
+        Card(datetime.datetime(2020, 1, 1), "Question 1", "Answer 1", consolidation_reviews=[
+            ConsolidationReview(review_datetime, False),
+            ConsolidationReview(review_datetime, True),         # Reviews of the same day keep their order
+            ConsolidationReview(review_datetime + datetime.timedelta(days=1), False)
+        ]),
+        Card(datetime.datetime(2020, 1, 2), "Question 2", "Answer 2"),
+        Card(datetime.datetime(2020, 1, 3), "Question 3", "Answer 3", consolidation_reviews=[ConsolidationReview(review_datetime, True)])
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        # Reviews inserted after the others (e.g. by `save_changes`) are sorted by date
+        con = opencal.io.connection.get_connection(db_path)
+        con.execute(f"INSERT INTO {opencal.io.sqlitedb.CONSOLIDATION_REVIEW_TABLE_NAME} (card_id, review_datetime, is_right_answer) VALUES (0, '2020-12-31', 1)")
+        con.commit()
+        card_list[0].consolidation_reviews.insert(0, ConsolidationReview(datetime.datetime(2020, 12, 31), 1))
+
+        loaded_card_list = opencal.io.sqlitedb.load_pkb(db_path)
+
+        opencal.io.connection.close_connection(db_path)
+
+    assert [card_to_tuple(card) for card in loaded_card_list] == [card_to_tuple(card) for card in card_list]
+    assert loaded_card_list[0].last_activity_datetime == datetime.datetime(2021, 1, 2)
+
+
+def test_iter_sql_statements():
+    lines = [
+        "BEGIN TRANSACTION;\n",
+        "INSERT INTO t VALUES('a;\n",
+        "b;');\n",
+        "INSERT INTO t VALUES('c');\n",
+    ]
+
+    assert list(opencal.io.sqlitedb.iter_sql_statements(lines)) == ["BEGIN TRANSACTION;\n", "INSERT INTO t VALUES('a;\nb;');\n", "INSERT INTO t VALUES('c');\n"]
+
+    with pytest.raises(ValueError):
+        list(opencal.io.sqlitedb.iter_sql_statements(["INSERT INTO t VALUES('a;\n"]))
+
+
+@pytest.mark.parametrize("dump_file_name", ["dump.sql", "dump.sql.gz", "dump.sql.zst"])
+def test_dump_restore_db(dump_file_name):
+    if dump_file_name.endswith(".zst"):
+        pytest.importorskip("zstandard")
+
+    card_list = make_card_list()
+    card_list[0].question = "Multi-line question;\nwith semicolons; and 'quotes';"
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        restored_db_path = os.path.join(temp_dir_path, "restored.sqlite")
+        dump_file_path = os.path.join(temp_dir_path, dump_file_name)
+
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+        num_dumped_statements = opencal.io.sqlitedb.dump_db(db_path, dump_file_path, progress_interval_s=None)
+
+        # A small batch size to commit several batches
+        num_restored_statements = opencal.io.sqlitedb.restore_db(restored_db_path, dump_file_path, backup_dir_path=temp_dir_path, batch_size=7, progress_interval_s=None)
+
+        loaded_card_list = opencal.io.sqlitedb.load_pkb(restored_db_path)
+
+        # A new database gets the default permissions of new files, an existing one keeps its permissions
+        umask = os.umask(0)
+        os.umask(umask)
+        assert stat.S_IMODE(os.stat(restored_db_path).st_mode) == 0o666 & ~umask
+
+        os.chmod(restored_db_path, 0o640)
+        opencal.io.sqlitedb.restore_db(restored_db_path, dump_file_path, backup_dir_path=temp_dir_path, progress_interval_s=None)
+        assert stat.S_IMODE(os.stat(restored_db_path).st_mode) == 0o640
+
+        opencal.io.connection.close_connection(db_path)
+        opencal.io.connection.close_connection(restored_db_path)
+
+    assert num_restored_statements == num_dumped_statements - 2      # Without "BEGIN TRANSACTION;" and "COMMIT;"
+    assert [card_to_tuple(card) for card in loaded_card_list] == [card_to_tuple(card) for card in card_list]
+
+
+
+def test_restore_db_malformed_dump():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        dump_file_path = os.path.join(temp_dir_path, "test.sql")
+        backup_dir_path = os.path.join(temp_dir_path, "backups")
+        os.mkdir(backup_dir_path)
+
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+        opencal.io.sqlitedb.dump_db(db_path, dump_file_path, progress_interval_s=None)
+
+        # A malformed statement in the middle of the dump (before the consolidation reviews)
+        with open(dump_file_path) as fd:
+            line_list = fd.readlines()
+        line_index = next(index for index, line in enumerate(line_list) if line.startswith('INSERT INTO "t_consolidation_review"'))
+        line_list.insert(line_index, "INSERT INTO t_unknown VALUES (1);\n")
+        with open(dump_file_path, "w") as fd:
+            fd.writelines(line_list)
+
+        # The restore fails after several batches: the original database is left untouched
+        with pytest.raises(sqlite3.OperationalError):
+            opencal.io.sqlitedb.restore_db(db_path, dump_file_path, backup_dir_path=backup_dir_path, batch_size=7, progress_interval_s=None)
+
+        loaded_card_list = opencal.io.sqlitedb.load_pkb(db_path)
+        file_name_list = os.listdir(temp_dir_path)
+
+        opencal.io.connection.close_connection(db_path)
+
+    assert not any(file_name.endswith(".restoring") for file_name in file_name_list)
+    assert [card_to_tuple(card) for card in loaded_card_list] == [card_to_tuple(card) for card in card_list]
+
+@pytest.mark.parametrize("use_vacuum_into", [False, True])
+def test_backup_db(use_vacuum_into):
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        backup_file_path = opencal.io.sqlitedb.backup_db(db_path, temp_dir_path, pages=2, use_vacuum_into=use_vacuum_into, keep=0)
+
+        assert not os.path.exists(backup_file_path)     # The backup is pruned (keep=0)
+
+        # Backups made the same day are all kept
+        first_backup_file_path = opencal.io.sqlitedb.backup_db(db_path, temp_dir_path, pages=2, use_vacuum_into=use_vacuum_into, keep=2)
+        backup_file_path = opencal.io.sqlitedb.backup_db(db_path, temp_dir_path, pages=2, use_vacuum_into=use_vacuum_into, keep=2)
+        assert os.path.exists(first_backup_file_path) and first_backup_file_path != backup_file_path
+
+        opencal.io.sqlitedb.prune_backups(temp_dir_path, keep=1)
+        assert not os.path.exists(first_backup_file_path)
+
+        loaded_card_list = opencal.io.sqlitedb.load_pkb(backup_file_path)
+
+        opencal.io.connection.close_connection(db_path)
+        opencal.io.connection.close_connection(backup_file_path)
+
+    assert [card_to_tuple(card) for card in loaded_card_list] == [card_to_tuple(card) for card in card_list]
+
+
+def test_differential_backup():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        restored_db_path = os.path.join(temp_dir_path, "restored.sqlite")
+        backup_dir_path = os.path.join(temp_dir_path, "backups")
+        os.mkdir(backup_dir_path)
+
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        # Writes are only logged once differential backups are used
+        con = opencal.io.connection.get_connection(db_path)
+        trigger_query_str = "SELECT count(*) FROM sqlite_master WHERE type='trigger' AND name LIKE '%_change_log'"
+        assert con.execute(trigger_query_str).fetchone()[0] == 0
+        opencal.io.sqlitedb.backup_db(db_path, backup_dir_path, keep=1)
+        assert con.execute(trigger_query_str).fetchone()[0] == 0
+
+        # No full backup yet: a full backup is made
+        full_backup_file_path = opencal.io.sqlitedb.backup_db(db_path, backup_dir_path, differential=True, keep=1)
+        assert full_backup_file_path.endswith("_opencal.sqlite")
+        assert con.execute(trigger_query_str).fetchone()[0] == 3 * len(opencal.io.sqlitedb.CHANGE_LOG_TABLE_LIST)
+
+        # Update, delete and insert rows
+        card_list[1].question = "New question"
+        card_list[2].tags = ["tag 4"]
+        card_list[3].consolidation_reviews.append(ConsolidationReview(datetime.datetime(2021, 6, 1), True))
+        opencal.io.sqlitedb.save_changes(card_list, db_path)
+
+        con.execute(f"DELETE FROM {opencal.io.sqlitedb.CONSOLIDATION_REVIEW_TABLE_NAME} WHERE card_id=4")
+        con.commit()
+        card_list[4].consolidation_reviews.clear()
+
+        differential_backup_file_path = opencal.io.sqlitedb.backup_db(db_path, backup_dir_path, differential=True, keep=1)
+        assert differential_backup_file_path.endswith("_opencal_diff.sqlite")
+
+        # Changes made after the differential backup are not restored
+        con.execute(f"DELETE FROM {opencal.io.sqlitedb.CONSOLIDATION_REVIEW_TABLE_NAME} WHERE card_id=5")
+        con.commit()
+
+        opencal.io.sqlitedb.restore_backup(differential_backup_file_path, restored_db_path, backup_dir_path)
+        loaded_card_list = opencal.io.sqlitedb.load_pkb(restored_db_path)
+        filtered_card_list = opencal.io.sqlitedb.load_pkb(restored_db_path, tags=["tag 4"])
+
+        # A new full backup made the same day doesn't replace the base of the differential backup: both are pruned
+        new_full_backup_file_path = opencal.io.sqlitedb.backup_db(db_path, backup_dir_path, keep=1)
+        assert new_full_backup_file_path != full_backup_file_path
+        assert os.listdir(backup_dir_path) == [os.path.basename(new_full_backup_file_path)]
+
+        opencal.io.connection.close_connection(db_path)
+        opencal.io.connection.close_connection(restored_db_path)
+
+    assert [card_to_tuple(card) for card in loaded_card_list] == [card_to_tuple(card) for card in card_list]
+    assert [card.question for card in filtered_card_list] == [card_list[2].question]
+
+
+def test_xml_to_sqlite():
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        xml_file_path = os.path.join(temp_dir_path, "test.xml.gz")
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+
+        opencal.io.pkb.save_pkb(card_list, xml_file_path)
+
+        # A small batch size to insert several batches
+        assert opencal.io.sqlitedb.xml_to_sqlite(xml_file_path, db_path, batch_size=7) == len(card_list)
+
+        con = opencal.io.connection.get_connection(db_path)
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert opencal.io.sqlitedb.get_schema_version(con) == opencal.io.sqlitedb.SCHEMA_VERSION
+
+        loaded_card_list = opencal.io.sqlitedb.load_pkb(db_path)
+        filtered_card_list = opencal.io.sqlitedb.load_pkb(db_path, tags=["tag 1"])
+
+        opencal.io.connection.close_connection(db_path)
+
+    assert [card_to_tuple(card) for card in loaded_card_list] == [card_to_tuple(card) for card in card_list]
+    assert [card_to_tuple(card) for card in filtered_card_list] == [card_to_tuple(card) for card in card_list if "tag 1" in card.tags]
+
+
+def test_load_pkb_dataframes():
+    from opencal.core.data import card_list_to_dataframes
+
+    card_list = make_card_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        db_path = os.path.join(temp_dir_path, "test.sqlite")
+        opencal.io.sqlitedb.save_pkb(card_list, db_path)
+
+        card_df, review_df, tag_df = opencal.io.sqlitedb.load_pkb_dataframes(db_path)
+        filtered_card_df, filtered_review_df, filtered_tag_df = opencal.io.sqlitedb.load_pkb_dataframes(db_path, tags=["tag 1"])
+
+        opencal.io.connection.close_connection(db_path)
+
+    # Same content than the DataFrames made from the cards (card IDs are the positions of the cards)
+    expected_card_df, expected_review_df = card_list_to_dataframes(card_list)
+
+    assert card_df.index.tolist() == list(range(len(card_list)))
+    assert card_df["cdate"].tolist() == expected_card_df["cdate"].tolist()
+    assert card_df["hidden"].tolist() == expected_card_df["hidden"].tolist()
+    for column in ("rdate", "result", "card_id"):
+        assert review_df[column].tolist() == expected_review_df[column].tolist()
+
+    assert sorted(zip(tag_df["card_id"], tag_df["tag"])) == sorted((card_id, tag) for card_id, card in enumerate(card_list) for tag in card.tags)
+
+    filtered_card_id_list = [card_id for card_id, card in enumerate(card_list) if "tag 1" in card.tags]
+    assert filtered_card_df.index.tolist() == filtered_card_id_list
+    assert sorted(set(filtered_review_df["card_id"])) == [card_id for card_id in filtered_card_id_list if len(card_list[card_id].consolidation_reviews) > 0]
+    assert sorted(set(filtered_tag_df["card_id"])) == filtered_card_id_list
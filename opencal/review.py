@@ -4,6 +4,16 @@ from datetime import datetime, timedelta
 PY_DATE_FORMAT = r"%Y-%m-%d"
 
 class ConsolidationReview:
+
+    # Each card keeps its whole review history: there are several reviews per card (c.f. `Card.__slots__`)
+    __slots__ = (
+        "review_datetime",
+        "is_right_answer",
+        "user_response_time_ms",
+        "timedelta",
+        "last_validated_timedelta",
+    )
+
     def __init__(
             self,
             review_datetime: Union[datetime, str],
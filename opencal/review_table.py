@@ -0,0 +1,239 @@
+"""Columnar storage of consolidation reviews.
+
+A `ReviewTable` stores all the consolidation reviews of a PKB in a few NumPy
+arrays (a handful of bytes per review) instead of one `ConsolidationReview`
+object per review.
+
+`LazyCard` is a `Card` whose consolidation reviews are read from a
+`ReviewTable`: the `ConsolidationReview` objects are only built when the
+`consolidation_reviews` attribute of the card is actually accessed.
+"""
+
+import datetime
+from typing import List, Optional, Union
+
+import numpy as np
+
+from opencal.card import Card, as_datetime
+from opencal.review import ConsolidationReview
+
+NO_RESPONSE_TIME = -1
+
+
+class ReviewTable:
+
+    __slots__ = (
+        "card_id",
+        "day",
+        "is_right_answer",
+        "user_response_time_ms",
+    )
+
+    def __init__(
+            self,
+            card_id: np.ndarray,
+            day: np.ndarray,
+            is_right_answer: np.ndarray,
+            user_response_time_ms: Optional[np.ndarray] = None
+        ) -> None:
+        """
+        Initialize a ReviewTable instance.
+
+        Reviews must be sorted by card ID then by date.
+
+        Parameters
+        ----------
+        card_id : np.ndarray
+            The ID of the reviewed card of each review (int32).
+        day : np.ndarray
+            The date of each review, as a day ordinal (int32, c.f. `datetime.date.toordinal`).
+        is_right_answer : np.ndarray
+            A flag indicating whether each answer was correct (bool).
+        user_response_time_ms : np.ndarray, optional
+            The time taken by the user to respond, in milliseconds (int32, `NO_RESPONSE_TIME` if unknown).
+            Default is None, i.e. no response time is known.
+
+        Returns
+        -------
+        None
+        """
+        self.card_id: np.ndarray = np.asarray(card_id, dtype=np.int32)
+        self.day: np.ndarray = np.asarray(day, dtype=np.int32)
+        self.is_right_answer: np.ndarray = np.asarray(is_right_answer, dtype=bool)
+        self.user_response_time_ms: Optional[np.ndarray] = None if user_response_time_ms is None else np.asarray(user_response_time_ms, dtype=np.int32)
+
+        assert len(self.card_id) == len(self.day) == len(self.is_right_answer)
+        assert self.user_response_time_ms is None or len(self.user_response_time_ms) == len(self.card_id)
+
+
+    def __len__(self) -> int:
+        return len(self.card_id)
+
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the arrays of the table (in bytes)."""
+        nbytes = self.card_id.nbytes + self.day.nbytes + self.is_right_answer.nbytes
+        if self.user_response_time_ms is not None:
+            nbytes += self.user_response_time_ms.nbytes
+        return nbytes
+
+
+    def card_bounds(self, card_id: int) -> slice:
+        """
+        Get the rows of the reviews of one card.
+
+        Parameters
+        ----------
+        card_id : int
+            The ID of the card.
+
+        Returns
+        -------
+        slice
+            The rows of the table containing the reviews of the card.
+        """
+        start = int(np.searchsorted(self.card_id, card_id, side="left"))
+        stop = int(np.searchsorted(self.card_id, card_id, side="right"))
+        return slice(start, stop)
+
+
+    def make_reviews(self, rows: slice) -> List[ConsolidationReview]:
+        """
+        Build the `ConsolidationReview` objects of some rows of the table.
+
+        Parameters
+        ----------
+        rows : slice
+            The rows of the table to convert.
+
+        Returns
+        -------
+        List[ConsolidationReview]
+            The reviews.
+        """
+        day_list = self.day[rows].tolist()
+        is_right_answer_list = self.is_right_answer[rows].tolist()
+
+        if self.user_response_time_ms is None:
+            response_time_list = [None] * len(day_list)
+        else:
+            response_time_list = [None if t == NO_RESPONSE_TIME else t for t in self.user_response_time_ms[rows].tolist()]
+
+        return [
+            ConsolidationReview(
+                review_datetime=datetime.datetime.fromordinal(day),
+                is_right_answer=is_right_answer,
+                user_response_time_ms=response_time
+            )
+            for day, is_right_answer, response_time in zip(day_list, is_right_answer_list, response_time_list)
+        ]
+
+
+class LazyCard(Card):
+
+    __slots__ = (
+        "review_table",
+        "review_rows",
+        "_consolidation_reviews",
+    )
+
+    def __init__(
+            self,
+            creation_datetime: Union[datetime.datetime, str],
+            question: str,
+            review_table: ReviewTable,
+            review_rows: slice,
+            answer: str = "",
+            is_hidden: bool = False,
+            tags: Optional[List[str]] = None,
+            id: Optional[int] = None,
+        ) -> None:
+        """
+        Initialize a LazyCard instance.
+
+        Parameters
+        ----------
+        creation_datetime : datetime
+            The date and time when the card was created.
+        question : str
+            The question text of the card.
+        review_table : ReviewTable
+            The table containing the consolidation reviews of the card.
+        review_rows : slice
+            The rows of `review_table` containing the consolidation reviews of the card.
+        answer : str, optional
+            The answer text of the card (default is an empty string).
+        is_hidden : bool, optional
+            A flag indicating whether the card is hidden (default is False).
+        tags : list of str, optional
+            A list of tags associated with the card (default is None, which initializes an empty list).
+        id : int, optional
+            The primary key of the card in the SQLite database (default is None).
+
+        Returns
+        -------
+        None
+        """
+        # The last activity date is computed from the table (the reviews are not built)
+        super().__init__(
+            creation_datetime=creation_datetime,
+            question=question,
+            answer=answer,
+            is_hidden=is_hidden,
+            tags=tags,
+            id=id,
+            last_activity_datetime=table_last_activity_datetime(creation_datetime, review_table, review_rows)
+        )
+
+        self.review_table: ReviewTable = review_table
+        self.review_rows: slice = review_rows
+        self._consolidation_reviews: Optional[List[ConsolidationReview]] = None   # Built on first access
+
+
+    @property
+    def consolidation_reviews(self) -> List[ConsolidationReview]:
+        if self._consolidation_reviews is None:
+            self._consolidation_reviews = self.review_table.make_reviews(self.review_rows)
+        return self._consolidation_reviews
+
+
+    @consolidation_reviews.setter
+    def consolidation_reviews(self, value: List[ConsolidationReview]) -> None:
+        self._consolidation_reviews = value
+
+
+    def update_last_activity_datetime(self) -> None:
+        """Same as `Card.update_last_activity_datetime` but read the date of the last review from the table (without building the reviews)."""
+        if self._consolidation_reviews is not None:
+            super().update_last_activity_datetime()
+        else:
+            self.last_activity_datetime = table_last_activity_datetime(self.creation_datetime, self.review_table, self.review_rows)
+
+
+    @property
+    def is_materialized(self) -> bool:
+        """True if the `ConsolidationReview` objects of the card have been built."""
+        return self._consolidation_reviews is not None
+
+
+    @property
+    def num_consolidation_reviews(self) -> int:
+        """The number of consolidation reviews of the card (without building them)."""
+        if self._consolidation_reviews is None:
+            return self.review_rows.stop - self.review_rows.start
+        return len(self._consolidation_reviews)
+
+
+def table_last_activity_datetime(
+        creation_datetime: Union[datetime.datetime, str],
+        review_table: ReviewTable,
+        review_rows: slice
+    ) -> Union[datetime.datetime, str]:
+    """The last activity date of a card whose reviews are the rows `review_rows` of `review_table` (c.f. `Card.update_last_activity_datetime`)."""
+    last_activity_datetime = as_datetime(creation_datetime)
+    if review_rows.stop > review_rows.start:
+        # Reviews are sorted by date
+        last_review_datetime = datetime.datetime.fromordinal(int(review_table.day[review_rows.stop - 1]))
+        last_activity_datetime = max(last_activity_datetime, last_review_datetime)
+    return last_activity_datetime
@@ -0,0 +1,261 @@
+"""Columnar storage of card tags.
+
+A `TagVocabulary` interns tag strings: each distinct tag of a PKB gets a small
+integer ID. A `CardTagTable` stores the tags of all the cards of a PKB as
+arrays of tag IDs (the tags of the i-th card are
+`tag_ids[offsets[i]:offsets[i+1]]`).
+
+The priority and the difficulty of all the cards can then be estimated in a
+few vectorized operations: the weights of the tags (c.f. the
+`tag_priorities` and `tag_difficulties` options of professors) are converted
+once to an array indexed by tag ID instead of being looked up in a dict for
+each tag of each card.
+"""
+
+import itertools
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+DEFAULT_PRIORITY = 1.
+DEFAULT_DIFFICULTY = 1.
+
+
+class TagVocabulary:
+
+    __slots__ = (
+        "tag_to_id",
+        "tag_list",
+    )
+
+    def __init__(self, tags: Optional[Iterable[str]] = None) -> None:
+        """
+        Initialize a TagVocabulary instance.
+
+        Parameters
+        ----------
+        tags : Iterable[str], optional
+            The tags to intern (default is None, i.e. an empty vocabulary).
+
+        Returns
+        -------
+        None
+        """
+        self.tag_to_id: Dict[str, int] = {}
+        self.tag_list: List[str] = []
+
+        if tags is not None:
+            for tag in tags:
+                self.intern(tag)
+
+
+    def __len__(self) -> int:
+        return len(self.tag_list)
+
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self.tag_to_id
+
+
+    def intern(self, tag: str) -> int:
+        """Return the ID of `tag` (a new ID is assigned if the tag is not in the vocabulary yet)."""
+        tag_id = self.tag_to_id.get(tag)
+        if tag_id is None:
+            tag_id = len(self.tag_list)
+            self.tag_to_id[tag] = tag_id
+            self.tag_list.append(tag)
+        return tag_id
+
+
+    def weights(
+            self,
+            tag_weight_dict: Dict[str, float],
+            default: float
+        ) -> np.ndarray:
+        """
+        Convert a dict of tag weights to an array indexed by tag ID.
+
+        Parameters
+        ----------
+        tag_weight_dict : Dict[str, float]
+            The weight of each tag (e.g. the `tag_priorities` option of a professor).
+        default : float
+            The weight of the tags of the vocabulary that are not in `tag_weight_dict`.
+
+        Returns
+        -------
+        np.ndarray
+            The weight of each tag of the vocabulary (float64).
+        """
+        return np.array([tag_weight_dict.get(tag, default) for tag in self.tag_list], dtype=np.float64)
+
+
+class CardTagTable:
+
+    __slots__ = (
+        "vocabulary",
+        "offsets",
+        "tag_ids",
+    )
+
+    def __init__(
+            self,
+            vocabulary: TagVocabulary,
+            offsets: np.ndarray,
+            tag_ids: np.ndarray
+        ) -> None:
+        """
+        Initialize a CardTagTable instance.
+
+        Parameters
+        ----------
+        vocabulary : TagVocabulary
+            The vocabulary the tag IDs refer to.
+        offsets : np.ndarray
+            The index of the first tag of each card in `tag_ids`, followed by `len(tag_ids)` (int64, one more item than cards).
+        tag_ids : np.ndarray
+            The tag IDs of all the cards, card after card (int32).
+
+        Returns
+        -------
+        None
+        """
+        self.vocabulary: TagVocabulary = vocabulary
+        self.offsets: np.ndarray = np.asarray(offsets, dtype=np.int64)
+        self.tag_ids: np.ndarray = np.asarray(tag_ids, dtype=np.int32)
+
+        assert len(self.offsets) > 0 and self.offsets[-1] == len(self.tag_ids)
+
+
+    @classmethod
+    def from_card_list(
+            cls,
+            card_list: List[Any],
+            vocabulary: Optional[TagVocabulary] = None
+        ) -> "CardTagTable":
+        """
+        Intern the tags of a list of cards.
+
+        Parameters
+        ----------
+        card_list : List[Any]
+            A list of cards (`Card` instances or dicts with a "tags" item).
+        vocabulary : TagVocabulary, optional
+            The vocabulary to extend (default is None, i.e. a new vocabulary).
+
+        Returns
+        -------
+        CardTagTable
+            The tags of the cards of `card_list`, in the same order.
+        """
+        if vocabulary is None:
+            vocabulary = TagVocabulary()
+
+        tags_list = [card["tags"] for card in card_list]
+        all_tag_list = list(itertools.chain.from_iterable(tags_list))
+
+        # Tags are interned in the order of their first occurrence
+        for tag in dict.fromkeys(all_tag_list):
+            vocabulary.intern(tag)
+
+        offsets = np.zeros(len(tags_list) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, tags_list), dtype=np.int64, count=len(tags_list)), out=offsets[1:])
+        tag_id_list = list(map(vocabulary.tag_to_id.__getitem__, all_tag_list))
+
+        return cls(vocabulary, offsets, np.array(tag_id_list, dtype=np.int32))
+
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+    def card_tag_ids(self, card_index: int) -> np.ndarray:
+        """The tag IDs of the `card_index`-th card."""
+        return self.tag_ids[self.offsets[card_index]:self.offsets[card_index + 1]]
+
+
+    def card_tags(self, card_index: int) -> List[str]:
+        """The tags of the `card_index`-th card."""
+        return [self.vocabulary.tag_list[tag_id] for tag_id in self.card_tag_ids(card_index)]
+
+
+    def _reduce(self, ufunc: np.ufunc, weight_array: np.ndarray, empty_value: float) -> np.ndarray:
+        """Reduce the weights of the tags of each card with `ufunc` (cards without tags get `empty_value`)."""
+        result = np.full(len(self), empty_value, dtype=np.float64)
+
+        if len(self.tag_ids) > 0:
+            # `reduceat` doesn't handle empty segments: only non-empty cards are reduced
+            is_not_empty = self.offsets[1:] > self.offsets[:-1]
+            result[is_not_empty] = ufunc.reduceat(weight_array[self.tag_ids], self.offsets[:-1][is_not_empty])
+
+        return result
+
+
+    def estimate_priorities(
+            self,
+            tag_priority_dict: Dict[str, float],
+            default_priority: float = DEFAULT_PRIORITY
+        ) -> np.ndarray:
+        """
+        Estimate the priority of all the cards from their tags.
+
+        The priority of a card is the lowest priority of its tags if it is negative,
+        the highest one otherwise (tags that are not in `tag_priority_dict` have
+        the default priority, and so have cards without tags).
+
+        Parameters
+        ----------
+        tag_priority_dict : Dict[str, float]
+            The priority of each tag.
+        default_priority : float, optional
+            The default priority (default is `DEFAULT_PRIORITY`).
+
+        Returns
+        -------
+        np.ndarray
+            The priority of each card (float64).
+        """
+        weight_array = self.vocabulary.weights(tag_priority_dict, default_priority)
+
+        min_priority_array = self._reduce(np.minimum, weight_array, default_priority)
+        max_priority_array = self._reduce(np.maximum, weight_array, default_priority)
+
+        return np.where(min_priority_array < 0, min_priority_array, max_priority_array)
+
+
+    def estimate_difficulties(
+            self,
+            tag_difficulty_dict: Dict[str, float],
+            default_difficulty: float = DEFAULT_DIFFICULTY
+        ) -> np.ndarray:
+        """
+        Estimate the difficulty of all the cards from their tags.
+
+        The difficulty of a card is the highest difficulty of its tags that are
+        in `tag_difficulty_dict` (cards without such tags have the default difficulty).
+
+        Parameters
+        ----------
+        tag_difficulty_dict : Dict[str, float]
+            The difficulty of each tag.
+        default_difficulty : float, optional
+            The default difficulty (default is `DEFAULT_DIFFICULTY`).
+
+        Returns
+        -------
+        np.ndarray
+            The difficulty of each card (float64).
+        """
+        # Tags without difficulty are ignored by the max
+        weight_array = self.vocabulary.weights(tag_difficulty_dict, -np.inf)
+
+        max_difficulty_array = self._reduce(np.maximum, weight_array, -np.inf)
+
+        return np.where(np.isneginf(max_difficulty_array), default_difficulty, max_difficulty_array)
+
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the arrays of the table (in bytes)."""
+        return self.offsets.nbytes + self.tag_ids.nbytes
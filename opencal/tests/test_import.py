@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains unit tests for the lazy import of the "opencal" package.
+
+The import time itself depends on the machine and its load: it is measured by
+benchmarks/bench_import.py.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+HEAVY_MODULE_LIST = ["numpy", "pandas", "yaml"]
+
+# HELPERS #####################################################################
+
+def run_python(code, config_path):
+    env = dict(os.environ, OPENCAL_CONFIG_PATH=config_path)
+    return subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+# TEST FUNCTIONS ##############################################################
+
+def test_import_is_lazy():
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        config_path = os.path.join(temp_dir_path, "opencal.yml")
+
+        code = f"import sys, opencal; print(*[name for name in {HEAVY_MODULE_LIST!r} if name in sys.modules])"
+        result = run_python(code, config_path)
+
+        assert result.stdout.strip() == ""
+        assert not os.path.exists(config_path)
+
+        # The configuration is loaded on first access
+        result = run_python("import opencal; print(opencal.cfg['opencal']['consolidation_professor'])", config_path)
+
+        assert result.stdout.strip() == "doreen"
+        assert os.path.exists(config_path)
+
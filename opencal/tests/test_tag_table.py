@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This module contains unit tests for the "opencal.tag_table" module.
+"""
+
+from opencal.card import Card
+from opencal.core.professor.consolidation import berenice, celia, doreen
+from opencal.tag_table import CardTagTable, TagVocabulary
+
+import datetime
+import random
+
+TAG_LIST = ["easy", "hard", "important", "todo", "boring", "maths"]
+
+# HELPERS #####################################################################
+
+def make_card_list(num_cards=300, seed=0):
+    rng = random.Random(seed)
+    return [
+        Card(creation_datetime=datetime.datetime(2020, 1, 1), question="foo", tags=rng.sample(TAG_LIST, rng.randint(0, 4)))
+        for _ in range(num_cards)
+    ]
+
+# TEST FUNCTIONS ##############################################################
+
+def test_tag_vocabulary():
+    vocabulary = TagVocabulary(["easy", "hard", "easy"])
+
+    assert len(vocabulary) == 2
+    assert vocabulary.intern("hard") == 1
+    assert vocabulary.intern("todo") == 2
+    assert "todo" in vocabulary and "maths" not in vocabulary
+    assert vocabulary.weights({"hard": 2., "todo": -1}, 1.).tolist() == [1., 2., -1.]
+
+
+def test_card_tag_table():
+    card_list = make_card_list()
+    table = CardTagTable.from_card_list(card_list)
+
+    assert len(table) == len(card_list)
+    assert len(table.vocabulary) <= len(TAG_LIST)
+    assert all(table.card_tags(card_index) == card.tags for card_index, card in enumerate(card_list))
+
+
+def test_estimate_priorities_and_difficulties():
+    card_list = make_card_list()
+    table = CardTagTable.from_card_list(card_list)
+
+    tag_priority_dict = {"important": 3, "todo": 0.5, "boring": -1, "maths": -2}
+    tag_difficulty_dict = {"easy": 0.5, "hard": 2., "maths": 1.5}
+
+    # Doreen, Celia and Berenice have the same estimation rules
+    for professor_module in (doreen, celia, berenice):
+        assert table.estimate_priorities(tag_priority_dict).tolist() == [professor_module.estimate_card_priority(card, tag_priority_dict) for card in card_list]
+        assert table.estimate_difficulties(tag_difficulty_dict).tolist() == [professor_module.estimate_card_difficulty(card, tag_difficulty_dict) for card in card_list]
+
+
+def test_estimate_without_tags():
+    table = CardTagTable.from_card_list([{"tags": []}, {"tags": []}])
+
+    assert table.estimate_priorities({"important": 3}).tolist() == [1., 1.]
+    assert table.estimate_difficulties({"hard": 2.}).tolist() == [1., 1.]